@@ -20,6 +20,27 @@ resource "aws_dynamodb_table" "datasets" {
     name = "id"
     type = "S"
   }
+  attribute {
+    name = "hub"
+    type = "S"
+  }
+  attribute {
+    name = "owner_account_id"
+    type = "S"
+  }
+  # DynamoDB backfills new global secondary indexes from the existing items, no data migration is required.
+  global_secondary_index {
+    name            = "hub-index"
+    hash_key        = "hub"
+    range_key       = "id"
+    projection_type = "ALL"
+  }
+  global_secondary_index {
+    name            = "owner-index"
+    hash_key        = "owner_account_id"
+    range_key       = "id"
+    projection_type = "ALL"
+  }
   point_in_time_recovery {
     enabled = var.resource_name_prefix == "" ? true : false
   }
@@ -51,6 +72,36 @@ resource "aws_dynamodb_table" "resources" {
     name = "id"
     type = "S"
   }
+  attribute {
+    name = "hub"
+    type = "S"
+  }
+  attribute {
+    name = "resource_account_id"
+    type = "S"
+  }
+  attribute {
+    name = "owner_account_id"
+    type = "S"
+  }
+  global_secondary_index {
+    name            = "hub-index"
+    hash_key        = "hub"
+    range_key       = "id"
+    projection_type = "ALL"
+  }
+  global_secondary_index {
+    name            = "resource-account-index"
+    hash_key        = "resource_account_id"
+    range_key       = "id"
+    projection_type = "ALL"
+  }
+  global_secondary_index {
+    name            = "owner-index"
+    hash_key        = "owner_account_id"
+    range_key       = "id"
+    projection_type = "ALL"
+  }
   point_in_time_recovery {
     enabled = var.resource_name_prefix == "" ? true : false
   }
@@ -87,6 +138,24 @@ resource "aws_dynamodb_table" "filter_packages" {
   }
 }
 
+resource "aws_dynamodb_table" "kms_key_access" {
+  name         = "${var.resource_name_prefix}cdh-kms-key-access"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "resource_account_id_region"
+  range_key    = "id"
+  attribute {
+    name = "resource_account_id_region"
+    type = "S"
+  }
+  attribute {
+    name = "id"
+    type = "S"
+  }
+  point_in_time_recovery {
+    enabled = var.resource_name_prefix == "" ? true : false
+  }
+}
+
 output "dynamo_accounts_table_name" {
   value = aws_dynamodb_table.accounts.name
 }
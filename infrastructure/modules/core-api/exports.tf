@@ -0,0 +1,66 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+module "export_bucket" {
+  source = "../technical/s3"
+
+  name                  = "${var.resource_name_prefix}cdh-core-exports-${data.aws_caller_identity.current.account_id}-${data.aws_region.current.name}"
+  bucket_owner_enforced = true
+  force_destroy         = var.resource_name_prefix != ""
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "export_bucket" {
+  bucket = module.export_bucket.name
+
+  rule {
+    id     = "expire-exports"
+    status = "Enabled"
+    filter {}
+    expiration {
+      days = 7
+    }
+    abort_incomplete_multipart_upload {
+      days_after_initiation = 1
+    }
+  }
+}
+
+data "aws_iam_policy_document" "cdh-core-api-exports" {
+  statement {
+    effect = "Allow"
+    actions = [
+      "s3:GetObject",
+      "s3:PutObject",
+    ]
+    resources = ["${module.export_bucket.arn}/*"]
+  }
+  # exports are written by the job export_catalog, which the lambda invokes asynchronously, see cdh_core_api/jobs.py
+  statement {
+    effect    = "Allow"
+    actions   = ["lambda:InvokeFunction"]
+    resources = [aws_lambda_alias.core_api_lambda_alias.arn]
+  }
+}
+
+resource "aws_iam_policy" "cdh-core-api-exports" {
+  name        = "${var.resource_name_prefix}cdh-core-api-exports"
+  path        = "/"
+  description = "Policy grants access to the objects of the catalog export bucket and to start the export job."
+  policy      = data.aws_iam_policy_document.cdh-core-api-exports.json
+}
+
+resource "aws_iam_role_policy_attachment" "cdh-core-api-exports" {
+  role       = module.core-api-lambda.role_name
+  policy_arn = aws_iam_policy.cdh-core-api-exports.arn
+}
@@ -19,6 +19,7 @@ module "deps_layer" {
   context                = "coreapi"
   layer_name             = "${var.resource_name_prefix}core-api-deps-layer"
   requirements_file_path = abspath("${path.module}/../../../src/lambdas/cdh_core_api/requirements.txt")
+  config_file_path       = abspath(var.cdh_core_config_file_path)
 }
 
 resource "aws_sns_topic" "dataset_creation_and_change_notification_topic" {
@@ -84,6 +85,9 @@ module "core-api-lambda" {
     PYTHONFAULTHANDLER            = "1"
     ENCRYPTION_KEY_NAME           = aws_ssm_parameter.encryption_key.name
     RESULT_PAGE_SIZE              = local.result_page_size
+    LAZY_ENDPOINT_IMPORTS         = "true"
+    CDH_CORE_CONFIG_SNAPSHOT_PATH = "/opt/python/cdh_core_config_snapshot.pickle"
+    EXPORT_BUCKET_NAME            = module.export_bucket.name
   }
   environment               = var.environment
   alerts_topic_arn          = var.alerts_topic_arn
@@ -96,6 +100,9 @@ module "core-api-lambda" {
   publish_lambda            = true
   cdh_core_config_file_path = var.cdh_core_config_file_path
   admin_role_name           = var.admin_role_name
+
+  # The lambda queries the global secondary indexes, which must be backfilled before a new version is deployed.
+  depends_on = [aws_dynamodb_table.datasets, aws_dynamodb_table.resources, aws_dynamodb_table.kms_key_access]
 }
 
 resource "aws_lambda_alias" "core_api_lambda_alias" {
@@ -104,6 +111,28 @@ resource "aws_lambda_alias" "core_api_lambda_alias" {
   function_version = module.core-api-lambda.version
 }
 
+# Jobs are run by invoking the lambda with the event {"job": <name>}, see cdh_core_api/jobs.py
+resource "aws_cloudwatch_event_rule" "kms_key_access_consistency_schedule" {
+  name                = "${local.core_api_lambda_name}-kms-key-access-consistency"
+  schedule_expression = "rate(1 day)"
+  description         = "Triggers the daily consistency check of the KMS key access table"
+}
+
+resource "aws_cloudwatch_event_target" "kms_key_access_consistency_schedule" {
+  arn   = aws_lambda_alias.core_api_lambda_alias.arn
+  rule  = aws_cloudwatch_event_rule.kms_key_access_consistency_schedule.name
+  input = jsonencode({ job = "check_kms_key_access_consistency" })
+}
+
+resource "aws_lambda_permission" "kms_key_access_consistency_schedule_permission" {
+  statement_id  = "AllowKmsKeyAccessConsistencyFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = module.core-api-lambda.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.kms_key_access_consistency_schedule.arn
+  qualifier     = aws_lambda_alias.core_api_lambda_alias.name
+}
+
 
 resource "aws_xray_sampling_rule" "lambda" {
   count          = var.resource_name_prefix == "" ? 1 : 0
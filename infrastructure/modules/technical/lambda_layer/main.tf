@@ -43,6 +43,11 @@ variable "docker_build" {
   default     = true
   description = "If true, this will use Docker to build the dependencies layer. Set to true when having binary dependencies"
 }
+variable "config_file_path" {
+  type        = string
+  default     = "notset"
+  description = "Absolute path to the cdh-core config file. If set, a validated snapshot of the config is included as `/python/cdh_core_config_snapshot.pickle`."
+}
 
 data "aws_region" "current" {}
 
@@ -55,7 +60,8 @@ data "external" "build_layer_object" {
     "--bucket-name", var.bucket_name,
     "--fetch-custom-credentials", var.fetch_custom_credentials,
     "--include-zip", var.include_zip,
-    "--docker-build", var.docker_build
+    "--docker-build", var.docker_build,
+    "--config-file-path", var.config_file_path
   ]
   working_dir = "${path.module}/../../../../"
 }
@@ -0,0 +1,208 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from logging import getLogger
+from pathlib import Path
+from tempfile import gettempdir
+from typing import List
+from typing import Optional
+
+from cdh_core.aws_clients.cloudwatch_log_writer import CloudwatchLogWriter
+
+LOG = getLogger(__name__)
+# receives the messages which cannot be written to CloudWatch Logs, they end up in the log of the lambda instead
+DEAD_LETTER_LOG = getLogger(f"{__name__}.dead_letter")
+
+DEFAULT_SPOOL_DIRECTORY = Path(gettempdir()) / "cdh-log-spool"
+# limits of PutLogEvents, every event counts with its size in UTF-8 plus a fixed overhead
+MAX_BATCH_EVENTS = 10_000
+MAX_BATCH_BYTES = 1_048_576
+MAX_EVENT_BYTES = 262_144
+EVENT_OVERHEAD_BYTES = 26
+MAX_RETRY_INTERVAL_SECONDS = 30.0
+MAX_WRITE_ATTEMPTS = 5
+# Lambda provides at least 512 MB of ephemeral storage in /tmp
+MAX_SPOOL_BYTES = 64 * 1024 * 1024
+
+
+class BatchingLogWriter:
+    """Writes log messages in batches from a background thread to a CloudwatchLogWriter.
+
+    Messages are appended to a write-ahead spool file before they are buffered, and they are only removed from the spool
+    once they are written. Messages whose write failed are retried with a backoff, also by a new process which finds
+    them in the spool. Since AWS Lambda freezes all threads once a request is answered, flush has to be called before.
+    A batch whose write failed `max_write_attempts` times in a row and messages which do not fit into the spool of at
+    most `max_spool_bytes` are written to the DEAD_LETTER_LOG instead.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        log_writer: CloudwatchLogWriter,
+        spool_path: Path,
+        retry_interval: float = 1.0,
+        max_write_attempts: int = MAX_WRITE_ATTEMPTS,
+        max_spool_bytes: int = MAX_SPOOL_BYTES,
+    ) -> None:
+        self._log_writer = log_writer
+        self._spool_path = spool_path
+        self._retry_interval = retry_interval
+        self._max_write_attempts = max_write_attempts
+        self._max_spool_bytes = max_spool_bytes
+        self._condition = threading.Condition()
+        self._pending: List[str] = self._read_spool()
+        self._spool_bytes = sum(len(_to_spool_line(message)) for message in self._pending)
+        self._failing = False
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def for_log_group(
+        cls, log_writer: CloudwatchLogWriter, log_group_name: str, spool_directory: Path = DEFAULT_SPOOL_DIRECTORY
+    ) -> BatchingLogWriter:
+        """Create a writer whose spool does not depend on the log stream, which can change with a new process."""
+        spool_directory.mkdir(parents=True, exist_ok=True)
+        return cls(log_writer, spool_directory / f"{log_group_name.replace('/', '_')}.jsonl")
+
+    @property
+    def pending_messages(self) -> int:
+        """Return the number of messages which are not yet written."""
+        with self._condition:
+            return len(self._pending)
+
+    def write_log(self, messages: List[str]) -> None:
+        """Spool the messages and hand them over to the background thread."""
+        accepted = []
+        for message in messages:
+            if len(message.encode("utf-8")) + EVENT_OVERHEAD_BYTES > MAX_EVENT_BYTES:
+                LOG.error(f"The following message exceeds the size limit of CloudWatch Logs: {message}")
+            else:
+                accepted.append(message)
+        with self._condition:
+            lines = []
+            for message in accepted:
+                line = _to_spool_line(message)
+                if self._spool_bytes + len(line) > self._max_spool_bytes:
+                    _write_dead_letters([message], reason=f"the spool {self._spool_path} is full")
+                    continue
+                lines.append(line)
+                self._pending.append(message)
+                self._spool_bytes += len(line)
+            try:
+                with self._spool_path.open("a", encoding="utf-8") as spool:
+                    spool.writelines(lines)
+            except OSError:
+                LOG.exception(f"Cannot spool {len(lines)} log messages to {self._spool_path}")
+            self._start_thread()
+            self._condition.notify_all()
+
+    def flush(self, timeout: float) -> bool:
+        """Wait until all messages are written, a write fails or the timeout expires; return whether all are written.
+
+        While the writes fail, flush does not wait, the messages are retried during the next requests instead.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            if self._pending:
+                self._start_thread()
+            while self._pending and not self._failing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return not self._pending
+
+    def _start_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def _next_batch(self) -> List[str]:
+        batch_bytes = 0
+        for index, message in enumerate(self._pending[:MAX_BATCH_EVENTS]):
+            batch_bytes += len(message.encode("utf-8")) + EVENT_OVERHEAD_BYTES
+            if batch_bytes > MAX_BATCH_BYTES:
+                return self._pending[:index]
+        return self._pending[:MAX_BATCH_EVENTS]
+
+    def _run(self) -> None:
+        retry_interval = self._retry_interval
+        failed_attempts = 0
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                batch = self._next_batch()
+            try:
+                self._log_writer.write_log(batch)
+            except Exception:  # pylint: disable=broad-except
+                failed_attempts += 1
+                if failed_attempts < self._max_write_attempts:
+                    LOG.exception(f"Failed to write {len(batch)} log messages, they are kept in {self._spool_path}")
+                    with self._condition:
+                        self._failing = True
+                        self._condition.notify_all()
+                    time.sleep(retry_interval)
+                    retry_interval = min(2 * retry_interval, MAX_RETRY_INTERVAL_SECONDS)
+                    continue
+                LOG.exception(f"Failed to write {len(batch)} log messages {failed_attempts} times, giving up on them")
+                _write_dead_letters(batch, reason=f"its write failed {failed_attempts} times")
+            failed_attempts = 0
+            retry_interval = self._retry_interval
+            with self._condition:
+                del self._pending[: len(batch)]
+                self._spool_bytes -= sum(len(_to_spool_line(message)) for message in batch)
+                self._failing = False
+                self._rewrite_spool()
+                self._condition.notify_all()
+
+    def _read_spool(self) -> List[str]:
+        if not self._spool_path.is_file():
+            return []
+        messages = []
+        with self._spool_path.open(encoding="utf-8") as spool:
+            for line in spool:
+                try:
+                    messages.append(str(json.loads(line)))
+                except ValueError:
+                    # the last line is incomplete, if the process was stopped while spooling
+                    LOG.warning(f"Skipping the incomplete line {line!r} of the spool {self._spool_path}")
+        if messages:
+            LOG.info(f"Found {len(messages)} log messages in {self._spool_path}, which were not written yet")
+        return messages
+
+    def _rewrite_spool(self) -> None:
+        try:
+            if not self._pending:
+                self._spool_path.unlink(missing_ok=True)
+                return
+            temporary_path = self._spool_path.with_suffix(".tmp")
+            with temporary_path.open("w", encoding="utf-8") as spool:
+                spool.writelines(_to_spool_line(message) for message in self._pending)
+            os.replace(temporary_path, self._spool_path)
+        except OSError:
+            LOG.exception(f"Cannot update the spool {self._spool_path}")
+
+
+def _to_spool_line(message: str) -> str:
+    # the JSON encoding escapes all non-ASCII characters, so the length of the line is its size in bytes
+    return json.dumps(message) + "\n"
+
+
+def _write_dead_letters(messages: List[str], reason: str) -> None:
+    for message in messages:
+        DEAD_LETTER_LOG.error(f"Log message not written to CloudWatch Logs, because {reason}: {message}")
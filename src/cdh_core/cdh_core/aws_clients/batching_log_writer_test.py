@@ -0,0 +1,197 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import List
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+
+from cdh_core.aws_clients import batching_log_writer
+from cdh_core.aws_clients.batching_log_writer import BatchingLogWriter
+from cdh_core.aws_clients.batching_log_writer import EVENT_OVERHEAD_BYTES
+from cdh_core.aws_clients.batching_log_writer import MAX_BATCH_EVENTS
+from cdh_core.aws_clients.batching_log_writer import MAX_EVENT_BYTES
+from cdh_core_dev_tools.testing.builder import Builder
+
+
+class TestBatchingLogWriter:
+    @pytest.fixture(autouse=True)
+    def service_setup(self, tmp_path: Path) -> None:
+        self.log_writer = Mock()
+        self.written: List[List[str]] = []
+        self.log_writer.write_log.side_effect = lambda messages: self.written.append(list(messages))
+        self.spool_path = tmp_path / "spool.jsonl"
+
+    def build_writer(self, **kwargs: Any) -> BatchingLogWriter:
+        return BatchingLogWriter(self.log_writer, self.spool_path, retry_interval=0.01, **kwargs)
+
+    @staticmethod
+    def wait_until_written(writer: BatchingLogWriter) -> None:
+        deadline = time.monotonic() + 5
+        while writer.pending_messages and time.monotonic() < deadline:
+            threading.Event().wait(0.01)
+        assert writer.pending_messages == 0
+
+    def test_messages_are_written_on_flush(self) -> None:
+        writer = self.build_writer()
+        messages = [Builder.build_random_string() for _ in range(3)]
+
+        writer.write_log(messages[:2])
+        writer.write_log(messages[2:])
+
+        assert writer.flush(timeout=5)
+        assert [message for batch in self.written for message in batch] == messages
+        assert writer.pending_messages == 0
+        assert not self.spool_path.exists()
+
+    def test_messages_are_spooled_before_they_are_written(self) -> None:
+        release = threading.Event()
+        self.log_writer.write_log.side_effect = lambda _: release.wait(5)
+        writer = self.build_writer()
+        messages = ["first", 'second with "quotes"\nand a line break']
+
+        writer.write_log(messages)
+
+        assert [json.loads(line) for line in self.spool_path.read_text().splitlines()] == messages
+        release.set()
+        assert writer.flush(timeout=5)
+
+    def test_spooled_messages_are_written_by_new_writer(self) -> None:
+        self.spool_path.write_text('"first"\n"second"\n"incompl')
+
+        writer = self.build_writer()
+
+        assert writer.pending_messages == 2
+        assert writer.flush(timeout=5)
+        assert self.written == [["first", "second"]]
+
+    def test_failed_write_is_retried(self) -> None:
+        attempts: List[List[str]] = []
+        retry = threading.Event()
+
+        def write_log(messages: List[str]) -> None:
+            attempts.append(list(messages))
+            if len(attempts) == 1:
+                raise Exception("throttled")
+
+        self.log_writer.write_log.side_effect = write_log
+        writer = self.build_writer()
+
+        with patch.object(time, "sleep", side_effect=lambda _: retry.wait(5)):
+            writer.write_log(["message"])
+
+            assert not writer.flush(timeout=0.5)
+            assert json.loads(self.spool_path.read_text()) == "message"
+            retry.set()
+            self.wait_until_written(writer)
+
+        assert writer.flush(timeout=5)
+        assert attempts == [["message"], ["message"]]
+        assert not self.spool_path.exists()
+
+    def test_flush_does_not_wait_while_writes_fail(self) -> None:
+        self.log_writer.write_log.side_effect = Exception("throttled")
+        writer = self.build_writer(max_write_attempts=1000)
+        writer.write_log(["message"])
+        assert not writer.flush(timeout=5)
+
+        start = time.monotonic()
+        assert not writer.flush(timeout=5)
+
+        assert time.monotonic() - start < 1
+        assert writer.pending_messages == 1
+
+    def test_poison_batch_is_dead_lettered(self) -> None:
+        def write_log(messages: List[str]) -> None:
+            if "poison" in messages:
+                raise Exception("invalid")
+            self.written.append(list(messages))
+
+        self.log_writer.write_log.side_effect = write_log
+        writer = self.build_writer(max_write_attempts=3)
+
+        with patch.object(batching_log_writer, "DEAD_LETTER_LOG") as dead_letter_log:
+            writer.write_log(["poison"])
+            self.wait_until_written(writer)
+            writer.write_log(["healthy"])
+            assert writer.flush(timeout=5)
+
+        assert self.log_writer.write_log.call_count == 4
+        assert self.written == [["healthy"]]
+        assert "poison" in dead_letter_log.error.call_args.args[0]
+        assert not self.spool_path.exists()
+
+    def test_spool_size_is_capped(self) -> None:
+        writer = self.build_writer(max_spool_bytes=len('"first"\n"second"\n'))
+
+        with patch.object(writer, "_start_thread"), patch.object(
+            batching_log_writer, "DEAD_LETTER_LOG"
+        ) as dead_letter_log:
+            writer.write_log(["first", "second", "third"])
+
+        assert writer.pending_messages == 2
+        assert self.spool_path.read_text() == '"first"\n"second"\n'
+        assert "third" in dead_letter_log.error.call_args.args[0]
+
+    def test_flush_times_out(self) -> None:
+        release = threading.Event()
+        self.log_writer.write_log.side_effect = lambda _: release.wait(5)
+        writer = self.build_writer()
+
+        writer.write_log(["message"])
+
+        assert not writer.flush(timeout=0.01)
+        release.set()
+        assert writer.flush(timeout=5)
+
+    def test_batches_respect_number_of_events(self) -> None:
+        writer = self.build_writer()
+        with patch.object(writer, "_start_thread"):
+            writer.write_log(["x"] * (MAX_BATCH_EVENTS + 1))
+
+        assert len(writer._next_batch()) == MAX_BATCH_EVENTS  # pylint: disable=protected-access
+
+    def test_batches_respect_size(self) -> None:
+        writer = self.build_writer()
+        message = "x" * (MAX_EVENT_BYTES - EVENT_OVERHEAD_BYTES)
+        with patch.object(writer, "_start_thread"):
+            writer.write_log([message] * 5)
+
+        assert len(writer._next_batch()) == 4  # pylint: disable=protected-access
+
+    def test_too_large_messages_are_logged(self) -> None:
+        writer = self.build_writer()
+        message = "x" * MAX_EVENT_BYTES
+
+        with patch.object(batching_log_writer, "LOG") as log:
+            writer.write_log([message, "small"])
+
+        assert writer.flush(timeout=5)
+        assert self.written == [["small"]]
+        assert message in log.error.call_args.args[0]
+
+    def test_for_log_group(self, tmp_path: Path) -> None:
+        writer = BatchingLogWriter.for_log_group(
+            self.log_writer, "prefix/audit-log", spool_directory=tmp_path / "spool"
+        )
+
+        writer.write_log(["message"])
+
+        assert writer.flush(timeout=5)
+        assert (tmp_path / "spool").is_dir()
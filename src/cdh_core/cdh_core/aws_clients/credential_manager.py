@@ -0,0 +1,231 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timezone
+from logging import getLogger
+from typing import Any
+from typing import Callable
+from typing import cast
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Protocol
+from typing import Tuple
+from typing import TypeVar
+
+from botocore.utils import parse_timestamp
+
+LOG = getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS = 256
+DEFAULT_REFRESH_INTERVAL_SECONDS = 60.0
+DEFAULT_PREFETCH_WORKERS = 8
+# botocore refreshes credentials on use once they expire within 15 minutes, so refreshing them in the background has
+# to start earlier for the request path to find fresh credentials
+REFRESH_MARGIN_SECONDS = 20 * 60
+
+
+class AssumedRoleCredentialSource:
+    """Fetches the credentials of an assumed role and remembers when they expire.
+
+    The fetch function is expected to return cached credentials until they expire within the refresh margin, like the
+    AssumeRoleCredentialFetcher of botocore does. A call to STS is recognized by a changed expiry time.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Dict[str, Any]],
+        on_sts_call: Optional[Callable[[float], None]] = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self._fetch = fetch
+        self._on_sts_call = on_sts_call
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.expires_at: Optional[datetime] = None
+
+    def fetch_credentials(self) -> Dict[str, Any]:
+        """Return the current credentials, which are refreshed if they expire within the refresh margin."""
+        start = time.perf_counter()
+        credentials = self._fetch()
+        expires_at = parse_timestamp(credentials["expiry_time"])
+        with self._lock:
+            if expires_at == self.expires_at:
+                return credentials
+            self.expires_at = expires_at
+        if self._on_sts_call:
+            self._on_sts_call(time.perf_counter() - start)
+        return credentials
+
+    def expires_within(self, seconds: float) -> bool:
+        """Return whether the credentials expire within the given number of seconds."""
+        with self._lock:
+            expires_at = self.expires_at
+        return expires_at is None or (expires_at - self._clock()).total_seconds() < seconds
+
+
+class SessionWithCredentialSource(Protocol):  # pylint: disable=too-few-public-methods
+    """A session whose credentials may be fetched by an AssumedRoleCredentialSource."""
+
+    @property
+    def credential_source(self) -> Optional[AssumedRoleCredentialSource]:
+        """Return the source of the credentials if the session belongs to an assumed role."""
+
+
+S = TypeVar("S", bound=SessionWithCredentialSource)
+
+
+class CredentialManager:
+    """Caches the sessions of assumed roles across requests and refreshes their credentials before they expire.
+
+    The number of sessions is bounded, the least recently used one is evicted first. Concurrent requests for the same
+    session wait for a single call to STS. A background thread checks the credentials every `refresh_interval_seconds`
+    and refreshes those which expire within the refresh margin, so the request path does not wait for STS. Since AWS
+    Lambda freezes all threads between requests, the thread catches up on the next request.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        refresh_interval_seconds: Optional[float] = DEFAULT_REFRESH_INTERVAL_SECONDS,
+        prefetch_workers: int = DEFAULT_PREFETCH_WORKERS,
+        refresh_margin_seconds: float = REFRESH_MARGIN_SECONDS,
+    ):
+        self._max_sessions = max_sessions
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._prefetch_workers = prefetch_workers
+        self._refresh_margin_seconds = refresh_margin_seconds
+        self._sessions: OrderedDict[Hashable, SessionWithCredentialSource] = OrderedDict()
+        self._pending: Dict[Hashable, Future[Any]] = {}
+        self._statistics: Counter[str] = Counter()
+        self._sts_seconds = 0.0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def get_or_assume(self, key: Hashable, assume: Callable[[], S]) -> S:
+        """Return the cached session for the key or create it with the given function."""
+        with self._lock:
+            if (session := self._sessions.get(key)) is not None:
+                self._sessions.move_to_end(key)
+                self._statistics["hits"] += 1
+                return cast(S, session)
+            if (pending := self._pending.get(key)) is None:
+                self._statistics["misses"] += 1
+                future: Future[S] = Future()
+                self._pending[key] = future
+        if pending is not None:
+            return cast(S, pending.result())
+
+        try:
+            assumed = assume()
+        except Exception as error:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(error)
+            raise
+        with self._lock:
+            del self._pending[key]
+            self._sessions[key] = assumed
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+                self._statistics["evictions"] += 1
+            self._start_thread()
+        future.set_result(assumed)
+        return assumed
+
+    def prefetch(self, assumers: Mapping[Hashable, Callable[[], SessionWithCredentialSource]]) -> None:
+        """Create the sessions which are not cached yet concurrently.
+
+        Failures are only logged: the session is requested again when it is used, which raises the error in context.
+        """
+        with self._lock:
+            missing = [(key, assume) for key, assume in assumers.items() if key not in self._sessions]
+        if not missing:
+            return
+        get_or_assume: Callable[
+            [Hashable, Callable[[], SessionWithCredentialSource]], SessionWithCredentialSource
+        ] = self.get_or_assume
+        with ThreadPoolExecutor(
+            max_workers=min(len(missing), self._prefetch_workers), thread_name_prefix="prefetch-credentials"
+        ) as executor:
+            futures: List[Tuple[Hashable, Future[SessionWithCredentialSource]]] = [
+                (key, executor.submit(get_or_assume, key, assume)) for key, assume in missing
+            ]
+        for key, session_future in futures:
+            if error := session_future.exception():
+                LOG.warning(f"Cannot prefetch the credentials for {key}: {error}")
+
+    def refresh_expiring(self) -> int:
+        """Refresh the credentials which expire within the refresh margin and return their number."""
+        with self._lock:
+            sources = [
+                (key, session.credential_source)
+                for key, session in self._sessions.items()
+                if session.credential_source is not None
+            ]
+        refreshed = 0
+        for key, source in sources:
+            if not source.expires_within(self._refresh_margin_seconds):
+                continue
+            try:
+                source.fetch_credentials()
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception(f"Cannot refresh the credentials for {key}, they are refreshed on their next use")
+                continue
+            refreshed += 1
+        with self._lock:
+            self._statistics["refreshes"] += refreshed
+        return refreshed
+
+    def record_sts_call(self, seconds: float) -> None:
+        """Count a call to STS which took the given time."""
+        with self._lock:
+            self._statistics["calls"] += 1
+            self._sts_seconds += seconds
+
+    def pop_statistics(self) -> Dict[str, Any]:
+        """Return the counters of the cache and the calls to STS since the last call and reset them."""
+        with self._lock:
+            statistics: Dict[str, Any] = {
+                f"sts_{event}": self._statistics[event]
+                for event in ["calls", "hits", "misses", "evictions", "refreshes"]
+            }
+            statistics["sts_ms"] = round(self._sts_seconds * 1000)
+            self._statistics.clear()
+            self._sts_seconds = 0.0
+        return statistics
+
+    def _start_thread(self) -> None:
+        if self._thread is None and self._refresh_interval_seconds is not None:
+            self._thread = threading.Thread(target=self._run, name="credential-refresher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        assert self._refresh_interval_seconds is not None
+        while True:
+            time.sleep(self._refresh_interval_seconds)
+            try:
+                self.refresh_expiring()
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception("Refreshing the credentials failed")
@@ -0,0 +1,193 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from cdh_core.aws_clients.credential_manager import AssumedRoleCredentialSource
+from cdh_core.aws_clients.credential_manager import CredentialManager
+from cdh_core.aws_clients.credential_manager import REFRESH_MARGIN_SECONDS
+
+ASSUMED_ROLE_DURATION = timedelta(hours=1)
+
+
+class _FakeFetcher:
+    """Behaves like the AssumeRoleCredentialFetcher of botocore with a controllable clock."""
+
+    def __init__(self, now: datetime, duration: timedelta = ASSUMED_ROLE_DURATION):
+        self.now = now
+        self.duration = duration
+        self.sts_calls = 0
+        self._expiry_time: Optional[datetime] = None
+
+    def fetch_credentials(self) -> Dict[str, Any]:
+        if self._expiry_time is None or (self._expiry_time - self.now).total_seconds() < REFRESH_MARGIN_SECONDS:
+            self.sts_calls += 1
+            self._expiry_time = self.now + self.duration
+        return {"access_key": "a", "secret_key": "b", "token": "c", "expiry_time": self._expiry_time.isoformat()}
+
+
+class _FakeSession:
+    def __init__(self, credential_source: Optional[AssumedRoleCredentialSource]):
+        self.credential_source = credential_source
+
+
+class TestAssumedRoleCredentialSource:
+    def setup_method(self) -> None:
+        self.fetcher = _FakeFetcher(now=datetime.now(timezone.utc))
+        self.on_sts_call = Mock()
+        self.source = AssumedRoleCredentialSource(
+            self.fetcher.fetch_credentials, on_sts_call=self.on_sts_call, clock=lambda: self.fetcher.now
+        )
+
+    def test_sts_calls_are_reported(self) -> None:
+        assert self.source.expires_within(0)
+
+        for _ in range(3):
+            self.source.fetch_credentials()
+
+        assert self.fetcher.sts_calls == 1
+        self.on_sts_call.assert_called_once()
+        assert self.source.expires_at == self.fetcher.now + self.fetcher.duration
+
+    def test_expires_within(self) -> None:
+        self.source.fetch_credentials()
+
+        assert not self.source.expires_within(REFRESH_MARGIN_SECONDS)
+        self.fetcher.now += timedelta(minutes=45)
+        assert self.source.expires_within(REFRESH_MARGIN_SECONDS)
+
+        self.source.fetch_credentials()
+
+        assert not self.source.expires_within(REFRESH_MARGIN_SECONDS)
+        assert self.on_sts_call.call_count == 2
+
+
+class TestCredentialManager:
+    def setup_method(self) -> None:
+        self.now = datetime.now(timezone.utc)
+        self.fetchers: List[_FakeFetcher] = []
+        self.credential_manager = CredentialManager(max_sessions=2, refresh_interval_seconds=None)
+
+    def _assume(self) -> _FakeSession:
+        fetcher = _FakeFetcher(now=self.now)
+        self.fetchers.append(fetcher)
+        source = AssumedRoleCredentialSource(
+            fetcher.fetch_credentials, on_sts_call=self.credential_manager.record_sts_call, clock=lambda: fetcher.now
+        )
+        source.fetch_credentials()
+        return _FakeSession(source)
+
+    def test_get_or_assume_caches_sessions(self) -> None:
+        session = self.credential_manager.get_or_assume("a", self._assume)
+
+        assert self.credential_manager.get_or_assume("a", self._assume) is session
+        assert len(self.fetchers) == 1
+        assert self.credential_manager.pop_statistics() == {
+            "sts_calls": 1,
+            "sts_hits": 1,
+            "sts_misses": 1,
+            "sts_evictions": 0,
+            "sts_refreshes": 0,
+            "sts_ms": 0,
+        }
+        assert self.credential_manager.pop_statistics()["sts_calls"] == 0
+
+    def test_least_recently_used_session_is_evicted(self) -> None:
+        session_a = self.credential_manager.get_or_assume("a", self._assume)
+        self.credential_manager.get_or_assume("b", self._assume)
+        self.credential_manager.get_or_assume("a", self._assume)
+        self.credential_manager.get_or_assume("c", self._assume)
+
+        assert self.credential_manager.get_or_assume("a", self._assume) is session_a
+        self.credential_manager.get_or_assume("b", self._assume)
+        assert len(self.fetchers) == 4
+        assert self.credential_manager.pop_statistics()["sts_evictions"] == 2
+
+    def test_failures_are_not_cached(self) -> None:
+        with pytest.raises(ValueError):
+            self.credential_manager.get_or_assume("a", Mock(side_effect=ValueError()))
+
+        self.credential_manager.get_or_assume("a", self._assume)
+
+        assert len(self.fetchers) == 1
+
+    def test_concurrent_requests_assume_once(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def assume() -> _FakeSession:
+            started.set()
+            release.wait(timeout=5)
+            return self._assume()
+
+        sessions: List[_FakeSession] = []
+        threads = [
+            threading.Thread(target=lambda: sessions.append(self.credential_manager.get_or_assume("a", assume)))
+            for _ in range(3)
+        ]
+        threads[0].start()
+        started.wait(timeout=5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len(self.fetchers) == 1
+        assert len(sessions) == 3
+        assert all(session is sessions[0] for session in sessions)
+
+    def test_refresh_expiring(self) -> None:
+        self.credential_manager = CredentialManager(refresh_interval_seconds=None)
+        self.credential_manager.get_or_assume("a", self._assume)
+        self.credential_manager.get_or_assume("b", self._assume)
+        self.credential_manager.get_or_assume("no-role", lambda: _FakeSession(None))
+        self.fetchers[0].now += timedelta(minutes=45)
+
+        assert self.credential_manager.refresh_expiring() == 1
+
+        assert [fetcher.sts_calls for fetcher in self.fetchers] == [2, 1]
+        statistics = self.credential_manager.pop_statistics()
+        assert statistics["sts_calls"] == 3
+        assert statistics["sts_refreshes"] == 1
+
+    def test_refresh_failures_are_ignored(self) -> None:
+        session = self.credential_manager.get_or_assume("a", self._assume)
+        self.fetchers[0].now += timedelta(minutes=45)
+        assert session.credential_source is not None
+        session.credential_source._fetch = Mock(side_effect=Exception())  # pylint: disable=protected-access
+
+        assert self.credential_manager.refresh_expiring() == 0
+
+    def test_prefetch(self) -> None:
+        self.credential_manager.get_or_assume("a", self._assume)
+
+        self.credential_manager.prefetch(
+            {"a": self._assume, "b": self._assume, "fails": Mock(side_effect=Exception("STS is not available"))}
+        )
+
+        assert len(self.fetchers) == 2
+        statistics = self.credential_manager.pop_statistics()
+        assert statistics["sts_misses"] == 3
+        self.credential_manager.get_or_assume("b", self._assume)
+        assert len(self.fetchers) == 2
@@ -13,10 +13,19 @@
 # limitations under the License.
 from __future__ import annotations
 
-from functools import lru_cache
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any
+from typing import Callable
 from typing import cast
 from typing import Dict
+from typing import Iterable
+from typing import List
 from typing import Literal
 from typing import Mapping
 from typing import Optional
@@ -33,9 +42,13 @@ from botocore.credentials import AssumeRoleCredentialFetcher
 from botocore.credentials import CredentialProvider
 from botocore.credentials import CredentialResolver
 from botocore.credentials import DeferredRefreshableCredentials
+from botocore.loaders import Loader
 
 from cdh_core.aws_clients.athena_client import AthenaClient
 from cdh_core.aws_clients.cloudwatch_client import CloudwatchClient
+from cdh_core.aws_clients.credential_manager import AssumedRoleCredentialSource
+from cdh_core.aws_clients.credential_manager import CredentialManager
+from cdh_core.aws_clients.credential_manager import REFRESH_MARGIN_SECONDS
 from cdh_core.aws_clients.events_client import EventsClient
 from cdh_core.aws_clients.glue_client import GlueClient
 from cdh_core.aws_clients.iam_client import IamClient
@@ -55,6 +68,7 @@ from cdh_core.entities.credential import Credential
 from cdh_core.enums.accounts import AccountPurpose
 from cdh_core.enums.aws import Partition
 from cdh_core.enums.aws import Region
+from cdh_core.log.measure_time import MeasureTimeContextManager
 from cdh_core.primitives.account_id import AccountId
 
 T = TypeVar(  # pylint: disable=invalid-name
@@ -80,31 +94,81 @@ T = TypeVar(  # pylint: disable=invalid-name
 )
 
 
+DEFAULT_MAX_CLIENTS = 128
+DEFAULT_CLIENT_IDLE_SECONDS = 15 * 60
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+
+class _SharedLoader(Loader):
+    """Loads the service models once for all sessions.
+
+    boto3 appends its data path to the search paths of every session it wraps, so a copy of the search paths is
+    returned to keep them from growing. The data path of boto3 is part of the search paths from the start instead.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(extra_search_paths=[os.path.join(os.path.dirname(boto3.__file__), "data")])
+
+    @property
+    def search_paths(self) -> List[str]:
+        """Return a copy of the search paths."""
+        return list(super().search_paths)
+
+
+_SHARED_LOADER = _SharedLoader()
+
+
 class BotocoreSessionWrapper:
     """Abstracts the Botocore sessions handling."""
 
-    def __init__(self, config: Config, credentials: Optional[Credential] = None):
+    def __init__(
+        self,
+        config: Config,
+        credentials: Optional[Credential] = None,
+        credential_source: Optional[AssumedRoleCredentialSource] = None,
+    ):
         self._config = config
         self._credentials = credentials
+        self._credential_source = credential_source
         self._session = botocore.session.Session()
+        self._boto3_session: Optional[boto3.session.Session] = None
+        self._boto3_session_lock = threading.Lock()
+        self._session.register_component("data_loader", _SHARED_LOADER)
         self._session.set_default_client_config(config)
         if credentials:
             self._session.set_credentials(
                 access_key=credentials.access_key_id, secret_key=credentials.secret_access_key
             )
+        if credential_source:
+            self.register_credential_provider(CredentialResolver([AssumeRoleProvider(credential_source)]))
 
-    def assume_role(self, role_arn: Arn, session_name: str = "session", duration: int = 3600) -> BotocoreSessionWrapper:
-        """Assume the given role arn."""
+    @property
+    def credential_source(self) -> Optional[AssumedRoleCredentialSource]:
+        """Return the source of the credentials if the session belongs to an assumed role."""
+        return self._credential_source
+
+    def assume_role(
+        self,
+        role_arn: Arn,
+        session_name: str = "session",
+        duration: int = 3600,
+        on_sts_call: Optional[Callable[[float], None]] = None,
+    ) -> BotocoreSessionWrapper:
+        """Assume the given role arn.
+
+        The credentials are fetched again once they expire within the refresh margin, or a third of the duration for
+        short-lived sessions.
+        """
         fetcher = AssumeRoleCredentialFetcher(
             client_creator=self._session.create_client,
             source_credentials=self._session.get_credentials(),
             role_arn=str(role_arn),
             extra_args={"DurationSeconds": duration, "RoleSessionName": session_name},
+            expiry_window_seconds=min(REFRESH_MARGIN_SECONDS, duration // 3),
         )
-        fetcher.fetch_credentials()
-        role_session = BotocoreSessionWrapper(self._config)
-        role_session.register_credential_provider(CredentialResolver([AssumeRoleProvider(fetcher)]))
-        return role_session
+        credential_source = AssumedRoleCredentialSource(fetcher.fetch_credentials, on_sts_call=on_sts_call)
+        credential_source.fetch_credentials()
+        return BotocoreSessionWrapper(self._config, credential_source=credential_source)
 
     def register_credential_provider(self, component: CredentialResolver) -> None:
         """Set the CredentialResolver at the current session."""
@@ -112,24 +176,37 @@ class BotocoreSessionWrapper:
 
     @property
     def boto3_session(self) -> boto3.session.Session:
-        """Return a new boto3 session."""
-        return boto3.session.Session(botocore_session=self._session)
+        """Return the boto3 session of the botocore session.
+
+        It is created only once, because every boto3 session registers its event handlers at the botocore session
+        again, which breaks the creation of S3 clients.
+        """
+        with self._boto3_session_lock:
+            if self._boto3_session is None:
+                self._boto3_session = boto3.session.Session(botocore_session=self._session)
+            return self._boto3_session
 
 
 class AssumeRoleProvider(CredentialProvider):
-    """Provides roles via the CredentialFetcher."""
+    """Provides roles via the AssumedRoleCredentialSource."""
 
-    def __init__(self, fetcher: AssumeRoleCredentialFetcher, session: Optional[botocore.session.Session] = None):
+    def __init__(
+        self, credential_source: AssumedRoleCredentialSource, session: Optional[botocore.session.Session] = None
+    ):
         super().__init__(session=session)
-        self._fetcher = fetcher
+        self._credential_source = credential_source
 
     def load(self) -> DeferredRefreshableCredentials:
         """Load the credentials from their source & sets them on the object."""
-        return DeferredRefreshableCredentials(self._fetcher.fetch_credentials, "assume-role")
+        return DeferredRefreshableCredentials(self._credential_source.fetch_credentials, "assume-role")
 
 
 class AssumeRoleSessionProvider:
-    """Provides assumable Boto3 sessions."""
+    """Provides assumable Boto3 sessions.
+
+    The sessions of assumed roles are cached by a CredentialManager, which refreshes their credentials in the
+    background.
+    """
 
     def __init__(  # pylint: disable=too-many-arguments
         self,
@@ -140,10 +217,12 @@ class AssumeRoleSessionProvider:
         base_role_arn: Optional[Arn] = None,
         assume_role_session_name: Optional[str] = None,
         region_for_default_session: Optional[Region] = None,
+        credential_manager: Optional[CredentialManager] = None,
     ):
         self._additional_config = additional_config or {}
         self._proxies_per_region = proxies_per_region or {}
         self._assume_role_session_name = assume_role_session_name or "core-api"
+        self._credential_manager = credential_manager or CredentialManager()
         self._base_session = BotocoreSessionWrapper(
             config=Config(
                 region_name=region_for_default_session.value if region_for_default_session else None,
@@ -156,8 +235,15 @@ class AssumeRoleSessionProvider:
             )
         )
         if base_role_arn:
-            self._base_session = self._base_session.assume_role(
-                role_arn=base_role_arn, session_name=self._assume_role_session_name
+            default_session = self._base_session
+            base_role: Arn = base_role_arn
+            self._base_session = self._credential_manager.get_or_assume(
+                ("base", base_role),
+                lambda: default_session.assume_role(
+                    role_arn=base_role,
+                    session_name=self._assume_role_session_name,
+                    on_sts_call=self._credential_manager.record_sts_call,
+                ),
             )
         self._sessions_with_credentials = {
             account_id: BotocoreSessionWrapper(
@@ -172,7 +258,6 @@ class AssumeRoleSessionProvider:
         }
         self._role_arns = role_arns
 
-    @lru_cache()  # noqa: B019 # service instantiated only once per lambda runtime
     def get_session(
         self,
         account_id: AccountId,
@@ -183,7 +268,6 @@ class AssumeRoleSessionProvider:
         """Create a Boto3 session for a given account, specified by its id and purpose, and duration."""
         return self.get_session_wrapped(account_id, account_purpose, duration, session_name).boto3_session
 
-    @lru_cache()  # noqa: B019 # service instantiated only once per lambda runtime
     def get_session_wrapped(
         self,
         account_id: AccountId,
@@ -192,20 +276,102 @@ class AssumeRoleSessionProvider:
         session_name: Optional[str] = None,
     ) -> BotocoreSessionWrapper:
         """Return a BotocoreSessionWrapper for the account with given id and purpose."""
-        session = self._sessions_with_credentials.get(account_id, self._base_session)
         if (account_id, account_purpose) not in self._role_arns:
             raise UnknownAccountError(
                 f"Cannot create a session for account {account_id!r} with purpose "
                 f"{(account_purpose.value if account_purpose else account_purpose)!r} because no role was specified. "
                 f"To create a session using the current role, assign `None` to your current account."
             )
-        if role_arn := self._role_arns.get((account_id, account_purpose)):
-            session = session.assume_role(
-                role_arn=role_arn,
-                session_name=session_name or self._assume_role_session_name,
-                duration=duration,
+        if self._role_arns.get((account_id, account_purpose)):
+            return self._credential_manager.get_or_assume(
+                (account_id, account_purpose, duration, session_name),
+                self._account_role_assumer(account_id, account_purpose, duration, session_name),
             )
-        return session
+        return self._sessions_with_credentials.get(account_id, self._base_session)
+
+    def get_role_session(  # pylint: disable=too-many-arguments
+        self,
+        account_id: AccountId,
+        account_purpose: Optional[AccountPurpose],
+        role_arn: Arn,
+        session_name: str,
+        cached: bool = True,
+    ) -> BotocoreSessionWrapper:
+        """Return a session of a role which is assumed from the session of the given account and purpose.
+
+        Pass `cached=False` to verify that the role can currently be assumed.
+        """
+
+        def assume() -> BotocoreSessionWrapper:
+            return self.get_session_wrapped(account_id, account_purpose).assume_role(
+                role_arn=role_arn, session_name=session_name, on_sts_call=self._credential_manager.record_sts_call
+            )
+
+        if not cached:
+            return assume()
+        return self._credential_manager.get_or_assume((account_id, account_purpose, role_arn, session_name), assume)
+
+    def prefetch(self, accounts: Iterable[Tuple[AccountId, Optional[AccountPurpose]]]) -> None:
+        """Assume the roles of the given accounts concurrently, so that their sessions are cached when used."""
+        self._credential_manager.prefetch(
+            {
+                (account_id, account_purpose, 3600, None): self._account_role_assumer(
+                    account_id, account_purpose, 3600, None
+                )
+                for account_id, account_purpose in accounts
+                if self._role_arns.get((account_id, account_purpose))
+            }
+        )
+
+    def prefetch_role_sessions(
+        self,
+        account_id: AccountId,
+        account_purpose: Optional[AccountPurpose],
+        role_arns: Iterable[Arn],
+        session_name: str,
+    ) -> None:
+        """Assume the given roles concurrently from the session of the given account and purpose."""
+        self._credential_manager.prefetch(
+            {
+                (account_id, account_purpose, role_arn, session_name): self._role_session_assumer(
+                    account_id, account_purpose, role_arn, session_name
+                )
+                for role_arn in role_arns
+            }
+        )
+
+    def pop_statistics(self) -> Dict[str, Any]:
+        """Return the number and duration of calls to STS and the cache counters since the last call."""
+        return self._credential_manager.pop_statistics()
+
+    def _account_role_assumer(
+        self,
+        account_id: AccountId,
+        account_purpose: Optional[AccountPurpose],
+        duration: int,
+        session_name: Optional[str],
+    ) -> Callable[[], BotocoreSessionWrapper]:
+        return lambda: self._assume_account_role(account_id, account_purpose, duration, session_name)
+
+    def _role_session_assumer(
+        self, account_id: AccountId, account_purpose: Optional[AccountPurpose], role_arn: Arn, session_name: str
+    ) -> Callable[[], BotocoreSessionWrapper]:
+        return lambda: self.get_role_session(account_id, account_purpose, role_arn, session_name, cached=False)
+
+    def _assume_account_role(
+        self,
+        account_id: AccountId,
+        account_purpose: Optional[AccountPurpose],
+        duration: int,
+        session_name: Optional[str],
+    ) -> BotocoreSessionWrapper:
+        session = self._sessions_with_credentials.get(account_id, self._base_session)
+        return session.assume_role(
+            role_arn=self._role_arns[(account_id, account_purpose)],  # type: ignore
+            session_name=session_name or self._assume_role_session_name,
+            duration=duration,
+            on_sts_call=self._credential_manager.record_sts_call,
+        )
 
 
 class _RetryDict(TypedDict, total=False):
@@ -214,19 +380,41 @@ class _RetryDict(TypedDict, total=False):
     mode: Literal["legacy", "standard", "adaptive"]
 
 
+@dataclass
+class _CachedClient:
+    client: Any
+    last_used: float
+
+
 class AwsClientFactory:
-    """Creates and caches AWS clients."""
+    """Creates and caches AWS clients.
 
-    def __init__(
+    The number of cached clients is bounded, the least recently used one is evicted first. Clients which have not been
+    used for `client_idle_seconds` are evicted as well, which releases their connection pools. All clients share the
+    loaded service models.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         assume_role_session_provider: AssumeRoleSessionProvider,
         proxies_per_region: Optional[Dict[Any, Dict[str, str]]] = None,
         boto_read_timeout: Optional[int] = None,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+        client_idle_seconds: Optional[float] = DEFAULT_CLIENT_IDLE_SECONDS,
+        max_pool_connections_per_service: Optional[Dict[str, int]] = None,
+        clock: Callable[[], float] = time.monotonic,
     ):
         self._assume_role_session_provider = assume_role_session_provider
-        self._clients: Dict[Tuple[str, str, Optional[AccountPurpose], Region], Any] = {}
+        self._clients: OrderedDict[Tuple[str, str, Optional[AccountPurpose], Region], _CachedClient] = OrderedDict()
         self._proxies_per_region = proxies_per_region or {}
         self._boto_read_timeout = boto_read_timeout or 10
+        self._max_clients = max_clients
+        self._client_idle_seconds = client_idle_seconds
+        self._max_pool_connections_per_service = max_pool_connections_per_service or {}
+        self._clock = clock
+        self._statistics: Counter[str] = Counter()
+        self._creation_seconds = 0.0
+        self._lock = threading.Lock()
 
     def athena_client(
         self, account_id: AccountId, account_purpose: Optional[AccountPurpose], region: Region
@@ -376,6 +564,17 @@ class AwsClientFactory:
             service="ssm", account_id=account_id, account_purpose=account_purpose, region=region, client_class=SsmClient
         )
 
+    def pop_statistics(self) -> Dict[str, Any]:
+        """Return the cache counters and the time spent creating clients since the last call and reset them."""
+        with self._lock:
+            statistics: Dict[str, Any] = {
+                f"aws_client_{event}": self._statistics[event] for event in ["hits", "misses", "evictions"]
+            }
+            statistics["aws_client_creation_ms"] = round(self._creation_seconds * 1000)
+            self._statistics.clear()
+            self._creation_seconds = 0.0
+        return statistics
+
     def _get_client(  # pylint: disable=too-many-arguments
         self,
         service: str,
@@ -385,28 +584,52 @@ class AwsClientFactory:
         client_class: Type[T],
     ) -> T:
         key = (service, account_id, account_purpose, region)
-        if key not in self._clients:
-            if issubclass(client_class, IamClient):
-                self._clients[key] = client_class(
-                    self.create_client(
-                        service=service, region=region, account_id=account_id, account_purpose=account_purpose
-                    ),
-                    account_id=account_id,
-                    partition=region.partition,
-                )
-            elif issubclass(client_class, GlueClient):
-                self._clients[key] = client_class(
-                    self.create_client(
-                        service=service, region=region, account_id=account_id, account_purpose=account_purpose
-                    )
-                )
-            else:
-                self._clients[key] = client_class(  # type: ignore
-                    self.create_client(
-                        service=service, region=region, account_id=account_id, account_purpose=account_purpose
-                    )
-                )
-        return cast(T, self._clients[key])
+        with self._lock:
+            now = self._clock()
+            self._evict_idle_clients(now)
+            if (cached := self._clients.get(key)) is not None:
+                cached.last_used = now
+                self._clients.move_to_end(key)
+                self._statistics["hits"] += 1
+                return cast(T, cached.client)
+            self._statistics["misses"] += 1
+
+        with MeasureTimeContextManager(
+            f"Creating the {service} client for account {account_id} in {region.value}",
+            on_exit=self._record_creation,
+            log_level=logging.DEBUG,
+        ):
+            boto_client = self.create_client(
+                service=service, region=region, account_id=account_id, account_purpose=account_purpose
+            )
+        if issubclass(client_class, IamClient):
+            client: Any = client_class(boto_client, account_id=account_id, partition=region.partition)
+        else:
+            client = client_class(boto_client)  # type: ignore
+
+        with self._lock:
+            # another thread may have created the same client in the meantime, the first one is kept
+            cached = self._clients.setdefault(key, _CachedClient(client=client, last_used=self._clock()))
+            self._clients.move_to_end(key)
+            while len(self._clients) > self._max_clients:
+                self._clients.popitem(last=False)
+                self._statistics["evictions"] += 1
+        return cast(T, cached.client)
+
+    def _evict_idle_clients(self, now: float) -> None:
+        if self._client_idle_seconds is None:
+            return
+        # the clients are ordered by their last use, so only the first ones can be idle
+        while self._clients:
+            key, oldest = next(iter(self._clients.items()))
+            if now - oldest.last_used < self._client_idle_seconds:
+                return
+            del self._clients[key]
+            self._statistics["evictions"] += 1
+
+    def _record_creation(self, seconds: float) -> None:
+        with self._lock:
+            self._creation_seconds += seconds
 
     def create_client(  # pylint: disable=too-many-arguments
         self,
@@ -437,6 +660,7 @@ class AwsClientFactory:
                 read_timeout=self._boto_read_timeout,
                 retries=retry_config,
                 proxies=self._proxies_per_region.get(region),
+                max_pool_connections=self._max_pool_connections_per_service.get(service, DEFAULT_MAX_POOL_CONNECTIONS),
             ),
         )
 
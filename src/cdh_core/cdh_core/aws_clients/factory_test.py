@@ -18,6 +18,7 @@ from datetime import timezone
 from typing import Mapping
 from typing import Optional
 from typing import Tuple
+from unittest.mock import ANY
 from unittest.mock import Mock
 from unittest.mock import patch
 
@@ -26,6 +27,7 @@ import pytest
 from botocore.config import Config
 
 from cdh_core.aws_clients import factory
+from cdh_core.aws_clients.credential_manager import CredentialManager
 from cdh_core.aws_clients.factory import AssumeRoleSessionProvider
 from cdh_core.aws_clients.factory import AwsClientFactory
 from cdh_core.aws_clients.factory import BotocoreSessionWrapper
@@ -94,7 +96,7 @@ class TestAssumeRoleProvider:
         assert config.region_name == region.value
         assert config.proxies == proxies
         base_session.assume_role.assert_called_once_with(
-            role_arn=_ROLE_ARNS[(_ADMIN, _ADMIN_PURPOSE)], session_name=session_name, duration=1234
+            role_arn=_ROLE_ARNS[(_ADMIN, _ADMIN_PURPOSE)], session_name=session_name, duration=1234, on_sts_call=ANY
         )
 
     def test_get_target_role_via_base_role(self, session_wrapper_class: Mock, mock_config_file: ConfigFile) -> None:
@@ -117,9 +119,14 @@ class TestAssumeRoleProvider:
             )
             == session_with_target_role.boto3_session
         )
-        base_session.assume_role.assert_called_once_with(role_arn=base_role_arn, session_name=base_session_name)
+        base_session.assume_role.assert_called_once_with(
+            role_arn=base_role_arn, session_name=base_session_name, on_sts_call=ANY
+        )
         session_with_base_role.assume_role.assert_called_once_with(
-            role_arn=_ROLE_ARNS[(_ADMIN, _ADMIN_PURPOSE)], session_name=target_session_name, duration=1234
+            role_arn=_ROLE_ARNS[(_ADMIN, _ADMIN_PURPOSE)],
+            session_name=target_session_name,
+            duration=1234,
+            on_sts_call=ANY,
         )
 
     def test_get_default_session(self, session_wrapper_class: Mock, mock_config_file: ConfigFile) -> None:
@@ -143,7 +150,9 @@ class TestAssumeRoleProvider:
         )
 
         assert assume_role_session_provider.get_session(_ADMIN, _ADMIN_PURPOSE) == base_session_with_role.boto3_session
-        base_session.assume_role.assert_called_once_with(role_arn=base_role_arn, session_name=session_name)
+        base_session.assume_role.assert_called_once_with(
+            role_arn=base_role_arn, session_name=session_name, on_sts_call=ANY
+        )
 
     def test_get_with_credentials(self, session_wrapper_class: Mock, mock_config_file: ConfigFile) -> None:
         for partition in Partition:  # temporary workaround for #64 if fixed use pytest.mark.parametrize
@@ -212,9 +221,63 @@ class TestAssumeRoleProvider:
                 == session_with_credentials_assumed_role.boto3_session
             )
             session_with_credentials.assume_role.assert_called_once_with(
-                role_arn=_ROLE_ARNS[(_ADMIN, _ADMIN_PURPOSE)], session_name=session_name, duration=1234
+                role_arn=_ROLE_ARNS[(_ADMIN, _ADMIN_PURPOSE)], session_name=session_name, duration=1234, on_sts_call=ANY
+            )
+
+    def test_sessions_are_cached(self, session_wrapper_class: Mock, mock_config_file: ConfigFile) -> None:
+        base_session = Mock()
+        session_wrapper_class.side_effect = [base_session, Exception("No further sessions should be called")]
+        credential_manager = CredentialManager(refresh_interval_seconds=None)
+        assume_role_session_provider = AssumeRoleSessionProvider(
+            role_arns=_ROLE_ARNS, credential_manager=credential_manager
+        )
+
+        first_session = assume_role_session_provider.get_session_wrapped(_ADMIN, _ADMIN_PURPOSE)
+        second_session = assume_role_session_provider.get_session_wrapped(_ADMIN, _ADMIN_PURPOSE)
+
+        assert first_session is second_session is base_session.assume_role.return_value
+        base_session.assume_role.assert_called_once()
+        statistics = assume_role_session_provider.pop_statistics()
+        assert statistics["sts_hits"] == 1
+        assert statistics["sts_misses"] == 1
+
+    def test_prefetch(self, session_wrapper_class: Mock, mock_config_file: ConfigFile) -> None:
+        base_session = Mock()
+        session_wrapper_class.side_effect = [base_session, Exception("No further sessions should be called")]
+        assume_role_session_provider = AssumeRoleSessionProvider(
+            role_arns={**_ROLE_ARNS, (build_account_id(), None): None},
+            credential_manager=CredentialManager(refresh_interval_seconds=None),
+        )
+
+        assume_role_session_provider.prefetch(_ROLE_ARNS)
+
+        assert base_session.assume_role.call_count == len(_ROLE_ARNS)
+        assume_role_session_provider.get_session_wrapped(_ADMIN, _ADMIN_PURPOSE)
+        assume_role_session_provider.get_session_wrapped(_USER, _USER_PURPOSE)
+        assert base_session.assume_role.call_count == len(_ROLE_ARNS)
+
+    @pytest.mark.parametrize("cached", [False, True])
+    def test_get_role_session(self, session_wrapper_class: Mock, mock_config_file: ConfigFile, cached: bool) -> None:
+        base_session = Mock()
+        session_wrapper_class.side_effect = [base_session, Exception("No further sessions should be called")]
+        account_session = base_session.assume_role.return_value
+        role_arn = build_role_arn()
+        session_name = Builder.build_random_string()
+        assume_role_session_provider = AssumeRoleSessionProvider(
+            role_arns=_ROLE_ARNS, credential_manager=CredentialManager(refresh_interval_seconds=None)
+        )
+
+        for _ in range(2):
+            assert (
+                assume_role_session_provider.get_role_session(
+                    _ADMIN, _ADMIN_PURPOSE, role_arn=role_arn, session_name=session_name, cached=cached
+                )
+                == account_session.assume_role.return_value
             )
 
+        account_session.assume_role.assert_called_with(role_arn=role_arn, session_name=session_name, on_sts_call=ANY)
+        assert account_session.assume_role.call_count == (1 if cached else 2)
+
 
 # pylint: disable=unused-argument, protected-access
 @pytest.mark.usefixtures("mock_iam", "mock_s3")
@@ -222,9 +285,9 @@ class TestAssumeRoleProvider:
 class TestAwsClientFactory:
     @pytest.fixture(autouse=True)
     def service_setup(self, mock_config_file: ConfigFile) -> None:  # pylint: disable=unused-argument
-        assume_role_session_provider = Mock(spec=AssumeRoleSessionProvider)
-        assume_role_session_provider.get_session.return_value = boto3.session.Session()
-        self.factory = AwsClientFactory(assume_role_session_provider)
+        self.assume_role_session_provider = Mock(spec=AssumeRoleSessionProvider)
+        self.assume_role_session_provider.get_session.return_value = boto3.session.Session()
+        self.factory = AwsClientFactory(self.assume_role_session_provider)
         self.partition = build_partition()
         self.region = build_region(self.partition)
 
@@ -232,6 +295,44 @@ class TestAwsClientFactory:
         client = self.factory.s3_client(_USER, _USER_PURPOSE, self.region)
         assert self.factory.s3_client(_USER, _USER_PURPOSE, self.region) is client
 
+    def test_least_recently_used_client_is_evicted(self) -> None:
+        self.factory = AwsClientFactory(self.assume_role_session_provider, max_clients=2)
+        s3_client = self.factory.s3_client(_USER, _USER_PURPOSE, self.region)
+        self.factory.glue_client(_USER, _USER_PURPOSE, self.region)
+        self.factory.s3_client(_USER, _USER_PURPOSE, self.region)
+        self.factory.s3_client(_ADMIN, _ADMIN_PURPOSE, self.region)
+
+        assert self.factory.s3_client(_USER, _USER_PURPOSE, self.region) is s3_client
+        assert self.factory.pop_statistics() == {
+            "aws_client_hits": 2,
+            "aws_client_misses": 3,
+            "aws_client_evictions": 1,
+            "aws_client_creation_ms": ANY,
+        }
+        assert self.factory.pop_statistics()["aws_client_misses"] == 0
+
+    def test_idle_clients_are_evicted(self) -> None:
+        now = [0.0]
+        self.factory = AwsClientFactory(self.assume_role_session_provider, client_idle_seconds=60, clock=lambda: now[0])
+        s3_client = self.factory.s3_client(_USER, _USER_PURPOSE, self.region)
+        glue_client = self.factory.glue_client(_USER, _USER_PURPOSE, self.region)
+
+        now[0] = 30
+        assert self.factory.s3_client(_USER, _USER_PURPOSE, self.region) is s3_client
+        now[0] = 75
+        assert self.factory.s3_client(_USER, _USER_PURPOSE, self.region) is s3_client
+        assert self.factory.glue_client(_USER, _USER_PURPOSE, self.region) is not glue_client
+        assert self.factory.pop_statistics()["aws_client_evictions"] == 1
+
+    def test_max_pool_connections_per_service(self) -> None:
+        self.factory = AwsClientFactory(self.assume_role_session_provider, max_pool_connections_per_service={"s3": 50})
+
+        assert self.factory.s3_client(_USER, _USER_PURPOSE, self.region)._client.meta.config.max_pool_connections == 50
+        assert (
+            self.factory.glue_client(_USER, _USER_PURPOSE, self.region)._client.meta.config.max_pool_connections
+            == factory.DEFAULT_MAX_POOL_CONNECTIONS
+        )
+
     def test_iam_client(self) -> None:
         assert isinstance(self.factory.iam_client(_USER, _USER_PURPOSE, self.partition), IamClient)
         assert isinstance(self.factory.s3_client(_USER, _USER_PURPOSE, self.region), S3Client)
@@ -305,6 +406,24 @@ class TestBotocoreSessionWrapper:
     def setup_method(self) -> None:
         self._botocore_session_wrapper = BotocoreSessionWrapper(Config())
 
+    def test_boto3_session_is_reused(self, credential_fetcher_client_method: Mock) -> None:
+        boto3_session = self._botocore_session_wrapper.boto3_session
+
+        assert self._botocore_session_wrapper.boto3_session is boto3_session
+        boto3_session.client("s3", region_name="eu-central-1")
+        boto3_session.client("s3", region_name="eu-west-1")
+
+    def test_service_models_are_shared(self, credential_fetcher_client_method: Mock) -> None:
+        other_session_wrapper = BotocoreSessionWrapper(Config())
+        loader = self._botocore_session_wrapper._session.get_component("data_loader")
+        search_paths = loader.search_paths
+
+        for _ in range(3):
+            self._botocore_session_wrapper.boto3_session.client("s3", region_name="eu-central-1")
+
+        assert other_session_wrapper._session.get_component("data_loader") is loader
+        assert loader.search_paths == search_paths
+
     def test_assume_role(self, credential_fetcher_client_method: Mock) -> None:
         sts_client = Mock()
         credential_fetcher_client_method.return_value = sts_client
@@ -317,8 +436,9 @@ class TestBotocoreSessionWrapper:
             }
         }
         role_arn = build_role_arn()
+        on_sts_call = Mock()
 
-        result_session = self._botocore_session_wrapper.assume_role(role_arn, "session", 1200)
+        result_session = self._botocore_session_wrapper.assume_role(role_arn, "session", 1200, on_sts_call=on_sts_call)
 
         credentials = result_session._session.get_credentials()  # pylint: disable=protected-access
         assert credentials.access_key == "1"
@@ -327,3 +447,8 @@ class TestBotocoreSessionWrapper:
         sts_client.assume_role.assert_called_with(
             RoleArn=str(role_arn), RoleSessionName="session", DurationSeconds=1200
         )
+        on_sts_call.assert_called_once()
+        assert result_session.credential_source is not None
+        assert result_session.credential_source.expires_at is not None
+        expiration = sts_client.assume_role.return_value["Credentials"]["Expiration"]
+        assert abs((result_session.credential_source.expires_at - expiration).total_seconds()) < 1
@@ -47,7 +47,7 @@ else:
 LOG = getLogger(__name__)
 
 
-class S3Client:
+class S3Client:  # pylint: disable=too-many-public-methods
     """Abstracts the boto3 S3 client."""
 
     # we cannot use the waiters for bucket_exists since they (or repeatedly calling head-bucket) are broken in us-east-1
@@ -362,6 +362,38 @@ class S3Client:
             raise RuntimeError(f"Invalid bucket encryption configuration for bucket {bucket_name}")
         return rules[0]["BucketKeyEnabled"]
 
+    def put_object(  # pylint: disable=too-many-arguments
+        self, bucket: str, key: str, body: bytes, content_type: str, content_encoding: Optional[str] = None
+    ) -> None:
+        """Write an object with the given content."""
+        try:
+            if content_encoding:
+                self._client.put_object(
+                    Bucket=bucket, Key=key, Body=body, ContentType=content_type, ContentEncoding=content_encoding
+                )
+            else:
+                self._client.put_object(Bucket=bucket, Key=key, Body=body, ContentType=content_type)
+        except self._client.exceptions.NoSuchBucket as error:
+            raise BucketNotFound(bucket) from error
+
+    def get_object_body(self, bucket: str, key: str) -> bytes:
+        """Read the content of an object."""
+        try:
+            return self._client.get_object(Bucket=bucket, Key=key)["Body"].read()
+        except self._client.exceptions.NoSuchBucket as error:
+            raise BucketNotFound(bucket) from error
+        except self._client.exceptions.NoSuchKey as error:
+            raise ObjectNotFound(bucket, key) from error
+
+    def generate_presigned_get_url(self, bucket: str, key: str, expires_in_seconds: int) -> str:
+        """Return a url with which the object can be downloaded without further credentials.
+
+        The url stops working when it expires or when the credentials of the client expire, whichever happens first.
+        """
+        return self._client.generate_presigned_url(
+            "get_object", Params={"Bucket": bucket, "Key": key}, ExpiresIn=expires_in_seconds
+        )
+
 
 class BucketNotFound(Exception):
     """Signals that the requested S3 bucket does not exist."""
@@ -389,3 +421,10 @@ class BucketNotEmpty(Exception):
 
     def __init__(self, bucket: str):
         super().__init__(f"Bucket {bucket} is not empty")
+
+
+class ObjectNotFound(Exception):
+    """Signals that the requested object does not exist."""
+
+    def __init__(self, bucket: str, key: str):
+        super().__init__(f"Object {key} does not exist in bucket {bucket}")
@@ -27,6 +27,7 @@ from cdh_core.aws_clients.s3_client import BucketAlreadyExists
 from cdh_core.aws_clients.s3_client import BucketNotEmpty
 from cdh_core.aws_clients.s3_client import BucketNotFound
 from cdh_core.aws_clients.s3_client import NoSuchBucketPolicy
+from cdh_core.aws_clients.s3_client import ObjectNotFound
 from cdh_core.aws_clients.s3_client import S3Client
 from cdh_core.config.config_file import ConfigFile
 from cdh_core.config.config_file_test import CONFIG_FILE_MULTIPLE_PARTITIONS_ENVIRONMENTS_HUBS
@@ -506,6 +507,50 @@ class TestIsEmpty(TestS3Base):
             self._s3_client.is_empty(self._bucket_name)
 
 
+class TestObjects(TestS3Base):
+    @pytest.fixture(autouse=True)
+    def create_bucket(self, service_setup: Any) -> None:
+        self._boto_s3_client.create_bucket(
+            Bucket=self._bucket_name, CreateBucketConfiguration={"LocationConstraint": self._region.value}
+        )
+
+    def test_put_and_get_object(self) -> None:
+        self._s3_client.put_object(
+            self._bucket_name,
+            "export/part.gz",
+            b"content",
+            content_type="application/x-ndjson",
+            content_encoding="gzip",
+        )
+
+        assert self._s3_client.get_object_body(self._bucket_name, "export/part.gz") == b"content"
+        head = self._boto_s3_client.head_object(Bucket=self._bucket_name, Key="export/part.gz")
+        assert head["ContentType"] == "application/x-ndjson"
+        assert head["ContentEncoding"] == "gzip"
+
+    def test_put_object_without_content_encoding(self) -> None:
+        self._s3_client.put_object(self._bucket_name, "manifest.json", b"{}", content_type="application/json")
+
+        head = self._boto_s3_client.head_object(Bucket=self._bucket_name, Key="manifest.json")
+        assert head["ContentType"] == "application/json"
+        assert "ContentEncoding" not in head
+
+    def test_get_missing_object(self) -> None:
+        with pytest.raises(ObjectNotFound):
+            self._s3_client.get_object_body(self._bucket_name, "missing")
+
+    def test_put_object_to_missing_bucket(self) -> None:
+        with pytest.raises(BucketNotFound):
+            self._s3_client.put_object("missing-bucket", "key", b"content", content_type="text/plain")
+
+    def test_generate_presigned_get_url(self) -> None:
+        url = self._s3_client.generate_presigned_get_url(self._bucket_name, "export/part.gz", expires_in_seconds=60)
+
+        assert self._bucket_name in url
+        assert "export/part.gz" in url
+        assert "Expires=" in url or "X-Amz-Expires=60" in url
+
+
 class TestAccessLogs(TestS3Base):
     LOG_PREFIX = "mylogprefix"
 
@@ -0,0 +1,604 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=duplicate-code
+import json
+from types import TracebackType
+from typing import Any
+from typing import AsyncIterator
+from typing import cast
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Type
+from typing import TypeVar
+
+from cdh_core.clients.async_http_client import AsyncHttpClient
+from cdh_core.clients.async_http_client import DEFAULT_LIMIT_PER_HOST
+from cdh_core.clients.async_http_client import DEFAULT_MAX_CONCURRENCY
+from cdh_core.clients.async_http_client import SigV4Signer
+from cdh_core.clients.core_api_operations import CoreApiOperations
+from cdh_core.clients.core_api_operations import NEXT_PAGE_TOKEN_KEY
+from cdh_core.clients.core_api_operations import Operation
+from cdh_core.clients.core_api_operations import R
+from cdh_core.clients.core_api_operations import RequestBuilder
+from cdh_core.entities.accounts import AccountRole
+from cdh_core.entities.accounts import ResponseAccount
+from cdh_core.entities.accounts import ResponseAccountWithoutCosts
+from cdh_core.entities.catalog_export import CatalogExport
+from cdh_core.entities.catalog_export import CatalogExportEntityType
+from cdh_core.entities.dataset import Dataset
+from cdh_core.entities.dataset import DatasetAccountPermission
+from cdh_core.entities.dataset import DatasetId
+from cdh_core.entities.dataset import ExternalLink
+from cdh_core.entities.dataset import ResponseDataset
+from cdh_core.entities.dataset import SourceIdentifier
+from cdh_core.entities.dataset import SupportGroup
+from cdh_core.entities.dataset_participants import DatasetParticipant
+from cdh_core.entities.filter_package import FilterPackage
+from cdh_core.entities.filter_package import PackageId
+from cdh_core.entities.hub_business_object import HubBusinessObject
+from cdh_core.entities.resource import GlueSyncResourcePayload
+from cdh_core.entities.resource import ResourcePayload
+from cdh_core.entities.resource import S3ResourcePayload
+from cdh_core.enums.accounts import AccountType
+from cdh_core.enums.accounts import Affiliation
+from cdh_core.enums.aws import Region
+from cdh_core.enums.dataset_properties import BusinessObject
+from cdh_core.enums.dataset_properties import Confidentiality
+from cdh_core.enums.dataset_properties import DatasetPurpose
+from cdh_core.enums.dataset_properties import Layer
+from cdh_core.enums.dataset_properties import RetentionPeriod
+from cdh_core.enums.dataset_properties import SupportLevel
+from cdh_core.enums.dataset_properties import SyncType
+from cdh_core.enums.hubs import Hub
+from cdh_core.enums.resource_properties import ResourceType
+from cdh_core.enums.resource_properties import Stage
+from cdh_core.primitives.account_id import AccountId
+
+_JsonDictType = Dict[str, Any]
+
+T = TypeVar("T", bound="AsyncCoreApiClient")
+
+
+class AsyncCoreApiClient:  # pylint: disable=too-many-arguments,too-many-public-methods
+    """The asyncio counterpart of the CoreApiClient with the same methods, which have to be awaited.
+
+    The requests are built and the responses are parsed by the same CoreApiOperations, so both clients behave
+    identically. Many calls can be awaited concurrently, e.g. with `asyncio.gather`, the AsyncHttpClient limits how
+    many requests are sent at the same time. The client has to be closed, preferably by using it as an async context
+    manager.
+    """
+
+    def __init__(self, http_client: AsyncHttpClient):
+        self._client = http_client
+
+    @classmethod
+    def get_core_api_client(
+        cls: Type[T],
+        base_url: str,
+        region: Region,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+    ) -> T:
+        """Get async core api client for a given base url and region.
+
+        At most `max_concurrency` requests are sent at the same time and up to `limit_per_host` connections are kept
+        alive.
+        """
+        return cls(
+            http_client=AsyncHttpClient(
+                base_url=base_url,
+                signer=SigV4Signer(region.value),
+                max_concurrency=max_concurrency,
+                limit_per_host=limit_per_host,
+            ),
+        )
+
+    async def __aenter__(self: T) -> T:
+        """Return the client, whose connections are closed when the context is left."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        """Close the connections."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the connections."""
+        await self._client.close()
+
+    def connection_statistics(self) -> Dict[str, int]:
+        """Return how many requests were sent and how many connections were opened for them."""
+        return self._client.connection_statistics()
+
+    async def _run(self, operation: Operation[R]) -> R:
+        """Send the requests of the operation one after the other."""
+        try:
+            call = next(operation)
+            while True:
+                try:
+                    response = await getattr(self._client, call.method)(*call.args, **call.kwargs)
+                except Exception as error:  # pylint: disable=broad-except
+                    # the operation may recover from the error, otherwise it is raised again
+                    call = operation.throw(error)
+                else:
+                    call = operation.send(response)
+        except StopIteration as stop:
+            return cast(R, stop.value)
+
+    async def create_dataset(  # pylint: disable=too-many-locals
+        self,
+        hub: Hub,
+        business_object: BusinessObject,
+        name: str,
+        layer: Layer,
+        description: str,
+        engineers: List[DatasetParticipant],
+        confidentiality: Confidentiality,
+        documentation: Optional[str] = None,
+        external_links: Optional[List[ExternalLink]] = None,
+        friendly_name: Optional[str] = None,
+        hub_visibility: Optional[Set[Hub]] = None,
+        labels: Optional[List[str]] = None,
+        preview_available: Optional[bool] = None,
+        purpose: Optional[List[DatasetPurpose]] = None,
+        retention_period: Optional[RetentionPeriod] = None,
+        source_identifier: Optional[SourceIdentifier] = None,
+        stewards: Optional[List[DatasetParticipant]] = None,
+        support_group: Optional[SupportGroup] = None,
+        support_level: Optional[SupportLevel] = None,
+        tags: Optional[Dict[str, str]] = None,
+        upstream_lineage: Optional[Set[DatasetId]] = None,
+    ) -> ResponseDataset:
+        """Create a CDH dataset."""
+        return await self._run(
+            CoreApiOperations.create_dataset(
+                hub=hub,
+                business_object=business_object,
+                name=name,
+                layer=layer,
+                description=description,
+                engineers=engineers,
+                confidentiality=confidentiality,
+                documentation=documentation,
+                external_links=external_links,
+                friendly_name=friendly_name,
+                hub_visibility=hub_visibility,
+                labels=labels,
+                preview_available=preview_available,
+                purpose=purpose,
+                retention_period=retention_period,
+                source_identifier=source_identifier,
+                stewards=stewards,
+                support_group=support_group,
+                support_level=support_level,
+                tags=tags,
+                upstream_lineage=upstream_lineage,
+            )
+        )
+
+    async def create_s3_resource(
+        self,
+        hub: Hub,
+        dataset_id: DatasetId,
+        stage: Stage,
+        region: Region,
+        seconds_between_retries: Optional[int] = None,
+    ) -> S3ResourcePayload:
+        """Create a S3 resource (bucket)."""
+        return await self._run(
+            CoreApiOperations.create_s3_resource(
+                hub=hub,
+                dataset_id=dataset_id,
+                stage=stage,
+                region=region,
+                seconds_between_retries=seconds_between_retries,
+            )
+        )
+
+    async def create_glue_sync(
+        self,
+        hub: Hub,
+        dataset_id: DatasetId,
+        stage: Stage,
+        region: Region,
+        sync_type: Optional[SyncType] = None,
+        seconds_between_retries: Optional[int] = None,
+    ) -> GlueSyncResourcePayload:
+        """Create a Glue-Sync resource."""
+        return await self._run(
+            CoreApiOperations.create_glue_sync(
+                hub=hub,
+                dataset_id=dataset_id,
+                stage=stage,
+                region=region,
+                sync_type=sync_type,
+                seconds_between_retries=seconds_between_retries,
+            )
+        )
+
+    async def grant_dataset_permission(
+        self, hub: Hub, dataset_id: DatasetId, account_id: AccountId, stage: Stage, region: Region
+    ) -> DatasetAccountPermission:
+        """Add the permission to the dataset."""
+        return await self._run(
+            CoreApiOperations.grant_dataset_permission(
+                hub=hub, dataset_id=dataset_id, account_id=account_id, stage=stage, region=region
+            )
+        )
+
+    async def revoke_dataset_permission(
+        self, hub: Hub, dataset_id: DatasetId, account_id: AccountId, stage: Stage, region: Region
+    ) -> None:
+        """Remove the permission of a dataset."""
+        await self._run(
+            CoreApiOperations.revoke_dataset_permission(
+                hub=hub, dataset_id=dataset_id, account_id=account_id, stage=stage, region=region
+            )
+        )
+
+    async def get_datasets(self, hub: Hub) -> List[ResponseDataset]:
+        """Get all datasets."""
+        return await self._run(CoreApiOperations.get_datasets(hub))
+
+    async def iter_datasets(self, hub: Hub) -> AsyncIterator[ResponseDataset]:
+        """Stream all datasets of a hub, the next page is requested while the current one is consumed."""
+        async for item in self._client.iter_with_pagination(
+            f"/{hub.value}/datasets", next_page_key=NEXT_PAGE_TOKEN_KEY, item_key="datasets", pipelined=True
+        ):
+            yield ResponseDataset.from_dict(item)
+
+    async def iter_datasets_of_hubs(self, hubs: List[Hub]) -> AsyncIterator[ResponseDataset]:
+        """Stream all datasets of the given hubs, which are requested concurrently.
+
+        The datasets of a hub keep their order, but the datasets of different hubs are interleaved.
+        """
+        async for item in self._client.iter_with_parallel_pagination(
+            [(f"/{hub.value}/datasets", None) for hub in hubs], next_page_key=NEXT_PAGE_TOKEN_KEY, item_key="datasets"
+        ):
+            yield ResponseDataset.from_dict(item)
+
+    async def get_datasets_cross_hub(self, dataset_ids: List[DatasetId]) -> List[ResponseDataset]:
+        """Get all datasets with the given IDs, across hubs, ignoring missing items."""
+        return await self._run(CoreApiOperations.get_datasets_cross_hub(dataset_ids))
+
+    async def get_dataset(self, hub: Hub, dataset_id: DatasetId) -> ResponseDataset:
+        """Get a single dataset."""
+        return await self._run(CoreApiOperations.get_dataset(hub, dataset_id))
+
+    async def get_dataset_permissions(self, hub: Hub, dataset_id: DatasetId) -> FrozenSet[DatasetAccountPermission]:
+        """Get the permissions for a dataset."""
+        return await self._run(CoreApiOperations.get_dataset_permissions(hub, dataset_id))
+
+    async def delete_dataset(self, hub: Hub, dataset_id: DatasetId) -> None:
+        """Delete a dataset."""
+        await self._run(CoreApiOperations.delete_dataset(hub, dataset_id))
+
+    async def get_resources(
+        self,
+        hub: Hub,
+        dataset_id: Optional[DatasetId] = None,
+        stage: Optional[Stage] = None,
+        region: Optional[Region] = None,
+        resource_account_id: Optional[AccountId] = None,
+    ) -> Sequence[ResourcePayload]:
+        """Get all resources regardless of their type."""
+        return await self._run(
+            CoreApiOperations.get_resources(
+                hub=hub, dataset_id=dataset_id, stage=stage, region=region, resource_account_id=resource_account_id
+            )
+        )
+
+    async def iter_resources_of_datasets(
+        self, hub: Hub, dataset_ids: List[DatasetId]
+    ) -> AsyncIterator[ResourcePayload]:
+        """Stream the resources of the given datasets, which are requested concurrently.
+
+        The resources of a dataset keep their order, but the resources of different datasets are interleaved.
+        """
+        async for item in self._client.iter_with_parallel_pagination(
+            [
+                (
+                    f"/{hub.value}/resources",
+                    RequestBuilder.build_resources_query_param(
+                        dataset_id=dataset_id, stage=None, region=None, resource_account_id=None
+                    ),
+                )
+                for dataset_id in dataset_ids
+            ],
+            next_page_key=NEXT_PAGE_TOKEN_KEY,
+            item_key="resources",
+        ):
+            yield ResourcePayload.from_dict(item)
+
+    async def get_filter_packages(
+        self,
+        hub: Hub,
+        dataset_id: DatasetId,
+        stage: Stage,
+        region: Region,
+    ) -> List[FilterPackage]:
+        """Get all filter packages."""
+        return await self._run(CoreApiOperations.get_filter_packages(hub, dataset_id, stage, region))
+
+    async def get_filter_package(
+        self,
+        hub: Hub,
+        dataset_id: DatasetId,
+        stage: Stage,
+        region: Region,
+        package_id: PackageId,
+    ) -> FilterPackage:
+        """Get a single filter package."""
+        return await self._run(CoreApiOperations.get_filter_package(hub, dataset_id, stage, region, package_id))
+
+    async def delete_resource(
+        self,
+        hub: Hub,
+        dataset_id: DatasetId,
+        resource_type: ResourceType,
+        stage: Stage,
+        region: Region,
+        fail_if_not_found: bool = True,
+    ) -> None:
+        """Delete a dataset resource."""
+        await self._run(
+            CoreApiOperations.delete_resource(
+                hub=hub,
+                dataset_id=dataset_id,
+                resource_type=resource_type,
+                stage=stage,
+                region=region,
+                fail_if_not_found=fail_if_not_found,
+            )
+        )
+
+    async def get_s3_resource(self, hub: Hub, dataset_id: DatasetId, stage: Stage, region: Region) -> S3ResourcePayload:
+        """Get a single S3 resource."""
+        return await self._run(CoreApiOperations.get_s3_resource(hub, dataset_id, stage, region))
+
+    async def get_s3_resource_by_bucket_name(self, bucket_name: str) -> S3ResourcePayload:
+        """Get a single S3 resource."""
+        return await self._run(CoreApiOperations.get_s3_resource_by_bucket_name(bucket_name))
+
+    async def get_glue_resource(
+        self, hub: Hub, dataset_id: DatasetId, stage: Stage, region: Region
+    ) -> GlueSyncResourcePayload:
+        """Get a single Glue resource."""
+        return await self._run(CoreApiOperations.get_glue_resource(hub, dataset_id, stage, region))
+
+    async def get_accounts(self) -> List[ResponseAccountWithoutCosts]:
+        """Return all accounts."""
+        return await self._run(CoreApiOperations.get_accounts())
+
+    async def iter_accounts(self) -> AsyncIterator[ResponseAccountWithoutCosts]:
+        """Stream all accounts, the next page is requested while the current one is consumed."""
+        async for item in self._client.iter_with_pagination(
+            "/accounts", next_page_key=NEXT_PAGE_TOKEN_KEY, item_key="accounts", pipelined=True
+        ):
+            yield ResponseAccountWithoutCosts.from_dict(item)
+
+    async def create_catalog_export(self, hub: Hub) -> CatalogExport:
+        """Start writing a snapshot of all datasets, resources and accounts of a hub to S3.
+
+        The returned export is not complete yet, poll get_catalog_export until it is.
+        """
+        return await self._run(CoreApiOperations.create_catalog_export(hub))
+
+    async def get_catalog_export(self, hub: Hub, export_id: str) -> CatalogExport:
+        """Return an export with newly pre-signed urls of the parts written so far."""
+        return await self._run(CoreApiOperations.get_catalog_export(hub, export_id))
+
+    async def iter_exported_datasets(self, export: CatalogExport) -> AsyncIterator[Dataset]:
+        """Stream the datasets of an export, downloading one part after the other."""
+        async for item in self._iter_export(export, CatalogExportEntityType.datasets):
+            yield Dataset.from_dict(item)
+
+    async def iter_exported_resources(self, export: CatalogExport) -> AsyncIterator[ResourcePayload]:
+        """Stream the resources of an export, downloading one part after the other."""
+        async for item in self._iter_export(export, CatalogExportEntityType.resources):
+            yield ResourcePayload.from_dict(item)
+
+    async def iter_exported_accounts(self, export: CatalogExport) -> AsyncIterator[ResponseAccountWithoutCosts]:
+        """Stream the accounts of an export, downloading one part after the other."""
+        async for item in self._iter_export(export, CatalogExportEntityType.accounts):
+            yield ResponseAccountWithoutCosts.from_dict(item)
+
+    async def _iter_export(
+        self, export: CatalogExport, entity_type: CatalogExportEntityType
+    ) -> AsyncIterator[_JsonDictType]:
+        for url in CoreApiOperations.get_export_part_urls(export, entity_type):
+            async for line in self._client.iter_lines_from_url(url):
+                yield json.loads(line)
+
+    async def get_account(self, account_id: AccountId) -> ResponseAccount:
+        """Return a single account."""
+        return await self._run(CoreApiOperations.get_account(account_id))
+
+    async def register_account(  # pylint: disable=too-many-locals
+        self,
+        account_id: str,
+        affiliation: Affiliation,
+        business_objects: List[BusinessObject],
+        hub: Hub,
+        layers: List[Layer],
+        stages: List[Stage],
+        type: AccountType,  # pylint: disable=redefined-builtin
+        visible_in_hubs: List[Hub],
+        friendly_name: str,
+        admin_roles: Optional[List[str]] = None,
+        group: Optional[str] = None,
+        responsibles: Optional[List[str]] = None,
+        request_id: Optional[str] = None,
+        roles: Optional[List[AccountRole]] = None,
+        fail_if_exists: bool = True,
+    ) -> Optional[ResponseAccount]:
+        """Register a new account with the CDH.
+
+        If fail_if_exists is set to False, the call will not fail if the account is already registered.
+        """
+        return await self._run(
+            CoreApiOperations.register_account(
+                account_id=account_id,
+                affiliation=affiliation,
+                business_objects=business_objects,
+                hub=hub,
+                layers=layers,
+                stages=stages,
+                type=type,
+                visible_in_hubs=visible_in_hubs,
+                friendly_name=friendly_name,
+                admin_roles=admin_roles,
+                group=group,
+                responsibles=responsibles,
+                request_id=request_id,
+                roles=roles,
+                fail_if_exists=fail_if_exists,
+            )
+        )
+
+    async def deregister_account(self, account_id: AccountId) -> None:
+        """Deregister an account from the CDH."""
+        await self._run(CoreApiOperations.deregister_account(account_id))
+
+    async def update_account(
+        self,
+        account_id: str,
+        admin_roles: Optional[List[str]] = None,
+        affiliation: Optional[Affiliation] = None,
+        business_objects: Optional[List[BusinessObject]] = None,
+        friendly_name: Optional[str] = None,
+        group: Optional[str] = None,
+        layers: Optional[List[Layer]] = None,
+        responsibles: Optional[List[str]] = None,
+        roles: Optional[List[AccountRole]] = None,
+        stages: Optional[List[Stage]] = None,
+        type: Optional[AccountType] = None,  # pylint: disable=redefined-builtin
+        visible_in_hubs: Optional[List[Hub]] = None,
+    ) -> ResponseAccount:
+        """Update the specified parameters of an account.
+
+        Hint: Optional values and None are handled identically by core_api and will not change data
+        """
+        return await self._run(
+            CoreApiOperations.update_account(
+                account_id=account_id,
+                admin_roles=admin_roles,
+                affiliation=affiliation,
+                business_objects=business_objects,
+                friendly_name=friendly_name,
+                group=group,
+                layers=layers,
+                responsibles=responsibles,
+                roles=roles,
+                stages=stages,
+                type=type,
+                visible_in_hubs=visible_in_hubs,
+            )
+        )
+
+    async def update_account_billing(
+        self,
+        account_id: str,
+        cost_history: Optional[Dict[str, float]] = None,
+        estimated_cost: Optional[float] = None,
+        forecasted_cost: Optional[float] = None,
+    ) -> ResponseAccount:
+        """Update the specified billing information of an account.
+
+        Hint: Optional values and None are handled identically by core_api and will not change data
+        """
+        return await self._run(
+            CoreApiOperations.update_account_billing(
+                account_id=account_id,
+                cost_history=cost_history,
+                estimated_cost=estimated_cost,
+                forecasted_cost=forecasted_cost,
+            )
+        )
+
+    async def rename_dataset(
+        self,
+        hub: Hub,
+        new_friendly_name: str,
+        dataset_id: DatasetId,
+    ) -> ResponseDataset:
+        """Change the dataset name."""
+        return await self.update_dataset(hub=hub, dataset_id=dataset_id, friendly_name=new_friendly_name)
+
+    async def update_dataset(  # pylint: disable=too-many-locals
+        self,
+        hub: Hub,
+        dataset_id: DatasetId,
+        confidentiality: Optional[Confidentiality] = None,
+        contains_pii: Optional[bool] = None,
+        description: Optional[str] = None,
+        documentation: Optional[str] = None,
+        engineers: Optional[List[DatasetParticipant]] = None,
+        external_links: Optional[List[ExternalLink]] = None,
+        friendly_name: Optional[str] = None,
+        hub_visibility: Optional[Set[Hub]] = None,
+        labels: Optional[List[str]] = None,
+        preview_available: Optional[bool] = None,
+        purpose: Optional[List[DatasetPurpose]] = None,
+        retention_period: Optional[RetentionPeriod] = None,
+        source_identifier: Optional[SourceIdentifier] = None,
+        stewards: Optional[List[DatasetParticipant]] = None,
+        support_group: Optional[SupportGroup] = None,
+        support_level: Optional[SupportLevel] = None,
+        tags: Optional[Dict[str, str]] = None,
+        upstream_lineage: Optional[Set[DatasetId]] = None,
+        quality_score: Optional[int] = None,
+    ) -> ResponseDataset:
+        """Update the specified parameters of a dataset."""
+        return await self._run(
+            CoreApiOperations.update_dataset(
+                hub=hub,
+                dataset_id=dataset_id,
+                confidentiality=confidentiality,
+                contains_pii=contains_pii,
+                description=description,
+                documentation=documentation,
+                engineers=engineers,
+                external_links=external_links,
+                friendly_name=friendly_name,
+                hub_visibility=hub_visibility,
+                labels=labels,
+                preview_available=preview_available,
+                purpose=purpose,
+                retention_period=retention_period,
+                source_identifier=source_identifier,
+                stewards=stewards,
+                support_group=support_group,
+                support_level=support_level,
+                tags=tags,
+                upstream_lineage=upstream_lineage,
+                quality_score=quality_score,
+            )
+        )
+
+    async def get_hub_business_object(self, hub: Hub, business_object: BusinessObject) -> HubBusinessObject:
+        """Get a single HubBusinessObject."""
+        return await self._run(CoreApiOperations.get_hub_business_object(hub, business_object))
+
+    async def get_hub_business_objects(self, hub: Hub) -> List[HubBusinessObject]:
+        """Get all HubBusinessObjects for a given hub."""
+        return await self._run(CoreApiOperations.get_hub_business_objects(hub))
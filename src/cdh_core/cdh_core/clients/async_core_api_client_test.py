@@ -0,0 +1,166 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+from inspect import getfullargspec
+from inspect import isasyncgenfunction
+from inspect import iscoroutinefunction
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Union
+from unittest.mock import AsyncMock
+from unittest.mock import Mock
+
+import pytest
+
+from cdh_core.clients.async_core_api_client import AsyncCoreApiClient
+from cdh_core.clients.async_http_client import AsyncHttpClient
+from cdh_core.clients.core_api_client import CoreApiClient
+from cdh_core.clients.core_api_client_test import ClientRequestBuilder
+from cdh_core.clients.core_api_client_test import ClientResponseBuilder
+from cdh_core.clients.core_api_client_test import get_client_methods
+from cdh_core.clients.core_api_client_test import get_response_body
+from cdh_core.clients.http_client import HttpClient
+from cdh_core.clients.http_client import NonRetryableConflictError
+from cdh_core.entities.catalog_export import CatalogExportEntityType
+from cdh_core.entities.catalog_export_test import build_catalog_export
+from cdh_core.entities.catalog_export_test import build_catalog_export_part
+from cdh_core.entities.dataset_test import build_dataset
+from cdh_core.entities.dataset_test import build_dataset_account_permission
+from cdh_core.entities.dataset_test import build_response_dataset
+from cdh_core.enums.hubs_test import build_hub
+
+SYNC_ONLY_METHODS = {"RequestBuilder"}
+ASYNC_ONLY_METHODS = {"close"}
+
+
+def respond_with(response_builder: ClientResponseBuilder, method: str) -> Callable[..., Dict[str, Any]]:
+    def respond(path: str, params: Optional[Mapping[str, Union[str, List[str]]]] = None, **_: Any) -> Dict[str, Any]:
+        query_string = "?" + "&".join([f"{key}={value}" for key, value in params.items()]) if params else ""
+        return response_builder(method_path=method + path + query_string)
+
+    return respond
+
+
+class TestAsyncCoreApiClient:
+    def setup_method(self) -> None:
+        self.hub = build_hub()
+        self.http_client = AsyncMock(spec_set=AsyncHttpClient)
+        self.core_api_client = AsyncCoreApiClient(http_client=self.http_client)
+
+    def test_same_methods_as_core_api_client(self) -> None:
+        sync_methods = get_client_methods(CoreApiClient) - SYNC_ONLY_METHODS
+        async_methods = get_client_methods(AsyncCoreApiClient) - ASYNC_ONLY_METHODS  # type: ignore
+
+        assert async_methods == sync_methods
+        for method_name in sync_methods - {"connection_statistics"}:
+            sync_spec = getfullargspec(getattr(CoreApiClient, method_name))
+            async_method = getattr(AsyncCoreApiClient, method_name)
+            async_spec = getfullargspec(async_method)
+            assert async_spec.args == sync_spec.args
+            assert async_spec.defaults == sync_spec.defaults
+            assert {key: value for key, value in async_spec.annotations.items() if key != "return"} == {
+                key: value for key, value in sync_spec.annotations.items() if key != "return"
+            }
+            if method_name.startswith("iter_"):
+                assert isasyncgenfunction(async_method), method_name
+            else:
+                assert iscoroutinefunction(async_method), method_name
+
+    @pytest.mark.parametrize(
+        "method_name",
+        sorted(
+            method
+            for method in get_client_methods(CoreApiClient) - SYNC_ONLY_METHODS - {"connection_statistics"}
+            if not method.startswith("iter_")
+        ),
+    )
+    def test_same_requests_and_results_as_core_api_client(self, method_name: str) -> None:
+        response_builder = ClientResponseBuilder()
+        sync_http_client = Mock(spec_set=HttpClient)
+        for method in ["get", "post", "put", "patch", "delete", "get_with_pagination"]:
+            http_method = "GET" if method == "get_with_pagination" else method.upper()
+            getattr(sync_http_client, method).side_effect = respond_with(response_builder, http_method)
+            getattr(self.http_client, method).side_effect = respond_with(response_builder, http_method)
+        arguments = ClientRequestBuilder().generate_arguments(getattr(CoreApiClient, method_name))
+
+        expected = getattr(CoreApiClient(sync_http_client), method_name)(**arguments)
+        result = asyncio.run(getattr(self.core_api_client, method_name)(**arguments))
+
+        assert self.http_client.mock_calls == sync_http_client.mock_calls
+        assert result == expected
+
+    def test_grant_dataset_permission_non_retryable_conflict_recovered(self) -> None:
+        permission = build_dataset_account_permission()
+        self.http_client.post.side_effect = NonRetryableConflictError("Account ... already has access ...")
+        self.http_client.get.return_value = {"permissions": [get_response_body(permission)]}
+
+        result = asyncio.run(
+            self.core_api_client.grant_dataset_permission(
+                hub=self.hub,
+                dataset_id=build_dataset().id,
+                account_id=permission.account_id,
+                stage=permission.stage,
+                region=permission.region,
+            )
+        )
+
+        assert result == permission
+
+    def test_iter_datasets(self) -> None:
+        datasets = [build_response_dataset() for _ in range(3)]
+
+        async def iter_with_pagination(*_: Any, **__: Any) -> AsyncIterator[Dict[str, Any]]:
+            for dataset in datasets:
+                yield get_response_body(dataset)
+
+        self.http_client.iter_with_pagination = Mock(side_effect=iter_with_pagination)
+
+        async def collect() -> List[Any]:
+            return [dataset async for dataset in self.core_api_client.iter_datasets(self.hub)]
+
+        assert asyncio.run(collect()) == datasets
+        self.http_client.iter_with_pagination.assert_called_once_with(
+            f"/{self.hub.value}/datasets", next_page_key="nextPageToken", item_key="datasets", pipelined=True
+        )
+
+    def test_iter_exported_datasets(self) -> None:
+        datasets = [build_dataset(hub=self.hub) for _ in range(3)]
+        export = build_catalog_export(
+            hub=self.hub,
+            parts=[
+                build_catalog_export_part(CatalogExportEntityType.datasets, url="https://example.com/0"),
+                build_catalog_export_part(CatalogExportEntityType.accounts, url="https://example.com/accounts"),
+                build_catalog_export_part(CatalogExportEntityType.datasets, url="https://example.com/1"),
+            ],
+        )
+        lines = {
+            "https://example.com/0": [dataset.to_json().encode() for dataset in datasets[:2]],
+            "https://example.com/1": [datasets[2].to_json().encode()],
+        }
+
+        async def iter_lines_from_url(url: str) -> AsyncIterator[bytes]:
+            for line in lines[url]:
+                yield line
+
+        self.http_client.iter_lines_from_url = Mock(side_effect=iter_lines_from_url)
+
+        async def collect() -> List[Any]:
+            return [dataset async for dataset in self.core_api_client.iter_exported_datasets(export)]
+
+        assert asyncio.run(collect()) == datasets
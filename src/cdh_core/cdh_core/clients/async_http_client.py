@@ -0,0 +1,617 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import json
+import os
+import time
+from asyncio import sleep
+from collections import Counter
+from dataclasses import dataclass
+from http import HTTPStatus
+from logging import getLogger
+from types import TracebackType
+from typing import Any
+from typing import AsyncIterator
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+from typing import Union
+from urllib.parse import quote
+from urllib.parse import urlencode
+
+import aiohttp
+import botocore.session
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+from botocore.exceptions import NoCredentialsError
+from multidict import CIMultiDict
+from yarl import URL
+
+from cdh_core.clients.http_client import ACCEPT
+from cdh_core.clients.http_client import BaseHttpClient
+from cdh_core.clients.http_client import CONNECT_TIMEOUT_SECONDS
+from cdh_core.clients.http_client import DEFAULT_PAGINATION_WORKERS
+from cdh_core.clients.http_client import DEFAULT_RETRY_STATUS_CODES
+from cdh_core.clients.http_client import HttpStatusCodeNotInExpectedCodes
+from cdh_core.clients.http_client import MaximumFetchesExceeded
+from cdh_core.clients.http_client import PaginationShard
+from cdh_core.clients.http_client import READ_TIMEOUT_SECONDS
+from cdh_core.clients.http_client import ResponseHeaders
+from cdh_core.clients.http_client import ResponseJson
+
+LOG = getLogger(__name__)
+LOG.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_LIMIT_PER_HOST = 16
+
+
+class SigV4Signer:  # pylint: disable=too-few-public-methods
+    """Signs requests with AWS Signature Version 4, like the BotoAWSRequestsAuth does for the HttpClient.
+
+    Without explicit credentials, the default credentials of botocore are used. Refreshable credentials are refreshed
+    by botocore when they are about to expire.
+    """
+
+    def __init__(self, region: str, service: str = "execute-api", credentials: Optional[Credentials] = None):
+        self._region = region
+        self._service = service
+        self._credentials = credentials
+
+    def sign(self, method: str, url: str, headers: Mapping[str, str], body: Optional[bytes]) -> Dict[str, str]:
+        """Return the headers of the request extended by the signature."""
+        if self._credentials is None:
+            self._credentials = botocore.session.Session().get_credentials()
+            if self._credentials is None:
+                raise NoCredentialsError()
+        request = AWSRequest(method=method, url=url, headers=dict(headers), data=body or b"")
+        SigV4Auth(self._credentials.get_frozen_credentials(), self._service, self._region).add_auth(request)
+        return dict(request.headers.items())
+
+
+@dataclass(frozen=True)
+class AsyncHttpResponse:
+    """A response of the AsyncHttpClient, whose body has been read completely."""
+
+    status_code: int
+    headers: ResponseHeaders
+    content: bytes
+
+    @property
+    def text(self) -> str:
+        """Return the decoded body."""
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        """Return the parsed JSON body."""
+        return json.loads(self.content)
+
+
+class AsyncHttpClient(BaseHttpClient):  # pylint: disable=too-many-instance-attributes
+    """
+    Makes HTTP requests with asyncio based on the library 'aiohttp', with the same retries as the HttpClient.
+
+    At most `max_concurrency` requests are sent at the same time, the others wait until a request has finished. Up to
+    `limit_per_host` connections per host are kept alive for reuse. The connections belong to the event loop in which
+    the first request is sent, so the client must not be shared between event loops and has to be closed, preferably
+    by using it as an async context manager.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        signer: Optional[SigV4Signer] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+    ) -> None:
+        super().__init__(base_url)
+        self._signer = signer
+        self._max_concurrency = max_concurrency
+        self._limit_per_host = limit_per_host
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._limiter: Optional[asyncio.Semaphore] = None
+        self._statistics: Counter[str] = Counter()
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        """Return the client, whose connections are closed when the context is left."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        """Close the connections."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._limiter = None
+
+    async def get(
+        self,
+        path: str,
+        *,
+        expected_status_codes: Optional[List[HTTPStatus]] = None,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        min_bytes: Optional[int] = None,
+        params: Optional[Mapping[str, Union[str, List[str]]]] = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> ResponseJson:
+        """Make a HTTP request of the type 'GET'."""
+        return (
+            await self._fetch(
+                "GET",
+                path,
+                expected_status_codes=expected_status_codes,
+                retry_status_codes=retry_status_codes,
+                min_bytes=min_bytes,
+                body=None,
+                params=params,
+                headers=headers,
+            )
+        )[0]
+
+    async def post(
+        self,
+        path: str,
+        *,
+        expected_status_codes: Optional[List[HTTPStatus]] = None,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        seconds_between_retries: Optional[int] = None,
+        min_bytes: Optional[int] = None,
+        body: Optional[Dict[str, Any]] = None,
+        params: Optional[Mapping[str, Union[str, List[str]]]] = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> ResponseJson:
+        """Make a HTTP request of the type 'POST'."""
+        return (
+            await self._fetch(
+                "POST",
+                path,
+                expected_status_codes=expected_status_codes,
+                retry_status_codes=retry_status_codes,
+                min_bytes=min_bytes,
+                body=body,
+                params=params,
+                seconds_between_retries=seconds_between_retries,
+                headers=headers,
+            )
+        )[0]
+
+    async def put(
+        self,
+        path: str,
+        *,
+        expected_status_codes: Optional[List[HTTPStatus]] = None,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        min_bytes: Optional[int] = None,
+        body: Optional[Dict[str, Any]] = None,
+        params: Optional[Mapping[str, Union[str, List[str]]]] = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> ResponseJson:
+        """Make a HTTP request of the type 'PUT'."""
+        return (
+            await self._fetch(
+                "PUT",
+                path,
+                expected_status_codes=expected_status_codes,
+                retry_status_codes=retry_status_codes,
+                min_bytes=min_bytes,
+                body=body,
+                params=params,
+                headers=headers,
+            )
+        )[0]
+
+    async def patch(
+        self,
+        path: str,
+        *,
+        expected_status_codes: Optional[List[HTTPStatus]] = None,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        min_bytes: Optional[int] = None,
+        body: Optional[Dict[str, Any]] = None,
+        params: Optional[Mapping[str, Union[str, List[str]]]] = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> ResponseJson:
+        """Make a HTTP request of the type 'PATCH'."""
+        return (
+            await self._fetch(
+                "PATCH",
+                path,
+                expected_status_codes=expected_status_codes,
+                retry_status_codes=retry_status_codes,
+                min_bytes=min_bytes,
+                body=body,
+                params=params,
+                headers=headers,
+            )
+        )[0]
+
+    async def delete(
+        self,
+        path: str,
+        *,
+        expected_status_codes: Optional[List[HTTPStatus]] = None,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        min_bytes: Optional[int] = None,
+        body: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> ResponseJson:
+        """Make a HTTP request of the type 'DELETE'."""
+        return (
+            await self._fetch(
+                "DELETE",
+                path,
+                expected_status_codes=expected_status_codes,
+                retry_status_codes=retry_status_codes,
+                min_bytes=min_bytes,
+                body=body,
+                headers=headers,
+            )
+        )[0]
+
+    async def options(self, path: str, *, expected_status_codes: List[HTTPStatus], min_bytes: int = 0) -> ResponseJson:
+        """Make a HTTP request of the type 'OPTIONS'."""
+        return (await self._fetch("OPTIONS", path, expected_status_codes=expected_status_codes, min_bytes=min_bytes))[0]
+
+    async def _fetch(
+        self,
+        method: str,
+        path: str,
+        *,
+        expected_status_codes: Optional[List[HTTPStatus]] = None,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        seconds_between_retries: Optional[int] = None,
+        min_bytes: Optional[int] = None,
+        body: Optional[Dict[str, Any]] = None,
+        params: Optional[Mapping[str, Union[str, List[str]]]] = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[ResponseJson, ResponseHeaders]:
+        response = await self.raw(
+            method=method,
+            path=path,
+            expected_status_codes=expected_status_codes,
+            retry_status_codes=retry_status_codes,
+            min_bytes=min_bytes,
+            body=body,
+            params=params,
+            seconds_between_retries=seconds_between_retries,
+            headers=headers,
+        )
+        response_json = {}
+        if response.content:
+            response_json = response.json()
+            if not isinstance(response_json, dict):
+                raise TypeError("Only responses which are dict shaped are supported.")
+        return response_json, response.headers
+
+    def connection_statistics(self) -> Dict[str, int]:
+        """Return how many requests were sent and how many connections were opened for them."""
+        requests = self._statistics["requests"]
+        connections = self._statistics["connections"]
+        return {"requests": requests, "connections": connections, "reused_connections": requests - connections}
+
+    async def raw(  # pylint: disable=too-many-locals
+        self,
+        method: str,
+        path: str,
+        *,
+        expected_status_codes: Optional[List[HTTPStatus]] = None,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        min_bytes: Optional[int] = None,
+        body: Optional[Dict[str, Any]] = None,
+        params: Optional[Mapping[str, Union[str, List[str]]]] = None,
+        retries: Optional[int] = None,
+        seconds_between_retries: Optional[int] = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> AsyncHttpResponse:
+        """Make a HTTP where everything can be configured, the retries behave like the ones of the HttpClient."""
+        retry_status_codes = [*(retry_status_codes or []), *DEFAULT_RETRY_STATUS_CODES]
+        expected_status_codes = expected_status_codes or []
+
+        if retries is None:
+            retries = self.default_retries
+
+        if seconds_between_retries is None:
+            seconds_between_retries = self.default_seconds_between_retries
+
+        url = self._base_url + path
+        if params:
+            # quote instead of quote_plus to encode the parameters as required by the signature
+            url += "?" + urlencode(dict(params), doseq=True, quote_via=quote)
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request_headers = {
+            "Accept": ACCEPT,
+            **({"Content-Type": "application/json"} if data is not None else {}),
+            **(headers or {}),
+        }
+        response: Optional[AsyncHttpResponse] = None
+        for attempt in range(retries):
+            LOG.info(f"REQUEST (#{attempt}) {method}: {self._base_url + path}")
+            start = time.perf_counter()
+            try:
+                response = await self._send(method, url, request_headers, data)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                LOG.info(f"RESPONSE Exception (total={int((time.perf_counter() - start) * 1000)}ms): {err!r}")
+                if attempt == retries - 1:
+                    raise
+                await sleep(self._seconds_before_retry(attempt, seconds_between_retries))
+                continue
+            LOG.info(
+                " ".join(
+                    [
+                        f"RESPONSE {response.status_code}",
+                        f"(total time={int((time.perf_counter() - start) * 1000)}ms)",
+                        f"(total content size={len(response.content)}bytes)",
+                    ]
+                )
+            )
+
+            if self._is_final_response(
+                response.status_code, response.content, expected_status_codes, retry_status_codes
+            ):
+                break
+
+            if attempt < retries - 1:
+                await sleep(
+                    self._seconds_before_retry(attempt, seconds_between_retries, response.headers.get("Retry-After"))
+                )
+
+        assert response is not None
+        self._check_response(response.status_code, response.content, expected_status_codes, min_bytes)
+        return response
+
+    async def _send(self, method: str, url: str, headers: Dict[str, str], data: Optional[bytes]) -> AsyncHttpResponse:
+        if self._signer is not None:
+            headers = self._signer.sign(method, url, headers, data)
+        session, limiter = self._get_session()
+        async with limiter:
+            # the url is already encoded, aiohttp must not encode it differently from the signed one
+            # pylint infers the typing-only overloads of aiohttp, whose bodies are '...', as returning None
+            # pylint: disable=not-async-context-manager
+            async with session.request(method, URL(url, encoded=True), headers=headers, data=data) as response:
+                return AsyncHttpResponse(
+                    status_code=response.status, headers=CIMultiDict(response.headers), content=await response.read()
+                )
+
+    def _get_session(self) -> Tuple[aiohttp.ClientSession, asyncio.Semaphore]:
+        # created lazily, because both belong to the event loop which is running at the time
+        if self._session is None or self._limiter is None:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_start.append(self._count_request)
+            trace_config.on_connection_create_end.append(self._count_connection)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=0, limit_per_host=self._limit_per_host),
+                timeout=aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT_SECONDS, sock_read=READ_TIMEOUT_SECONDS),
+                trace_configs=[trace_config],
+            )
+            self._limiter = asyncio.Semaphore(self._max_concurrency)
+        return self._session, self._limiter
+
+    async def _count_request(self, *_: Any) -> None:
+        self._statistics["requests"] += 1
+
+    async def _count_connection(self, *_: Any) -> None:
+        self._statistics["connections"] += 1
+
+    async def get_with_pagination(
+        self,
+        path: str,
+        *,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        min_bytes: Optional[int] = None,
+        params: Optional[Mapping[str, Union[str, List[str]]]] = None,
+        next_page_key: str,
+        item_key: str,
+        max_number_of_fetches: int = 100,
+    ) -> ResponseJson:
+        """Perform a bounded sequence of 'GET' requests and concatenate the results along the provided 'item_key'."""
+        return {
+            item_key: [
+                item
+                async for item in self.iter_with_pagination(
+                    path,
+                    retry_status_codes=retry_status_codes,
+                    min_bytes=min_bytes,
+                    params=params,
+                    next_page_key=next_page_key,
+                    item_key=item_key,
+                    max_number_of_fetches=max_number_of_fetches,
+                )
+            ]
+        }
+
+    async def iter_with_pagination(
+        self,
+        path: str,
+        *,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        min_bytes: Optional[int] = None,
+        params: Optional[Mapping[str, Union[str, List[str]]]] = None,
+        next_page_key: str,
+        item_key: str,
+        max_number_of_fetches: int = 100,
+        pipelined: bool = False,
+    ) -> AsyncIterator[Any]:
+        """Yield the items of a bounded sequence of 'GET' requests along the provided 'item_key' as the pages arrive.
+
+        If `pipelined` is set, the next page is requested while the items of the current page are consumed. If the
+        iteration is stopped early, a pending request is cancelled.
+        """
+        pages = self._iter_pages(
+            path,
+            retry_status_codes=retry_status_codes,
+            min_bytes=min_bytes,
+            params=params,
+            next_page_key=next_page_key,
+            item_key=item_key,
+            max_number_of_fetches=max_number_of_fetches,
+        )
+        async for page in _fetch_ahead(pages) if pipelined else pages:
+            for item in page:
+                yield item
+
+    async def iter_with_parallel_pagination(
+        self,
+        shards: Sequence[PaginationShard],
+        *,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        min_bytes: Optional[int] = None,
+        next_page_key: str,
+        item_key: str,
+        max_number_of_fetches: int = 100,
+        max_workers: int = DEFAULT_PAGINATION_WORKERS,
+    ) -> AsyncIterator[Any]:
+        """Yield the items of several independent paginated 'GET' requests, e.g. the same endpoint for every hub.
+
+        This behaves like `HttpClient.iter_with_parallel_pagination`, but the shards are paginated by tasks instead of
+        threads. If the iteration is stopped early or a shard fails, the remaining shards are cancelled.
+        """
+        shard_pages = [
+            self._iter_pages(
+                path,
+                retry_status_codes=retry_status_codes,
+                min_bytes=min_bytes,
+                params=params,
+                next_page_key=next_page_key,
+                item_key=item_key,
+                max_number_of_fetches=max_number_of_fetches,
+            )
+            for path, params in shards
+        ]
+        async for page in _merge_pages(shard_pages, max_workers):
+            for item in page:
+                yield item
+
+    async def _iter_pages(
+        self,
+        path: str,
+        *,
+        retry_status_codes: Optional[List[HTTPStatus]],
+        min_bytes: Optional[int],
+        params: Optional[Mapping[str, Union[str, List[str]]]],
+        next_page_key: str,
+        item_key: str,
+        max_number_of_fetches: int,
+    ) -> AsyncIterator[List[Any]]:
+        page_params: Dict[str, Union[str, List[str]]] = dict(params) if params else {}
+        for _ in range(max_number_of_fetches):
+            response_json, headers = await self._fetch(
+                "GET",
+                path,
+                expected_status_codes=[HTTPStatus.OK],
+                retry_status_codes=retry_status_codes,
+                min_bytes=min_bytes,
+                body=None,
+                params=page_params,
+            )
+            new_items = response_json[item_key]
+            if not isinstance(new_items, list):
+                raise TypeError("Cannot paginate over non-list values")
+            yield new_items
+            next_page_token = headers.get(next_page_key)
+            if not next_page_token:
+                return
+            page_params = {**page_params, next_page_key: next_page_token}
+        raise MaximumFetchesExceeded(f"Maximum number of fetches (={max_number_of_fetches}) exceeded")
+
+    async def iter_lines_from_url(self, url: str, *, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Stream the lines of a document that is downloaded from an absolute url without credentials.
+
+        This is meant for pre-signed urls, the body is decoded according to its Content-Encoding while it is read.
+        """
+        LOG.info(f"REQUEST GET (streamed): {url.split('?', 1)[0]}")
+        session, _ = self._get_session()
+        async with session.get(URL(url, encoded=True)) as response:  # pylint: disable=not-async-context-manager
+            if response.status != HTTPStatus.OK:
+                raise HttpStatusCodeNotInExpectedCodes(
+                    status_code=HTTPStatus(response.status),
+                    expected_status_codes=[HTTPStatus.OK],
+                    content=await response.text(errors="replace"),
+                )
+            pending = b""
+            async for chunk in response.content.iter_chunked(chunk_size):
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    if line := line.rstrip(b"\r"):
+                        yield line
+            if pending := pending.rstrip(b"\r"):
+                yield pending
+
+
+async def _fetch_ahead(pages: AsyncIterator[List[Any]]) -> AsyncIterator[List[Any]]:
+    """Request the next page while the current one is consumed."""
+    next_page = asyncio.ensure_future(_next_or_none(pages))
+    try:
+        while (page := await next_page) is not None:
+            next_page = asyncio.ensure_future(_next_or_none(pages))
+            yield page
+    finally:
+        _discard(next_page)
+
+
+async def _next_or_none(pages: AsyncIterator[List[Any]]) -> Optional[List[Any]]:
+    async for page in pages:
+        return page
+    return None
+
+
+async def _merge_pages(shards: Sequence[AsyncIterator[List[Any]]], max_workers: int) -> AsyncIterator[List[Any]]:
+    """Paginate up to `max_workers` shards at the same time and yield their pages as they arrive."""
+    if not shards:
+        return
+    pages: "asyncio.Queue[Tuple[Optional[List[Any]], Optional[Exception]]]" = asyncio.Queue(maxsize=max_workers)
+    workers = asyncio.Semaphore(max_workers)
+
+    async def paginate(shard: AsyncIterator[List[Any]]) -> None:
+        async with workers:
+            try:
+                async for page in shard:
+                    await pages.put((page, None))
+            except Exception as error:  # pylint: disable=broad-except
+                await pages.put((None, error))
+                return
+        await pages.put((None, None))
+
+    tasks = [asyncio.ensure_future(paginate(shard)) for shard in shards]
+    try:
+        remaining = len(shards)
+        while remaining:
+            page, error = await pages.get()
+            if error:
+                raise error
+            if page is None:
+                remaining -= 1
+                continue
+            yield page
+    finally:
+        for task in tasks:
+            _discard(task)
+
+
+def _discard(task: "asyncio.Future[Any]") -> None:
+    """Cancel a task whose result is not needed anymore, without logging its exception."""
+    task.cancel()
+    task.add_done_callback(lambda done: done.cancelled() or done.exception())
@@ -0,0 +1,259 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import gzip
+import json
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from unittest.mock import call
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from botocore.credentials import Credentials
+
+from cdh_core.clients import async_http_client
+from cdh_core.clients.async_http_client import AsyncHttpClient
+from cdh_core.clients.async_http_client import SigV4Signer
+from cdh_core.clients.http_client import ACCEPT
+from cdh_core.clients.http_client import HttpStatusCodeNotInExpectedCodes
+from cdh_core.clients.http_client import MaximumFetchesExceeded
+from cdh_core.clients.http_client import NonRetryableConflictError
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+@asynccontextmanager
+async def serve(handler: Handler) -> AsyncIterator[AsyncHttpClient]:
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    async with TestServer(app, host="127.0.0.1") as server:
+        async with AsyncHttpClient(base_url=str(server.make_url("")).rstrip("/"), max_concurrency=4) as client:
+            client.default_seconds_between_retries = 0
+            yield client
+
+
+def paginated(pages: Dict[str, List[int]]) -> Handler:
+    """Serve the pages {token: items}, the first page has the token ''."""
+    tokens = list(pages)
+
+    async def handler(request: web.Request) -> web.Response:
+        token = request.query.get("nextPageToken", "")
+        index = tokens.index(token)
+        headers = {"nextPageToken": tokens[index + 1]} if index + 1 < len(tokens) else {}
+        return web.json_response({"items": pages[token], "path": request.path}, headers=headers)
+
+    return handler
+
+
+class TestAsyncHttpClient:
+    def test_get(self) -> None:
+        requests: List[web.Request] = []
+
+        async def handler(request: web.Request) -> web.Response:
+            requests.append(request)
+            return web.json_response({"ok": True})
+
+        async def run() -> Dict[str, Any]:
+            async with serve(handler) as client:
+                return await client.get(
+                    "/datasets",
+                    expected_status_codes=[HTTPStatus.OK],
+                    params={"name": "a b/c", "ids": ["1", "2"]},
+                    headers={"X-Custom": "value"},
+                )
+
+        assert asyncio.run(run()) == {"ok": True}
+        assert requests[0].path_qs == "/datasets?name=a%20b%2Fc&ids=1&ids=2"
+        assert requests[0].headers["X-Custom"] == "value"
+        assert requests[0].headers["Accept"] == ACCEPT
+        assert "gzip" in requests[0].headers["Accept-Encoding"]
+
+    def test_post_sends_json(self) -> None:
+        async def handler(request: web.Request) -> web.Response:
+            assert request.content_type == "application/json"
+            return web.json_response({"received": await request.json()}, status=HTTPStatus.CREATED)
+
+        async def run() -> Dict[str, Any]:
+            async with serve(handler) as client:
+                return await client.post("/", body={"a": [1]}, expected_status_codes=[HTTPStatus.CREATED])
+
+        assert asyncio.run(run()) == {"received": {"a": [1]}}
+
+    def test_retry_after_is_honored(self) -> None:
+        responses = [
+            web.Response(status=HTTPStatus.TOO_MANY_REQUESTS, headers={"Retry-After": "7"}),
+            web.Response(status=HTTPStatus.LOCKED, headers={"Retry-After": "3600"}),
+            web.json_response({}),
+        ]
+
+        async def handler(_: web.Request) -> web.Response:
+            return responses.pop(0)
+
+        async def run() -> float:
+            async with serve(handler) as client:
+                await client.get("/", expected_status_codes=[HTTPStatus.OK])
+                return client.max_seconds_between_retries
+
+        with patch.object(async_http_client, "sleep") as sleep:
+            max_seconds_between_retries = asyncio.run(run())
+
+        assert sleep.call_args_list == [call(7), call(max_seconds_between_retries)]
+
+    def test_unexpected_status_code(self) -> None:
+        async def handler(_: web.Request) -> web.Response:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="invalid")
+
+        async def run() -> None:
+            async with serve(handler) as client:
+                await client.get("/", expected_status_codes=[HTTPStatus.OK])
+
+        with pytest.raises(HttpStatusCodeNotInExpectedCodes):
+            asyncio.run(run())
+
+    def test_nonretryable_conflict(self) -> None:
+        calls = 0
+
+        async def handler(_: web.Request) -> web.Response:
+            nonlocal calls
+            calls += 1
+            return web.json_response({"Code": "ConflictError"}, status=HTTPStatus.CONFLICT)
+
+        async def run() -> None:
+            async with serve(handler) as client:
+                await client.post("/", expected_status_codes=[HTTPStatus.CREATED])
+
+        with pytest.raises(NonRetryableConflictError):
+            asyncio.run(run())
+        assert calls == 1
+
+    def test_concurrency_is_limited_and_connections_are_reused(self) -> None:
+        running = 0
+        max_running = 0
+
+        async def handler(_: web.Request) -> web.Response:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return web.json_response({})
+
+        async def run() -> Dict[str, int]:
+            async with serve(handler) as client:
+                await asyncio.gather(*[client.get("/", expected_status_codes=[HTTPStatus.OK]) for _ in range(20)])
+                return client.connection_statistics()
+
+        statistics = asyncio.run(run())
+
+        assert max_running == 4
+        assert statistics == {"requests": 20, "connections": 4, "reused_connections": 16}
+
+    def test_requests_are_signed(self) -> None:
+        headers: List[Dict[str, str]] = []
+
+        async def handler(request: web.Request) -> web.Response:
+            headers.append(dict(request.headers))
+            return web.json_response({})
+
+        async def run() -> None:
+            async with serve(handler) as client:
+                client._signer = SigV4Signer(  # pylint: disable=protected-access
+                    "eu-central-1", credentials=Credentials("AKID", "SECRET", "TOKEN")
+                )
+                await client.post("/path", params={"a": "b c"}, body={}, expected_status_codes=[HTTPStatus.OK])
+
+        asyncio.run(run())
+
+        authorization = headers[0]["Authorization"]
+        assert authorization.startswith("AWS4-HMAC-SHA256 Credential=AKID/")
+        assert "/eu-central-1/execute-api/aws4_request" in authorization
+        assert headers[0]["X-Amz-Security-Token"] == "TOKEN"
+        assert "X-Amz-Date" in headers[0]
+
+    @pytest.mark.parametrize("pipelined", [False, True])
+    def test_iter_with_pagination(self, pipelined: bool) -> None:
+        async def run() -> List[int]:
+            async with serve(paginated({"": [1, 2], "a": [], "b": [3]})) as client:
+                return [
+                    item
+                    async for item in client.iter_with_pagination(
+                        "/", next_page_key="nextPageToken", item_key="items", pipelined=pipelined
+                    )
+                ]
+
+        assert asyncio.run(run()) == [1, 2, 3]
+
+    def test_bound_number_of_pagination_fetches(self) -> None:
+        async def run() -> None:
+            async with serve(paginated({"": [1], "a": [2]})) as client:
+                await client.get_with_pagination(
+                    "/", next_page_key="nextPageToken", item_key="items", max_number_of_fetches=1
+                )
+
+        with pytest.raises(MaximumFetchesExceeded):
+            asyncio.run(run())
+
+    def test_iter_with_parallel_pagination(self) -> None:
+        async def run() -> List[int]:
+            async with serve(paginated({"": [1, 2], "a": [3]})) as client:
+                return [
+                    item
+                    async for item in client.iter_with_parallel_pagination(
+                        [("/hub1", None), ("/hub2", {"x": "y"}), ("/hub3", None)],
+                        next_page_key="nextPageToken",
+                        item_key="items",
+                        max_workers=2,
+                    )
+                ]
+
+        assert sorted(asyncio.run(run())) == [1, 1, 1, 2, 2, 2, 3, 3, 3]
+
+    def test_iter_with_parallel_pagination_raises_errors(self) -> None:
+        async def handler(request: web.Request) -> web.Response:
+            if request.path == "/broken":
+                return web.Response(status=HTTPStatus.FORBIDDEN)
+            return web.json_response({"items": [1]})
+
+        async def run() -> List[int]:
+            async with serve(handler) as client:
+                return [
+                    item
+                    async for item in client.iter_with_parallel_pagination(
+                        [("/ok", None), ("/broken", None)], next_page_key="nextPageToken", item_key="items"
+                    )
+                ]
+
+        with pytest.raises(HttpStatusCodeNotInExpectedCodes):
+            asyncio.run(run())
+
+    def test_iter_lines_from_url(self) -> None:
+        lines = [json.dumps({"id": index}).encode() for index in range(1000)]
+
+        async def handler(_: web.Request) -> web.Response:
+            return web.Response(body=gzip.compress(b"\r\n".join(lines) + b"\n"), headers={"Content-Encoding": "gzip"})
+
+        async def run() -> List[bytes]:
+            async with serve(handler) as client:
+                url = client._base_url + "/part-0.jsonl.gz?X-Amz-Signature=abc"  # pylint: disable=protected-access
+                return [line async for line in client.iter_lines_from_url(url, chunk_size=100)]
+
+        assert asyncio.run(run()) == lines
@@ -47,6 +47,10 @@ from cdh_core.clients.http_client import NonRetryableConflictError
 from cdh_core.entities.accounts import ResponseAccounts
 from cdh_core.entities.accounts_test import build_response_account
 from cdh_core.entities.accounts_test import build_response_account_without_costs
+from cdh_core.entities.catalog_export import CatalogExport
+from cdh_core.entities.catalog_export import CatalogExportEntityType
+from cdh_core.entities.catalog_export_test import build_catalog_export
+from cdh_core.entities.catalog_export_test import build_catalog_export_part
 from cdh_core.entities.dataset import DatasetAccountPermission
 from cdh_core.entities.dataset import DatasetId
 from cdh_core.entities.dataset import ExternalLink
@@ -289,6 +293,27 @@ class TestCoreApiClientNoneMocked:
         self.http_client.get_with_pagination.return_value = get_response_body(ResponseDatasets(datasets=datasets))
         assert self.core_api_client.get_datasets(hub=self.hub) == datasets
 
+    def test_iter_datasets(self) -> None:
+        datasets = [build_response_dataset() for _ in range(5)]
+        self.http_client.iter_with_pagination.return_value = iter(get_response_body(dataset) for dataset in datasets)
+
+        assert list(self.core_api_client.iter_datasets(hub=self.hub)) == datasets
+        self.http_client.iter_with_pagination.assert_called_once_with(
+            f"/{self.hub.value}/datasets", next_page_key="nextPageToken", item_key="datasets", pipelined=True
+        )
+
+    def test_iter_datasets_of_hubs(self) -> None:
+        datasets = [build_response_dataset() for _ in range(5)]
+        hubs = [build_hub() for _ in range(3)]
+        self.http_client.iter_with_parallel_pagination.return_value = iter(
+            get_response_body(dataset) for dataset in datasets
+        )
+
+        assert list(self.core_api_client.iter_datasets_of_hubs(hubs)) == datasets
+        self.http_client.iter_with_parallel_pagination.assert_called_once_with(
+            [(f"/{hub.value}/datasets", None) for hub in hubs], next_page_key="nextPageToken", item_key="datasets"
+        )
+
     def test_create_dataset(self) -> None:
         dataset = build_response_dataset()
         self.http_client.post.return_value = get_response_body(dataset)
@@ -452,6 +477,20 @@ class TestCoreApiClientNoneMocked:
         self.http_client.get_with_pagination.return_value = get_response_body(ResourcesPayload(resources))
         assert self.core_api_client.get_resources(hub=self.hub) == resources
 
+    def test_iter_resources_of_datasets(self) -> None:
+        resources = [cast(ResourcePayload, build_s3_resource().to_payload()) for _ in range(3)]
+        dataset_ids = [build_dataset().id for _ in range(2)]
+        self.http_client.iter_with_parallel_pagination.return_value = iter(
+            get_response_body(resource) for resource in resources
+        )
+
+        assert list(self.core_api_client.iter_resources_of_datasets(self.hub, dataset_ids)) == resources
+        self.http_client.iter_with_parallel_pagination.assert_called_once_with(
+            [(f"/{self.hub.value}/resources", {"datasetId": dataset_id}) for dataset_id in dataset_ids],
+            next_page_key="nextPageToken",
+            item_key="resources",
+        )
+
     def test_get_account(self) -> None:
         response_account = build_response_account()
         self.http_client.get.return_value = get_response_body(response_account)
@@ -462,6 +501,12 @@ class TestCoreApiClientNoneMocked:
         self.http_client.get_with_pagination.return_value = get_response_body(ResponseAccounts(accounts=accounts))
         assert self.core_api_client.get_accounts() == accounts
 
+    def test_iter_accounts(self) -> None:
+        accounts = [build_response_account_without_costs() for _ in range(5)]
+        self.http_client.iter_with_pagination.return_value = iter(get_response_body(account) for account in accounts)
+
+        assert list(self.core_api_client.iter_accounts()) == accounts
+
     @pytest.mark.parametrize("fail_if_exists", [True, False])
     def test_register_account_success(self, fail_if_exists: bool) -> None:
         response_account = build_response_account()
@@ -551,6 +596,64 @@ class TestCoreApiClientNoneMocked:
             == filter_package
         )
 
+    def test_create_catalog_export(self) -> None:
+        export = build_catalog_export(hub=self.hub)
+        self.http_client.post.return_value = get_response_body(export)
+
+        assert self.core_api_client.create_catalog_export(hub=self.hub) == export
+        self.http_client.post.assert_called_once_with(
+            f"/{self.hub.value}/exports", expected_status_codes=[HTTPStatus.ACCEPTED]
+        )
+
+    def test_get_catalog_export(self) -> None:
+        export = build_catalog_export(hub=self.hub)
+        self.http_client.get.return_value = get_response_body(export)
+
+        assert self.core_api_client.get_catalog_export(hub=self.hub, export_id=export.export_id) == export
+        self.http_client.get.assert_called_once_with(
+            f"/{self.hub.value}/exports/{export.export_id}", expected_status_codes=[HTTPStatus.OK]
+        )
+
+    def test_iter_exported_datasets(self) -> None:
+        datasets = [build_dataset(hub=self.hub) for _ in range(3)]
+        export = build_catalog_export(
+            hub=self.hub,
+            parts=[
+                build_catalog_export_part(CatalogExportEntityType.datasets, url="https://example.com/0"),
+                build_catalog_export_part(CatalogExportEntityType.accounts, url="https://example.com/accounts"),
+                build_catalog_export_part(CatalogExportEntityType.datasets, url="https://example.com/1"),
+            ],
+        )
+        lines = {
+            "https://example.com/0": [dataset.to_json().encode() for dataset in datasets[:2]],
+            "https://example.com/1": [datasets[2].to_json().encode()],
+        }
+        self.http_client.iter_lines_from_url.side_effect = lambda url: iter(lines[url])
+
+        assert list(self.core_api_client.iter_exported_datasets(export)) == datasets
+
+    def test_iter_exported_resources(self) -> None:
+        resource = build_s3_resource().to_payload()
+        export = build_catalog_export(
+            parts=[build_catalog_export_part(CatalogExportEntityType.resources, url="https://example.com")]
+        )
+        self.http_client.iter_lines_from_url.return_value = iter([resource.to_json().encode()])
+
+        assert list(self.core_api_client.iter_exported_resources(export)) == [resource]
+
+    def test_iter_incomplete_export(self) -> None:
+        export = build_catalog_export(complete=False)
+
+        with pytest.raises(ValueError):
+            list(self.core_api_client.iter_exported_accounts(export))
+        self.http_client.iter_lines_from_url.assert_not_called()
+
+    def test_iter_export_without_urls(self) -> None:
+        export = build_catalog_export(parts=[build_catalog_export_part(CatalogExportEntityType.accounts)])
+
+        with pytest.raises(ValueError):
+            list(self.core_api_client.iter_exported_accounts(export))
+
 
 class ClientResponseBuilder:
     """
@@ -592,6 +695,8 @@ class ClientResponseBuilder:
             (r"^PUT/accounts/.+/billing", get_response_body(build_response_account())),
             (r"^GET/.*?/businessObjects$", {"businessObjects": [get_response_body(build_hub_business_object())]}),
             (r"^GET/.*?/businessObjects/.+", get_response_body(build_hub_business_object())),
+            (r"^POST/.*?/exports$", get_response_body(build_catalog_export())),
+            (r"^GET/.*?/exports/.+", get_response_body(build_catalog_export())),
         ]
         self.path_response_mapping: List[Tuple[str, Dict[str, Any]]] = (path_response_mapping or []) + default_mapping
 
@@ -617,6 +722,7 @@ class ClientRequestBuilder:
             int: lambda: random.randint(0, 10),
             float: lambda: random.uniform(0, 10),
             AccountId: build_account_id,
+            CatalogExport: build_catalog_export,
             DatasetId: lambda: build_dataset().id,
             DatasetAccountPermission: build_dataset_account_permission,
             DatasetParticipant: build_dataset_participant,
@@ -14,25 +14,37 @@
 import logging
 import os
 import random
+import threading
 import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from datetime import datetime
+from datetime import timezone
+from email.utils import parsedate_to_datetime
 from http import HTTPStatus
 from http.client import HTTPConnection
-from json import JSONDecodeError
+from json import loads
 from logging import getLogger
+from queue import Full
+from queue import Queue
 from time import sleep
 from typing import Any
+from typing import Collection
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 from typing import Union
 
 from aws_requests_auth.aws_auth import AWSRequestsAuth
 from aws_requests_auth.boto_utils import BotoAWSRequestsAuth
-from requests import request
 from requests import Response
+from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.exceptions import ProxyError
 from requests.exceptions import Timeout
@@ -49,12 +61,78 @@ if os.environ.get("LOG_LEVEL_HTTP_CLIENT", "").upper() == "DEBUG":
 
 ResponseJson = Dict[str, Any]
 ResponseHeaders = Mapping[str, str]
+# the Core API compresses responses which exceed the payload limit of Lambda, if this is the first accepted media type
+ACCEPT = "application/gzip, application/json"
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_SECONDS_BETWEEN_RETRIES = 30
+DEFAULT_PAGINATION_WORKERS = 4
+DEFAULT_RETRY_STATUS_CODES = [HTTPStatus.LOCKED, HTTPStatus.GATEWAY_TIMEOUT, HTTPStatus.TOO_MANY_REQUESTS]
+CONNECT_TIMEOUT_SECONDS = 12
+READ_TIMEOUT_SECONDS = 42
+# the path and the parameters of a paginated request which is independent of the others, e.g. for one hub
+PaginationShard = Tuple[str, Optional[Mapping[str, Union[str, List[str]]]]]
+
+
+class BaseHttpClient:
+    """Holds the retry behavior which the synchronous HttpClient and the AsyncHttpClient share."""
+
+    def __init__(self, base_url: str) -> None:
+        self._base_url = _ensure_scheme_and_remove_last_slash(base_url)
+        self.default_retries = 4
+        self.default_seconds_between_retries = 2
+        self.max_seconds_between_retries = DEFAULT_MAX_SECONDS_BETWEEN_RETRIES
+        self.retry_sleep_jitter_factor_min = 0.8
+        self.retry_sleep_jitter_factor_max = 1.2
+
+    def _seconds_before_retry(
+        self, attempt: int, seconds_between_retries: float, retry_after: Optional[str] = None
+    ) -> float:
+        """Return how long to wait before the next attempt, a Retry-After header of the response takes precedence."""
+        if (seconds := _parse_retry_after(retry_after)) is not None:
+            return min(seconds, self.max_seconds_between_retries)
+        backoff = min(seconds_between_retries * float(2**attempt), self.max_seconds_between_retries)
+        return backoff * random.uniform(self.retry_sleep_jitter_factor_min, self.retry_sleep_jitter_factor_max)
+
+    @staticmethod
+    def _is_final_response(
+        status_code: int,
+        content: bytes,
+        expected_status_codes: Collection[int],
+        retry_status_codes: Collection[int],
+    ) -> bool:
+        """Return whether the response must not be retried, a conflict which cannot be retried is raised."""
+        if _is_retryable_conflict(status_code, content):
+            return False
+        # non retry-able Conflicts may also be listed in expected_status_codes
+        if status_code in expected_status_codes:
+            return True
+        if status_code == HTTPStatus.CONFLICT:
+            raise NonRetryableConflictError(_decode(content))
+        # stop loop when status_code is not set as retryable
+        return status_code not in retry_status_codes
+
+    @staticmethod
+    def _check_response(
+        status_code: int, content: bytes, expected_status_codes: List[HTTPStatus], min_bytes: Optional[int]
+    ) -> None:
+        if status_code not in expected_status_codes:
+            raise HttpStatusCodeNotInExpectedCodes(
+                status_code=HTTPStatus(status_code),
+                expected_status_codes=expected_status_codes,
+                content=_decode(content),
+            )
+        if min_bytes and len(content) < min_bytes:
+            raise ResponseTooSmall(actual_size=len(content), min_size=min_bytes)
 
 
-class HttpClient:
+class HttpClient(BaseHttpClient):
     """
     Makes HTTP requests based on the library 'requests' extended by retries and more.
 
+    All requests are sent via one session, which keeps up to `pool_maxsize` connections per host alive for reuse.
+    Retries wait exponentially longer, starting at `seconds_between_retries`, unless the response tells how long to
+    wait via its Retry-After header.
+
     The debug log of the client and requests can be enable via the env entry LOG_LEVEL_HTTP_CLIENT=DEBUG.
     """
 
@@ -62,13 +140,11 @@ class HttpClient:
         self,
         base_url: str,
         credentials: Optional[Union[AWSRequestsAuth, BotoAWSRequestsAuth]],
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
     ) -> None:
-        self._base_url = _ensure_https_and_remove_last_slash(base_url)
-        self.default_retries = 4
-        self.default_seconds_between_retries = 2
-        self.retry_sleep_jitter_factor_min = 0.8
-        self.retry_sleep_jitter_factor_max = 1.2
+        super().__init__(base_url)
         self._auth = credentials
+        self._session = _build_session(pool_maxsize)
 
     def get(
         self,
@@ -215,11 +291,26 @@ class HttpClient:
                 raise TypeError("Only responses which are dict shaped are supported.")
         return response_json, response.headers
 
-    def _wait_with_jitter(self, seconds_between_retries: int) -> None:
-        sleep_factor = random.uniform(self.retry_sleep_jitter_factor_min, self.retry_sleep_jitter_factor_max)
-        sleep(seconds_between_retries * sleep_factor)
+    def connection_statistics(self) -> Dict[str, int]:
+        """Return how many requests were sent and how many connections were opened for them by the pooled hosts."""
+        adapters = {id(adapter): adapter for adapter in self._session.adapters.values()}.values()
+        pools = [
+            adapter.poolmanager.pools[key]
+            for adapter in adapters
+            if isinstance(adapter, HTTPAdapter)
+            for key in adapter.poolmanager.pools.keys()
+        ]
+        requests = sum(pool.num_requests for pool in pools)
+        connections = sum(pool.num_connections for pool in pools)
+        return {"requests": requests, "connections": connections, "reused_connections": requests - connections}
+
+    def _wait_before_retry(
+        self, attempt: int, seconds_between_retries: float, response: Optional[Response] = None
+    ) -> None:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        sleep(self._seconds_before_retry(attempt, seconds_between_retries, retry_after))
 
-    def raw(  # pylint: disable=too-many-locals
+    def raw(
         self,
         method: str,
         path: str,
@@ -233,11 +324,13 @@ class HttpClient:
         seconds_between_retries: Optional[int] = None,
         headers: Optional[Dict[str, Any]] = None,
     ) -> Response:
-        """Make a HTTP where everything can be configured."""
-        retry_status_codes = retry_status_codes or []
+        """Make a HTTP where everything can be configured.
+
+        The n-th retry waits `seconds_between_retries * 2**n` seconds with some jitter, but not longer than
+        `max_seconds_between_retries`. If the response has a Retry-After header, its delay is used instead.
+        """
+        retry_status_codes = [*(retry_status_codes or []), *DEFAULT_RETRY_STATUS_CODES]
         expected_status_codes = expected_status_codes or []
-        connect_timeout = 12
-        read_timeout = 42
 
         if retries is None:
             retries = self.default_retries
@@ -245,31 +338,27 @@ class HttpClient:
         if seconds_between_retries is None:
             seconds_between_retries = self.default_seconds_between_retries
 
-        # Default retryable status codes
-        retry_status_codes.append(HTTPStatus.LOCKED)
-        retry_status_codes.append(HTTPStatus.GATEWAY_TIMEOUT)
-        retry_status_codes.append(HTTPStatus.TOO_MANY_REQUESTS)
         response = Response()
         for attempt in range(retries):
             LOG.info(f"REQUEST (#{attempt}) {method}: {self._base_url + path}")
             start = time.perf_counter()
             try:
-                response = request(
+                response = self._session.request(
                     method,
                     self._base_url + path,
                     # mypy does not acknowledge an BotoAwsRequestsAuth as an AuthBase
                     auth=self._auth,  # type: ignore
                     json=body,
-                    timeout=(connect_timeout, read_timeout),
+                    timeout=(CONNECT_TIMEOUT_SECONDS, READ_TIMEOUT_SECONDS),
                     params=dict(params) if params is not None else None,
-                    headers=headers,
+                    headers={"Accept": ACCEPT, **(headers or {})},
                 )
             except (ProxyError, RequestsConnectionError, Timeout) as err:
                 end = time.perf_counter()
                 LOG.info(f"RESPONSE Exception (total={int((end - start) * 1000)}ms / response=-ms): {err}")
                 if attempt == retries - 1:
                     raise
-                self._wait_with_jitter(seconds_between_retries)
+                self._wait_before_retry(attempt, seconds_between_retries)
                 continue
             end = time.perf_counter()
             response_time = int(response.elapsed.microseconds / 1000)
@@ -279,34 +368,22 @@ class HttpClient:
                         f"RESPONSE {response.status_code}",
                         f"(total time={int((end-start)*1000)}ms / response time={response_time}ms)",
                         f"(total content size={len(response.content)}bytes)",
+                        f"(content encoding={response.headers.get('Content-Encoding', 'identity')})",
                     ]
                 )
             )
             if LOG.isEnabledFor(logging.DEBUG):
                 LOG.debug(response.text)
 
-            if not _is_retryable_conflict(response):
-                # non retry-able Conflicts may also be listed in expected_status_codes
-                if response.status_code in expected_status_codes:
-                    break
-                if response.status_code == HTTPStatus.CONFLICT:
-                    raise NonRetryableConflictError(response.text)
-                # stop loop when status_code is not set as retryable
-                if response.status_code not in retry_status_codes:
-                    break
-
-            self._wait_with_jitter(seconds_between_retries)
+            if self._is_final_response(
+                response.status_code, response.content, expected_status_codes, retry_status_codes
+            ):
+                break
 
-        if response is not Response() and response.status_code not in expected_status_codes:
-            raise HttpStatusCodeNotInExpectedCodes(
-                status_code=HTTPStatus(response.status_code),
-                expected_status_codes=expected_status_codes,
-                content=response.text,
-            )
-
-        if min_bytes and len(response.content) < min_bytes:
-            raise ResponseTooSmall(actual_size=len(response.content), min_size=min_bytes)
+            if attempt < retries - 1:
+                self._wait_before_retry(attempt, seconds_between_retries, response)
 
+        self._check_response(response.status_code, response.content, expected_status_codes, min_bytes)
         return response
 
     def options(self, path: str, *, expected_status_codes: List[HTTPStatus], min_bytes: int = 0) -> ResponseJson:
@@ -331,8 +408,121 @@ class HttpClient:
         max_number_of_fetches: int = 100,
     ) -> ResponseJson:
         """Perform a bounded sequence of 'GET' requests and concatenate the results along the provided 'item_key'."""
+        return {
+            item_key: list(
+                self.iter_with_pagination(
+                    path,
+                    retry_status_codes=retry_status_codes,
+                    min_bytes=min_bytes,
+                    params=params,
+                    next_page_key=next_page_key,
+                    item_key=item_key,
+                    max_number_of_fetches=max_number_of_fetches,
+                )
+            )
+        }
+
+    def iter_with_pagination(
+        self,
+        path: str,
+        *,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        min_bytes: Optional[int] = None,
+        params: Optional[Mapping[str, Union[str, List[str]]]] = None,
+        next_page_key: str,
+        item_key: str,
+        max_number_of_fetches: int = 100,
+        pipelined: bool = False,
+    ) -> Iterator[Any]:
+        """Yield the items of a bounded sequence of 'GET' requests along the provided 'item_key' as the pages arrive.
+
+        The items are yielded in the order of the pages. Only the current page is kept in memory. If `pipelined` is
+        set, the next page is requested by a background thread while the items of the current page are consumed, so
+        that at most two pages are kept in memory. If the iteration is stopped early, a pending request is awaited.
+        """
+        pages = self._iter_pages(
+            path,
+            retry_status_codes=retry_status_codes,
+            min_bytes=min_bytes,
+            params=params,
+            next_page_key=next_page_key,
+            item_key=item_key,
+            max_number_of_fetches=max_number_of_fetches,
+        )
+        for page in _fetch_ahead(pages) if pipelined else pages:
+            yield from page
+
+    def iter_with_parallel_pagination(
+        self,
+        shards: Sequence[PaginationShard],
+        *,
+        retry_status_codes: Optional[List[HTTPStatus]] = None,
+        min_bytes: Optional[int] = None,
+        next_page_key: str,
+        item_key: str,
+        max_number_of_fetches: int = 100,
+        max_workers: int = DEFAULT_PAGINATION_WORKERS,
+    ) -> Iterator[Any]:
+        """Yield the items of several independent paginated 'GET' requests, e.g. the same endpoint for every hub.
+
+        Every shard consists of a path and its parameters, up to `max_workers` shards are paginated concurrently. The
+        items of a shard are yielded in the order of its pages, but the pages of different shards are interleaved in
+        the order in which they arrive. A worker waits with its next request until its previous page was handed over,
+        so that at most two pages per worker are kept in memory. If the iteration is stopped early or a shard fails,
+        the remaining shards are cancelled, which awaits the pending requests.
+        """
+        if not shards:
+            return
+        pages: "Queue[Tuple[Optional[List[Any]], Optional[Exception]]]" = Queue(maxsize=max_workers)
+        stopped = threading.Event()
+
+        def paginate(path: str, params: Optional[Mapping[str, Union[str, List[str]]]]) -> None:
+            try:
+                for page in self._iter_pages(
+                    path,
+                    retry_status_codes=retry_status_codes,
+                    min_bytes=min_bytes,
+                    params=params,
+                    next_page_key=next_page_key,
+                    item_key=item_key,
+                    max_number_of_fetches=max_number_of_fetches,
+                ):
+                    if not _put_unless_stopped(pages, (page, None), stopped):
+                        return
+            except Exception as error:  # pylint: disable=broad-except
+                _put_unless_stopped(pages, (None, error), stopped)
+                return
+            _put_unless_stopped(pages, (None, None), stopped)
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(shards)), thread_name_prefix="pagination")
+        try:
+            for path, params in shards:
+                executor.submit(paginate, path, params)
+            remaining = len(shards)
+            while remaining:
+                page, error = pages.get()
+                if error:
+                    raise error
+                if page is None:
+                    remaining -= 1
+                    continue
+                yield from page
+        finally:
+            stopped.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _iter_pages(
+        self,
+        path: str,
+        *,
+        retry_status_codes: Optional[List[HTTPStatus]],
+        min_bytes: Optional[int],
+        params: Optional[Mapping[str, Union[str, List[str]]]],
+        next_page_key: str,
+        item_key: str,
+        max_number_of_fetches: int,
+    ) -> Iterator[List[Any]]:
         params = {k: deepcopy(v) for k, v in params.items()} if params else {}
-        items = []
         for _ in range(max_number_of_fetches):
             json, headers = self._fetch(
                 "GET",
@@ -346,30 +536,100 @@ class HttpClient:
             new_items = json[item_key]
             if not isinstance(new_items, list):
                 raise TypeError("Cannot paginate over non-list values")
-            items.extend(new_items)
+            yield new_items
             next_page_token = headers.get(next_page_key)
             if not next_page_token:
-                return {item_key: items}
+                return
             params[next_page_key] = next_page_token
         raise MaximumFetchesExceeded(f"Maximum number of fetches (={max_number_of_fetches}) exceeded")
 
+    def iter_lines_from_url(self, url: str, *, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Stream the lines of a document that is downloaded from an absolute url without credentials.
+
+        This is meant for pre-signed urls, the body is decoded according to its Content-Encoding while it is read.
+        """
+        LOG.info(f"REQUEST GET (streamed): {url.split('?', 1)[0]}")
+        with self._session.request(
+            "GET",
+            url,
+            stream=True,
+            timeout=(CONNECT_TIMEOUT_SECONDS, READ_TIMEOUT_SECONDS),
+        ) as response:
+            if response.status_code != HTTPStatus.OK:
+                raise HttpStatusCodeNotInExpectedCodes(
+                    status_code=HTTPStatus(response.status_code),
+                    expected_status_codes=[HTTPStatus.OK],
+                    content=response.text,
+                )
+            for line in response.iter_lines(chunk_size=chunk_size):
+                if line:
+                    yield line
+
 
-def _is_retryable_conflict(response: Response) -> bool:
-    if response.status_code != HTTPStatus.CONFLICT:
+def _is_retryable_conflict(status_code: int, content: bytes) -> bool:
+    if status_code != HTTPStatus.CONFLICT:
         return False
     try:
-        error_dict = response.json()
-    except JSONDecodeError:
+        error_dict = loads(content)
+    except ValueError:
         return False
-    if "Retryable" not in error_dict:
+    if not isinstance(error_dict, dict) or "Retryable" not in error_dict:
         return False
     if error_dict["Retryable"] != "True":
         return False
     return True
 
 
-def _ensure_https_and_remove_last_slash(url: str) -> str:
-    return (url if url.startswith("https://") else "https://" + url).rstrip("/")
+def _decode(content: bytes) -> str:
+    return content.decode("utf-8", errors="replace")
+
+
+def _fetch_ahead(pages: Iterator[List[Any]]) -> Iterator[List[Any]]:
+    """Request the next page in a background thread while the current one is consumed."""
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pagination") as executor:
+        next_page: "Future[Optional[List[Any]]]" = executor.submit(lambda: next(pages, None))
+        while (page := next_page.result()) is not None:
+            next_page = executor.submit(lambda: next(pages, None))
+            yield page
+
+
+def _put_unless_stopped(queue: "Queue[Any]", item: Any, stopped: threading.Event) -> bool:
+    """Put the item into the queue as soon as there is space and return whether it was put before stopping."""
+    while not stopped.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+        except Full:
+            continue
+        return True
+    return False
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the seconds to wait according to a Retry-After header, which contains either seconds or a date."""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _build_session(pool_maxsize: int) -> Session:
+    session = Session()
+    # the HttpClient retries on its own, the adapter must not retry in addition
+    adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _ensure_scheme_and_remove_last_slash(url: str) -> str:
+    return (url if url.startswith(("https://", "http://")) else "https://" + url).rstrip("/")
 
 
 class HttpStatusCodeNotInExpectedCodes(Exception):
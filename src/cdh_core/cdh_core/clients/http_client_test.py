@@ -11,13 +11,26 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import gzip
+import json
 import random
+import threading
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from email.utils import format_datetime
 from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 from typing import Union
+from unittest.mock import call
 from unittest.mock import Mock
+from unittest.mock import patch
 
 import pytest
 from aws_requests_auth.boto_utils import BotoAWSRequestsAuth
@@ -26,6 +39,9 @@ from requests.exceptions import ProxyError
 from requests.exceptions import Timeout
 from requests_mock.mocker import Mocker
 
+from cdh_core.clients import http_client
+from cdh_core.clients.http_client import _parse_retry_after
+from cdh_core.clients.http_client import ACCEPT
 from cdh_core.clients.http_client import HttpClient
 from cdh_core.clients.http_client import HttpStatusCodeNotInExpectedCodes
 from cdh_core.clients.http_client import MaximumFetchesExceeded
@@ -35,6 +51,31 @@ from cdh_core_dev_tools.testing.assert_raises import assert_raises
 from cdh_core_dev_tools.testing.builder import Builder
 
 
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        body = b'{"ok": true}'
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture()
+def stub_server_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
 # pylint: disable=protected-access
 class TestHttpClient:
     def setup_method(self) -> None:
@@ -67,6 +108,29 @@ class TestHttpClient:
         assert actual_response == expected_response_data
         self._assert_params_were_applied(requests_mock.last_request)
 
+    def test_get_gzip_compressed(self, requests_mock: Mocker) -> None:
+        expected_response_data = {Builder.build_random_string(): Builder.build_random_string()}
+        requests_mock.request(
+            method="GET",
+            url=self.full_url,
+            status_code=HTTPStatus.OK,
+            content=gzip.compress(json.dumps(expected_response_data).encode("utf-8")),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+        actual_response = self.http_client.get(path=self.path, expected_status_codes=[HTTPStatus.OK])
+
+        assert actual_response == expected_response_data
+        assert requests_mock.request_history[-1].headers["Accept"] == ACCEPT
+        assert "gzip" in requests_mock.request_history[-1].headers["Accept-Encoding"]
+
+    def test_accept_can_be_overwritten(self, requests_mock: Mocker) -> None:
+        requests_mock.request(method="GET", url=self.full_url, status_code=HTTPStatus.OK, json={})
+
+        self.http_client.get(path=self.path, expected_status_codes=[HTTPStatus.OK], headers={"Accept": "text/csv"})
+
+        assert requests_mock.request_history[-1].headers["Accept"] == "text/csv"
+
     def test_post_should_retry(self, requests_mock: Mocker) -> None:
         requests_mock.request(
             method="POST",
@@ -227,6 +291,53 @@ class TestHttpClient:
         assert actual_response.status_code == HTTPStatus.OK
         assert requests_mock.call_count == 2
 
+    def test_retries_back_off_exponentially(self, requests_mock: Mocker) -> None:
+        requests_mock.request(method="GET", url=self.full_url, status_code=HTTPStatus.LOCKED)
+        self.http_client.default_seconds_between_retries = 1
+        self.http_client.max_seconds_between_retries = 3
+        self.http_client.retry_sleep_jitter_factor_min = self.http_client.retry_sleep_jitter_factor_max = 1
+
+        with patch.object(http_client, "sleep") as sleep, pytest.raises(HttpStatusCodeNotInExpectedCodes):
+            self.http_client.raw("GET", self.path, expected_status_codes=[HTTPStatus.OK], retries=4)
+
+        assert sleep.call_args_list == [call(1), call(2), call(3)]
+        assert requests_mock.call_count == 4
+
+    def test_retry_after_is_honored(self, requests_mock: Mocker) -> None:
+        requests_mock.request(
+            method="GET",
+            url=self.full_url,
+            response_list=[
+                {"status_code": HTTPStatus.TOO_MANY_REQUESTS, "headers": {"Retry-After": "7"}},
+                {"status_code": HTTPStatus.TOO_MANY_REQUESTS, "headers": {"Retry-After": "3600"}},
+                {"status_code": HTTPStatus.OK, "json": {}},
+            ],
+        )
+
+        with patch.object(http_client, "sleep") as sleep:
+            self.http_client.get(self.path, expected_status_codes=[HTTPStatus.OK])
+
+        assert sleep.call_args_list == [call(7), call(self.http_client.max_seconds_between_retries)]
+
+    @pytest.mark.parametrize(
+        "value,expected", [(None, None), ("", None), ("12", 12), ("soon", None), ("Wed, 21 Oct 2015 07:28:00 GMT", 0)]
+    )
+    def test_parse_retry_after(self, value: Optional[str], expected: Optional[float]) -> None:
+        assert _parse_retry_after(value) == expected
+
+    def test_parse_retry_after_date(self) -> None:
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+        assert 25 < (_parse_retry_after(format_datetime(retry_at, usegmt=True)) or 0) <= 30
+
+    def test_connections_are_reused(self, stub_server_url: str) -> None:
+        client = HttpClient(base_url=stub_server_url, credentials=None)
+
+        for _ in range(3):
+            assert client.get("/ping", expected_status_codes=[HTTPStatus.OK]) == {"ok": True}
+
+        assert client.connection_statistics() == {"requests": 3, "connections": 1, "reused_connections": 2}
+
     def test_request_exceptions_should_be_retried_and_reraised(self, requests_mock: Mocker) -> None:
         retries = 3
         requests_mock.request(
@@ -308,6 +419,74 @@ class TestHttpClient:
         assert requests_mock.request_history[1].qs[next_page_key] == ["first"]
         assert requests_mock.request_history[2].qs[next_page_key] == ["second"]
 
+    @pytest.mark.parametrize("pipelined", [False, True])
+    def test_iter_with_pagination(self, requests_mock: Mocker, pipelined: bool) -> None:
+        item_key = Builder.build_random_string()
+        next_page_key = Builder.build_random_string()
+        pages = [[{"page": page, "item": item} for item in range(random.randint(1, 5))] for page in range(3)]
+        requests_mock.request(
+            method="GET",
+            url=self.full_url,
+            response_list=[
+                {"status_code": HTTPStatus.OK, "json": {item_key: page}, "headers": {next_page_key: f"token{index}"}}
+                for index, page in enumerate(pages[:-1])
+            ]
+            + [{"status_code": HTTPStatus.OK, "json": {item_key: pages[-1]}}],
+        )
+
+        items = self.http_client.iter_with_pagination(
+            path=self.path, params=self.params, next_page_key=next_page_key, item_key=item_key, pipelined=pipelined
+        )
+
+        assert next(items) == pages[0][0]
+        if not pipelined:
+            assert requests_mock.call_count == 1
+        assert [pages[0][0], *items] == sum(pages, [])
+        assert requests_mock.call_count == 3
+        for request in requests_mock.request_history:
+            self._assert_params_were_applied(request)
+
+    def test_iter_with_parallel_pagination(self, requests_mock: Mocker) -> None:
+        item_key = Builder.build_random_string()
+        next_page_key = Builder.build_random_string()
+        shards = {f"/{shard}": [[f"{shard}{page}{item}" for item in range(3)] for page in range(2)] for shard in "abc"}
+        for path, pages in shards.items():
+            requests_mock.request(
+                method="GET",
+                url=self.base_url + path,
+                response_list=[
+                    {"status_code": HTTPStatus.OK, "json": {item_key: pages[0]}, "headers": {next_page_key: "next"}},
+                    {"status_code": HTTPStatus.OK, "json": {item_key: pages[1]}},
+                ],
+            )
+
+        items = list(
+            self.http_client.iter_with_parallel_pagination(
+                [(path, self.params) for path in shards],
+                next_page_key=next_page_key,
+                item_key=item_key,
+                max_workers=2,
+            )
+        )
+
+        assert sorted(items) == sorted(sum(sum(shards.values(), []), []))
+        for shard, pages in zip("abc", shards.values()):
+            assert [item for item in items if item.startswith(shard)] == sum(pages, [])
+        assert requests_mock.call_count == 6
+        for request in requests_mock.request_history:
+            self._assert_params_were_applied(request)
+
+    def test_iter_with_parallel_pagination_raises_errors(self, requests_mock: Mocker) -> None:
+        requests_mock.request(method="GET", url=self.base_url + "/a", status_code=HTTPStatus.OK, json={"items": [1]})
+        requests_mock.request(method="GET", url=self.base_url + "/b", status_code=HTTPStatus.FORBIDDEN)
+
+        with pytest.raises(HttpStatusCodeNotInExpectedCodes):
+            list(
+                self.http_client.iter_with_parallel_pagination(
+                    [("/a", None), ("/b", None)], next_page_key="next", item_key="items"
+                )
+            )
+
     @pytest.mark.parametrize("exceed", [False, True])
     def test_bound_number_of_pagination_fetches(self, requests_mock: Mocker, exceed: bool) -> None:
         item_key = Builder.build_random_string()
@@ -347,6 +526,26 @@ class TestHttpClient:
                 max_number_of_fetches=2,
             ) == {item_key: sum(pages, [])}
 
+    def test_iter_lines_from_url(self, requests_mock: Mocker) -> None:
+        lines = [json.dumps({Builder.build_random_string(): i}).encode() for i in range(3)]
+        url = f"{self.full_url}?X-Amz-Signature=abc"
+        requests_mock.request(
+            method="GET",
+            url=url,
+            status_code=HTTPStatus.OK,
+            content=gzip.compress(b"\n".join(lines) + b"\n"),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+        assert list(self.http_client.iter_lines_from_url(url, chunk_size=16)) == lines
+        self.auth.assert_not_called()
+
+    def test_iter_lines_from_url_unexpected_status(self, requests_mock: Mocker) -> None:
+        requests_mock.request(method="GET", url=self.full_url, status_code=HTTPStatus.FORBIDDEN)
+
+        with pytest.raises(HttpStatusCodeNotInExpectedCodes):
+            list(self.http_client.iter_lines_from_url(self.full_url))
+
     def _assert_params_were_applied(self, request: Any) -> None:
         for param_key, param_value in self.params.items():
             expected_value = param_value if isinstance(param_value, list) else [param_value]
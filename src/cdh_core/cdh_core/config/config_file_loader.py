@@ -13,28 +13,47 @@
 # limitations under the License.
 from __future__ import annotations
 
+import hashlib
 import os
+import pickle
 from functools import lru_cache
+from logging import getLogger
 from pathlib import Path
+from typing import Optional
 
 import marshmallow_dataclass
 import yaml
 
+from cdh_core.config import config_file as config_file_module
 from cdh_core.config.config_file import ConfigFile
 
+LOG = getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = b"1"
+SNAPSHOT_FILE_NAME = "cdh_core_config_snapshot.pickle"
+
 
 class ConfigFileLoader:
-    """Loads the configuration for creating enums dynamically."""
+    """Loads the configuration for creating enums dynamically.
+
+    Parsing and validating the YAML file takes several milliseconds in every fresh process. If a snapshot of the
+    validated config is available, it is loaded instead, as long as its digest matches the config file and the
+    definition of ConfigFile. The snapshot is written by write_snapshot when the deployment packages are built.
+    """
 
     _ENVIRONMENT_KEY = "CDH_CORE_CONFIG_FILE_PATH"
+    _SNAPSHOT_ENVIRONMENT_KEY = "CDH_CORE_CONFIG_SNAPSHOT_PATH"
 
     @staticmethod
     @lru_cache()
     def get_config() -> ConfigFile:
-        """Return the Configuration either from cache or from file."""
+        """Return the Configuration either from cache, from the snapshot or from file."""
         if ConfigFileLoader._ENVIRONMENT_KEY not in os.environ:
             raise RuntimeError(f"The environment key {ConfigFileLoader._ENVIRONMENT_KEY} is not set.")
         file_path = Path(os.environ[ConfigFileLoader._ENVIRONMENT_KEY])
+        if snapshot_path := os.environ.get(ConfigFileLoader._SNAPSHOT_ENVIRONMENT_KEY):
+            if config_file := ConfigFileLoader._read_snapshot(file_path, Path(snapshot_path)):
+                return config_file
         return ConfigFileLoader._read_config_file(file_path)
 
     @classmethod
@@ -47,3 +66,35 @@ class ConfigFileLoader:
         if not isinstance(config_file, ConfigFile):
             raise RuntimeError(f"The type of the config file is not as expected: {type(config_file)}")
         return config_file
+
+    @staticmethod
+    def _get_digest(file_path: Path) -> str:
+        digest = hashlib.sha256(SNAPSHOT_FORMAT_VERSION)
+        digest.update(Path(config_file_module.__file__).read_bytes())
+        digest.update(file_path.read_bytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def _read_snapshot(cls, file_path: Path, snapshot_path: Path) -> Optional[ConfigFile]:
+        """Return the config from the snapshot, or None if it is missing, stale or cannot be read."""
+        if not snapshot_path.is_file() or not file_path.is_file():
+            LOG.info(f"Reading the config file {file_path}, the snapshot {snapshot_path} is not available")
+            return None
+        try:
+            # the snapshot is part of the deployment package, just as the code itself
+            digest, config_file = pickle.loads(snapshot_path.read_bytes())  # nosec B301
+        except Exception as error:  # pylint: disable=broad-except
+            LOG.warning(f"Cannot read the config snapshot {snapshot_path}: {error!r}")
+            return None
+        if digest != cls._get_digest(file_path) or not isinstance(config_file, ConfigFile):
+            LOG.warning(f"The config snapshot {snapshot_path} does not match the config file {file_path}")
+            return None
+        return config_file
+
+    @classmethod
+    def write_snapshot(cls, file_path: Path, snapshot_path: Path) -> str:
+        """Validate the config file, write the snapshot which get_config loads instead and return its digest."""
+        config_file = cls._read_config_file(file_path)
+        digest = cls._get_digest(file_path)
+        snapshot_path.write_bytes(pickle.dumps((digest, config_file), pickle.HIGHEST_PROTOCOL))
+        return digest
@@ -13,6 +13,8 @@
 # limitations under the License.
 from pathlib import Path
 from typing import Any
+from typing import Iterator
+from unittest.mock import patch
 
 import pytest
 
@@ -47,3 +49,48 @@ class TestConfigFileLoader:
         monkeypatch.setenv(ConfigFileLoader._ENVIRONMENT_KEY, Builder.build_random_string())
         with pytest.raises(RuntimeError):
             ConfigFileLoader.get_config()
+
+
+class TestConfigSnapshot:
+    @pytest.fixture(autouse=True)
+    def service_setup(self, monkeypatch: Any, tmp_path: Path) -> Iterator[None]:
+        self.config_path = tmp_path / "config.yaml"
+        self.config_path.write_bytes((Path(__file__).parents[4].absolute() / "cdh-core-config.yaml").read_bytes())
+        self.snapshot_path = tmp_path / "snapshot.pickle"
+        monkeypatch.setenv(ConfigFileLoader._ENVIRONMENT_KEY, str(self.config_path))
+        monkeypatch.setenv(ConfigFileLoader._SNAPSHOT_ENVIRONMENT_KEY, str(self.snapshot_path))
+        ConfigFileLoader.get_config.cache_clear()  # type: ignore
+        yield
+        ConfigFileLoader.get_config.cache_clear()  # type: ignore
+
+    def test_snapshot_equals_config_file(self) -> None:
+        ConfigFileLoader.write_snapshot(self.config_path, self.snapshot_path)
+
+        with patch.object(ConfigFileLoader, "_read_config_file") as read_config_file:
+            config = ConfigFileLoader.get_config()
+
+        read_config_file.assert_not_called()
+        assert config == ConfigFileLoader._read_config_file(self.config_path)
+
+    def test_missing_snapshot_falls_back_to_config_file(self) -> None:
+        assert ConfigFileLoader.get_config() == ConfigFileLoader._read_config_file(self.config_path)
+
+    def test_stale_snapshot_falls_back_to_config_file(self) -> None:
+        ConfigFileLoader.write_snapshot(self.config_path, self.snapshot_path)
+        with self.config_path.open("a", encoding="utf-8") as file:
+            file.write("\n# changed after the snapshot was written\n")
+
+        with patch.object(ConfigFileLoader, "_read_config_file") as read_config_file:
+            assert ConfigFileLoader.get_config() is read_config_file.return_value
+
+    def test_corrupt_snapshot_falls_back_to_config_file(self) -> None:
+        self.snapshot_path.write_bytes(Builder.build_random_string().encode())
+
+        assert ConfigFileLoader.get_config() == ConfigFileLoader._read_config_file(self.config_path)
+
+    def test_write_snapshot_validates_config_file(self) -> None:
+        self.config_path.write_text("partition: {}")
+
+        with pytest.raises(Exception):
+            ConfigFileLoader.write_snapshot(self.config_path, self.snapshot_path)
+        assert not self.snapshot_path.exists()
@@ -0,0 +1,38 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import argparse
+import json
+from pathlib import Path
+
+from cdh_core.config.config_file_loader import ConfigFileLoader
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        "Validate the config file and write the snapshot which the ConfigFileLoader reads instead of the config file"
+    )
+    parser.add_argument("--config-file-path", help="Path to the config file", required=True, type=Path)
+    parser.add_argument("--snapshot-path", help="Output path of the snapshot", required=True, type=Path)
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Write the snapshot of the config file and print the digest guarding it."""
+    arguments = _parse_arguments()
+    digest = ConfigFileLoader.write_snapshot(arguments.config_file_path, arguments.snapshot_path)
+    print(json.dumps({"digest": digest}))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
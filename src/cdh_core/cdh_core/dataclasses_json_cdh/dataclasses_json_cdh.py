@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import json
 from functools import lru_cache
 from typing import Any
 from typing import Dict
@@ -19,6 +18,8 @@ from typing import Dict
 from dataclasses_json import config
 from dataclasses_json import DataClassJsonMixin
 
+from cdh_core.dataclasses_json_cdh.serializer_registry import SerializerRegistry
+
 
 @lru_cache(10000)
 def _to_camel_case(name: str) -> str:
@@ -27,6 +28,8 @@ def _to_camel_case(name: str) -> str:
 
 
 CDH_DATACLASS_JSON_CONFIG = config(letter_case=_to_camel_case)["dataclasses_json"]
+# like dataclasses_json, nested dataclasses without a config of their own keep their field names
+_PLAIN_REGISTRY = SerializerRegistry(default_config={})
 
 
 class DataClassJsonCDHMixin(DataClassJsonMixin):
@@ -35,8 +38,8 @@ class DataClassJsonCDHMixin(DataClassJsonMixin):
     dataclass_json_config = CDH_DATACLASS_JSON_CONFIG
 
     def to_plain_dict(self) -> Dict[str, Any]:
-        """Create an untyped dict from the class."""
-        data = json.loads(self.to_json())
+        """Create an untyped dict from the class, as it is represented in JSON."""
+        data = _PLAIN_REGISTRY.to_plain(self)
         if isinstance(data, dict):
             return data
         raise TypeError(f"Result is not a dict it is: {type(data)}")
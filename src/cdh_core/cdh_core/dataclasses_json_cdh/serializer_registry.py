@@ -0,0 +1,103 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import fields
+from dataclasses import is_dataclass
+from operator import attrgetter
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+import orjson
+from dataclasses_json.core import confs
+from dataclasses_json.core import FieldOverride
+
+Serializer = Callable[[object], Any]
+# original name, converted key, encoder and exclude of a field
+_FieldPlan = Tuple[str, str, Optional[Callable[[Any], Any]], Optional[Callable[[Any], bool]]]
+
+
+class SerializerRegistry:
+    """Serializes dataclasses with orjson, the serializer of every dataclass is compiled once per process.
+
+    The serializer of a dataclass turns an instance into a dict whose keys are converted in advance, according to the
+    dataclasses_json config of the class and its fields. Enums, datetimes and nested dataclasses are left to orjson.
+    Dataclasses without a dataclasses_json config of their own are serialized with the default config.
+    """
+
+    OPTIONS = orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def __init__(self, default_config: Mapping[str, Any]) -> None:
+        self._default_config = default_config
+        self._serializers: Dict[type, Serializer] = {}
+
+    def serialize(self, obj: object) -> Any:
+        """Serialize the types that orjson cannot handle, to be passed as default to orjson.dumps."""
+        serializer = self._serializers.get(type(obj))
+        if serializer is not None:
+            return serializer(obj)
+        if is_dataclass(obj):
+            serializer = self._serializers.setdefault(type(obj), self._compile(type(obj)))
+            return serializer(obj)
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        raise TypeError(f"Cannot serialize {obj}")
+
+    def dumps(self, obj: object) -> bytes:
+        """Serialize the object as JSON."""
+        return orjson.dumps(obj, default=self.serialize, option=self.OPTIONS)
+
+    def to_plain(self, obj: object) -> Any:
+        """Return the object as it is represented in JSON, built from lists, dicts and primitive types."""
+        return orjson.loads(self.dumps(obj))
+
+    def _get_field_plans(self, class_type: type) -> List[_FieldPlan]:
+        class_config = getattr(class_type, "dataclass_json_config", None)
+        plans: List[_FieldPlan] = []
+        for field in fields(class_type):
+            field_config = {**(self._default_config if class_config is None else class_config)}
+            field_config.update(field.metadata.get("dataclasses_json", {}))
+            override = FieldOverride(*map(field_config.get, confs))  # type: ignore # the config matches the overrides
+            letter_case = override.letter_case
+            key = letter_case(field.name) if letter_case else field.name  # type: ignore[truthy-function]
+            plans.append((field.name, key, override.encoder, override.exclude))
+        return plans
+
+    def _compile(self, class_type: type) -> Serializer:
+        plans = self._get_field_plans(class_type)
+        if not plans:
+            return lambda obj: {}
+        if any(encoder or exclude for _, _, encoder, exclude in plans):
+            getters = [(attrgetter(name), key, encoder, exclude) for name, key, encoder, exclude in plans]
+
+            def serializer(obj: object) -> Any:
+                result = {}
+                for getter, key, encoder, exclude in getters:
+                    value = getter(obj)
+                    if exclude and exclude(value):
+                        continue
+                    result[key] = encoder(value) if encoder else value
+                return result
+
+            return serializer
+        keys = [key for _, key, _, _ in plans]
+        if len(keys) == 1:
+            getter = attrgetter(plans[0][0])
+            return lambda obj: {keys[0]: getter(obj)}
+        # attrgetter with several names returns all values as a tuple in a single call
+        getter = attrgetter(*(name for name, _, _, _ in plans))
+        return lambda obj: dict(zip(keys, getter(obj)))
@@ -0,0 +1,118 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from enum import Enum
+from typing import Dict
+from typing import Optional
+from unittest.mock import patch
+
+import orjson
+import pytest
+from dataclasses_json import config
+from dataclasses_json import Exclude
+
+from cdh_core.dataclasses_json_cdh.dataclasses_json_cdh import CDH_DATACLASS_JSON_CONFIG
+from cdh_core.dataclasses_json_cdh.dataclasses_json_cdh import DataClassJsonCDHMixin
+from cdh_core.dataclasses_json_cdh.serializer_registry import SerializerRegistry
+
+
+class TestSerializerRegistry:
+    class _SomeEnum(Enum):
+        PROPERTY_A = "A"
+
+    @dataclass
+    class _Plain:
+        first_value: int
+        second_value: Optional[str]
+
+    @dataclass
+    class _Configured(DataClassJsonCDHMixin):
+        some_enum: "TestSerializerRegistry._SomeEnum"
+        plain_values: Dict[str, "TestSerializerRegistry._Plain"]
+        timestamp: datetime = field(metadata=config(encoder=lambda value: value.strftime("%Y")))
+        hidden_value: str = field(metadata=config(exclude=Exclude.ALWAYS))
+        renamed_value: int = field(metadata=config(field_name="anotherName"))
+
+    @dataclass
+    class _SingleField:
+        single_value: int
+
+    @dataclass
+    class _Empty:
+        pass
+
+    def build_configured(self) -> "TestSerializerRegistry._Configured":
+        return TestSerializerRegistry._Configured(
+            some_enum=TestSerializerRegistry._SomeEnum.PROPERTY_A,
+            plain_values={"some_key": TestSerializerRegistry._Plain(first_value=1, second_value=None)},
+            timestamp=datetime(2022, 1, 1),
+            hidden_value="secret",
+            renamed_value=2,
+        )
+
+    def test_class_config_takes_precedence_over_default_config(self) -> None:
+        registry = SerializerRegistry(default_config={})
+
+        assert registry.to_plain(self.build_configured()) == {
+            "someEnum": "A",
+            "plainValues": {"some_key": {"first_value": 1, "second_value": None}},
+            "timestamp": "2022",
+            "anotherName": 2,
+        }
+
+    def test_default_config_is_used_for_classes_without_config(self) -> None:
+        registry = SerializerRegistry(default_config=CDH_DATACLASS_JSON_CONFIG)
+
+        assert registry.to_plain(TestSerializerRegistry._Plain(first_value=1, second_value="x")) == {
+            "firstValue": 1,
+            "secondValue": "x",
+        }
+
+    def test_matches_dataclasses_json(self) -> None:
+        registry = SerializerRegistry(default_config={})
+        data = self.build_configured()
+
+        assert registry.dumps(data) == orjson.dumps(json.loads(data.to_json()))
+
+    @pytest.mark.parametrize("class_type", [_SingleField, _Empty])
+    def test_small_dataclasses(self, class_type: type) -> None:
+        registry = SerializerRegistry(default_config=CDH_DATACLASS_JSON_CONFIG)
+        expected = {"singleValue": 3} if class_type is TestSerializerRegistry._SingleField else {}
+
+        assert registry.to_plain(class_type(*expected.values())) == expected
+
+    def test_sets_and_datetimes(self) -> None:
+        registry = SerializerRegistry(default_config={})
+
+        assert registry.dumps({"values": frozenset({1}), "timestamp": datetime(2022, 1, 1)}) == (
+            b'{"values":[1],"timestamp":"2022-01-01T00:00:00"}'
+        )
+
+    def test_unknown_types_are_rejected(self) -> None:
+        registry = SerializerRegistry(default_config={})
+
+        with pytest.raises(TypeError):
+            registry.dumps({"value": object()})
+
+    def test_every_class_is_compiled_once(self) -> None:
+        registry = SerializerRegistry(default_config={})
+
+        with patch.object(registry, "_compile", wraps=registry._compile) as compile_mock:
+            registry.dumps([self.build_configured(), self.build_configured()])
+            registry.dumps(self.build_configured())
+
+        assert sorted(call.args[0].__name__ for call in compile_mock.call_args_list) == ["_Configured", "_Plain"]
@@ -0,0 +1,78 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from datetime import datetime
+from enum import Enum
+from typing import Callable
+from typing import List
+from typing import Optional
+
+from dataclasses_json import config
+from marshmallow import fields as mm_fields
+
+from cdh_core.dataclasses_json_cdh.dataclasses_json_cdh import DataClassJsonCDHMixin
+from cdh_core.dates import date_input
+from cdh_core.dates import date_output
+from cdh_core.enums.hubs import Hub
+
+
+# pylint: disable=invalid-name
+class CatalogExportEntityType(Enum):
+    """The kinds of entities contained in a catalog export."""
+
+    accounts = "accounts"
+    datasets = "datasets"
+    resources = "resources"
+
+    @property
+    def friendly_name(self) -> str:
+        """Return a human friendly name."""
+        return self.value.capitalize()
+
+
+@dataclass(frozen=True)
+class CatalogExportPart(DataClassJsonCDHMixin):
+    """A gzip compressed NDJSON object in S3 that contains one entity per line."""
+
+    entity_type: CatalogExportEntityType
+    key: str
+    item_count: int
+    url: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class CatalogExport(DataClassJsonCDHMixin):
+    """Describes a snapshot of the datasets, resources and accounts of a hub written to S3.
+
+    The manifest of an export is rewritten after every part, so `complete` is False until all parts are written.
+    The urls of the parts are pre-signed for a limited time and only set in responses, not in the stored manifest.
+    """
+
+    export_id: str
+    hub: Hub
+    started_at: datetime = field(
+        metadata=config(encoder=date_output, decoder=date_input, mm_field=mm_fields.DateTime(format="iso"))
+    )
+    complete: bool
+    parts: List[CatalogExportPart]
+
+    def get_parts(self, entity_type: CatalogExportEntityType) -> List[CatalogExportPart]:
+        """Return the parts that contain the given kind of entities, in the order they were written."""
+        return [part for part in self.parts if part.entity_type is entity_type]
+
+    def with_urls(self, get_url: Callable[[str], str]) -> "CatalogExport":
+        """Return a copy with the urls of all parts set from their keys."""
+        return replace(self, parts=[replace(part, url=get_url(part.key)) for part in self.parts])
@@ -0,0 +1,77 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from datetime import datetime
+from typing import List
+from typing import Optional
+
+from cdh_core.entities.catalog_export import CatalogExport
+from cdh_core.entities.catalog_export import CatalogExportEntityType
+from cdh_core.entities.catalog_export import CatalogExportPart
+from cdh_core.enums.hubs import Hub
+from cdh_core.enums.hubs_test import build_hub
+from cdh_core_dev_tools.testing.builder import Builder
+
+
+def build_catalog_export_part(
+    entity_type: Optional[CatalogExportEntityType] = None, url: Optional[str] = None
+) -> CatalogExportPart:
+    return CatalogExportPart(
+        entity_type=entity_type or Builder.get_random_element(list(CatalogExportEntityType)),
+        key=Builder.build_random_string(),
+        item_count=Builder.get_random_element(range(100)),
+        url=url,
+    )
+
+
+def build_catalog_export(
+    hub: Optional[Hub] = None,
+    complete: bool = True,
+    parts: Optional[List[CatalogExportPart]] = None,
+) -> CatalogExport:
+    return CatalogExport(
+        export_id=Builder.build_random_string(),
+        hub=hub or build_hub(),
+        started_at=datetime.now(),
+        complete=complete,
+        parts=parts
+        if parts is not None
+        else [
+            build_catalog_export_part(entity_type=entity_type, url=f"https://example.com/{entity_type.value}")
+            for entity_type in CatalogExportEntityType
+        ],
+    )
+
+
+class TestCatalogExport:
+    def test_get_parts(self) -> None:
+        dataset_parts = [build_catalog_export_part(CatalogExportEntityType.datasets) for _ in range(3)]
+        account_part = build_catalog_export_part(CatalogExportEntityType.accounts)
+        export = build_catalog_export(parts=[dataset_parts[0], account_part, *dataset_parts[1:]])
+
+        assert export.get_parts(CatalogExportEntityType.datasets) == dataset_parts
+        assert export.get_parts(CatalogExportEntityType.accounts) == [account_part]
+        assert export.get_parts(CatalogExportEntityType.resources) == []
+
+    def test_with_urls(self) -> None:
+        export = build_catalog_export(parts=[build_catalog_export_part() for _ in range(3)])
+
+        with_urls = export.with_urls(lambda key: f"https://example.com/{key}")
+
+        assert [part.url for part in with_urls.parts] == [f"https://example.com/{part.key}" for part in export.parts]
+        assert all(part.url is None for part in export.parts)
+
+    def test_json_roundtrip(self) -> None:
+        export = build_catalog_export()
+
+        assert CatalogExport.from_json(export.to_json()) == export
@@ -13,12 +13,17 @@
 # limitations under the License.
 from __future__ import annotations
 
+import binascii
 import json
+from base64 import b64decode
 from dataclasses import dataclass
 from dataclasses import field
+from dataclasses import replace
+from functools import lru_cache
 from http.cookies import SimpleCookie
 from json import JSONDecodeError
 from typing import Any
+from typing import Collection
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -55,6 +60,7 @@ class Headers:
 
     def __init__(self, headers: Dict[str, str]):
         self._headers = {key.lower(): value for key, value in headers.items()}
+        self._cookies: Optional[Dict[str, str]] = None
 
     @classmethod
     def from_lambda_event(cls, event: Dict[str, Any]) -> Headers:
@@ -91,6 +97,13 @@ class Headers:
         """Return the header as dict."""
         return self._headers.copy()
 
+    def get_cookies(self) -> Dict[str, str]:
+        """Return the values of the cookies in the Cookie header by their names, which are parsed only once."""
+        if self._cookies is None:
+            cookie: SimpleCookie[Any] = SimpleCookie(self.get("Cookie", ""))  # pylint: disable=unsubscriptable-object
+            self._cookies = {name: morsel.value for name, morsel in cookie.items()}
+        return self._cookies
+
 
 @dataclass(frozen=True)
 class Request(DataClassJsonCDHMixin):
@@ -126,7 +139,7 @@ class Request(DataClassJsonCDHMixin):
             query_params_multi_value=event["multiValueQueryStringParameters"] or {},
             path_params=event["pathParameters"] or {},
             body=cls._get_body(event, headers) if not ignore_body else {},
-            _requester_arn=Arn(requester_arn_string) if requester_arn_string else None,
+            _requester_arn=_parse_requester_arn(requester_arn_string) if requester_arn_string else None,
             user=event["requestContext"]["identity"]["user"],
             api_request_id=event["requestContext"]["requestId"],
         )
@@ -138,13 +151,42 @@ class Request(DataClassJsonCDHMixin):
 
         if body := event.get("body"):
             try:
-                if (json_body := json.loads(body)) and isinstance(json_body, dict):
-                    return json_body
-                raise BadRequestError("Invalid JSON body. Body is not a dictionary.")
-            except JSONDecodeError as error:
+                # API Gateway passes the body in base64, if the Content-Type is configured as a binary media type
+                json_body = json.loads(b64decode(body) if event.get("isBase64Encoded") else body)
+            except (JSONDecodeError, binascii.Error, UnicodeDecodeError) as error:
                 raise BadRequestError("Invalid JSON body") from error
+            if json_body and isinstance(json_body, dict):
+                return json_body
+            raise BadRequestError("Invalid JSON body. Body is not a dictionary.")
         return {}
 
+    def with_body(self, event: Dict[str, Any]) -> Request:
+        """Return a copy of a request built with ignore_body, whose body is parsed from the same lambda event."""
+        return replace(self, body=self._get_body(event, self.headers))
+
+    def to_audit_dict(self, excluded_headers: Collection[str] = ()) -> Dict[str, Any]:
+        """Return the same dict as to_plain_dict, but without a JSON round trip and without copying the parameters.
+
+        The result shares the parameters and the body with the request, so it must only be serialized.
+        """
+        headers = self.headers.to_dict()
+        for header in excluded_headers:
+            headers.pop(header.lower(), None)
+        return {
+            "id": self.id,
+            "httpVerb": self.http_verb.value,
+            "route": self.route,
+            "path": self.path,
+            "pathParams": self.path_params,
+            "queryParams": self.query_params,
+            "queryParamsMultiValue": self.query_params_multi_value,
+            "headers": headers,
+            "body": self.body,
+            "requesterArn": str(self._requester_arn),
+            "user": self.user,
+            "apiRequestId": self.api_request_id,
+        }
+
     @property
     def requester_arn(self) -> Arn:
         """Return the requester ARN, if the request contains authentication."""
@@ -164,10 +206,14 @@ class Request(DataClassJsonCDHMixin):
 
     def get_cookie(self, name: str) -> Optional[Cookie]:
         """Return the cookie based on the name."""
-        cookie: SimpleCookie[Any] = SimpleCookie(  # pylint: disable=unsubscriptable-object
-            self.headers.get("Cookie", "")
-        )
-        return Cookie(name, cookie[name].value) if name in cookie else None
+        value = self.headers.get_cookies().get(name)
+        return Cookie(name, value) if value is not None else None
+
+
+@lru_cache(maxsize=128)
+def _parse_requester_arn(arn_string: str) -> Arn:
+    # a warm lambda container mostly serves the same few requesters
+    return Arn(arn_string)
 
 
 @dataclass(frozen=True)
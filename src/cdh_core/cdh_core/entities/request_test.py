@@ -11,12 +11,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import base64
 from dataclasses import replace
+from http.cookies import SimpleCookie
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
 from unittest.mock import Mock
+from unittest.mock import patch
 
 import pytest
 
@@ -111,7 +114,7 @@ class TestRequest:
             "requestId": "746dbb58-9839-49b3-b79d-77caccf2b479",
         },
         "body": '{"key": "value"}',
-        "isBase64Encoded": "A boolean flag to indicate if the applicable request payload is Base64-encode",
+        "isBase64Encoded": False,
     }
     CONTEXT: LambdaContext = Mock(aws_request_id="deef4878-7910-11e6-8f14-25afc3e9ae33")
     EXPECTED_REQUEST = Request(
@@ -164,13 +167,23 @@ class TestRequest:
     def test_from_lambda_event_missing_header(self) -> None:
         """Not every lambda call contains a headers information."""
         event = dict(self.EVENT)
-        event["headers"] = None  # type: ignore
+        event["headers"] = None
         assert Request.from_lambda_event(event, self.CONTEXT) == replace(self.EXPECTED_REQUEST, headers=Headers({}))
 
     def test_invalid_body(self) -> None:
         with pytest.raises(BadRequestError):
             Request.from_lambda_event({**self.EVENT, "body": "this ain't no JSON"}, self.CONTEXT)
 
+    def test_base64_encoded_body(self) -> None:
+        event = {**self.EVENT, "body": base64.b64encode(b'{"key": "value"}').decode("ascii"), "isBase64Encoded": True}
+        assert Request.from_lambda_event(event, self.CONTEXT) == self.EXPECTED_REQUEST
+
+    @pytest.mark.parametrize("body", [b"this ain't no JSON", b"\xff"])
+    def test_invalid_base64_encoded_body(self, body: bytes) -> None:
+        event = {**self.EVENT, "body": base64.b64encode(body).decode("ascii"), "isBase64Encoded": True}
+        with pytest.raises(BadRequestError):
+            Request.from_lambda_event(event, self.CONTEXT)
+
     def test_invalid_body_with_ignored_body(self) -> None:
         request = Request.from_lambda_event(
             {**self.EVENT, "body": "this ain't no JSON"}, self.CONTEXT, ignore_body=True
@@ -184,3 +197,40 @@ class TestRequest:
     def test_get_missing_cookie(self) -> None:
         request = Request.from_lambda_event({**self.EVENT, "headers": {"Cookie": "jwt=123;abc=456"}}, self.CONTEXT)
         assert request.get_cookie("does-not-exist") is None
+
+    def test_cookies_are_parsed_once(self) -> None:
+        request = Request.from_lambda_event({**self.EVENT, "headers": {"Cookie": "jwt=123;abc=456"}}, self.CONTEXT)
+        with patch("cdh_core.entities.request.SimpleCookie", wraps=SimpleCookie) as simple_cookie:
+            assert request.get_cookie("jwt") == Cookie("jwt", "123")
+            assert request.get_cookie("abc") == Cookie("abc", "456")
+
+        simple_cookie.assert_called_once()
+
+    def test_with_body(self) -> None:
+        request = Request.from_lambda_event(self.EVENT, self.CONTEXT, ignore_body=True)
+
+        assert request.with_body(self.EVENT) == self.EXPECTED_REQUEST
+        assert request.with_body(self.EVENT).headers is request.headers
+        with pytest.raises(BadRequestError):
+            request.with_body({**self.EVENT, "body": "this ain't no JSON"})
+
+    @pytest.mark.parametrize("authenticated", [True, False])
+    def test_to_audit_dict(self, authenticated: bool) -> None:
+        user_arn = str(self.arn) if authenticated else None
+        event = {
+            **self.EVENT,
+            "headers": {"Content-Type": "application/json", "Cookie": "jwt=123"},
+            "requestContext": {
+                "identity": {"userArn": user_arn, "user": "Hans"},
+                "requestId": "746dbb58-9839-49b3-b79d-77caccf2b479",
+            },
+        }
+        request = Request.from_lambda_event(event, self.CONTEXT)
+        expected = request.to_plain_dict()
+        expected["headers"].pop("cookie")
+
+        audit_dict = request.to_audit_dict(excluded_headers=["Cookie"])
+
+        assert audit_dict == expected
+        assert audit_dict["body"] is request.body
+        assert "cookie" in request.headers
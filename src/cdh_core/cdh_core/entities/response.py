@@ -11,8 +11,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import base64
+import gzip
+import time
 from abc import ABC
 from abc import abstractmethod
+from dataclasses import dataclass
 from http import HTTPStatus
 from typing import Any
 from typing import Dict
@@ -22,9 +26,18 @@ from typing import Union
 import orjson
 
 from cdh_core.dataclasses_json_cdh.dataclasses_json_cdh import DataClassJsonCDHMixin
-from cdh_core.entities.serializer_factory import Serializer
+from cdh_core.dataclasses_json_cdh.serializer_registry import Serializer
 from cdh_core.entities.serializer_factory import SerializerFactory
 
+GZIP_ENCODING = "gzip"
+# API Gateway decodes base64 encoded response bodies only if the first media type of the Accept header is a binary one
+GZIP_MEDIA_TYPE = "application/gzip"
+# API Gateway compresses the responses itself, but bodies close to the 6 MB payload limit of Lambda have to be
+# compressed before they leave the Lambda
+COMPRESSION_THRESHOLD_BYTES = 5 * 1024 * 1024
+# higher levels shrink the JSON of the list endpoints by a few percent only, but take up to six times as long
+GZIP_COMPRESSION_LEVEL = 5
+
 
 class Response(ABC):
     """Meta class for HTTP responses."""
@@ -38,6 +51,47 @@ class Response(ABC):
         raise NotImplementedError
 
 
+@dataclass(frozen=True)
+class CompressionInfo:
+    """Describes the compression of a response body."""
+
+    encoding: str
+    original_size: int
+    compressed_size: int
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        """Return the size of the original body divided by the size of the compressed body."""
+        return self.original_size / self.compressed_size
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Check if an Accept-Encoding header allows a gzip compressed response."""
+    if not accept_encoding:
+        return False
+    qualities = {}
+    for entry in accept_encoding.split(","):
+        coding, *parameters = [part.strip() for part in entry.split(";")]
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities.get(GZIP_ENCODING, qualities.get("*", 0.0)) > 0
+
+
+def accepts_gzip_media_type(accept: Optional[str]) -> bool:
+    """Check if API Gateway passes a gzip compressed response on to a client sending this Accept header."""
+    if not accept:
+        return False
+    return accept.split(",")[0].split(";")[0].strip().lower() == GZIP_MEDIA_TYPE
+
+
 class JsonResponse(Response):
     """Formats the HTTP body as JSON."""
 
@@ -53,30 +107,60 @@ class JsonResponse(Response):
         self.headers = headers or {}
         if next_page_token:
             self.headers["nextPageToken"] = next_page_token
+        self.compression: Optional[CompressionInfo] = None
 
-    def to_dict(self, serializer: Optional[Serializer] = None) -> Dict[str, Any]:  # pylint: disable=arguments-differ
+    def to_dict(  # pylint: disable=arguments-differ
+        self,
+        serializer: Optional[Serializer] = None,
+        accept_encoding: Optional[str] = None,
+        accept: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Return the content as dict where the body is a json string.
 
         The input body can be a Dict containing only primitive types or a DataClassJsonCDHMixin object which implements
-        the to_json() method.
+        the to_json() method. If the Accept-Encoding and the Accept header allow it, bodies which exceed the Lambda
+        payload limit otherwise are gzip compressed and base64 encoded, which is described by the attribute compression
+        afterwards.
         """
         # The necessary output format for Lambdas invoked by API Gateway is documented here:
         # https://docs.aws.amazon.com/apigateway/latest/developerguide/set-up-lambda-proxy-integrations.html#api-gateway-simple-proxy-for-lambda-output-format
         body = None
+        headers = self.headers
+        self.compression = None
         if self.body is not None:
             serializer = serializer or SerializerFactory.create_serializer()
-            body = orjson.dumps(self.body, default=serializer, option=orjson.OPT_PASSTHROUGH_DATACLASS).decode("utf-8")
+            json_body = orjson.dumps(self.body, default=serializer, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+            if (
+                len(json_body) >= COMPRESSION_THRESHOLD_BYTES
+                and accepts_gzip(accept_encoding)
+                and accepts_gzip_media_type(accept)
+            ):
+                body = self._compress(json_body)
+                headers = {**self.headers, "Content-Encoding": GZIP_ENCODING, "Vary": "Accept-Encoding"}
+            else:
+                body = json_body.decode("utf-8")
 
         result: Dict[str, Any] = {
-            "isBase64Encoded": False,
+            "isBase64Encoded": self.compression is not None,
             "statusCode": self.status_code.value,
             "body": body,
         }
-        if self.headers:
-            result["headers"] = self.headers
+        if headers:
+            result["headers"] = headers
 
         return result
 
+    def _compress(self, json_body: bytes) -> str:
+        start = time.perf_counter()
+        compressed = gzip.compress(json_body, compresslevel=GZIP_COMPRESSION_LEVEL, mtime=0)
+        self.compression = CompressionInfo(
+            encoding=GZIP_ENCODING,
+            original_size=len(json_body),
+            compressed_size=len(compressed),
+            seconds=time.perf_counter() - start,
+        )
+        return base64.b64encode(compressed).decode("ascii")
+
 
 class CsvResponse(Response):
     """Returns the result as CSV."""
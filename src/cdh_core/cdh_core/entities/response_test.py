@@ -11,11 +11,20 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import base64
+import gzip
 import json
 from http import HTTPStatus
+from typing import Optional
 from unittest.mock import Mock
 
+import pytest
+
+from cdh_core.entities.response import accepts_gzip
+from cdh_core.entities.response import accepts_gzip_media_type
+from cdh_core.entities.response import COMPRESSION_THRESHOLD_BYTES
 from cdh_core.entities.response import CsvResponse
+from cdh_core.entities.response import GZIP_MEDIA_TYPE
 from cdh_core.entities.response import JsonResponse
 from cdh_core_dev_tools.testing.builder import Builder
 
@@ -89,6 +98,83 @@ class TestJsonResponse:
             "body": None,
         }
 
+    def test_large_body_is_compressed(self) -> None:
+        body = {"items": ["x" * COMPRESSION_THRESHOLD_BYTES]}
+        response = JsonResponse(body=body, headers={"WWW-Authenticate": "Basic"})
+
+        result = response.to_dict(accept_encoding="gzip", accept=GZIP_MEDIA_TYPE)
+
+        assert result["isBase64Encoded"]
+        assert result["headers"] == {
+            "WWW-Authenticate": "Basic",
+            "Content-Encoding": "gzip",
+            "Vary": "Accept-Encoding",
+        }
+        assert json.loads(gzip.decompress(base64.b64decode(result["body"]))) == body
+        assert response.headers == {"WWW-Authenticate": "Basic"}
+        assert response.compression is not None
+        assert response.compression.encoding == "gzip"
+        assert response.compression.compressed_size == len(base64.b64decode(result["body"]))
+        assert response.compression.ratio > 100
+
+    @pytest.mark.parametrize("accept_encoding", [None, "identity", "gzip;q=0"])
+    def test_large_body_is_not_compressed_without_accepted_encoding(self, accept_encoding: Optional[str]) -> None:
+        response = JsonResponse(body={"items": ["x" * COMPRESSION_THRESHOLD_BYTES]})
+
+        result = response.to_dict(accept_encoding=accept_encoding, accept=GZIP_MEDIA_TYPE)
+
+        assert not result["isBase64Encoded"]
+        assert "headers" not in result
+        assert response.compression is None
+
+    @pytest.mark.parametrize("accept", [None, "*/*", "application/json, application/gzip"])
+    def test_large_body_is_not_compressed_if_api_gateway_would_not_decode_it(self, accept: Optional[str]) -> None:
+        response = JsonResponse(body={"items": ["x" * COMPRESSION_THRESHOLD_BYTES]})
+
+        result = response.to_dict(accept_encoding="gzip", accept=accept)
+
+        assert not result["isBase64Encoded"]
+        assert response.compression is None
+
+    def test_small_body_is_not_compressed(self) -> None:
+        response = JsonResponse(body={"mass": "index"})
+
+        assert response.to_dict(accept_encoding="gzip", accept=GZIP_MEDIA_TYPE)["body"] == '{"mass":"index"}'
+        assert response.compression is None
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        (None, False),
+        ("", False),
+        ("gzip", True),
+        ("deflate, GZIP;q=0.5", True),
+        ("br, deflate", False),
+        ("*", True),
+        ("gzip;q=0, *", False),
+        ("gzip;q=0.0", False),
+        ("gzip;q=invalid", False),
+    ],
+)
+def test_accepts_gzip(accept_encoding: Optional[str], expected: bool) -> None:
+    assert accepts_gzip(accept_encoding) is expected
+
+
+@pytest.mark.parametrize(
+    "accept,expected",
+    [
+        (None, False),
+        ("", False),
+        ("application/gzip", True),
+        ("Application/GZIP;q=0.9, application/json", True),
+        ("application/json, application/gzip", False),
+        ("*/*", False),
+    ],
+)
+def test_accepts_gzip_media_type(accept: Optional[str], expected: bool) -> None:
+    assert accepts_gzip_media_type(accept) is expected
+
 
 class TestCsvResponse:
     def test_to_dict(self) -> None:
@@ -11,80 +11,26 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from dataclasses import Field
-from dataclasses import fields
-from dataclasses import is_dataclass
-from operator import attrgetter
-from typing import Any
-from typing import Callable
-from typing import Dict
-from typing import Tuple
-
-from dataclasses_json.core import confs
-from dataclasses_json.core import FieldOverride
-
 from cdh_core.dataclasses_json_cdh.dataclasses_json_cdh import CDH_DATACLASS_JSON_CONFIG
-
-Serializer = Callable[[object], Any]
+from cdh_core.dataclasses_json_cdh.serializer_registry import Serializer
+from cdh_core.dataclasses_json_cdh.serializer_registry import SerializerRegistry
 
 
 class SerializerFactory:
-    """Create serializers for dataclasses, other custom types and enums."""
-
-    @classmethod
-    def create_serializer(cls) -> Serializer:
-        """Create serializers for dataclasses, other custom types and enums."""
-        dataclass_serializers: Dict[type, Serializer] = {}
+    """Create serializers for dataclasses, other custom types and enums.
 
-        def serialize(obj: object) -> Any:
-            if is_dataclass(obj):
-                class_type = type(obj)
-                # Mypy does not understand that types are hashable
-                if class_type not in dataclass_serializers:
-                    dataclass_serializers[class_type] = SerializerFactory._create_dataclass_serializer(class_type)
-                return dataclass_serializers[class_type](obj)
-            if isinstance(obj, (set, frozenset)):
-                return list(obj)
-            raise TypeError(f"Cannot serialize {obj}")
+    All dataclasses are serialized with camelCase keys, also those which are not DataClassJsonCDHMixins. The
+    serializers are shared by the whole process, so every dataclass is only compiled once.
+    """
 
-        return serialize
+    _REGISTRY = SerializerRegistry(CDH_DATACLASS_JSON_CONFIG)
 
     @classmethod
-    def _get_serialization_config(
-        cls, class_fields: Tuple[Field, ...]  # type: ignore # Field does not have type hints
-    ) -> Dict[str, FieldOverride]:
-        serialization_configs = {}
-        for field in class_fields:
-            field_config = {}
-            field_config.update(CDH_DATACLASS_JSON_CONFIG)
-            field_config.update(field.metadata.get("dataclasses_json", {}))
-            serialization_configs[field.name] = FieldOverride(
-                *map(field_config.get, confs)  # type: ignore # we are sure the config matches the overrides
-            )
-        return serialization_configs
+    def create_serializer(cls) -> Serializer:
+        """Return the serializer for dataclasses, other custom types and enums."""
+        return cls._REGISTRY.serialize
 
     @classmethod
-    def _create_dataclass_serializer(cls, class_type: type) -> Callable[[object], Any]:
-        class_fields = fields(class_type)
-        field_configs = SerializerFactory._get_serialization_config(class_fields)
-        getters = {field.name: attrgetter(field.name) for field in class_fields}
-
-        def serializer(obj: object) -> Any:
-            result = {}
-            for original_key, field_config in field_configs.items():
-                original_value = getters[original_key](obj)
-                exclude = field_config.exclude
-                if exclude and exclude(original_value):  # type: ignore[truthy-function]
-                    continue
-
-                serialized = (
-                    field_config.encoder(original_value)
-                    if field_config.encoder  # type: ignore[truthy-function]
-                    else original_value
-                )
-
-                converted_key = field_config.letter_case(original_key)
-                result[converted_key] = serialized
-            return result
-
-        return serializer
+    def dumps(cls, obj: object) -> bytes:
+        """Serialize the object as JSON."""
+        return cls._REGISTRY.dumps(obj)
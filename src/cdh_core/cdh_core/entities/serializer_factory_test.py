@@ -105,3 +105,11 @@ class TestSerializerFactory:
         assert len(recovered["items"]) == 2
         assert recovered["items"][0] == {"name": "foo"}
         assert recovered["items"][1] == {"name": "barbar"}
+
+    def test_serializer_is_shared(self) -> None:
+        data = TestSerializerFactory._Base("foo")
+
+        assert SerializerFactory.create_serializer() == SerializerFactory.create_serializer()
+        assert SerializerFactory.dumps(data) == orjson.dumps(
+            data, default=SerializerFactory.create_serializer(), option=orjson.OPT_PASSTHROUGH_DATACLASS
+        )
@@ -11,19 +11,28 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import logging
 import time
 from logging import getLogger
 from typing import Any
+from typing import Callable
+from typing import Optional
 
 LOG = getLogger(__name__)
 
 
 class MeasureTimeContextManager:
-    """Can be used to measure the time a context takes to finish and logs afterwards to INFO."""
+    """Can be used to measure the time a context takes to finish and logs afterwards to INFO.
 
-    def __init__(self, message: str):
+    The measured time is also passed in seconds to `on_exit`, which allows to collect it as a metric.
+    """
+
+    def __init__(self, message: str, on_exit: Optional[Callable[[float], None]] = None, log_level: int = logging.INFO):
         self.message = message
+        self.on_exit = on_exit
+        self.log_level = log_level
         self.start_time = 0.0
+        self.duration = 0.0
 
     def __enter__(self) -> None:
         """Store the current time when entering the context."""
@@ -31,4 +40,7 @@ class MeasureTimeContextManager:
 
     def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
         """Print the time on log level info it took for completing the context."""
-        LOG.info(f"{self.message} took {int(time.perf_counter() - self.start_time)}s")
+        self.duration = time.perf_counter() - self.start_time
+        LOG.log(self.log_level, f"{self.message} took {int(self.duration)}s")
+        if self.on_exit:
+            self.on_exit(self.duration)
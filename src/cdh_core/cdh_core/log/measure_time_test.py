@@ -11,6 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from unittest.mock import Mock
+
 import pytest
 
 from cdh_core.log.measure_time import MeasureTimeContextManager
@@ -23,3 +25,13 @@ class TestMeasureTimeContextManager:
             with MeasureTimeContextManager("foo"):
                 raise error
         assert exc_info.value == error
+
+    def test_on_exit(self) -> None:
+        on_exit = Mock()
+        measure_time = MeasureTimeContextManager("foo", on_exit=on_exit)
+
+        with measure_time:
+            pass
+
+        on_exit.assert_called_once_with(measure_time.duration)
+        assert measure_time.duration >= 0
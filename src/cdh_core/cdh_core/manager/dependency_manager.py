@@ -18,11 +18,16 @@ from dataclasses import dataclass
 from enum import Enum
 from graphlib import CycleError
 from graphlib import TopologicalSorter
+from threading import RLock
 from typing import Any
 from typing import Callable
+from typing import Collection
 from typing import Dict
+from typing import FrozenSet
 from typing import List
+from typing import Optional
 from typing import Set
+from typing import Tuple
 from typing import TypeVar
 
 AnyCallable = Callable[..., Any]
@@ -34,6 +39,71 @@ def get_parameter_names(any_callable: AnyCallable) -> Set[str]:
     return set(inspect.signature(any_callable).parameters)
 
 
+_NOT_BUILT = object()
+
+
+def _realize(alias: str, factory: AnyCallable, kwargs: Dict[str, Any], realized: Optional[List[str]]) -> Any:
+    value = factory(**kwargs)
+    if realized is not None:
+        realized.append(alias)
+    return value
+
+
+class LazyDependency:
+    """
+    A thin proxy for a dependency which is built on the first access to one of its attributes.
+
+    The dependencies of the factory are passed as they are, lazy ones are not realized by building this one.
+    The proxy reports the class of the dependency, so that isinstance checks work (and realize the dependency).
+    """
+
+    __slots__ = ("_alias", "_factory", "_kwargs", "_realized", "_lock", "_building", "_value")
+
+    def __init__(self, alias: str, factory: AnyCallable, kwargs: Dict[str, Any], realized: Optional[List[str]]):
+        object.__setattr__(self, "_alias", alias)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_kwargs", kwargs)
+        object.__setattr__(self, "_realized", realized)
+        object.__setattr__(self, "_lock", RLock())
+        object.__setattr__(self, "_building", False)
+        object.__setattr__(self, "_value", _NOT_BUILT)
+
+    def get_lazy_dependency_value(self) -> Any:
+        """Return the dependency, which is built if necessary."""
+        if self._value is not _NOT_BUILT:
+            return self._value
+        with self._lock:
+            if self._value is not _NOT_BUILT:
+                return self._value
+            if self._building:
+                raise CycleFoundError(f"{self._alias!r} is required while it is built.")
+            object.__setattr__(self, "_building", True)
+            try:
+                value = _realize(self._alias, self._factory, self._kwargs, self._realized)
+            finally:
+                object.__setattr__(self, "_building", False)
+            object.__setattr__(self, "_value", value)
+            return value
+
+    @property  # type: ignore
+    def __class__(self) -> type:
+        """Return the class of the dependency."""
+        return type(self.get_lazy_dependency_value())
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward the attribute access to the dependency."""
+        return getattr(self.get_lazy_dependency_value(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Forward setting the attribute to the dependency."""
+        setattr(self.get_lazy_dependency_value(), name, value)
+
+    def __repr__(self) -> str:
+        """Return a representation which does not realize the dependency."""
+        state = "not realized" if self._value is _NOT_BUILT else "realized"
+        return f"<LazyDependency {self._alias!r} ({state})>"
+
+
 class DependencyManager:
     """Tracks dependencies for functions based on the argument names."""
 
@@ -52,12 +122,19 @@ class DependencyManager:
 
             time_to_live: DependencyManager.TimeToLive
             factory: AnyCallable
+            parameter_names: Tuple[str, ...]
+            lazy: bool = False
 
         def __init__(self) -> None:
             self._factory_register: Dict[str, DependencyManager.Register.Entry] = {}
 
         def add_new_factory(
-            self, factory: AnyCallable, alias: str, time_to_live: DependencyManager.TimeToLive, force: bool
+            self,
+            factory: AnyCallable,
+            alias: str,
+            time_to_live: DependencyManager.TimeToLive,
+            force: bool,
+            lazy: bool = False,
         ) -> None:
             """
             Add a new factory to the register.
@@ -68,7 +145,10 @@ class DependencyManager:
             """
             if force or alias not in self._factory_register:
                 self._factory_register[alias] = DependencyManager.Register.Entry(
-                    time_to_live=time_to_live, factory=factory
+                    time_to_live=time_to_live,
+                    factory=factory,
+                    parameter_names=tuple(get_parameter_names(factory)),
+                    lazy=lazy,
                 )
             else:
                 raise DependencyAlreadyRegisteredError()
@@ -80,7 +160,7 @@ class DependencyManager:
             Can be filtered by the time to live flag to only include the matching factories.
             """
             return {
-                alias: get_parameter_names(entry.factory)
+                alias: set(entry.parameter_names)
                 for alias, entry in self._factory_register.items()
                 if entry.time_to_live in time_to_live
             }
@@ -92,18 +172,60 @@ class DependencyManager:
             except KeyError as error:
                 raise FactoryNotFoundError() from error
 
+        def get_optional_entry(self, key: str) -> Optional[Entry]:
+            """Return the registered entry or None, if there is none."""
+            return self._factory_register.get(key)
+
+    @dataclass(frozen=True)
+    class ResolutionPlan:
+        """
+        The precompiled resolution of the dependencies of a single callable.
+
+        The plan binds the forever dependencies and lists the per-request factories the callable requires,
+        directly or transitively, in the order in which they have to be called, and whether they are lazy.
+        """
+
+        parameter_names: Tuple[str, ...]
+        forever_builds: Dict[str, Any]
+        steps: Tuple[Tuple[str, AnyCallable, Tuple[str, ...], bool], ...]
+
+        def evaluate(self, arguments: Dict[str, Any], realized: Optional[List[str]] = None) -> Dict[str, Any]:
+            """
+            Call the per-request factories and return the arguments of the callable.
+
+            Lazy dependencies are replaced by a LazyDependency proxy. The aliases of the per-request dependencies are
+            appended to realized, once they have been built.
+            """
+            builds = {**self.forever_builds, **arguments}
+            for alias, factory, parameter_names, lazy in self.steps:
+                kwargs = {name: builds[name] for name in parameter_names}
+                builds[alias] = (
+                    LazyDependency(alias, factory, kwargs, realized)
+                    if lazy
+                    else _realize(alias, factory, kwargs, realized)
+                )
+            return {name: builds[name] for name in self.parameter_names}
+
     def __init__(self) -> None:
         self._register = DependencyManager.Register()
         self._forever_builds: Dict[str, Any] = {}
         self._locked = False
+        self._plans: Dict[Tuple[AnyCallable, FrozenSet[str]], DependencyManager.ResolutionPlan] = {}
+        self._realized: List[str] = []
 
-    def register(self, alias: str, time_to_live: TimeToLive, force: bool = False) -> Callable[[Factory], Factory]:
+    def register(
+        self, alias: str, time_to_live: TimeToLive, force: bool = False, lazy: bool = False
+    ) -> Callable[[Factory], Factory]:
         """
         Register the given function at the dependency manager.
 
         The last one which gets registered overrides formerly registered entries with the same alias, if force is True.
         If force is false a second register will raise an exception.
+        A lazy per-request dependency is injected as a LazyDependency proxy by build_dependencies_for_callable and is
+        only built on the first access to one of its attributes. Forever dependencies cannot be lazy.
         """
+        if lazy and time_to_live is DependencyManager.TimeToLive.FOREVER:
+            raise ValueError(f"A {DependencyManager.TimeToLive.FOREVER} dependency cannot be lazy.")
         if self._locked:
             if time_to_live is DependencyManager.TimeToLive.FOREVER:
                 raise LockedDependencyError(
@@ -120,7 +242,8 @@ class DependencyManager:
                     pass
 
         def decorator(factory: Factory) -> Factory:
-            self._register.add_new_factory(factory, alias, time_to_live, force)
+            self._register.add_new_factory(factory, alias, time_to_live, force, lazy)
+            self._plans.clear()
             return factory
 
         return decorator
@@ -158,8 +281,9 @@ class DependencyManager:
 
     def _get_dependency_resolution_order(self, time_to_live_filter: Set[DependencyManager.TimeToLive]) -> List[str]:
         dependency_graph = self._register.build_dependency_graph(time_to_live_filter)
-        order = list(TopologicalSorter(dependency_graph).static_order())  # includes unregistered dependencies
-        return sorted(dependency_graph.keys(), key=order.index)
+        # includes unregistered dependencies
+        position = {vertex: index for index, vertex in enumerate(TopologicalSorter(dependency_graph).static_order())}
+        return sorted(dependency_graph.keys(), key=position.__getitem__)
 
     def build_dependencies(self, include_per_request_dependencies: bool = True) -> Dict[str, Any]:
         """
@@ -183,7 +307,7 @@ class DependencyManager:
                 continue
             entry = self._register.get_entry(vertex)
             try:
-                kwargs = {argument: all_builds[argument] for argument in get_parameter_names(entry.factory)}
+                kwargs = {argument: all_builds[argument] for argument in entry.parameter_names}
             except KeyError as error:
                 if entry.time_to_live == DependencyManager.TimeToLive.PER_REQUEST:
                     continue  # cannot provide this per-request dependency at this point
@@ -202,24 +326,79 @@ class DependencyManager:
         self._locked = True
 
     def build_forever_dependencies(self) -> Dict[str, Any]:
-        """Return all dependencies which have the time to live FOREVER."""
+        """
+        Return all dependencies which have the time to live FOREVER.
+
+        Once they have been built, forever dependencies cannot change anymore and are returned without any checks.
+        """
+        if self._locked:
+            return {**self._forever_builds}
         return self.build_dependencies(include_per_request_dependencies=False)
 
+    def compile_plan(
+        self, any_callable: AnyCallable, argument_names: Collection[str] = ()
+    ) -> DependencyManager.ResolutionPlan:
+        """
+        Return the resolution plan for the dependencies the any_callable requires.
+
+        The argument names are provided on every evaluation of the plan and take precedence over registered factories.
+        Only the per-request dependencies the callable needs, directly or transitively, are part of the plan.
+        Plans are cached until the next registration; compiling the first plan builds the forever dependencies.
+        This fails if the callable requires a dependency which has not been registered yet.
+        """
+        key = (any_callable, frozenset(argument_names))
+        if plan := self._plans.get(key):
+            return plan
+        forever_builds = self.build_forever_dependencies()
+        steps: List[Tuple[str, AnyCallable, Tuple[str, ...], bool]] = []
+        resolved: Set[str] = set(key[1]) | set(forever_builds)
+        resolving: List[str] = []
+
+        def resolve(alias: str) -> None:
+            if alias in resolved:
+                return
+            if alias in resolving:
+                raise CycleFoundError(f"There is a cycle in the dependencies: {' -> '.join([*resolving, alias])}.")
+            if (entry := self._register.get_optional_entry(alias)) is None:
+                raise MissingDeclaredFunctionError(f"{alias!r} is required but not defined.")
+            resolving.append(alias)
+            for name in entry.parameter_names:
+                resolve(name)
+            resolving.pop()
+            steps.append((alias, entry.factory, entry.parameter_names, entry.lazy))
+            resolved.add(alias)
+
+        parameter_names = tuple(get_parameter_names(any_callable))
+        for name in parameter_names:
+            resolve(name)
+        used = {*parameter_names, *(name for _, _, names, _ in steps for name in names)}
+        plan = DependencyManager.ResolutionPlan(
+            parameter_names=parameter_names,
+            forever_builds={name: value for name, value in forever_builds.items() if name in used},
+            steps=tuple(steps),
+        )
+        self._plans[key] = plan
+        return plan
+
     def build_dependencies_for_callable(
-        self,
-        any_callable: AnyCallable,
+        self, any_callable: AnyCallable, arguments: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Return only the dependencies the any_callable requires.
 
+        The arguments are used as they are instead of building a dependency with the same name.
+        Lazy dependencies are injected as proxies. The built per-request dependencies are recorded until
+        pop_realized_dependencies is called.
         This fails if the handler requires a dependency which has not been registered yet.
         """
-        deps = self.build_dependencies()
-        required_by_handler = get_parameter_names(any_callable)
-        try:
-            return {keyword: deps[keyword] for keyword in required_by_handler}
-        except KeyError as error:
-            raise MissingDeclaredFunctionError() from error
+        arguments = arguments or {}
+        return self.compile_plan(any_callable, arguments.keys()).evaluate(arguments, self._realized)
+
+    def pop_realized_dependencies(self) -> List[str]:
+        """Return the aliases of the per-request dependencies built since the last call, in the order of building."""
+        realized = self._realized[:]
+        del self._realized[: len(realized)]
+        return realized
 
 
 class DependencyManagerError(Exception):
@@ -12,11 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # pylint: disable=invalid-name,unused-argument
+from typing import List
+from unittest.mock import Mock
+
 import pytest
 
 from cdh_core.manager.dependency_manager import CycleFoundError
 from cdh_core.manager.dependency_manager import DependencyAlreadyRegisteredError
 from cdh_core.manager.dependency_manager import DependencyManager
+from cdh_core.manager.dependency_manager import LazyDependency
 from cdh_core.manager.dependency_manager import LifecycleInconsistencyError
 from cdh_core.manager.dependency_manager import LockedDependencyError
 from cdh_core.manager.dependency_manager import MissingDeclaredFunctionError
@@ -409,3 +413,139 @@ class TestDependencyManager:
         dependencies = self.dependency_manager.build_dependencies()
         assert dependencies["a"] == 2
         assert dependencies["b"] == 2
+
+    def test_build_dependencies_for_handler_builds_required_per_request_dependencies_only(self) -> None:
+        unused = Mock()
+        self.dependency_manager.register("a", DependencyManager.TimeToLive.PER_REQUEST)(lambda b, c: b + c)
+        self.dependency_manager.register("b", DependencyManager.TimeToLive.PER_REQUEST)(lambda c: c + 1)
+        self.dependency_manager.register("c", DependencyManager.TimeToLive.FOREVER)(lambda: 1)
+        self.dependency_manager.register("unused", DependencyManager.TimeToLive.PER_REQUEST)(lambda: unused())
+
+        def handler(a: int) -> None:
+            raise AssertionError()
+
+        assert self.dependency_manager.build_dependencies_for_callable(handler) == {"a": 3}
+        unused.assert_not_called()
+
+    def test_build_dependencies_for_handler_with_arguments(self) -> None:
+        self.dependency_manager.register("a", DependencyManager.TimeToLive.PER_REQUEST)(lambda request: request + 1)
+        self.dependency_manager.register("b", DependencyManager.TimeToLive.PER_REQUEST)(lambda: 0)
+
+        def handler(a: int, b: int) -> None:
+            raise AssertionError()
+
+        for request in range(3):
+            assert self.dependency_manager.build_dependencies_for_callable(
+                handler, arguments={"request": request, "b": -request}
+            ) == {"a": request + 1, "b": -request}
+
+    def test_compile_plan_is_cached_until_next_registration(self) -> None:
+        self.dependency_manager.register("a", DependencyManager.TimeToLive.PER_REQUEST)(lambda: 1)
+
+        def handler(a: int) -> None:
+            raise AssertionError()
+
+        plan = self.dependency_manager.compile_plan(handler)
+        assert self.dependency_manager.compile_plan(handler) is plan
+
+        self.dependency_manager.register("a", DependencyManager.TimeToLive.PER_REQUEST, force=True)(lambda: 2)
+        assert self.dependency_manager.compile_plan(handler) is not plan
+        assert self.dependency_manager.build_dependencies_for_callable(handler) == {"a": 2}
+
+    def test_compile_plan_binds_forever_dependencies(self) -> None:
+        forever = Mock(return_value=1)
+        self.dependency_manager.register("a", DependencyManager.TimeToLive.FOREVER)(lambda: forever())
+        self.dependency_manager.register("b", DependencyManager.TimeToLive.FOREVER)(lambda: 2)
+
+        def handler(a: int) -> None:
+            raise AssertionError()
+
+        plan = self.dependency_manager.compile_plan(handler)
+        for _ in range(3):
+            assert self.dependency_manager.build_dependencies_for_callable(handler) == {"a": 1}
+        assert plan.forever_builds == {"a": 1}
+        assert plan.steps == ()
+        forever.assert_called_once()
+
+    def test_compile_plan_cycle(self) -> None:
+        self.dependency_manager.register("a", DependencyManager.TimeToLive.PER_REQUEST)(lambda b: b)
+        self.dependency_manager.register("b", DependencyManager.TimeToLive.PER_REQUEST)(lambda a: a)
+
+        def handler(a: int) -> None:
+            raise AssertionError()
+
+        with pytest.raises(CycleFoundError):
+            self.dependency_manager.compile_plan(handler)
+
+    def test_compile_plan_missing_transitive_dependency(self) -> None:
+        self.dependency_manager.register("a", DependencyManager.TimeToLive.PER_REQUEST)(lambda b: b)
+
+        def handler(a: int) -> None:
+            raise AssertionError()
+
+        with pytest.raises(MissingDeclaredFunctionError):
+            self.dependency_manager.compile_plan(handler)
+        assert self.dependency_manager.compile_plan(handler, argument_names=["b"]).steps[0][0] == "a"
+
+    def test_build_forever_dependencies_once_locked(self) -> None:
+        forever = Mock(return_value=1)
+        self.dependency_manager.register("a", DependencyManager.TimeToLive.FOREVER)(lambda: forever())
+
+        assert self.dependency_manager.build_forever_dependencies() == {"a": 1}
+        assert self.dependency_manager.build_forever_dependencies() == {"a": 1}
+        forever.assert_called_once()
+
+    def test_lazy_dependency_is_built_on_first_attribute_access(self) -> None:
+        class Service:
+            def __init__(self, b: int) -> None:
+                self.b = b
+
+        factory = Mock(side_effect=Service)
+        self.dependency_manager.register("a", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)(lambda b: factory(b))
+        self.dependency_manager.register("b", DependencyManager.TimeToLive.PER_REQUEST)(lambda: 1)
+
+        def handler(a: Service) -> None:
+            raise AssertionError()
+
+        a = self.dependency_manager.build_dependencies_for_callable(handler)["a"]
+        assert isinstance(a, LazyDependency)
+        assert repr(a) == "<LazyDependency 'a' (not realized)>"
+        assert self.dependency_manager.pop_realized_dependencies() == ["b"]
+        factory.assert_not_called()
+
+        assert a.b == 1
+        a.b = 2
+        assert a.b == 2
+        assert isinstance(a, Service)
+        assert repr(a) == "<LazyDependency 'a' (realized)>"
+        factory.assert_called_once_with(1)
+        assert self.dependency_manager.pop_realized_dependencies() == ["a"]
+        assert self.dependency_manager.pop_realized_dependencies() == []
+
+    def test_lazy_dependency_does_not_realize_its_lazy_dependencies(self) -> None:
+        factory = Mock()
+        self.dependency_manager.register("a", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)(lambda b: b)
+        self.dependency_manager.register("b", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)(lambda: factory())
+
+        def handler(a: Mock) -> None:
+            raise AssertionError()
+
+        a = self.dependency_manager.build_dependencies_for_callable(handler)["a"]
+        assert type(a.get_lazy_dependency_value()) is LazyDependency  # pylint: disable=unidiomatic-typecheck
+        assert self.dependency_manager.pop_realized_dependencies() == ["a"]
+        factory.assert_not_called()
+
+        assert a.value is factory.return_value.value
+        assert self.dependency_manager.pop_realized_dependencies() == ["b"]
+
+    def test_lazy_dependency_required_while_it_is_built(self) -> None:
+        proxies: List[LazyDependency] = []
+        lazy_dependency = LazyDependency("a", lambda: proxies[0].value, {}, None)
+        proxies.append(lazy_dependency)
+
+        with pytest.raises(CycleFoundError):
+            lazy_dependency.get_lazy_dependency_value()
+
+    def test_forever_cannot_be_lazy(self) -> None:
+        with pytest.raises(ValueError):
+            self.dependency_manager.register("a", DependencyManager.TimeToLive.FOREVER, lazy=True)
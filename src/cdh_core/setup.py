@@ -18,6 +18,9 @@ from setuptools import setup
 
 with open(Path(__file__).with_name("requirements.txt"), "r", encoding="utf-8") as file:
     install_requires = file.read().splitlines()
+# the AsyncCoreApiClient is not used by the lambdas, so its dependencies are kept out of their layer
+with open(Path(__file__).with_name("requirements-async.txt"), "r", encoding="utf-8") as file:
+    async_requires = file.read().splitlines()
 
 setup(
     name="cdh-core",
@@ -34,6 +37,7 @@ setup(
     ],
     license="Apache License 2.0",
     install_requires=install_requires,
+    extras_require={"async": async_requires},
     author="Cloud Data Hub Team",
     author_email="clouddatahub@bmwgroup.com",
 )
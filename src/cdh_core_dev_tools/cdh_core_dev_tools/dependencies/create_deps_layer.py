@@ -41,6 +41,8 @@ LOG = logging.getLogger("create_deps_layer")
 NOTSET = "notset"
 FORMAT = ".zip"
 MAX_RUN_TIME = 600
+CDH_CORE_SOURCE_PATH = Path(__file__).parents[3] / "cdh_core"
+CONFIG_SNAPSHOT_FILE_NAME = "cdh_core_config_snapshot.pickle"
 
 
 def get_new_aws_credentials(script: Path, region_name: str) -> Dict[str, Any]:
@@ -70,6 +72,35 @@ def file_exists_on_aws_s3_client(s3_resource: Any, bucket_name: str, key: str) -
     return False
 
 
+def create_config_snapshot(config_file_path: str, snapshot_path: Path) -> str:
+    """Validate the config file, write the snapshot read by the ConfigFileLoader and return the digest guarding it.
+
+    The snapshot is created by the cdh_core sources of this repository, which are shipped in the cdh_core layer.
+    """
+    python_path = [str(CDH_CORE_SOURCE_PATH)] + ([os.environ["PYTHONPATH"]] if os.environ.get("PYTHONPATH") else [])
+    command = [
+        sys.executable,
+        "-m",
+        "cdh_core.config.create_config_snapshot",
+        "--config-file-path",
+        config_file_path,
+        "--snapshot-path",
+        str(snapshot_path),
+    ]
+    try:
+        output = subprocess.check_output(
+            command,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(python_path)},
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=MAX_RUN_TIME,
+        )
+    except subprocess.CalledProcessError as error:
+        LOG.exception(error.stderr)
+        raise
+    return str(json.loads(output)["digest"])
+
+
 class FileMaker:
     """Builds the dependencies file."""
 
@@ -87,11 +118,17 @@ class FileMaker:
             )
 
     def get_dependencies_file_name(
-        self, requirements_file_path_name: str, docker_build: bool, zip_file: Optional[str]
+        self,
+        requirements_file_path_name: str,
+        docker_build: bool,
+        zip_file: Optional[str],
+        config_digest: Optional[str] = None,
     ) -> Path:
         """Construct the name of the dependencies file to be created."""
         requirements = gather_requirements(requirements_file_path_name)
-        requirements_bytes = ("\n".join(sorted(requirements)) + str(zip_file)).encode("utf-8")
+        requirements_bytes = (
+            "\n".join(sorted(requirements)) + str(zip_file) + (f"config-{config_digest}" if config_digest else "")
+        ).encode("utf-8")
         requirements_hash_sum = hashlib.sha256(requirements_bytes).hexdigest()
         is_dockerized = "docker-" if docker_build else ""
         return Path(f"{self._context}-deps-layer-{is_dockerized}{requirements_hash_sum}").with_suffix(FORMAT)
@@ -104,6 +141,12 @@ class FileMaker:
                     with add.open(item) as item_object:
                         base.writestr(item, item_object.read())
 
+    @classmethod
+    def _add_config_snapshot(cls, zip_file_base: str, config_snapshot: Path) -> None:
+        # Lambda unzips layers to /opt, the snapshot is read from /opt/python
+        with zipfile.ZipFile(zip_file_base, "a") as base:
+            base.write(config_snapshot, arcname=f"python/{CONFIG_SNAPSHOT_FILE_NAME}")
+
     @classmethod
     def _fetch_requirements_docker(cls, tmp_dir: str, file_name: Path, requirements_file_path_name: str) -> str:
         lib_path = str(pathlib.Path(__file__).parent.resolve())
@@ -162,6 +205,7 @@ class FileMaker:
         zip_file: Optional[str],
         file_name: Path,
         docker_build: bool,
+        config_snapshot: Optional[Path] = None,
     ) -> Path:
         """Create a zip package with the specified name with all required dependencies."""
         if docker_build:
@@ -170,6 +214,8 @@ class FileMaker:
             output_file = self._fetch_requirements_locally(tmp_dir, file_name, requirements_file_path_name)
         if zip_file:
             self._merge_zip_files(output_file, zip_file)
+        if config_snapshot:
+            self._add_config_snapshot(output_file, config_snapshot)
         return Path(output_file)
 
 
@@ -188,23 +234,34 @@ def generate_and_upload_new_zip_file(  # pylint: disable=too-many-arguments
     zip_file: Optional[str],
     file_maker: FileMaker,
     docker_build: bool,
+    config_file_path: Optional[str] = None,
 ) -> str:
     """Check if zip has to be built and if required trigger build process and upload it to a S3 bucket."""
-    file_name = file_maker.get_dependencies_file_name(
-        requirements_file_path_name=requirements_file_path_name, docker_build=docker_build, zip_file=zip_file
-    )
-    if file_exists_on_aws_s3_client(s3_resource=s3_resource, bucket_name=bucket_name, key=file_name.name):
-        LOG.info("File already exists on s3_client")
-    else:
-        with TemporaryDirectory() as tmp_dir:
-            file_path = file_maker.make_file(
-                tmp_dir=tmp_dir,
-                requirements_file_path_name=requirements_file_path_name,
-                file_name=file_name,
-                zip_file=zip_file,
-                docker_build=docker_build,
-            )
-            s3_resource.Bucket(bucket_name).upload_file(Filename=str(file_path), Key=file_name.name)
+    with TemporaryDirectory() as snapshot_dir:
+        config_snapshot: Optional[Path] = None
+        config_digest: Optional[str] = None
+        if config_file_path:
+            config_snapshot = Path(snapshot_dir) / CONFIG_SNAPSHOT_FILE_NAME
+            config_digest = create_config_snapshot(config_file_path, config_snapshot)
+        file_name = file_maker.get_dependencies_file_name(
+            requirements_file_path_name=requirements_file_path_name,
+            docker_build=docker_build,
+            zip_file=zip_file,
+            config_digest=config_digest,
+        )
+        if file_exists_on_aws_s3_client(s3_resource=s3_resource, bucket_name=bucket_name, key=file_name.name):
+            LOG.info("File already exists on s3_client")
+        else:
+            with TemporaryDirectory() as tmp_dir:
+                file_path = file_maker.make_file(
+                    tmp_dir=tmp_dir,
+                    requirements_file_path_name=requirements_file_path_name,
+                    file_name=file_name,
+                    zip_file=zip_file,
+                    docker_build=docker_build,
+                    config_snapshot=config_snapshot,
+                )
+                s3_resource.Bucket(bucket_name).upload_file(Filename=str(file_path), Key=file_name.name)
     return json.dumps({"bucket": bucket_name, "key": file_name.name})
 
 
@@ -242,6 +299,13 @@ def main() -> None:
         help="If true, this will use Docker to build the dependencies layer. Set to true when having binary "
         "dependencies.",
     )
+    parser.add_argument(
+        "--config-file-path",
+        type=str,
+        required=False,
+        help="Path to the cdh-core config file. If set, the config is validated and a snapshot of it is included in "
+        f"the layer as python/{CONFIG_SNAPSHOT_FILE_NAME}, which spares the lambdas to parse the config file.",
+    )
 
     args = parser.parse_args()
     region = args.region
@@ -253,6 +317,7 @@ def main() -> None:
         credentials = get_new_aws_credentials(script=fetch_custom_credentials, region_name=region)
 
     include_zip = args.include_zip if args.include_zip not in {None, "", NOTSET} else None
+    config_file_path = args.config_file_path if args.config_file_path not in {None, "", NOTSET} else None
 
     print(  # noqa: T201
         generate_and_upload_new_zip_file(
@@ -262,6 +327,7 @@ def main() -> None:
             zip_file=include_zip,
             file_maker=FileMaker(args.context),
             docker_build=args.docker_build,
+            config_file_path=config_file_path,
         )
     )
 
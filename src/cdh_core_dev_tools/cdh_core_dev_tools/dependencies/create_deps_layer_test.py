@@ -13,6 +13,7 @@
 # limitations under the License.
 import os
 import shutil
+import subprocess
 from contextlib import contextmanager
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -26,6 +27,8 @@ from unittest.mock import patch
 import pytest
 from botocore.exceptions import ClientError
 
+from cdh_core_dev_tools.dependencies.create_deps_layer import CONFIG_SNAPSHOT_FILE_NAME
+from cdh_core_dev_tools.dependencies.create_deps_layer import create_config_snapshot
 from cdh_core_dev_tools.dependencies.create_deps_layer import FileMaker
 from cdh_core_dev_tools.dependencies.create_deps_layer import FORMAT
 from cdh_core_dev_tools.dependencies.create_deps_layer import generate_and_upload_new_zip_file
@@ -79,6 +82,55 @@ class TestGenerateAndUpload:
             Filename=str(full_file_path), Key=self.deps_file_name.name
         )
 
+    def test_generate_and_upload_new_zip_file_with_config_snapshot(self) -> None:
+        load_mocked = Mock()
+        load_mocked.load.side_effect = ClientError({"Error": {"Code": "404"}}, "Mock")
+        self.s3_resource.Object.return_value = load_mocked
+        config_file_path = Builder.build_random_string()
+        digest = Builder.build_random_string()
+
+        def make_file(config_snapshot: Path, **_: object) -> Path:
+            assert config_snapshot.name == CONFIG_SNAPSHOT_FILE_NAME
+            return config_snapshot
+
+        self.file_maker.make_file.side_effect = make_file
+        with patch(
+            "cdh_core_dev_tools.dependencies.create_deps_layer.create_config_snapshot", return_value=digest
+        ) as create_snapshot:
+            generate_and_upload_new_zip_file(
+                s3_resource=self.s3_resource,
+                requirements_file_path_name=self.requirements_file_path,
+                bucket_name=self.bucket_name,
+                zip_file=None,
+                file_maker=self.file_maker,
+                docker_build=False,
+                config_file_path=config_file_path,
+            )
+
+        create_snapshot.assert_called_once_with(
+            config_file_path, self.file_maker.make_file.call_args.kwargs["config_snapshot"]
+        )
+        assert self.file_maker.get_dependencies_file_name.call_args.kwargs["config_digest"] == digest
+        self.s3_resource.Bucket().upload_file.assert_called_once()
+
+
+class TestCreateConfigSnapshot:
+    def test_snapshot_of_sample_config(self, tmp_path: Path) -> None:
+        config_file_path = Path(__file__).parents[4] / "cdh-core-config.yaml"
+        snapshot_path = tmp_path / CONFIG_SNAPSHOT_FILE_NAME
+
+        digest = create_config_snapshot(str(config_file_path), snapshot_path)
+
+        assert snapshot_path.is_file()
+        assert digest == create_config_snapshot(str(config_file_path), tmp_path / Builder.build_random_string())
+
+    def test_invalid_config(self, tmp_path: Path) -> None:
+        config_file_path = tmp_path / "config.yaml"
+        config_file_path.write_text("partition: {}")
+
+        with pytest.raises(subprocess.CalledProcessError):
+            create_config_snapshot(str(config_file_path), tmp_path / CONFIG_SNAPSHOT_FILE_NAME)
+
 
 class TestGetNewAwsCredentials:
     def create_script(self, tmp_dir: str, content: str) -> Path:
@@ -158,6 +210,28 @@ class TestFileMaker:
                         assert folder in os.listdir(os.path.join(extract_dir, "python"))
                         assert all(file in os.listdir(os.path.join(extract_dir, "python", folder)) for file in files)
 
+    def test_make_file_with_config_snapshot(self, tmp_path: Path) -> None:
+        file_maker = FileMaker(Builder.build_random_string())
+        requirements_file_path_name = os.path.join(tmp_path, Builder.build_random_string())
+        _create_requirements_file(requirements_file_path_name, [Builder.build_random_string()])
+        config_snapshot = tmp_path / Builder.build_random_string()
+        config_snapshot.write_bytes(os.urandom(64))
+        install_dir = tmp_path / "install_dir"
+        install_dir.mkdir()
+        with self.mock_pip():
+            output_file = file_maker.make_file(
+                str(install_dir),
+                requirements_file_path_name=requirements_file_path_name,
+                file_name=Path(Builder.build_random_string() + FORMAT),
+                zip_file=None,
+                docker_build=False,
+                config_snapshot=config_snapshot,
+            )
+
+        extract_dir = install_dir / "unpackaged"
+        shutil.unpack_archive(output_file, extract_dir)
+        assert (extract_dir / "python" / CONFIG_SNAPSHOT_FILE_NAME).read_bytes() == config_snapshot.read_bytes()
+
     def create_dummy_zip(self, tmp_path: Path, contents: Dict[str, List[str]]) -> Path:
         subdir = "python"
         (Path(tmp_path) / subdir).mkdir()
@@ -304,6 +378,20 @@ class TestFileMakerFilename:
             requirements_file_path_name=requirements_file_path_name, docker_build=True, zip_file=None
         )
 
+    def test_get_file_name_sensitive_to_config_digest(self) -> None:
+        file_maker = FileMaker(self.context)
+        names = {
+            file_maker.get_dependencies_file_name(
+                requirements_file_path_name=self.requirements_file_path_name,
+                docker_build=True,
+                zip_file=self.zip_file,
+                config_digest=config_digest,
+            )
+            for config_digest in [None, "a", "b"]
+        }
+
+        assert len(names) == 3
+
     @pytest.mark.parametrize("build_docker", [False, True])
     def test_get_file_name_sensitive_to_build_docker(self, build_docker: bool) -> None:
         file_maker = FileMaker(self.context)
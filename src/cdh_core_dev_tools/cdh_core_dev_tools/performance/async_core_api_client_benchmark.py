@@ -0,0 +1,99 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the request throughput of the AsyncCoreApiClient with the one of the CoreApiClient.
+
+Run with `python -m cdh_core_dev_tools.performance.async_core_api_client_benchmark [number of requests]` from an
+environment in which `cdh-core[async]` is installed, the config file is read from CDH_CORE_CONFIG_FILE_PATH. A stub
+server on localhost answers every GET with the same dataset after a delay, which stands in for the latency of the API.
+The CoreApiClient fetches the dataset with `get_dataset` sequentially and from several threads, the
+AsyncCoreApiClient with as many concurrent calls as its concurrency limit allows. Both clients parse the responses in
+the same way, which takes a few milliseconds per dataset and bounds the throughput of the single event loop.
+"""
+import asyncio
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from cdh_core.clients.async_core_api_client import AsyncCoreApiClient
+from cdh_core.clients.async_http_client import AsyncHttpClient
+from cdh_core.clients.core_api_client import CoreApiClient
+from cdh_core.clients.http_client import HttpClient
+from cdh_core.entities.dataset_test import build_response_dataset
+from cdh_core.enums.hubs_test import build_hub
+from cdh_core_dev_tools.performance.http_client_benchmark import BODY
+from cdh_core_dev_tools.performance.http_client_benchmark import measure
+from cdh_core_dev_tools.performance.http_client_benchmark import StubHandler
+
+DEFAULT_NUMBER_OF_REQUESTS = 1_000
+LATENCY_SECONDS = 0.02
+THREADS = 8
+CONCURRENCY = [8, 32]
+
+
+class SlowStubHandler(StubHandler):
+    """Answers every GET with the same dataset after a delay."""
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Send the dataset after the delay."""
+        time.sleep(LATENCY_SECONDS)
+        super().do_GET()
+
+
+async def measure_async(client: AsyncCoreApiClient, number_of_requests: int) -> float:
+    """Return the number of requests per second."""
+    hub = build_hub()
+    dataset_id = build_response_dataset().id
+    start = time.perf_counter()
+    await asyncio.gather(*[client.get_dataset(hub, dataset_id) for _ in range(number_of_requests)])
+    return number_of_requests / (time.perf_counter() - start)
+
+
+async def run_async(base_url: str, number_of_requests: int, max_concurrency: int) -> None:
+    """Print the throughput of the AsyncCoreApiClient with the given concurrency limit."""
+    async with AsyncCoreApiClient(
+        AsyncHttpClient(base_url=base_url, max_concurrency=max_concurrency, limit_per_host=max_concurrency)
+    ) as client:
+        throughput = await measure_async(client, number_of_requests)
+        statistics = client.connection_statistics()
+    print(  # noqa: T201
+        f"async, {max_concurrency:2} concurrent requests {throughput:7.0f} ({statistics['connections']} connections)"
+    )
+
+
+def run(number_of_requests: int) -> None:
+    """Print the throughput of both clients."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(  # noqa: T201
+        f"{number_of_requests} requests of {len(BODY)} bytes with {LATENCY_SECONDS * 1000:.0f}ms latency, "
+        "requests per second"
+    )
+    try:
+        for threads in [1, THREADS]:
+            client = CoreApiClient(HttpClient(base_url=base_url, credentials=None, pool_maxsize=THREADS))
+            # a sequential client would take too long for all requests
+            requests = number_of_requests // (THREADS // threads)
+            throughput = measure(client, requests, threads)
+            print(f"sync, {threads:2} thread(s)           {throughput:7.0f}")  # noqa: T201
+        for max_concurrency in CONCURRENCY:
+            asyncio.run(run_async(base_url, number_of_requests, max_concurrency))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUMBER_OF_REQUESTS)
@@ -0,0 +1,102 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the conversion of full datasets with the conversion of dataset summaries.
+
+Run with `python -m cdh_core_dev_tools.performance.datasets_table_benchmark [number of items]` from an environment in
+which the Core API can be imported, the config file is read from CDH_CORE_CONFIG_FILE_PATH. Every variant converts the
+same page of raw DynamoDB items, the summary variants convert the projected items that DynamoDB would return for them.
+"""
+import json
+import sys
+import timeit
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+
+from cdh_core_api.catalog.datasets_table import _DatasetModel
+from cdh_core_api.catalog.datasets_table import DatasetSummary
+
+from cdh_core.entities.dataset_test import build_dataset
+from cdh_core.entities.dataset_test import build_dataset_account_permission
+
+DEFAULT_NUMBER_OF_ITEMS = 10_000
+REPETITIONS = 3
+
+RawItem = Dict[str, Dict[str, Any]]
+
+
+def build_page(number_of_items: int) -> List[RawItem]:
+    """Build the raw items of a scan page, every dataset has a few permissions."""
+    return [
+        _DatasetModel.from_dataset(
+            build_dataset(permissions=frozenset(build_dataset_account_permission() for _ in range(5)))
+        ).serialize()
+        for _ in range(number_of_items)
+    ]
+
+
+def project(page: List[RawItem], attributes: FrozenSet[str]) -> List[RawItem]:
+    """Return the items as DynamoDB returns them for a ProjectionExpression on the given attributes."""
+    return [{name: value for name, value in item.items() if name in attributes} for item in page]
+
+
+def convert_datasets(page: List[RawItem]) -> None:
+    """Convert every item to a full dataset."""
+    for item in page:
+        _DatasetModel.from_raw_data(item).dataset()
+
+
+def convert_summaries(page: List[RawItem], attributes: FrozenSet[str], access_permissions: bool) -> None:
+    """Convert every item to a summary and read its id and, if requested, its permissions."""
+    for item in page:
+        summary = DatasetSummary(_DatasetModel.from_raw_data(item), attributes)
+        _ = summary.id
+        if access_permissions:
+            _ = summary.permissions
+
+
+def run(number_of_items: int) -> None:
+    """Print the best time of every variant and the size of the page that DynamoDB would transfer."""
+    page = build_page(number_of_items)
+    summary_attributes = DatasetSummary.ATTRIBUTES
+    permissions_attributes = DatasetSummary.ATTRIBUTES | {"permissions"}
+    summary_page = project(page, summary_attributes)
+    permissions_page = project(page, permissions_attributes)
+    variants: Dict[str, Callable[[], None]] = {
+        "full dataset": lambda: convert_datasets(page),
+        "summary, id only": lambda: convert_summaries(summary_page, summary_attributes, access_permissions=False),
+        "summary with unused permissions": lambda: convert_summaries(
+            permissions_page, permissions_attributes, access_permissions=False
+        ),
+        "summary with permissions": lambda: convert_summaries(
+            permissions_page, permissions_attributes, access_permissions=True
+        ),
+    }
+    pages = {
+        "full dataset": page,
+        "summary, id only": summary_page,
+        "summary with unused permissions": permissions_page,
+        "summary with permissions": permissions_page,
+    }
+    print(f"{number_of_items} items, best of {REPETITIONS} runs")  # noqa: T201
+    for name, variant in variants.items():
+        seconds = min(timeit.repeat(variant, number=1, repeat=REPETITIONS))
+        page_size = len(json.dumps(pages[name], default=list))
+        print(f"{name:<32} {seconds * 1000:8.1f} ms {page_size / 1024:10.0f} KiB")  # noqa: T201
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUMBER_OF_ITEMS)
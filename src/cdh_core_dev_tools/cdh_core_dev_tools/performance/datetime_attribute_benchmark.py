@@ -0,0 +1,90 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the DateTimeAttribute codec with the strftime and strptime conversion it replaced.
+
+Run with `python -m cdh_core_dev_tools.performance.datetime_attribute_benchmark [number of values]` from an environment
+in which the Core API can be imported, the config file is read from CDH_CORE_CONFIG_FILE_PATH. The cost per item of a
+catalog model is the cost per value times the number of datetime attributes of the model; the nested table filters of
+filter packages add two values per filter on top.
+"""
+import sys
+import timeit
+from datetime import datetime
+from datetime import timedelta
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Type
+
+from cdh_core_api.catalog.accounts_table import AccountModel
+from cdh_core_api.catalog.base import DateTimeAttribute
+from cdh_core_api.catalog.datasets_table import _DatasetModel
+from cdh_core_api.catalog.filter_packages_table import _FilterPackageModel
+from cdh_core_api.catalog.locks_table import _LockModel
+from cdh_core_api.catalog.resource_table import ResourceModel
+from pynamodb.models import Model
+
+DEFAULT_NUMBER_OF_VALUES = 100_000
+REPETITIONS = 5
+MODELS: List[Type[Model]] = [AccountModel, _DatasetModel, _FilterPackageModel, _LockModel, ResourceModel]
+
+
+def legacy_serialize(value: datetime) -> str:
+    """Convert the date object to a string with strftime."""
+    return value.strftime(DateTimeAttribute.DATETIME_FORMAT)
+
+
+def legacy_deserialize(value: str) -> datetime:
+    """Convert the string to a date object with strptime."""
+    return datetime.strptime(value, DateTimeAttribute.DATETIME_FORMAT)
+
+
+def measure(func: Callable[[], object], number_of_values: int) -> float:
+    """Return the best time per value in microseconds."""
+    return min(timeit.repeat(func, number=1, repeat=REPETITIONS)) / number_of_values * 1_000_000
+
+
+def run(number_of_values: int) -> None:
+    """Print the cost per value and per item of every catalog model."""
+    attribute = DateTimeAttribute()
+    start = datetime(2022, 1, 1)
+    values = [start + timedelta(seconds=index, microseconds=index) for index in range(number_of_values)]
+    serialized = [attribute.serialize(value) for value in values]
+    costs: Dict[str, Dict[str, float]] = {
+        "serialize": {
+            "legacy": measure(lambda: [legacy_serialize(value) for value in values], number_of_values),
+            "current": measure(lambda: [attribute.serialize(value) for value in values], number_of_values),
+        },
+        "deserialize": {
+            "legacy": measure(lambda: [legacy_deserialize(value) for value in serialized], number_of_values),
+            "current": measure(lambda: [attribute.deserialize(value) for value in serialized], number_of_values),
+        },
+    }
+    print(f"{number_of_values} values, best of {REPETITIONS} runs, microseconds")  # noqa: T201
+    for operation, cost in costs.items():
+        print(  # noqa: T201
+            f"per value {operation:<12} legacy {cost['legacy']:6.2f} current {cost['current']:6.2f} "
+            f"speedup {cost['legacy'] / cost['current']:5.1f}x"
+        )
+    for model in MODELS:
+        count = sum(isinstance(attr, DateTimeAttribute) for attr in model.get_attributes().values())
+        deserialize = costs["deserialize"]
+        print(  # noqa: T201
+            f"per item {model.__name__:<20} {count} attributes, deserialize legacy "
+            f"{count * deserialize['legacy']:6.2f} current {count * deserialize['current']:6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUMBER_OF_VALUES)
@@ -0,0 +1,118 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the dependency injection of the precompiled plans with the resolution of the whole graph per request.
+
+Run with `python -m cdh_core_dev_tools.performance.dependencies_benchmark [number of requests]` from an environment in
+which the Core API can be imported, the config file is read from CDH_CORE_CONFIG_FILE_PATH. The factories of the Core
+API are replaced by stubs with the same parameters, so that only the overhead of the dependency injection is measured;
+forever dependencies are built before the measurement.
+"""
+import inspect
+import sys
+import timeit
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+from cdh_core_api.api.route_collection import AnyHandler
+from cdh_core_api.app import coreapi
+
+from cdh_core.enums.http import HttpVerb
+from cdh_core.manager.dependency_manager import AnyCallable
+from cdh_core.manager.dependency_manager import DependencyManager
+from cdh_core.manager.dependency_manager import get_parameter_names
+
+DEFAULT_NUMBER_OF_REQUESTS = 1_000
+REPETITIONS = 5
+ANNOTATED_PARAMETERS = ["body", "path", "query"]
+
+
+def build_stub(parameter_names: Tuple[str, ...]) -> AnyCallable:
+    """Return a factory with the given parameters, which returns its arguments."""
+
+    def factory(**kwargs: Any) -> Dict[str, Any]:
+        return kwargs
+
+    factory.__signature__ = inspect.Signature(  # type: ignore
+        [inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY) for name in parameter_names]
+    )
+    return factory
+
+
+def build_stub_manager() -> DependencyManager:
+    """Return a dependency manager with the dependency graph of the Core API and forever dependencies built."""
+    manager = DependencyManager()
+    coreapi._register_dependencies(context=None)  # type: ignore # pylint: disable=protected-access
+    # pylint: disable=protected-access
+    for alias, entry in coreapi._dependency_manager._register._factory_register.items():
+        manager.register(alias, entry.time_to_live, lazy=entry.lazy)(build_stub(entry.parameter_names))
+    manager.build_forever_dependencies()
+    return manager
+
+
+def get_annotations(handler: AnyHandler) -> Dict[str, Any]:
+    """Return the annotations of the body, path and query parameters, as the router registers them."""
+    signature = inspect.signature(handler)
+    return {
+        f"{name}_annotation": signature.parameters[name].annotation if name in signature.parameters else None
+        for name in ANNOTATED_PARAMETERS
+    }
+
+
+def legacy_build(manager: DependencyManager, handler: AnyHandler, request: object) -> Dict[str, Any]:
+    """Inject the handler arguments as the router did before the plans were compiled."""
+    manager.register_constant("request", DependencyManager.TimeToLive.PER_REQUEST, value=request, force=True)
+    for name, annotation in get_annotations(handler).items():
+        manager.register_constant(name, DependencyManager.TimeToLive.PER_REQUEST, value=annotation, force=True)
+    manager.validate_dependencies()
+    deps = manager.build_dependencies()
+    return {keyword: deps[keyword] for keyword in get_parameter_names(handler)}
+
+
+def measure(func: Callable[[], object], number_of_requests: int) -> float:
+    """Return the best time per request in microseconds."""
+    return min(timeit.repeat(func, number=number_of_requests, repeat=REPETITIONS)) / number_of_requests * 1_000_000
+
+
+def measure_handler(
+    legacy_manager: DependencyManager, manager: DependencyManager, handler: AnyHandler, number_of_requests: int
+) -> Tuple[int, float, float]:
+    """Return the number of factories of the handler and the legacy and current time per request in microseconds."""
+    request = object()
+    arguments = {"request": request, **get_annotations(handler)}
+    plan = manager.compile_plan(handler, arguments.keys())
+    legacy = measure(lambda: legacy_build(legacy_manager, handler, request), number_of_requests)
+    current = measure(lambda: manager.build_dependencies_for_callable(handler, arguments), number_of_requests)
+    return len(plan.steps), legacy, current
+
+
+def run(number_of_requests: int) -> None:
+    """Print the dependency injection overhead per request of every route."""
+    legacy_manager = build_stub_manager()
+    manager = build_stub_manager()
+    print(f"{number_of_requests} requests per route, best of {REPETITIONS} runs, microseconds")  # noqa: T201
+    # pylint: disable=protected-access
+    routes: Dict[str, Dict[HttpVerb, AnyHandler]] = coreapi._router._routes._handlers
+    for path, handlers in sorted(routes.items()):
+        for http_verb, handler in handlers.items():
+            factories, legacy, current = measure_handler(legacy_manager, manager, handler, number_of_requests)
+            print(  # noqa: T201
+                f"{http_verb.value:<6} {path:<70} {factories:2} factories "
+                f"legacy {legacy:8.1f} current {current:6.1f} speedup {legacy / current:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUMBER_OF_REQUESTS)
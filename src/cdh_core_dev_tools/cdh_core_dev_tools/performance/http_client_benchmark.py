@@ -0,0 +1,114 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the request throughput of the CoreApiClient with pooled connections and with a connection per request.
+
+Run with `python -m cdh_core_dev_tools.performance.http_client_benchmark [number of requests]`, the config file is read
+from CDH_CORE_CONFIG_FILE_PATH. A stub server on localhost answers every GET with the same dataset, the client fetches
+it with `get_dataset`, sequentially and from several threads. Previously, every request was sent via
+`requests.request`, which opens a new connection each time. The stub server speaks plain HTTP, so the TLS handshake,
+which the pooled connections save as well, is not part of the numbers.
+"""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+from typing import Dict
+
+import requests
+
+from cdh_core.clients.core_api_client import CoreApiClient
+from cdh_core.clients.http_client import HttpClient
+from cdh_core.entities.dataset_test import build_response_dataset
+from cdh_core.enums.hubs_test import build_hub
+
+DEFAULT_NUMBER_OF_REQUESTS = 2_000
+THREADS = 8
+BODY = build_response_dataset().to_json().encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every GET with the same dataset and keeps the connection alive."""
+
+    protocol_version = "HTTP/1.1"
+    # headers and body are sent together, otherwise Nagle's algorithm adds a delay to every response
+    wbufsize = 64 * 1024
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Send the dataset."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        """Do not log the requests."""
+
+
+class SessionPerRequest:  # pylint: disable=too-few-public-methods
+    """Sends every request via `requests.request` like the HttpClient did before."""
+
+    adapters: Dict[str, Any] = {}
+
+    @staticmethod
+    def request(method: str, url: str, timeout: Any, **kwargs: Any) -> requests.Response:
+        """Send the request via a new session."""
+        return requests.request(method, url, timeout=timeout, **kwargs)
+
+
+def build_client(base_url: str, pooled: bool) -> CoreApiClient:
+    """Return a client whose requests share a pool of connections or open a new connection each."""
+    http_client = HttpClient(base_url=base_url, credentials=None, pool_maxsize=THREADS)
+    if not pooled:
+        http_client._session = SessionPerRequest()  # type: ignore # pylint: disable=protected-access
+    return CoreApiClient(http_client)
+
+
+def measure(client: CoreApiClient, number_of_requests: int, threads: int) -> float:
+    """Return the number of requests per second."""
+    hub = build_hub()
+    dataset_id = build_response_dataset().id
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: client.get_dataset(hub, dataset_id), range(number_of_requests)))
+    return number_of_requests / (time.perf_counter() - start)
+
+
+def run(number_of_requests: int) -> None:
+    """Print the throughput with and without connection pooling."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"{number_of_requests} requests of {len(BODY)} bytes, requests per second")  # noqa: T201
+    try:
+        for threads in [1, THREADS]:
+            legacy = measure(build_client(base_url, pooled=False), number_of_requests, threads)
+            client = build_client(base_url, pooled=True)
+            current = measure(client, number_of_requests, threads)
+            statistics = client.connection_statistics()
+            print(  # noqa: T201
+                f"{threads} thread(s) connection per request {legacy:7.0f} pooled {current:7.0f} "
+                f"speedup {current / legacy:4.1f}x ({statistics['connections']} connections)"
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUMBER_OF_REQUESTS)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Report the import times of a module measured with `python -X importtime` and check them against budgets.
+
+Run with `import_time_report.py cdh_core_api.app --budget-ms 50 --total-budget-ms 1500` from an environment in which
+the module can be imported, e.g. with CDH_CORE_CONFIG_FILE_PATH set for the Core API. The script exits with 1, if the
+self time of a module or the total import time exceeds its budget.
+"""
+import argparse
+import logging
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict
+from typing import List
+from typing import Optional
+
+logging.basicConfig(stream=sys.stdout, level=os.environ.get("LOG_LEVEL", "INFO").upper())
+LOG = logging.getLogger("import_time_report")
+
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    """The time it took to import a module, in microseconds; the cumulative time includes nested imports."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_times(output: str) -> List[ImportTime]:
+    """Parse the stderr output of `python -X importtime`, lines which are not part of the report are ignored."""
+    import_times = []
+    for line in output.splitlines():
+        if match := IMPORT_TIME_PATTERN.match(line):
+            self_us, cumulative_us, indentation, module = match.groups()
+            import_times.append(ImportTime(module, int(self_us), int(cumulative_us), (len(indentation) - 1) // 2))
+    return import_times
+
+
+def measure_import_times(module: str, runs: int, python: str = sys.executable) -> List[ImportTime]:
+    """Import the module in fresh interpreters and return the fastest time of every module across the runs."""
+    fastest: Dict[str, ImportTime] = {}
+    for _ in range(runs):
+        process = subprocess.run(
+            [python, "-X", "importtime", "-c", f"import {module}"], capture_output=True, check=False, text=True
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"Cannot import {module}: {process.stderr.strip()}")
+        for import_time in parse_import_times(process.stderr):
+            known = fastest.get(import_time.module)
+            if known is None or import_time.cumulative_us < known.cumulative_us:
+                fastest[import_time.module] = import_time
+    return list(fastest.values())
+
+
+def find_budget_violations(
+    import_times: List[ImportTime],
+    module: str,
+    budget_ms: float,
+    total_budget_ms: Optional[float] = None,
+    module_budgets_ms: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """Return a message for every module whose self time exceeds its budget and for an exceeded total time."""
+    module_budgets_ms = module_budgets_ms or {}
+    violations = [
+        f"{import_time.module} took {import_time.self_us / 1000:.1f} ms, the budget is {budget:.1f} ms"
+        for import_time in sorted(import_times, key=lambda import_time: -import_time.self_us)
+        if import_time.self_us / 1000 > (budget := module_budgets_ms.get(import_time.module, budget_ms))
+    ]
+    total = next((import_time for import_time in import_times if import_time.module == module), None)
+    if total_budget_ms is not None and total is not None and total.cumulative_us / 1000 > total_budget_ms:
+        violations.append(
+            f"Importing {module} took {total.cumulative_us / 1000:.1f} ms in total, the budget is {total_budget_ms} ms"
+        )
+    return violations
+
+
+def format_report(import_times: List[ImportTime], top: int) -> str:
+    """Return a table of the modules with the highest self and cumulative times."""
+    lines = [f"{'self [ms]':>10} {'cumulative [ms]':>16}  module"]
+    for import_time in sorted(import_times, key=lambda import_time: -import_time.self_us)[:top]:
+        lines.append(
+            f"{import_time.self_us / 1000:10.1f} {import_time.cumulative_us / 1000:16.1f}  {import_time.module}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_module_budget(value: str) -> Dict[str, float]:
+    module, _, budget = value.partition("=")
+    if not module or not budget:
+        raise argparse.ArgumentTypeError(f"Expected <module>=<milliseconds>, got {value!r}")
+    return {module: float(budget)}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the commandline arguments."""
+    parser = argparse.ArgumentParser(description="reports the import times of a module and checks their budgets")
+    parser.add_argument("module", help="the module to import, e.g. cdh_core_api.app")
+    parser.add_argument("--budget-ms", type=float, default=50, help="budget for the self time of every module")
+    parser.add_argument("--total-budget-ms", type=float, help="budget for the cumulative time of the module")
+    parser.add_argument(
+        "--module-budget",
+        type=_parse_module_budget,
+        action="append",
+        default=[],
+        help="budget for the self time of a single module as <module>=<milliseconds>, can be repeated",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="number of imports, the fastest one is reported")
+    parser.add_argument("--top", type=int, default=25, help="number of modules in the report")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Print the import time report and exit with 1 if a budget is exceeded."""
+    args = parse_args()
+    import_times = measure_import_times(args.module, runs=args.runs)
+    LOG.info(format_report(import_times, args.top))
+    violations = find_budget_violations(
+        import_times,
+        module=args.module,
+        budget_ms=args.budget_ms,
+        total_budget_ms=args.total_budget_ms,
+        module_budgets_ms={module: budget for budget in args.module_budget for module, budget in budget.items()},
+    )
+    for violation in violations:
+        LOG.error(violation)
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
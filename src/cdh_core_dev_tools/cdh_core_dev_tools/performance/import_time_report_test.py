@@ -0,0 +1,72 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import sys
+
+import pytest
+
+from cdh_core_dev_tools.performance.import_time_report import find_budget_violations
+from cdh_core_dev_tools.performance.import_time_report import format_report
+from cdh_core_dev_tools.performance.import_time_report import ImportTime
+from cdh_core_dev_tools.performance.import_time_report import measure_import_times
+from cdh_core_dev_tools.performance.import_time_report import parse_import_times
+
+OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:      2500 |       2620 | json
+some other output
+import time:     60000 |      70000 |     heavy.module
+"""
+
+
+def test_parse_import_times() -> None:
+    assert parse_import_times(OUTPUT) == [
+        ImportTime("_json", self_us=120, cumulative_us=120, depth=1),
+        ImportTime("json", self_us=2500, cumulative_us=2620, depth=0),
+        ImportTime("heavy.module", self_us=60000, cumulative_us=70000, depth=2),
+    ]
+
+
+def test_find_budget_violations() -> None:
+    import_times = parse_import_times(OUTPUT)
+
+    assert find_budget_violations(import_times, module="json", budget_ms=100, total_budget_ms=3) == []
+    assert find_budget_violations(import_times, module="json", budget_ms=2, total_budget_ms=2) == [
+        "heavy.module took 60.0 ms, the budget is 2.0 ms",
+        "json took 2.5 ms, the budget is 2.0 ms",
+        "Importing json took 2.6 ms in total, the budget is 2 ms",
+    ]
+    assert (
+        find_budget_violations(
+            import_times, module="json", budget_ms=2, module_budgets_ms={"heavy.module": 60, "json": 3}
+        )
+        == []
+    )
+
+
+def test_format_report() -> None:
+    report = format_report(parse_import_times(OUTPUT), top=1).splitlines()
+
+    assert len(report) == 2
+    assert report[1].split() == ["60.0", "70.0", "heavy.module"]
+
+
+def test_measure_import_times() -> None:
+    import_times = measure_import_times("json", runs=2, python=sys.executable)
+
+    assert "json" in {import_time.module for import_time in import_times}
+
+
+def test_measure_import_times_of_unknown_module() -> None:
+    with pytest.raises(RuntimeError):
+        measure_import_times("this_module_does_not_exist", runs=1, python=sys.executable)
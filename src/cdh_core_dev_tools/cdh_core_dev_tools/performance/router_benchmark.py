@@ -0,0 +1,200 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the single pass request parsing of the router with the parsing it replaced.
+
+Run with `python -m cdh_core_dev_tools.performance.router_benchmark [number of requests]` from an environment in which
+the Core API can be imported, the config file is read from CDH_CORE_CONFIG_FILE_PATH. The events have the shape of API
+Gateway proxy events recorded for the Core API, including the headers added by CloudFront and API Gateway and a JWT
+cookie. Per event, the parsing variants read the cookie twice, as the authorization and the audit log do, and serialize
+the audit representation of the request. Finally, the whole router is measured with a handler that returns
+immediately.
+"""
+import json
+import logging
+import sys
+import timeit
+from base64 import b64encode
+from http.cookies import SimpleCookie
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from unittest.mock import Mock
+
+from cdh_core_api.api.router import Router
+from cdh_core_api.config import Config
+
+from cdh_core.config.authorization_api import AuthApi
+from cdh_core.entities.account_store import AccountStore
+from cdh_core.entities.request import Headers
+from cdh_core.entities.request import Request
+from cdh_core.entities.response import JsonResponse
+from cdh_core.enums.environment import Environment
+from cdh_core.enums.http import HttpVerb
+from cdh_core.enums.hubs import Hub
+from cdh_core.manager.dependency_manager import DependencyManager
+from cdh_core.primitives.account_id import AccountId
+
+DEFAULT_NUMBER_OF_REQUESTS = 10_000
+REPETITIONS = 5
+COOKIE_NAME = "auth"
+ORIGIN = "https://portal.example.com"
+CONTEXT = Mock(aws_request_id="deef4878-7910-11e6-8f14-25afc3e9ae33", get_remaining_time_in_millis=lambda: 0)
+
+
+def build_event(method: str, path: str, resource: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Return an event in the format of the API Gateway proxy integration."""
+    jwt_payload = b64encode(json.dumps({"id": "user-1234", "exp": 1700000000}).encode()).decode().rstrip("=")
+    headers = {
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Accept-Language": "en-US,en;q=0.9",
+        "CloudFront-Forwarded-Proto": "https",
+        "CloudFront-Is-Desktop-Viewer": "true",
+        "CloudFront-Is-Mobile-Viewer": "false",
+        "CloudFront-Viewer-Country": "DE",
+        "Content-Type": "application/json",
+        "Cookie": f"_ga=GA1.2.1234567890.1600000000; {COOKIE_NAME}=header.{jwt_payload}.signature; theme=dark",
+        "Host": "api.example.com",
+        "Origin": ORIGIN,
+        "Referer": f"{ORIGIN}/datasets",
+        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0",
+        "Via": "2.0 0123456789abcdef0123456789abcdef.cloudfront.net (CloudFront)",
+        "X-Amz-Cf-Id": "Qx0jcNVbjEGQsmaVvLQrhsXIoVsaQlJgVnm-Ex6s6xA27xpQMm5iXg==",
+        "X-Amz-Date": "20231016T120000Z",
+        "X-Amz-Security-Token": "IQoJb3JpZ2luX2VjEJr//////////wEaDGV1LWNlbnRyYWwtMSJHMEUCIQD" * 8,
+        "X-Amzn-Trace-Id": "Root=1-652d2500-0123456789abcdef01234567",
+        "X-Forwarded-For": "192.0.2.1, 198.51.100.2",
+        "X-Forwarded-Port": "443",
+        "X-Forwarded-Proto": "https",
+    }
+    return {
+        "resource": resource,
+        "path": path,
+        "httpMethod": method,
+        "headers": headers,
+        "multiValueHeaders": {key: [value] for key, value in headers.items()},
+        "queryStringParameters": None if body else {"limit": "100"},
+        "multiValueQueryStringParameters": None if body else {"limit": ["100"]},
+        "pathParameters": {"hub": "global"},
+        "stageVariables": None,
+        "requestContext": {
+            "identity": {"userArn": "arn:aws:sts::123456789012:assumed-role/CDHDevOps/user-1234", "user": "user-1234"},
+            "requestId": "746dbb58-9839-49b3-b79d-77caccf2b479",
+            "requestTimeEpoch": None,
+        },
+        "body": json.dumps(body) if body else None,
+        "isBase64Encoded": False,
+    }
+
+
+EVENTS = [
+    build_event("GET", "/global/datasets", "/{hub}/datasets"),
+    build_event(
+        "POST",
+        "/global/datasets",
+        "/{hub}/datasets",
+        body={
+            "name": "sales_orders",
+            "businessObject": "sales",
+            "description": "All orders of the sales department",
+            "engine": "glue",
+            "layer": "raw",
+            "tags": {"team": "sales", "cost-center": "1234"},
+        },
+    ),
+]
+
+
+def legacy_get_cookie(request: Request, name: str) -> Optional[str]:
+    """Read the cookie as the request did before, the header was parsed on every call."""
+    cookie: SimpleCookie[Any] = SimpleCookie(request.headers.get("Cookie", ""))  # pylint: disable=E1136
+    return cookie[name].value if name in cookie else None
+
+
+def legacy_parse(event: Dict[str, Any]) -> str:
+    """Parse the event as the router did before, the request was built twice."""
+    Request.from_lambda_event(event, CONTEXT, ignore_body=True)
+    request = Request.from_lambda_event(event, CONTEXT)
+    Headers.from_lambda_event(event).get("Origin")
+    legacy_get_cookie(request, COOKIE_NAME)
+    legacy_get_cookie(request, COOKIE_NAME)
+    request_info = json.loads(request.to_json())
+    request_info["headers"].pop("cookie")
+    return json.dumps(request_info)
+
+
+def current_parse(event: Dict[str, Any]) -> str:
+    """Parse the event as the router does, the request is built once and its body is added afterwards."""
+    request = Request.from_lambda_event(event, CONTEXT, ignore_body=True)
+    request = request.with_body(event)
+    request.headers.get("Origin")
+    request.get_cookie(COOKIE_NAME)
+    request.get_cookie(COOKIE_NAME)
+    return json.dumps(request.to_audit_dict(excluded_headers=["cookie"]))
+
+
+def build_config() -> Config:
+    """Return a config which uses the authorization API, so that the router reads the user from the JWT cookie."""
+    environment = next(iter(Environment))
+    return Config(
+        lambda_account_id=AccountId("123456789012"),
+        environment=environment,
+        hubs=Hub.get_hubs(environment=environment),
+        notification_topics=frozenset(),
+        prefix="",
+        disabled=False,
+        account_store=AccountStore(),
+        authorization_api_params=AuthApi(
+            auth_url="https://auth.example.com", cookie_name=COOKIE_NAME, users_url="https://users.example.com"
+        ),
+        encryption_key="",
+        result_page_size=100,
+    )
+
+
+def build_router() -> Router:
+    """Return a router whose handlers of the events return immediately."""
+    router = Router([ORIGIN], DependencyManager())
+    router.set_audit_logger(Mock())
+    for event in EVENTS:
+        router.route(event["resource"], HttpVerb[event["httpMethod"]], force=True)(lambda: JsonResponse(body={}))
+    router.compile_dependency_plans()
+    return router
+
+
+def measure(func: Callable[[], object], number_of_requests: int) -> float:
+    """Return the best time per request in microseconds."""
+    return min(timeit.repeat(func, number=1, repeat=REPETITIONS)) / number_of_requests * 1_000_000
+
+
+def run(number_of_requests: int) -> None:
+    """Print the cost per request of the parsing variants and of the whole router."""
+    # outside of lambda, the X-Ray recorder logs an error for every subsegment which the router begins
+    logging.disable(logging.ERROR)
+    events: List[Dict[str, Any]] = [EVENTS[index % len(EVENTS)] for index in range(number_of_requests)]
+    assert all(json.loads(legacy_parse(event)) == json.loads(current_parse(event)) for event in EVENTS)
+    legacy = measure(lambda: [legacy_parse(event) for event in events], number_of_requests)
+    current = measure(lambda: [current_parse(event) for event in events], number_of_requests)
+    router = build_router()
+    config = build_config()
+    handle = measure(lambda: [router.handle_request(event, CONTEXT, config) for event in events], number_of_requests)
+    print(f"{number_of_requests} requests, best of {REPETITIONS} runs, microseconds per request")  # noqa: T201
+    print(f"parsing legacy {legacy:7.1f} current {current:7.1f} speedup {legacy / current:4.1f}x")  # noqa: T201
+    print(f"whole router   {handle:7.1f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUMBER_OF_REQUESTS)
@@ -8,6 +8,9 @@ class AWSXRayRecorder:
     def end_subsegment(self, end_time: Optional[Any] = ...) -> None: ...
     def begin_segment(self, name: Any, namespace: str = ...) -> Subsegment: ...
     def end_segment(self, end_time: Optional[Any] = ...) -> None: ...
+    def get_trace_entity(self) -> Any: ...
+    def set_trace_entity(self, trace_entity: Any) -> None: ...
+    def clear_trace_entities(self) -> None: ...
     @property
     def context(self) -> Any: ...
     @property
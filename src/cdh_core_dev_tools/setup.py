@@ -40,6 +40,7 @@ setup(
         "cdh_core_dev_tools/pre_commit/import_linter.py",
         "cdh_core_dev_tools/pre_commit/liccheck_wrapper.py",
         "cdh_core_dev_tools/pre_commit/format_commit_message.py",
+        "cdh_core_dev_tools/performance/import_time_report.py",
     ],
     author="Cloud Data Hub Team",
     author_email="clouddatahub@bmwgroup.com",
@@ -726,6 +726,11 @@ servers:
   # The gateway id in this URL is ignored when uploading to AWS.
   - url: "{url}"
 x-amazon-apigateway-minimum-compression-size: 0
+# responses which exceed the payload limit of Lambda are compressed and base64 encoded by the Core API,
+# API Gateway decodes them for clients whose first accepted media type is this one (requests with JSON bodies are
+# not affected)
+x-amazon-apigateway-binary-media-types:
+  - "application/gzip"
 x-amazon-apigateway-request-validators:
   validateBodyAndParameters:
     validateRequestParameters: true
@@ -11,9 +11,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import importlib
+import json
+import os
 from typing import Callable
 from typing import Dict
 from typing import List
+from typing import Optional
 
 from cdh_core.entities.response import Response
 from cdh_core.enums.http import HttpVerb
@@ -21,13 +25,28 @@ from cdh_core.exceptions.http import MethodNotAllowedError
 from cdh_core.exceptions.http import NotFoundError
 
 AnyHandler = Callable[..., Response]
+RouteManifest = Dict[str, Dict[str, str]]
+
+ROUTE_MANIFEST_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "route_manifest.json")
+
+
+def load_route_manifest(path: str = ROUTE_MANIFEST_PATH) -> RouteManifest:
+    """Load the manifest which maps every route and HTTP method to the module of its handler."""
+    with open(path, "r", encoding="UTF-8") as file:
+        manifest: RouteManifest = json.load(file)
+    return manifest
 
 
 class RouteCollection:
-    """Stores the routes for each endpoint."""
+    """Stores the routes for each endpoint.
+
+    With a route manifest, the module of a handler is imported when its route is requested for the first time, which
+    registers the handler. This way, only the modules of the requested routes have to be imported.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, manifest: Optional[RouteManifest] = None) -> None:
         self._handlers: Dict[str, Dict[HttpVerb, AnyHandler]] = {}
+        self._manifest = manifest or {}
 
     def add(self, route: str, http_verb: HttpVerb, handler: AnyHandler, force: bool = False) -> None:
         """Register a new route.
@@ -45,6 +64,10 @@ class RouteCollection:
 
     def get(self, route: str, http_verb: HttpVerb) -> AnyHandler:
         """Return the handler for the route/http verb combination."""
+        if http_verb not in self._handlers.get(route, {}) and (
+            module := self._manifest.get(route, {}).get(http_verb.value)
+        ):
+            importlib.import_module(module)
         # Normally, the following errors should already have been caught by API Gateway.
         if route not in self._handlers:
             raise NotFoundError(f"Route {route} does not exist")
@@ -52,11 +75,30 @@ class RouteCollection:
             raise MethodNotAllowedError(f"Route {route} does not support HTTP method {http_verb.value}")
         return self._handlers[route][http_verb]
 
+    def get_all_handlers(self) -> List[AnyHandler]:
+        """Return the handlers of all routes which have been registered so far."""
+        return [handler for handlers in self._handlers.values() for handler in handlers.values()]
+
     def get_available_http_verbs(self, route: str) -> List[HttpVerb]:
         """Return a list of http verbs for the given route."""
-        if route not in self._handlers:
+        if route not in self._handlers and route not in self._manifest:
             raise NotFoundError(f"Route {route} does not exist")
-        return list(self._handlers[route].keys())
+        http_verbs = list(self._handlers.get(route, {}).keys())
+        return http_verbs + [
+            HttpVerb(http_verb) for http_verb in self._manifest.get(route, {}) if HttpVerb(http_verb) not in http_verbs
+        ]
+
+    def import_all_handlers(self) -> None:
+        """Import the modules of all routes in the manifest, which have not been imported yet."""
+        for module in sorted({module for http_verbs in self._manifest.values() for module in http_verbs.values()}):
+            importlib.import_module(module)
+
+    def get_manifest(self) -> RouteManifest:
+        """Return the manifest of the registered routes."""
+        return {
+            route: {http_verb.value: handler.__module__ for http_verb, handler in handlers.items()}
+            for route, handlers in sorted(self._handlers.items())
+        }
 
 
 class DuplicateRoute(Exception):
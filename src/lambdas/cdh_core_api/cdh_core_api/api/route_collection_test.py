@@ -11,10 +11,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import importlib
+import json
+from pathlib import Path
 from unittest.mock import Mock
+from unittest.mock import patch
 
 import pytest
 from cdh_core_api.api.route_collection import DuplicateRoute
+from cdh_core_api.api.route_collection import load_route_manifest
 from cdh_core_api.api.route_collection import RouteCollection
 
 from cdh_core.enums.http import HttpVerb
@@ -83,3 +88,57 @@ class TestRouteCollection:
         collection = RouteCollection()
         with pytest.raises(NotFoundError):
             collection.get_available_http_verbs("/route")
+
+    def test_get_all_handlers(self) -> None:
+        collection = RouteCollection()
+        handlers = [Mock(), Mock(), Mock()]
+        collection.add("/route1", HttpVerb.GET, handler=handlers[0])
+        collection.add("/route1", HttpVerb.POST, handler=handlers[1])
+        collection.add("/route2", HttpVerb.GET, handler=handlers[2])
+        assert collection.get_all_handlers() == handlers
+
+    def test_handler_is_imported_on_first_request(self) -> None:
+        collection = RouteCollection({"/route": {"get": "endpoints.module", "post": "endpoints.other_module"}})
+        handler = Mock()
+
+        def import_module(module: str) -> None:
+            collection.add("/route", HttpVerb.GET, handler)
+
+        with patch.object(importlib, "import_module", side_effect=import_module) as import_mock:
+            assert collection.get_available_http_verbs("/route") == [HttpVerb.GET, HttpVerb.POST]
+            assert collection.get("/route", HttpVerb.GET) is handler
+            assert collection.get("/route", HttpVerb.GET) is handler
+            assert collection.get_available_http_verbs("/route") == [HttpVerb.GET, HttpVerb.POST]
+            with pytest.raises(NotFoundError):
+                collection.get("/unknown", HttpVerb.GET)
+
+        import_mock.assert_called_once_with("endpoints.module")
+
+    def test_import_all_handlers(self) -> None:
+        collection = RouteCollection(
+            {"/route1": {"get": "endpoints.module", "post": "endpoints.module"}, "/route2": {"get": "endpoints.other"}}
+        )
+
+        with patch.object(importlib, "import_module") as import_mock:
+            collection.import_all_handlers()
+
+        assert [call.args[0] for call in import_mock.call_args_list] == ["endpoints.module", "endpoints.other"]
+
+    def test_get_manifest(self) -> None:
+        collection = RouteCollection()
+        handler = Mock(__module__="endpoints.module")
+        collection.add("/route2", HttpVerb.POST, handler=handler)
+        collection.add("/route2", HttpVerb.GET, handler=handler)
+        collection.add("/route1", HttpVerb.GET, handler=handler)
+
+        assert collection.get_manifest() == {
+            "/route1": {"get": "endpoints.module"},
+            "/route2": {"post": "endpoints.module", "get": "endpoints.module"},
+        }
+
+    def test_load_route_manifest(self, tmp_path: Path) -> None:
+        manifest = {"/route": {"get": "endpoints.module"}}
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps(manifest))
+
+        assert load_route_manifest(str(path)) == manifest
@@ -22,20 +22,25 @@ from typing import Any
 from typing import Callable
 from typing import Collection
 from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Set
 
+import orjson
 from aws_xray_sdk.core import xray_recorder
 from cdh_core_api.api.openapi_spec.openapi import Handler
 from cdh_core_api.api.route_collection import AnyHandler
 from cdh_core_api.api.route_collection import RouteCollection
+from cdh_core_api.api.route_collection import RouteManifest
 from cdh_core_api.config import Config
 from cdh_core_api.jwt_helper import get_jwt_user_id
 from marshmallow import ValidationError
 
-from cdh_core.aws_clients.cloudwatch_log_writer import CloudwatchLogWriter
+from cdh_core.aws_clients.batching_log_writer import BatchingLogWriter
 from cdh_core.entities.lambda_context import LambdaContext
 from cdh_core.entities.request import Headers
 from cdh_core.entities.request import Request
+from cdh_core.entities.response import CompressionInfo
 from cdh_core.entities.response import JsonResponse
 from cdh_core.entities.response import Response
 from cdh_core.enums.http import HttpVerb
@@ -45,6 +50,7 @@ from cdh_core.exceptions.http import InternalError
 from cdh_core.exceptions.http import ServiceUnavailableError
 from cdh_core.log.xray import XRayMiddleware
 from cdh_core.manager.dependency_manager import DependencyManager
+from cdh_core.manager.dependency_manager import DependencyManagerError
 
 LOG = getLogger(__name__)
 
@@ -61,6 +67,9 @@ SECURITY_HEADERS = {
 }
 
 LAMBDA_TIMEOUT_SECONDS = int(os.environ.get("AWS_LAMBDA_TIMEOUT", "0"))
+AUDIT_LOG_FLUSH_TIMEOUT_SECONDS = 5.0
+# time which is left for answering the request, if writing the audit log takes longer
+AUDIT_LOG_FLUSH_MARGIN_SECONDS = 1.0
 
 
 class Router:
@@ -70,27 +79,38 @@ class Router:
         self,
         allowed_origins: Collection[str],
         dependency_manager: DependencyManager,
+        route_manifest: Optional[RouteManifest] = None,
     ) -> None:
-        self._routes = RouteCollection()
+        self._routes = RouteCollection(route_manifest)
         self._allowed_origins = allowed_origins
         self._dependency_manager = dependency_manager
         self._xray = XRayMiddleware(
             xray_recorder=xray_recorder, services_to_patch=["boto3", "botocore", "requests", "pynamodb"]
         )
-        self._audit_logger: CloudwatchLogWriter = None  # type: ignore
+        self._audit_logger: BatchingLogWriter = None  # type: ignore
+        self._latency_info_providers: List[Callable[[], Dict[str, Any]]] = []
+        self._annotations: Dict[AnyHandler, Dict[str, Any]] = {}
 
-    def set_audit_logger(self, audit_logger: CloudwatchLogWriter) -> None:
+    def set_audit_logger(self, audit_logger: BatchingLogWriter) -> None:
         """Set an audit logger, which has to be done in an AWS context."""
         self._audit_logger = audit_logger
 
+    def add_latency_info_provider(self, provider: Callable[[], Dict[str, Any]]) -> None:
+        """Add a function whose result is included in the latency info logged after each request."""
+        self._latency_info_providers.append(provider)
+
     def handle_request(self, event: Dict[str, Any], context: LambdaContext, config: Config) -> Dict[str, Any]:
         """Handle an AWS request and call the handler based on the request."""
         request: Optional[Request] = None
+        headers: Optional[Headers] = None
         try:
             if config.disabled:
                 raise ServiceUnavailableError("The Core API is currently unavailable due to maintenance")
-            self._log_request(event, context)
-            request = Request.from_lambda_event(event, context)
+            # the request is logged before its body is parsed, because parsing the body can fail
+            request_without_body = Request.from_lambda_event(event, context, ignore_body=True)
+            headers = request_without_body.headers
+            self._log_request(request_without_body)
+            request = request_without_body.with_body(event)
             if request.http_verb is not HttpVerb.OPTIONS:
                 response = self._handle_normal_request(request)
             else:
@@ -98,35 +118,57 @@ class Router:
         except Exception as error:  # pylint: disable=broad-except
             response = self._handle_error(event, context, error)
 
-        response.headers.update(self._get_mandatory_response_headers(event))
-        if event["httpMethod"] in AUDIT_VERBS:
-            self._write_audit_log(event=event, request=request, response=response, config=config)
+        headers = headers or Headers.from_lambda_event(event)
+        response.headers.update(self._get_mandatory_response_headers(headers))
         self._xray.log_response(response)
         xray_recorder.begin_subsegment("response to dict")
-        response_as_dict = response.to_dict()
+        compression: Optional[CompressionInfo] = None
+        # responses to mutating requests are small and they are written to the audit log, so they are not compressed
+        if isinstance(response, JsonResponse) and event["httpMethod"] not in AUDIT_VERBS:
+            response_as_dict = response.to_dict(
+                accept_encoding=headers.get("Accept-Encoding"), accept=headers.get("Accept")
+            )
+            compression = response.compression
+        else:
+            response_as_dict = response.to_dict()
         xray_recorder.end_subsegment()
+        if event["httpMethod"] in AUDIT_VERBS:
+            self._write_audit_log(event=event, request=request, response_as_dict=response_as_dict, config=config)
         self._log_latency_info(
             event=event,
             context=context,
             request=request,
             status_code=response.status_code,
             response_size=len(response_as_dict["body"]) if response_as_dict and response_as_dict.get("body") else 0,
+            compression=compression,
         )
+        if event["httpMethod"] in AUDIT_VERBS:
+            self._flush_audit_log(context)
         return response_as_dict
 
-    @staticmethod
-    def _log_latency_info(
+    def _log_latency_info(  # pylint: disable=too-many-arguments
+        self,
         event: Dict[str, Any],
         context: LambdaContext,
         request: Optional[Request],
         status_code: HTTPStatus,
         response_size: int,
+        compression: Optional[CompressionInfo] = None,
     ) -> None:
         latency_info: Dict[str, Any] = {
             "elapsed_lambda_ms": LAMBDA_TIMEOUT_SECONDS * 1000 - context.get_remaining_time_in_millis(),
             "status_code": status_code.value,
             "response_size": response_size,
         }
+        if compression:
+            latency_info.update(
+                {
+                    "content_encoding": compression.encoding,
+                    "uncompressed_response_size": compression.original_size,
+                    "compression_ratio": round(compression.ratio, 2),
+                    "compression_ms": round(compression.seconds * 1000, 2),
+                }
+            )
         if request:
             latency_info.update(
                 {
@@ -140,29 +182,56 @@ class Router:
             request_time_epoch := request_context.get("requestTimeEpoch")
         ):
             latency_info["elapsed_total_ms"] = datetime.now().timestamp() * 1000 - request_time_epoch
+        for provider in self._latency_info_providers:
+            latency_info.update(provider())
         LOG.info(json.dumps(latency_info))
 
     def get_route(self, path: str, method: HttpVerb) -> AnyHandler:
         """Return the handler based on the path/method."""
         return self._routes.get(route=path, http_verb=method)
 
+    def import_all_handlers(self) -> None:
+        """Import the handlers of all routes in the route manifest."""
+        self._routes.import_all_handlers()
+
+    def get_route_manifest(self) -> RouteManifest:
+        """Return the manifest of the registered routes."""
+        return self._routes.get_manifest()
+
+    def compile_dependency_plans(self) -> None:
+        """Compile the dependency resolution plans of all routes, which should be done once the app is configured."""
+        for handler in self._routes.get_all_handlers():
+            try:
+                self._dependency_manager.compile_plan(handler, self._get_handler_arguments(handler, None).keys())
+            except DependencyManagerError as error:
+                # the request to such a route fails with the same error, when the plan is compiled again
+                LOG.warning(f"Cannot compile the dependency plan for {handler.__qualname__}: {error}")
+
+    def get_request_schemas(self) -> Set[Any]:
+        """Return the types of the body, path and query parameters of all registered routes."""
+        return {
+            annotation
+            for handler in self._routes.get_all_handlers()
+            for annotation in self._get_handler_arguments(handler, None).values()
+            if annotation is not None
+        }
+
+    def _get_handler_arguments(self, handler: AnyHandler, request: Optional[Request]) -> Dict[str, Any]:
+        if (annotations := self._annotations.get(handler)) is None:
+            signature = inspect.signature(handler)
+            annotations = {
+                f"{name}_annotation": signature.parameters[name].annotation if signature.parameters.get(name) else None
+                for name in ["body", "path", "query"]
+            }
+            self._annotations[handler] = annotations
+        return {"request": request, **annotations}
+
     def _handle_normal_request(self, request: Request) -> Response:
         handler = self._routes.get(request.route, request.http_verb)
         xray_recorder.begin_subsegment(f"build_dependencies for {handler.__qualname__}")
-        self._dependency_manager.register_constant(
-            "request", DependencyManager.TimeToLive.PER_REQUEST, value=request, force=True
+        handler_arguments = self._dependency_manager.build_dependencies_for_callable(
+            any_callable=handler, arguments=self._get_handler_arguments(handler, request)
         )
-        signature = inspect.signature(handler)
-        for name in ["body", "path", "query"]:
-            annotation = signature.parameters[name].annotation if signature.parameters.get(name) else None
-            self._dependency_manager.register_constant(
-                f"{name}_annotation",
-                DependencyManager.TimeToLive.PER_REQUEST,
-                value=annotation,
-                force=True,
-            )
-        self._dependency_manager.validate_dependencies()
-        handler_arguments = self._dependency_manager.build_dependencies_for_callable(any_callable=handler)
         xray_recorder.end_subsegment()
         xray_recorder.begin_subsegment(handler.__qualname__)
         result = handler(**handler_arguments)
@@ -200,8 +269,8 @@ class Router:
             return "; ".join(f"{key}: {value}" for key, value in error.messages.items())
         return str(error.messages)
 
-    def _get_mandatory_response_headers(self, event: Dict[str, Any]) -> Dict[str, str]:
-        origin = Headers.from_lambda_event(event).get("Origin", "")
+    def _get_mandatory_response_headers(self, request_headers: Headers) -> Dict[str, str]:
+        origin = request_headers.get("Origin", "")
         headers = SECURITY_HEADERS.copy()
         if origin in self._allowed_origins:
             headers["Access-Control-Allow-Origin"] = origin
@@ -217,8 +286,7 @@ class Router:
 
         return decorator
 
-    def _log_request(self, event: Dict[str, Any], context: LambdaContext) -> None:
-        request = Request.from_lambda_event(event, context, ignore_body=True)
+    def _log_request(self, request: Request) -> None:
         self._xray.log_request(request)
         parameter_info = f" with parameters {request.path_params}" if request.path_params else ""
         LOG.info(f"{request.http_verb.value} to {request.route}{parameter_info} ({request.id})")
@@ -239,25 +307,30 @@ class Router:
         )
 
     def _write_audit_log(
-        self, event: Dict[str, Any], request: Optional[Request], response: Response, config: Config
+        self, event: Dict[str, Any], request: Optional[Request], response_as_dict: Dict[str, Any], config: Config
     ) -> None:
-        audit_info: Dict[str, Optional[Dict[str, Any]]] = {
-            "response": response.to_dict() if response is not None else {}
-        }
+        audit_info: Dict[str, Optional[Dict[str, Any]]] = {"response": response_as_dict}
         if request is not None:
             audit_info["request"] = self._extract_request_info(request, config)
         else:  # if request cannot be parsed, log event instead
             audit_info.update({"request": None, "event": event})
         try:
-            self._audit_logger.write_log([json.dumps(audit_info)])
+            self._audit_logger.write_log([orjson.dumps(audit_info).decode("utf-8")])
         except Exception:  # pylint: disable=broad-except
             LOG.exception(f"Lost the following audit log information: {audit_info}")
 
+    def _flush_audit_log(self, context: LambdaContext) -> None:
+        # the audit log is written in the background, but the lambda is frozen once the request is answered
+        timeout = min(
+            AUDIT_LOG_FLUSH_TIMEOUT_SECONDS,
+            context.get_remaining_time_in_millis() / 1000 - AUDIT_LOG_FLUSH_MARGIN_SECONDS,
+        )
+        if not self._audit_logger.flush(timeout=max(timeout, 0)):
+            LOG.warning("The audit log is not written yet, it will be written during one of the next requests")
+
     @staticmethod
     def _extract_request_info(request: Request, config: Config) -> Dict[str, Any]:
-        request_info = request.to_plain_dict()
-        if "cookie" in request_info["headers"]:
-            request_info["headers"].pop("cookie")
+        request_info = request.to_audit_dict(excluded_headers=["cookie"])
         if jwt_user_id := get_jwt_user_id(request, config):
             request_info["jwtUserId"] = jwt_user_id
         return request_info
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # pylint: disable=protected-access
+import base64
+import gzip
 import json
 import random
 from http import HTTPStatus
@@ -24,6 +26,7 @@ from unittest.mock import patch
 import orjson
 import pytest
 from cdh_core_api.api import router
+from cdh_core_api.api.router import AUDIT_LOG_FLUSH_TIMEOUT_SECONDS
 from cdh_core_api.api.router import AUDIT_VERBS
 from cdh_core_api.api.router import CORS_HEADER
 from cdh_core_api.api.router import CORS_METHODS
@@ -32,8 +35,11 @@ from cdh_core_api.api.router import SECURITY_HEADERS
 from cdh_core_api.config_test import build_config
 from marshmallow import ValidationError
 
+from cdh_core.clients.http_client import ACCEPT
 from cdh_core.entities.lambda_context import LambdaContext
+from cdh_core.entities.request import Headers
 from cdh_core.entities.request import Request
+from cdh_core.entities.response import COMPRESSION_THRESHOLD_BYTES
 from cdh_core.entities.response import JsonResponse
 from cdh_core.enums.aws_test import build_region
 from cdh_core.enums.http import HttpVerb
@@ -135,6 +141,23 @@ class TestRouter:
         assert logged_request_dict == expected_request_dict
         assert "cookie" not in logged_request_dict["headers"]
 
+    @pytest.mark.parametrize("http_verb", sorted(AUDIT_VERBS))
+    def test_request_is_parsed_once(self, http_verb: str) -> None:
+        event = RequestEventBuilder.build_event(http_verb, additional_headers={"Cookie": "a=b"})
+        event["body"] = '{"key": "value"}'
+
+        @self.router.route(RequestEventBuilder.PATH, HttpVerb[http_verb])
+        def handler(request: Request) -> JsonResponse:
+            return JsonResponse(body=request.body)
+
+        with patch.object(Request, "from_lambda_event", wraps=Request.from_lambda_event) as from_lambda_event:
+            with patch.object(Headers, "__init__", autospec=True, side_effect=Headers.__init__) as headers_init:
+                response = self.router.handle_request(event, self.CONTEXT, self.config)
+
+        assert json.loads(response["body"]) == {"key": "value"}
+        from_lambda_event.assert_called_once_with(event, self.CONTEXT, ignore_body=True)
+        headers_init.assert_called_once()
+
     @pytest.mark.parametrize("http_verb", sorted(AUDIT_VERBS))
     def test_logger_in_case_of_error_during_request_parsing(self, http_verb: str) -> None:
         event = RequestEventBuilder.build_event(http_verb, origin=RequestEventBuilder.ALLOWED_ORIGINS[1])
@@ -153,6 +176,68 @@ class TestRouter:
         event = RequestEventBuilder.build_event(http_verb, origin=RequestEventBuilder.ALLOWED_ORIGINS[1])
         self.router.handle_request(event, self.CONTEXT, self.config)
 
+    @pytest.mark.parametrize(
+        "remaining_millis,timeout", [(60_000, AUDIT_LOG_FLUSH_TIMEOUT_SECONDS), (3_000, 2), (0, 0)]
+    )
+    def test_audit_log_is_flushed_within_remaining_time(self, remaining_millis: int, timeout: float) -> None:
+        context = Mock(
+            aws_request_id=self.CONTEXT.aws_request_id, get_remaining_time_in_millis=lambda: remaining_millis
+        )
+        event = RequestEventBuilder.build_event(random.choice(list(AUDIT_VERBS)))
+
+        self.router.handle_request(event, context, self.config)
+
+        self.router._audit_logger.flush.assert_called_once_with(timeout=timeout)  # type: ignore
+
+    def test_audit_log_not_flushed(self) -> None:
+        self.router._audit_logger.flush.return_value = False  # type: ignore
+        event = RequestEventBuilder.build_event(random.choice(list(AUDIT_VERBS)))
+
+        with patch.object(router, "LOG") as log:
+            response = self.router.handle_request(event, self.CONTEXT, self.config)
+
+        assert response["statusCode"] == HTTPStatus.NOT_FOUND.value
+        log.warning.assert_called_once()
+
+    def test_latency_info_contains_provided_values(self) -> None:
+        self.router.add_latency_info_provider(lambda: {"auth_cache_hits": 3})
+        event = RequestEventBuilder.build_event("GET", origin=RequestEventBuilder.ALLOWED_ORIGINS[1])
+
+        with patch.object(router, "LOG") as log:
+            self.router.handle_request(event, self.CONTEXT, self.config)
+
+        latency_info = json.loads(log.info.call_args.args[0])
+        assert latency_info["auth_cache_hits"] == 3
+        assert latency_info["status_code"] == HTTPStatus.NOT_FOUND.value
+
+    @pytest.mark.parametrize("http_verb", ["GET", "POST"])
+    def test_large_responses_to_get_requests_are_compressed(self, http_verb: str) -> None:
+        items = [{"id": str(index)} for index in range(COMPRESSION_THRESHOLD_BYTES // 10)]
+        event = RequestEventBuilder.build_event(
+            http_verb, additional_headers={"Accept-Encoding": "gzip, deflate", "Accept": ACCEPT}
+        )
+
+        @self.router.route(RequestEventBuilder.PATH, HttpVerb[http_verb])
+        def handler() -> JsonResponse:
+            return JsonResponse(body={"items": items})
+
+        with patch.object(router, "LOG") as log:
+            response = self.router.handle_request(event, self.CONTEXT, self.config)
+
+        latency_info = json.loads(log.info.call_args.args[0])
+        if http_verb == "GET":
+            assert response["isBase64Encoded"]
+            assert response["headers"]["Content-Encoding"] == "gzip"
+            assert json.loads(gzip.decompress(base64.b64decode(response["body"]))) == {"items": items}
+            assert latency_info["content_encoding"] == "gzip"
+            assert latency_info["uncompressed_response_size"] > latency_info["response_size"]
+            assert latency_info["compression_ratio"] > 1
+            assert "compression_ms" in latency_info
+        else:
+            assert not response["isBase64Encoded"]
+            assert json.loads(response["body"]) == {"items": items}
+            assert "content_encoding" not in latency_info
+
     def test_logger_is_not_called(self) -> None:
         all_http_verbs = {verb.value for verb in HttpVerb}
         non_audit_logging_actions = all_http_verbs - AUDIT_VERBS
@@ -162,6 +247,7 @@ class TestRouter:
             event = RequestEventBuilder.build_event(http_verb, origin=RequestEventBuilder.ALLOWED_ORIGINS[1])
             local_router.handle_request(event, self.CONTEXT, self.config)
             local_router._audit_logger.write_log.assert_not_called()
+            local_router._audit_logger.flush.assert_not_called()
 
     def test_handler_is_called(self) -> None:
         call_check = Mock()
@@ -205,6 +291,63 @@ class TestRouter:
         call_check.assert_called_once()
         assert call_check.call_args[0][0] == "injected!"  # pylint: disable=unsubscriptable-object
 
+    def test_annotations_are_injected(self) -> None:
+        @self.router.route(RequestEventBuilder.PATH, HttpVerb.GET)
+        def handler(injected_value: Any, query: int) -> JsonResponse:
+            return JsonResponse(body=injected_value)
+
+        self.dependency_manager.register("query", DependencyManager.TimeToLive.PER_REQUEST)(lambda: 1)
+        self.dependency_manager.register("injected_value", DependencyManager.TimeToLive.PER_REQUEST)(
+            lambda request, body_annotation, query_annotation: {
+                "route": request.route,
+                "body": repr(body_annotation),
+                "query": repr(query_annotation),
+            }
+        )
+
+        response = self.router.handle_request(RequestEventBuilder.build_event("GET"), self.CONTEXT, self.config)
+
+        assert json.loads(response["body"]) == {
+            "route": RequestEventBuilder.PATH,
+            "body": "None",
+            "query": "<class 'int'>",
+        }
+
+    def test_compile_dependency_plans(self) -> None:
+        @self.router.route(RequestEventBuilder.PATH, HttpVerb.GET)
+        def handler(injected_value: str) -> JsonResponse:
+            return JsonResponse(body={"value": injected_value})
+
+        @self.router.route(RequestEventBuilder.PATH, HttpVerb.POST)
+        def broken_handler(missing_value: str) -> JsonResponse:
+            raise AssertionError()
+
+        factory = Mock(return_value="injected!")
+        self.dependency_manager.register("injected_value", DependencyManager.TimeToLive.PER_REQUEST)(
+            lambda request: factory(request)
+        )
+        with patch.object(router, "LOG") as log:
+            self.router.compile_dependency_plans()
+
+        log.warning.assert_called_once()
+        factory.assert_not_called()
+        response = self.router.handle_request(RequestEventBuilder.build_event("GET"), self.CONTEXT, self.config)
+        assert json.loads(response["body"]) == {"value": "injected!"}
+        assert factory.call_args.args[0].route == RequestEventBuilder.PATH
+        response = self.router.handle_request(RequestEventBuilder.build_event("POST"), self.CONTEXT, self.config)
+        assert response["statusCode"] == HTTPStatus.INTERNAL_SERVER_ERROR.value
+
+    def test_get_request_schemas(self) -> None:
+        @self.router.route(RequestEventBuilder.PATH, HttpVerb.GET)
+        def handler(path: str, query: int) -> JsonResponse:
+            raise AssertionError()
+
+        @self.router.route(RequestEventBuilder.PATH, HttpVerb.POST)
+        def other_handler(body: float) -> JsonResponse:
+            raise AssertionError()
+
+        assert self.router.get_request_schemas() == {str, int, float}
+
     def test_view_error(self) -> None:
         @self.router.route(RequestEventBuilder.PATH, HttpVerb.GET)
         def handler() -> JsonResponse:
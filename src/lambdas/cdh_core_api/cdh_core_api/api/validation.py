@@ -12,13 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import dataclasses
+import importlib
+import inspect
+import pkgutil
+from contextvars import ContextVar
 from dataclasses import is_dataclass
+from functools import lru_cache
+from types import ModuleType
 from typing import Any
 from typing import Callable
 from typing import cast
 from typing import Dict
 from typing import Generic
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 from typing import Union
@@ -35,6 +44,12 @@ from marshmallow.validate import Validator
 AnyThing = TypeVar("AnyThing")
 ValidatorFunction = Callable[[Any], Any]
 ValidatorWithContextFunction = Callable[[ValidationContext, object], Any]
+# attribute name, validator of the field and validator of the entries of a list field
+ContextValidation = Tuple[str, Optional[ValidatorWithContextFunction], Optional[ValidatorWithContextFunction]]
+
+_NO_CONTEXT = object()
+# set by SchemaValidator for the duration of a load, since the schema instances are shared by all requests
+_VALIDATION_CONTEXT: ContextVar[Any] = ContextVar("validation_context")
 
 
 class BaseSchema(MarshmallowSchema):
@@ -47,26 +62,67 @@ class BaseSchema(MarshmallowSchema):
 
     TYPE_MAPPING: Dict[type, Type[MarshmallowField]] = {}
 
+    def _init_fields(self) -> None:
+        super()._init_fields()
+        self._context_validations: List[ContextValidation] = []
+        for attr_name, field_obj in self.dump_fields.items():
+            validator = field_obj.metadata.get("validator_with_context")
+            inner_validator = (
+                field_obj.inner.metadata.get("validator_with_context") if isinstance(field_obj, fields.List) else None
+            )
+            if validator or inner_validator:
+                self._context_validations.append((attr_name, validator, inner_validator))
+
     @post_load
     def validate_with_context(self, data: Any, **_: Any) -> Any:
         """Return the data if it is valid based on the given context."""
+        context = _VALIDATION_CONTEXT.get(_NO_CONTEXT)
+        if context is _NO_CONTEXT:
+            context = self.context
 
-        def validate_field(fields_obj: fields.Field, input_value: Any) -> None:
-            validator = fields_obj.metadata.get("validator_with_context")
-            if validator:
-                result = validator(self.context, input_value)
-                assert result is input_value  # We do not support validators that transform values.
+        def validate_value(validator: ValidatorWithContextFunction, input_value: Any) -> None:
+            result = validator(context, input_value)
+            assert result is input_value  # We do not support validators that transform values.
 
-        for attr_name, field_obj in self.dump_fields.items():
+        for attr_name, validator, inner_validator in self._context_validations:
             value = data.get(attr_name)
-            validate_field(field_obj, input_value=value)
-            if isinstance(field_obj, fields.List):
+            if validator:
+                validate_value(validator, value)
+            if inner_validator:
                 for entry in value or set():
-                    validate_field(field_obj.inner, entry)
+                    validate_value(inner_validator, entry)
 
         return data
 
 
+@lru_cache(maxsize=None)
+def get_schema(schema: type) -> BaseSchema:
+    """Return the marshmallow schema of a dataclass, which is built once per process and shared by all requests."""
+    return cast(BaseSchema, marshmallow_dataclass.class_schema(schema, base_schema=BaseSchema)())
+
+
+def prewarm_schemas(schemas: Iterable[Any]) -> None:
+    """Build the schemas of the given dataclasses, such that the first requests using them do not have to."""
+    for schema in schemas:
+        if inspect.isclass(schema) and is_dataclass(schema):
+            get_schema(schema)
+
+
+def find_dataclasses(package: ModuleType) -> List[type]:
+    """Import the modules of the package and return the dataclasses defined in them."""
+    dataclass_types: List[type] = []
+    for module_info in pkgutil.iter_modules(package.__path__, prefix=f"{package.__name__}."):
+        if module_info.name.endswith("_test"):
+            continue
+        module = importlib.import_module(module_info.name)
+        dataclass_types.extend(
+            member
+            for _, member in inspect.getmembers(module, inspect.isclass)
+            if is_dataclass(member) and member.__module__ == module.__name__
+        )
+    return dataclass_types
+
+
 class SchemaValidator(Validator, Generic[AnyThing]):
     """Validates an object based on a type."""
 
@@ -75,14 +131,18 @@ class SchemaValidator(Validator, Generic[AnyThing]):
             raise TypeError("SchemaValidator requires a dataclass")
 
         self.schema = schema
-        self._validator = marshmallow_dataclass.class_schema(schema, base_schema=BaseSchema)()
-        self._validator.context = context
+        self._validator = get_schema(schema)
+        self._context = context
 
     def __call__(self, input_object: object) -> AnyThing:
         """Return a concrete object if it is valid."""
         if not isinstance(input_object, dict):
             raise ValidationError("input must be a dictionary")
-        return cast(AnyThing, self._validator.load(input_object))
+        token = _VALIDATION_CONTEXT.set(self._context)
+        try:
+            return cast(AnyThing, self._validator.load(input_object))
+        finally:
+            _VALIDATION_CONTEXT.reset(token)
 
 
 class FunctionValidator(Validator):
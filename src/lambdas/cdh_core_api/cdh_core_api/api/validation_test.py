@@ -23,14 +23,19 @@ from typing import Type
 from unittest.mock import Mock
 from unittest.mock import patch
 
+import cdh_core_api.bodies
 import marshmallow_dataclass
 import pytest
 from cdh_core_api.api.validation import AnyThing
 from cdh_core_api.api.validation import BaseSchema
 from cdh_core_api.api.validation import field
 from cdh_core_api.api.validation import FieldAlreadyRegisteredForType
+from cdh_core_api.api.validation import find_dataclasses
+from cdh_core_api.api.validation import get_schema
+from cdh_core_api.api.validation import prewarm_schemas
 from cdh_core_api.api.validation import register_for_type
 from cdh_core_api.api.validation import SchemaValidator
+from cdh_core_api.bodies.datasets import NewDatasetBody
 from cdh_core_api.config import ValidationContext
 from marshmallow import fields
 from marshmallow import ValidationError
@@ -179,6 +184,72 @@ class TestSchemaValidator:
             validator({"middle": {"some": {"inner": {"whatever": "nan"}}}})
 
 
+class TestSchemaCache:
+    def test_schema_is_shared(self) -> None:
+        @dataclass
+        class Schema:
+            name: str
+
+        assert SchemaValidator(Schema)._validator is SchemaValidator(Schema)._validator  # pylint: disable=W0212
+        assert get_schema(Schema) is SchemaValidator(Schema)._validator  # pylint: disable=W0212
+
+    def test_context_is_passed_per_call(self) -> None:
+        def equals_context(context: Any, input_value: Any) -> Any:
+            if input_value != context:
+                raise ValidationError("Input must equal context")
+            return input_value
+
+        @dataclass
+        class Inner:
+            value: str = field(validator_with_context=equals_context)
+
+        @dataclass
+        class Schema:
+            value: str = field(validator_with_context=equals_context)
+            inner: Optional[Inner] = None
+
+        for context in ["first", "second"]:
+            assert SchemaValidator(Schema, context=context)({"value": context, "inner": {"value": context}}) == Schema(
+                value=context, inner=Inner(value=context)
+            )
+            with pytest.raises(ValidationError):
+                SchemaValidator(Schema, context=context)({"value": context, "inner": {"value": "other"}})
+
+    def test_context_validations_are_precomputed(self) -> None:
+        def validation(_: Any, input_value: Any) -> Any:
+            return input_value
+
+        @dataclass
+        class Schema:
+            plain: str
+            validated: str = field(validator_with_context=validation)
+            entries: List[str] = field(
+                default_factory=list,
+                metadata={"marshmallow_field": fields.List(fields.String(validator_with_context=validation))},
+            )
+
+        assert sorted(get_schema(Schema)._context_validations) == [  # pylint: disable=protected-access
+            ("entries", None, validation),
+            ("validated", validation, None),
+        ]
+
+    def test_prewarm_schemas(self) -> None:
+        @dataclass
+        class Schema:
+            name: str
+
+        get_schema.cache_clear()  # type: ignore
+        prewarm_schemas([Schema, str, None])
+
+        assert get_schema.cache_info().currsize == 1  # type: ignore
+
+    def test_find_dataclasses(self) -> None:
+        dataclass_types = find_dataclasses(cdh_core_api.bodies)
+
+        assert NewDatasetBody in dataclass_types
+        assert all(not dataclass_type.__module__.endswith("_test") for dataclass_type in dataclass_types)
+
+
 class TestField:
     def validate(self, schema: Type[AnyThing], value: Any, *, context: Any = None) -> Any:
         validator: SchemaValidator[AnyThing] = SchemaValidator(schema, context=context)
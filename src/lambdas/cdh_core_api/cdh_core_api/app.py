@@ -14,6 +14,7 @@
 # pylint: disable=unnecessary-lambda
 import dataclasses
 import datetime
+import importlib
 import logging
 import os
 from contextlib import suppress
@@ -27,17 +28,23 @@ from typing import Type
 from typing import TypeVar
 from typing import Union
 
+import cdh_core_api.bodies
 from aws_xray_sdk.core import xray_recorder
 from cdh_core_api.api.openapi_spec.openapi import Handler
 from cdh_core_api.api.openapi_spec.openapi import OpenApiSpecCollector
 from cdh_core_api.api.route_collection import AnyHandler
+from cdh_core_api.api.route_collection import load_route_manifest
+from cdh_core_api.api.route_collection import RouteManifest
 from cdh_core_api.api.router import Router
+from cdh_core_api.api.validation import find_dataclasses
+from cdh_core_api.api.validation import prewarm_schemas
 from cdh_core_api.api.validation import SchemaValidator
 from cdh_core_api.bodies.accounts import UpdateAccountBody
 from cdh_core_api.bodies.resources import NewGlueSyncBody
 from cdh_core_api.catalog.accounts_table import AccountsTable
 from cdh_core_api.catalog.datasets_table import DatasetsTable
 from cdh_core_api.catalog.filter_packages_table import FilterPackagesTable
+from cdh_core_api.catalog.kms_key_access_table import KmsKeyAccessTable
 from cdh_core_api.catalog.resource_table import ResourcesTable
 from cdh_core_api.config import Config
 from cdh_core_api.config import ValidationContext
@@ -49,7 +56,11 @@ from cdh_core_api.services.account_manager import AccountManager
 from cdh_core_api.services.account_validator import AccountValidator
 from cdh_core_api.services.api_info_manager import ApiInfoManager
 from cdh_core_api.services.authorization_api import AuthorizationApi
+from cdh_core_api.services.authorization_api_cache import AuthorizationApiCache
+from cdh_core_api.services.authorization_api_cache import build_requester_key
+from cdh_core_api.services.authorization_api_cache import CachingAuthorizationApi
 from cdh_core_api.services.authorizer import Authorizer
+from cdh_core_api.services.catalog_exporter import CatalogExporter
 from cdh_core_api.services.data_explorer import DataExplorerSync
 from cdh_core_api.services.dataset_manager import DatasetManager
 from cdh_core_api.services.dataset_participants_manager import DatasetParticipantsManager
@@ -65,6 +76,7 @@ from cdh_core_api.services.lock_service import LockService
 from cdh_core_api.services.metadata_role_assumer import AssumableAccountSpec
 from cdh_core_api.services.metadata_role_assumer import MetadataRoleAssumer
 from cdh_core_api.services.pagination_service import PaginationService
+from cdh_core_api.services.parallel_executor import ParallelExecutor
 from cdh_core_api.services.phone_book import PhoneBook
 from cdh_core_api.services.resource_link import ResourceLink
 from cdh_core_api.services.resource_payload_builder import ResourcePayloadBuilder
@@ -81,6 +93,7 @@ from cdh_core_api.services.visible_data_loader import VisibleDataLoader
 from cdh_core_api.validation.base import validate_hub
 from cryptography.fernet import Fernet
 
+from cdh_core.aws_clients.batching_log_writer import BatchingLogWriter
 from cdh_core.aws_clients.cloudwatch_log_writer import CloudwatchLogWriter
 from cdh_core.aws_clients.factory import AssumeRoleSessionProvider
 from cdh_core.aws_clients.factory import AwsClientFactory
@@ -107,17 +120,26 @@ __all__ = ["coreapi", "openapi"]
 
 LOG = logging.getLogger(__name__)
 
+Job = Callable[..., Dict[str, Any]]
+# Jobs are registered when this module is imported, which happens on the first invocation of a job
+JOBS_MODULE = "cdh_core_api.jobs"
+
 
 class Application:
     """This class contains the AWS lambda entry and represents the API."""
 
-    def __init__(self, openapi_collector: OpenApiSpecCollector):
+    def __init__(self, openapi_collector: OpenApiSpecCollector, route_manifest: Optional[RouteManifest] = None):
         self._dependency_manager = DependencyManager()
         self.dependency = self._dependency_manager.register
-        self._router = Router(set(ConfigFileLoader.get_config().stage_by_origin.instances), self._dependency_manager)
+        self._router = Router(
+            set(ConfigFileLoader.get_config().stage_by_origin.instances), self._dependency_manager, route_manifest
+        )
+        self.lazy_endpoint_imports = route_manifest is not None
         self._configured = False
         self._registered_dependencies = False
         self._openapi = openapi_collector
+        self._jobs: Dict[str, Job] = {}
+        self._invocation_context: Optional[LambdaContext] = None
 
     def _configure(self, context: LambdaContext) -> None:
         if self._configured:
@@ -128,23 +150,44 @@ class Application:
 
         self._dependency_manager.validate_dependencies()
         deps = self._dependency_manager.build_forever_dependencies()
+        self._router.add_latency_info_provider(deps["authorization_api_cache"].pop_statistics)
+        if "assume_role_session_provider" in deps:
+            self._router.add_latency_info_provider(deps["assume_role_session_provider"].pop_statistics)
+        self._router.add_latency_info_provider(deps["aws"].pop_statistics)
+        self._router.add_latency_info_provider(
+            lambda: {"realized_dependencies": self._dependency_manager.pop_realized_dependencies()}
+        )
+        audit_log_group_name = f"{os.environ.get('RESOURCE_NAME_PREFIX', '')}cdh-audit-log"
         self._router.set_audit_logger(
-            CloudwatchLogWriter(
-                deps["aws"].logs_client(
-                    account_id=deps["config"].lambda_account_id,
-                    account_purpose=AccountPurpose("api"),
-                    region=Region(os.environ["AWS_REGION"]),
+            BatchingLogWriter.for_log_group(
+                CloudwatchLogWriter(
+                    deps["aws"].logs_client(
+                        account_id=deps["config"].lambda_account_id,
+                        account_purpose=AccountPurpose("api"),
+                        region=Region(os.environ["AWS_REGION"]),
+                    ),
+                    audit_log_group_name,
+                    datetime.datetime.now().strftime("%Y/%m/%d"),
                 ),
-                f"{os.environ.get('RESOURCE_NAME_PREFIX', '')}cdh-audit-log",
-                datetime.datetime.now().strftime("%Y/%m/%d"),
+                audit_log_group_name,
             )
         )
+        self._router.compile_dependency_plans()
+        # routes imported lazily add their path and query schemas to the cache on their first request
+        prewarm_schemas([*self._router.get_request_schemas(), *find_dataclasses(cdh_core_api.bodies)])
         self._configured = True
 
     def _register_dependencies(self, context: LambdaContext) -> None:
         if self._registered_dependencies:
             return
         self.dependency("context", DependencyManager.TimeToLive.FOREVER)(lambda: context)
+        # the context of the first invocation builds the configuration, this one belongs to the current invocation
+        self.dependency("invocation_context", DependencyManager.TimeToLive.PER_REQUEST)(
+            lambda: self._invocation_context
+        )
+        self.dependency("authorization_api_cache", DependencyManager.TimeToLive.FOREVER)(
+            AuthorizationApiCache.from_environment
+        )
         self.dependency("current_hub", DependencyManager.TimeToLive.PER_REQUEST)(
             lambda config, request: validate_hub(ValidationContext(config, None), request.path_params["hub"])
             if "hub" in request.path_params
@@ -204,14 +247,33 @@ class Application:
 
         return decorator
 
+    def job(self, name: str) -> Callable[[Job], Job]:
+        """Register a job, which is run instead of a route when the lambda is invoked with the event {"job": name}.
+
+        Jobs are invoked by schedules or asynchronously by routes. Their arguments are built like the dependencies of a
+        route, except that there is no request. Instead, the invocation event can be injected as `event`.
+        """
+
+        def decorator(job: Job) -> Job:
+            if name in self._jobs:
+                raise ValueError(f"Several jobs were defined with the name {name}")
+            self._jobs[name] = job
+            return job
+
+        return decorator
+
     def handle_request(self, event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
         """Handle the AWS lambda request."""
         xray_recorder.begin_subsegment("configure and build_forever_dependencies")
         self._configure(context=context)
+        self._invocation_context = context
         deps = self._dependency_manager.build_forever_dependencies()
         deps["lock_service"].set_request_id(request_id=context.aws_request_id)
         xray_recorder.end_subsegment()
-        response = self._router.handle_request(event, context, deps["config"])
+        if "job" in event:
+            response = self._run_job(event)
+        else:
+            response = self._router.handle_request(event, context, deps["config"])
         if deps["lock_service"].lock_count != 0:
             LOG.error(
                 f"Lock service holds still {deps['lock_service'].lock_count} "
@@ -219,13 +281,44 @@ class Application:
             )
         return response
 
+    def _run_job(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        if event["job"] not in self._jobs:
+            importlib.import_module(JOBS_MODULE)
+        try:
+            job = self._jobs[event["job"]]
+        except KeyError as error:
+            raise UnknownJob(event["job"]) from error
+        LOG.info(f"Running job {event['job']}")
+        result = job(**self._dependency_manager.build_dependencies_for_callable(job, arguments={"event": event}))
+        LOG.info(f"Finished job {event['job']}: {result}")
+        return result
+
     def get_route(self, path: str, method: HttpVerb) -> AnyHandler:
         """Return the route handler for the path/method combination."""
         return self._router.get_route(path=path, method=method)
 
+    def import_all_routes(self) -> None:
+        """Import the endpoint modules of all routes, if they are imported lazily."""
+        self._router.import_all_handlers()
+
+    def get_route_manifest(self) -> RouteManifest:
+        """Return the manifest which maps the registered routes to the modules of their handlers."""
+        return self._router.get_route_manifest()
+
+
+class UnknownJob(Exception):
+    """Signals that the lambda was invoked with a job that has not been registered."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Job {name} does not exist")
+
 
 openapi = OpenApiSpecCollector()
-coreapi: Application = Application(openapi)
+# Endpoint modules are imported on the first request to one of their routes, see create_route_manifest.py
+coreapi: Application = Application(
+    openapi,
+    route_manifest=load_route_manifest() if os.environ.get("LAZY_ENDPOINT_IMPORTS", "").lower() == "true" else None,
+)
 coreapi.dependency("account_store", DependencyManager.TimeToLive.FOREVER)(lambda: AccountStore())
 coreapi.dependency("config", DependencyManager.TimeToLive.FOREVER)(
     lambda account_store, context: Config.from_environment_and_context(context, account_store)
@@ -247,7 +340,7 @@ coreapi.dependency("account_environment_verifier", DependencyManager.TimeToLive.
     lambda metadata_role_assumer: AccountEnvironmentVerifier(metadata_role_assumer)
 )
 coreapi.dependency("api_info_manager", DependencyManager.TimeToLive.FOREVER)(
-    lambda config: ApiInfoManager(config, openapi)
+    lambda config: ApiInfoManager(config, openapi, import_all_routes=coreapi.import_all_routes)
 )
 coreapi.dependency("s3_bucket_manager", DependencyManager.TimeToLive.FOREVER)(
     lambda config, aws: S3BucketManager(config, aws)
@@ -260,6 +353,9 @@ coreapi.dependency("filter_packages_table", DependencyManager.TimeToLive.FOREVER
 coreapi.dependency("resources_table", DependencyManager.TimeToLive.FOREVER)(
     lambda config: ResourcesTable(config.prefix)
 )
+coreapi.dependency("kms_key_access_table", DependencyManager.TimeToLive.FOREVER)(
+    lambda config: KmsKeyAccessTable(config.prefix)
+)
 coreapi.dependency("resource_link", DependencyManager.TimeToLive.FOREVER)(
     lambda aws, accounts_table, metadata_role_assumer: ResourceLink(aws, accounts_table, metadata_role_assumer)
 )
@@ -295,15 +391,21 @@ coreapi.dependency("requester_identity", DependencyManager.TimeToLive.PER_REQUES
         arn=request.requester_arn, user=request.user, jwt_user_id=extract_jwt_user_id(jwt)
     )
 )
-coreapi.dependency("authorization_api", DependencyManager.TimeToLive.PER_REQUEST)(
-    lambda authorization_api_session, request, jwt: AuthorizationApi(
-        authorization_api_session, request.requester_arn, jwt
+coreapi.dependency("authorization_api", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)(
+    lambda authorization_api_session, authorization_api_cache, request, jwt: CachingAuthorizationApi(
+        authorization_api_session,
+        request.requester_arn,
+        jwt,
+        cache=authorization_api_cache.for_request(
+            build_requester_key(request.requester_arn, jwt), mutating=request.http_verb is not HttpVerb.GET
+        ),
     )
 )
+coreapi.dependency("parallel_executor", DependencyManager.TimeToLive.FOREVER)(ParallelExecutor.from_environment)
 coreapi.dependency("full_vision_check", DependencyManager.TimeToLive.FOREVER)(
     lambda config, phone_book: FullVisionCheck(config, phone_book)
 )
-coreapi.dependency("visibility_check", DependencyManager.TimeToLive.PER_REQUEST)(
+coreapi.dependency("visibility_check", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)(
     lambda authorization_api, request, full_vision_check, config: VisibilityCheck(
         full_vision_check=full_vision_check,
         authorization_api=authorization_api,
@@ -326,7 +428,7 @@ coreapi.dependency("ssm_client", DependencyManager.TimeToLive.FOREVER)(
         region=Region(os.environ["AWS_REGION"]),
     )
 )
-coreapi.dependency("sns_publisher", DependencyManager.TimeToLive.PER_REQUEST)(
+coreapi.dependency("sns_publisher", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)(
     lambda config, sns_client, requester_identity: SnsPublisher(
         sns_client=sns_client, topic_arns=config.notification_topics, requester_identity=requester_identity
     )
@@ -353,12 +455,13 @@ coreapi.dependency("users_api", DependencyManager.TimeToLive.FOREVER)(
 
 
 @coreapi.dependency("visible_data_loader", DependencyManager.TimeToLive.PER_REQUEST)
-def _build_visible_data_loader(
+def _build_visible_data_loader(  # pylint: disable=too-many-arguments
     accounts_table: AccountsTable,
     resources_table: ResourcesTable,
     datasets_table: DatasetsTable,
     filter_packages_table: FilterPackagesTable,
     visibility_check: VisibilityCheck,
+    parallel_executor: ParallelExecutor,
 ) -> VisibleDataLoader[Account, S3Resource, GlueSyncResource]:
     return VisibleDataLoader(
         accounts_table=accounts_table,
@@ -366,10 +469,11 @@ def _build_visible_data_loader(
         datasets_table=datasets_table,
         filter_packages_table=filter_packages_table,
         visibility_check=visibility_check,
+        parallel_executor=parallel_executor,
     )
 
 
-@coreapi.dependency("account_manager", DependencyManager.TimeToLive.PER_REQUEST)
+@coreapi.dependency("account_manager", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)
 def _build_account_manager(
     accounts_table: AccountsTable,
     lock_service: LockService,
@@ -403,10 +507,11 @@ def _build_account_validator(  # pylint: disable=too-many-arguments
 
 
 coreapi.dependency("response_dataset_builder", DependencyManager.TimeToLive.PER_REQUEST)(
-    lambda config, authorization_api, phone_book: ResponseDatasetBuilder(
+    lambda config, authorization_api, phone_book, parallel_executor: ResponseDatasetBuilder(
         config=config,
         authorization_api=authorization_api,
         phone_book=phone_book,
+        parallel_executor=parallel_executor,
     )
 )
 coreapi.dependency("encryption_service", DependencyManager.TimeToLive.FOREVER)(
@@ -439,6 +544,37 @@ def _build_data_explorer_sync(  # pylint: disable=too-many-arguments
     )
 
 
+@coreapi.dependency("catalog_exporter", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)
+def _build_catalog_exporter(  # pylint: disable=too-many-arguments
+    config: Config,
+    invocation_context: LambdaContext,
+    aws: AwsClientFactory,
+    accounts_table: AccountsTable,
+    datasets_table: DatasetsTable,
+    resources_table: ResourcesTable,
+    parallel_executor: ParallelExecutor,
+) -> CatalogExporter[Account, S3Resource, GlueSyncResource]:
+    return CatalogExporter(
+        config=config,
+        s3_client=aws.s3_client(
+            account_id=config.lambda_account_id,
+            account_purpose=AccountPurpose("api"),
+            region=Region(os.environ["AWS_REGION"]),
+        ),
+        lambda_client=aws.lambda_client(
+            account_id=config.lambda_account_id,
+            account_purpose=AccountPurpose("api"),
+            region=Region(os.environ["AWS_REGION"]),
+        ),
+        # the job is run by the same version of the lambda as the request which starts the export
+        function_arn=invocation_context.invoked_function_arn,
+        accounts_table=accounts_table,
+        datasets_table=datasets_table,
+        resources_table=resources_table,
+        parallel_executor=parallel_executor,
+    )
+
+
 @coreapi.dependency("dataset_manager", DependencyManager.TimeToLive.FOREVER)
 def _build_dataset_manager(
     datasets_table: DatasetsTable,
@@ -462,6 +598,7 @@ def _build_s3_resource_manager(  # pylint: disable=too-many-arguments
     config: Config,
     resources_table: ResourcesTable,
     datasets_table: DatasetsTable,
+    kms_key_access_table: KmsKeyAccessTable,
     s3_bucket_manager: S3BucketManager,
     sns_topic_manager: SnsTopicManager,
     lock_service: LockService,
@@ -471,6 +608,7 @@ def _build_s3_resource_manager(  # pylint: disable=too-many-arguments
     return S3ResourceManager(
         resources_table=resources_table,
         datasets_table=datasets_table,
+        kms_key_access_table=kms_key_access_table,
         config=config,
         s3_bucket_manager=s3_bucket_manager,
         sns_topic_manager=sns_topic_manager,
@@ -481,7 +619,7 @@ def _build_s3_resource_manager(  # pylint: disable=too-many-arguments
     )
 
 
-@coreapi.dependency("authorizer", DependencyManager.TimeToLive.PER_REQUEST)
+@coreapi.dependency("authorizer", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)
 def _build_authorizer(
     request: Request,
     config: Config,
@@ -517,7 +655,7 @@ def _build_dataset_validator(  # pylint: disable=too-many-arguments
     )
 
 
-coreapi.dependency("dataset_participants_manager", DependencyManager.TimeToLive.PER_REQUEST)(
+coreapi.dependency("dataset_participants_manager", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)(
     lambda authorization_api, config, sns_publisher, users_api: DatasetParticipantsManager(
         authorization_api=authorization_api,
         config=config,
@@ -564,7 +702,7 @@ def _build_dataset_permissions_validator(
     )
 
 
-@coreapi.dependency("dataset_permissions_manager", DependencyManager.TimeToLive.PER_REQUEST)
+@coreapi.dependency("dataset_permissions_manager", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)
 def _build_dataset_permissions_manager(  # pylint: disable=too-many-arguments
     config: Config,
     datasets_table: DatasetsTable,
@@ -29,12 +29,15 @@ from typing import Tuple
 from typing import Union
 from unittest.mock import MagicMock
 from unittest.mock import Mock
+from unittest.mock import patch
 
 import pytest
+from cdh_core_api.api import router
 from cdh_core_api.api.openapi_spec.openapi import OpenApiSpecCollector
 from cdh_core_api.api.router import Router
 from cdh_core_api.app import Application
 from cdh_core_api.app import coreapi
+from cdh_core_api.app import UnknownJob
 from cdh_core_api.validation.common_paths import HubPath
 
 from cdh_core.entities.arn_test import build_arn
@@ -141,6 +144,7 @@ class TestApp:
     def setup_method(self) -> None:
         self.app = Application(OpenApiSpecCollector())
         self.aws = Mock()
+        self.aws.pop_statistics.return_value = {}
         self.config = Mock()
         self.config.disabled = False
         self.config.hubs = list(Hub)
@@ -228,6 +232,35 @@ class TestApp:
         self.app.handle_request(event, build_lambda_context())
         call_check.assert_called_once_with(BodySchema(value="bodyparam"))
 
+    def test_realized_dependencies_are_logged(self) -> None:
+        lazy_factory = Mock()
+
+        @self.app.dependency("lazy_value", DependencyManager.TimeToLive.PER_REQUEST, lazy=True)
+        def build_lazy_value() -> Any:
+            return lazy_factory()
+
+        self.app.dependency("eager_value", DependencyManager.TimeToLive.PER_REQUEST)(lambda lazy_value: lazy_value)
+
+        @self.app.route("/items", ["GET"])
+        def handler(eager_value: Mock) -> JsonResponse:  # pylint: disable=unused-argument
+            return JsonResponse()
+
+        @self.app.route("/items", ["POST"])
+        def use_lazy_handler(eager_value: Mock) -> JsonResponse:
+            eager_value.call()
+            return JsonResponse()
+
+        with patch.object(router, "LOG") as log:
+            self.app.handle_request(build_event("/items", "GET"), build_lambda_context())
+            self.app.handle_request(build_event("/items", "POST"), build_lambda_context())
+
+        latency_infos = [json.loads(call.args[0]) for call in log.info.call_args_list if call.args[0].startswith("{")]
+        assert [info["realized_dependencies"] for info in latency_infos] == [
+            ["eager_value"],
+            ["eager_value", "lazy_value"],
+        ]
+        lazy_factory.return_value.call.assert_called_once()
+
     def test_dependency_failure_recovery(self) -> None:
         return_value = 42
         flaky_calls: List[int] = []
@@ -252,6 +285,42 @@ class TestApp:
         response = self.app.handle_request(event, build_lambda_context())
         assert json.loads(response["body"]) == {"value": return_value}
 
+    def test_job(self) -> None:
+        self.app.dependency("value", DependencyManager.TimeToLive.FOREVER)(lambda: 42)
+
+        @self.app.job("my_job")
+        def job(value: int, event: Dict[str, Any]) -> Dict[str, Any]:
+            return {"value": value, "parameter": event["parameter"]}
+
+        @self.app.route("/items", ["GET"])
+        def handler() -> JsonResponse:
+            raise AssertionError()
+
+        result = self.app.handle_request({"job": "my_job", "parameter": "x"}, build_lambda_context())
+
+        assert result == {"value": 42, "parameter": "x"}
+
+    def test_invocation_context_of_each_invocation(self) -> None:
+        @self.app.job("my_job")
+        def job(context: LambdaContext, invocation_context: LambdaContext) -> Dict[str, Any]:
+            return {"context": context, "invocation_context": invocation_context}
+
+        first_context = build_lambda_context()
+        second_context = build_lambda_context()
+        self.app.handle_request({"job": "my_job"}, first_context)
+        result = self.app.handle_request({"job": "my_job"}, second_context)
+
+        assert result == {"context": first_context, "invocation_context": second_context}
+
+    def test_unknown_job(self) -> None:
+        with pytest.raises(UnknownJob):
+            self.app.handle_request({"job": Builder.build_random_string()}, build_lambda_context())
+
+    def test_duplicate_job(self) -> None:
+        self.app.job("my_job")(lambda: {})
+        with pytest.raises(ValueError):
+            self.app.job("my_job")(lambda: {})
+
 
 @pytest.mark.usefixtures("mock_xray")
 @pytest.mark.usefixtures("initialize_env_variables_for_config")
@@ -273,7 +342,9 @@ class CoreApiTestCase:
         self.core_api._router = self.router
 
         for dependency, ttl in self.dependencies_to_mock:
-            self.dependency_manager.register_constant(dependency, ttl, value=Mock(), force=True)
+            self.dependency_manager.register_constant(
+                dependency, ttl, value=Mock(**{"pop_statistics.return_value": {}}), force=True
+            )
 
     def run_test(self, example_data: Dict[str, Any]) -> None:
         http_verb = HttpVerb[example_data["method"]]
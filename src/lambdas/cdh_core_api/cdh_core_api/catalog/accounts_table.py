@@ -16,6 +16,7 @@ from datetime import datetime
 from typing import Any
 from typing import Dict
 from typing import Generic
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Type
@@ -113,10 +114,29 @@ class GenericAccountsTable(Generic[GenericAccount], BaseTable):
     def __init__(self, model_cls: Type[GenericAccountModel[GenericAccount]], prefix: str = "") -> None:
         self._model = create_model(table=f"{prefix}cdh-accounts", model=model_cls, module=__name__)
 
-    def get_all_accounts(self, consistent_read: bool = True) -> List[GenericAccount]:
-        """Get all accounts from the table."""
-        result = self._model.scan(consistent_read=consistent_read)
-        return [item.to_account() for item in result]
+    def get_all_accounts(self, consistent_read: bool = True, parallel_scan: bool = False) -> List[GenericAccount]:
+        """Get all accounts from the table.
+
+        If `parallel_scan` is set, the table is scanned in parallel segments and the accounts are returned in no
+        particular order.
+        """
+        return list(self.iter_all_accounts(consistent_read=consistent_read, parallel_scan=parallel_scan))
+
+    def iter_all_accounts(
+        self, hub: Optional[Hub] = None, consistent_read: bool = True, parallel_scan: bool = False
+    ) -> Iterator[GenericAccount]:
+        """Yield the accounts of the given hub, or all accounts, as they are read, see `get_all_accounts`.
+
+        The accounts are filtered by DynamoDB and not held in memory at once.
+        """
+        filter_condition = self._model.hub == hub if hub else None
+        result = (
+            self._parallel_scan(self._model, consistent_read=consistent_read, filter_condition=filter_condition)
+            if parallel_scan
+            else self._model.scan(consistent_read=consistent_read, filter_condition=filter_condition)
+        )
+        # the iteration cannot be resumed, the DynamoItemIterator only converts the errors of DynamoDB
+        return DynamoItemIterator(items=(item.to_account() for item in result), get_last_evaluated_key=lambda: None)
 
     def get(self, account_id: AccountId) -> GenericAccount:
         """Get one account from the table."""
@@ -29,6 +29,7 @@ from cdh_core_api.catalog.accounts_table import AccountModel
 from cdh_core_api.catalog.accounts_table import AccountNotFound
 from cdh_core_api.catalog.accounts_table import AccountsTable
 from cdh_core_api.catalog.base_test import get_nullable_attributes
+from cdh_core_api.catalog.base_test import simulate_scan_segments
 from mypy_boto3_dynamodb.service_resource import Table
 
 from cdh_core.entities.accounts import Account
@@ -135,6 +136,38 @@ class TestAccount(AccountsTableTest):
         assert len(account_list) == 2
         assert {account.id for account in account_list} == {account_id1, account_id2}
 
+    def test_get_all_accounts_parallel_scan(self) -> None:
+        accounts = [build_account() for _ in range(5)]
+        for account in accounts:
+            self.accounts_table.create(account)
+
+        with simulate_scan_segments(self.accounts_table._model, total_segments=2):  # pylint: disable=protected-access
+            account_list = self.accounts_table.get_all_accounts(parallel_scan=True)
+
+        assert sorted(account.id for account in account_list) == sorted(account.id for account in accounts)
+
+    def test_iter_all_accounts_of_hub(self) -> None:
+        hub = build_hub()
+        accounts = [build_account(hub=hub) for _ in range(3)]
+        for account in [*accounts, build_account(hub=Builder.get_random_element(Hub, exclude=[hub]))]:
+            self.accounts_table.create(account)
+
+        account_ids = sorted(account.id for account in self.accounts_table.iter_all_accounts(hub=hub))
+
+        assert account_ids == sorted(account.id for account in accounts)
+
+    def test_iter_all_accounts_of_hub_parallel_scan(self) -> None:
+        hub = build_hub()
+        accounts = [build_account(hub=hub) for _ in range(3)]
+        for account in [*accounts, build_account(hub=Builder.get_random_element(Hub, exclude=[hub]))]:
+            self.accounts_table.create(account)
+
+        with simulate_scan_segments(self.accounts_table._model, total_segments=2):  # pylint: disable=protected-access
+            accounts_iterator = self.accounts_table.iter_all_accounts(hub=hub, parallel_scan=True)
+            account_ids = sorted(account.id for account in accounts_iterator)
+
+        assert account_ids == sorted(account.id for account in accounts)
+
     def test_update_missing_account(self) -> None:
         new_hub = Builder.get_random_element(Hub, exclude=[self.account.hub])
 
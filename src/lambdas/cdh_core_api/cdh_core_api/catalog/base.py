@@ -11,40 +11,68 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import math
 import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from functools import wraps
+from logging import getLogger
+from queue import Full
+from queue import Queue
+from threading import Event
+from threading import Lock
 from typing import Any
 from typing import Callable
 from typing import cast
 from typing import Dict
+from typing import FrozenSet
 from typing import Generic
 from typing import Iterator
 from typing import NewType
 from typing import Optional
+from typing import Protocol
+from typing import Sequence
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 
 import pynamodb
 from pynamodb.attributes import Attribute
+from pynamodb.connection.base import Connection
 from pynamodb.constants import STRING
 from pynamodb.exceptions import GetError
 from pynamodb.exceptions import PynamoDBException
 from pynamodb.exceptions import QueryError
 from pynamodb.exceptions import ScanError
+from pynamodb.expressions.condition import Condition
 from pynamodb.models import Model
+from pynamodb.pagination import ResultIterator
+from pynamodb.transactions import TransactWrite
 
 from cdh_core.decorators import decorate_class
 from cdh_core.enums.aws import Partition
 from cdh_core.enums.aws import Region
 
+LOG = getLogger(__name__)
+
 M = TypeVar("M", bound=Model)  # pylint: disable=invalid-name
 T = TypeVar("T", bound=Callable[..., Any])  # pylint: disable=invalid-name
 LastEvaluatedKey = NewType("LastEvaluatedKey", Dict[str, Dict[str, Any]])
 
 NUM_RETRIES = 5
 SECONDS_BETWEEN_RETRIES = 1
+BATCH_GET_MAX_ITEMS = 100
+DEFAULT_PREFETCH_BUFFER_SIZE = 1000
+DEFAULT_SCAN_MAX_WORKERS = 4
+MAX_SCAN_SEGMENTS = 16
+BYTES_PER_SCAN_SEGMENT = 4 * 1024 * 1024
+# DynamoDB updates the reported table size only about every six hours
+SCAN_SEGMENTS_TTL_SECONDS = 3600
+
+_scan_segments_cache: Dict[str, Tuple[float, int]] = {}
 
 
 def catch_dynamo_errors(func: T) -> T:
@@ -88,6 +116,124 @@ class BaseTable:
         """Catch all dynamo errors within the subclasses."""
         decorate_class(cls=cls, decorator=catch_dynamo_errors)
 
+    @staticmethod
+    def _parallel_scan(  # pylint: disable=too-many-arguments,too-many-locals
+        model: Type[M],
+        consistent_read: bool,
+        filter_condition: Optional[Condition] = None,
+        attributes_to_get: Optional[Sequence[str]] = None,
+        total_segments: Optional[int] = None,
+        max_workers: int = DEFAULT_SCAN_MAX_WORKERS,
+        buffer_size: int = DEFAULT_PREFETCH_BUFFER_SIZE,
+        statistics: Optional["ReadStatistics"] = None,
+    ) -> Iterator[M]:
+        """Scan the whole table in segments that are read concurrently and yield the items as they arrive.
+
+        The items of different segments are interleaved in no particular order and the scan cannot be resumed, so use
+        it only for reads of the complete table. If `total_segments` is not given, it is derived from the table size,
+        see `get_scan_segments`. At most `max_workers` segments are read at the same time.
+        If `statistics` is given, every segment adds the number of items it read and returned once it has finished.
+        """
+        total_segments = total_segments or get_scan_segments(model)
+        if total_segments == 1:
+            result = model.scan(
+                consistent_read=consistent_read, filter_condition=filter_condition, attributes_to_get=attributes_to_get
+            )
+            try:
+                yield from result
+            finally:
+                if statistics is not None:
+                    statistics.add_result(result)
+            return
+        results: Queue[_PrefetchedItem[M]] = Queue(maxsize=buffer_size)
+        closed = Event()
+
+        @catch_dynamo_errors
+        def scan_segment(segment: int) -> None:
+            result = model.scan(
+                consistent_read=consistent_read,
+                filter_condition=filter_condition,
+                attributes_to_get=attributes_to_get,
+                segment=segment,
+                total_segments=total_segments,
+            )
+            try:
+                for item in result:
+                    if not _put_until_closed(results, _PrefetchedItem(item, None), closed):
+                        return
+            finally:
+                if statistics is not None:
+                    statistics.add_result(result)
+
+        def run_segment(segment: int) -> None:
+            try:
+                scan_segment(segment)
+            except Exception as error:  # pylint: disable=broad-except
+                _put_until_closed(results, _PrefetchedItem[M](None, None, error=error), closed)
+            else:
+                _put_until_closed(results, _PrefetchedItem[M](None, None, end=True), closed)
+
+        # The segments block while the buffer is full, so they must not run on the container-wide ParallelExecutor:
+        # they could occupy all of its workers and starve the calls that the request submits meanwhile. The pool ends
+        # with the scan, which also discards the segments that have not started when the iteration is stopped early.
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, total_segments), thread_name_prefix="parallel-scan")
+        try:
+            for segment in range(total_segments):
+                executor.submit(run_segment, segment)
+            remaining_segments = total_segments
+            while remaining_segments:
+                prefetched = results.get()
+                if prefetched.error:
+                    raise prefetched.error
+                if prefetched.end:
+                    remaining_segments -= 1
+                    continue
+                yield cast(M, prefetched.item)
+        finally:
+            closed.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ReadStatistics:
+    """Counts the items that DynamoDB read and the ones it returned after applying the filter condition."""
+
+    def __init__(self, read_count: int = 0, returned_count: int = 0) -> None:
+        self.read_count = read_count
+        self.returned_count = returned_count
+        self._lock = Lock()
+
+    @classmethod
+    def of_result(cls, result: ResultIterator[Any]) -> "ReadStatistics":
+        """Return the counts of a scan or query result."""
+        return cls(read_count=result.page_iter.total_scanned_count, returned_count=result.total_count)
+
+    def add_result(self, result: ResultIterator[Any]) -> None:
+        """Add the counts of a scan or query result, which may be read by another thread."""
+        with self._lock:
+            self.read_count += result.page_iter.total_scanned_count
+            self.returned_count += result.total_count
+
+
+def get_scan_segments(model: Type[Model]) -> int:
+    """Return the number of segments for a parallel scan of the table behind the model.
+
+    Every segment covers about BYTES_PER_SCAN_SEGMENT of the size that DynamoDB reports for the table, up to
+    MAX_SCAN_SEGMENTS. The result is cached per table for SCAN_SEGMENTS_TTL_SECONDS. If the table cannot be described,
+    a single segment is used.
+    """
+    table_name = model.Meta.table_name
+    cached = _scan_segments_cache.get(table_name)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    try:
+        table_size = int(model.describe_table().get("TableSizeBytes", 0))
+    except PynamoDBException:
+        LOG.warning(f"Could not determine the size of table {table_name}, scanning it in a single segment")
+        return 1
+    segments = max(1, min(MAX_SCAN_SEGMENTS, math.ceil(table_size / BYTES_PER_SCAN_SEGMENT)))
+    _scan_segments_cache[table_name] = (time.monotonic() + SCAN_SEGMENTS_TTL_SECONDS, segments)
+    return segments
+
 
 Thing = TypeVar("Thing")
 
@@ -112,18 +258,163 @@ class DynamoItemIterator(Generic[Thing], Iterator[Thing]):
         return self._get_last_evaluated_key()
 
 
+@dataclass(frozen=True)
+class VisibilityPredicate(Generic[Thing]):
+    """Decides which items are visible to the requester.
+
+    If the IDs of all visible items are known, `visible_ids` contains them, otherwise it is None.
+    """
+
+    is_visible: Callable[[Thing], bool]
+    visible_ids: Optional[FrozenSet[str]] = None
+
+
+@dataclass(frozen=True)
+class _PrefetchedItem(Generic[Thing]):
+    item: Optional[Thing]
+    last_evaluated_key: Optional[LastEvaluatedKey]
+    error: Optional[Exception] = None
+    end: bool = False
+
+
+class CallExecutor(Protocol):
+    """Runs calls in the background, like the ParallelExecutor of `cdh_core_api.services.parallel_executor`."""
+
+    @property
+    def is_concurrent(self) -> bool:
+        """Return whether submitted calls run concurrently instead of directly."""
+
+    def submit(self, name: str, func: Callable[[], None]) -> "Future[None]":
+        """Start the call and return a future of its result."""
+
+
+class PrefetchingDynamoItemIterator(DynamoItemIterator[Thing]):
+    """Iterates over the visible items of another DynamoItemIterator, reading ahead on a CallExecutor.
+
+    The items of the next page are fetched while the caller is still processing the current ones, at most `page_size`
+    visible items are held back. If the executor runs calls directly, the items are read when they are requested.
+    The visibility predicate is only requested once the first item has been read, so it may be determined concurrently
+    with the first page.
+    If `get_visible_items` is given and the predicate knows at most `batch_get_threshold` visible IDs, the source is
+    abandoned in favour of the iterator that `get_visible_items` returns for these IDs, unless it returns None.
+
+    Call `close` if the iterator is not consumed completely, so that the reading ahead stops after the current item.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        source: DynamoItemIterator[Thing],
+        get_visibility: Callable[[], VisibilityPredicate[Thing]],
+        parallel_executor: CallExecutor,
+        page_size: int,
+        get_visible_items: Optional[Callable[[FrozenSet[str]], Optional[DynamoItemIterator[Thing]]]] = None,
+        batch_get_threshold: int = BATCH_GET_MAX_ITEMS,
+    ) -> None:
+        super().__init__(items=self._consume(), get_last_evaluated_key=lambda: self._last_evaluated_key)
+        self._last_evaluated_key = source.last_evaluated_key
+        self._get_visibility = get_visibility
+        self._get_visible_items = get_visible_items
+        self._batch_get_threshold = batch_get_threshold
+        self._closed = Event()
+        self._prefetched = self._produce(source)
+        self._queue: Optional[Queue[_PrefetchedItem[Thing]]] = None
+        if parallel_executor.is_concurrent:
+            self._queue = Queue(maxsize=page_size)
+            parallel_executor.submit("prefetch items", self._fill_queue)
+
+    def close(self) -> None:
+        """Stop reading ahead."""
+        self._closed.set()
+
+    def _consume(self) -> Iterator[Thing]:
+        while True:
+            prefetched = self._get_next_prefetched()
+            self._last_evaluated_key = prefetched.last_evaluated_key
+            if prefetched.error:
+                raise prefetched.error
+            if prefetched.end:
+                return
+            yield cast(Thing, prefetched.item)
+
+    def _get_next_prefetched(self) -> _PrefetchedItem[Thing]:
+        if self._queue is None:
+            return next(self._prefetched)
+        return self._queue.get()
+
+    def _fill_queue(self) -> None:
+        queue = cast(Queue[_PrefetchedItem[Thing]], self._queue)
+        for prefetched in self._prefetched:
+            if not _put_until_closed(queue, prefetched, self._closed):
+                return
+
+    def _produce(self, source: DynamoItemIterator[Thing]) -> Iterator[_PrefetchedItem[Thing]]:
+        try:
+            yield from self._produce_visible_items(source, allow_batch_get=True)
+        except Exception as error:  # pylint: disable=broad-except
+            yield _PrefetchedItem(None, None, error=error)
+
+    def _produce_visible_items(
+        self, source: DynamoItemIterator[Thing], allow_batch_get: bool
+    ) -> Iterator[_PrefetchedItem[Thing]]:
+        visibility: Optional[VisibilityPredicate[Thing]] = None
+        for item in source:
+            if self._closed.is_set():
+                return
+            if visibility is None:
+                visibility = self._get_visibility()
+                if allow_batch_get and (visible_items := self._get_batch_get_source(visibility)) is not None:
+                    yield from self._produce_visible_items(visible_items, allow_batch_get=False)
+                    return
+            if visibility.is_visible(item):
+                yield _PrefetchedItem(item, source.last_evaluated_key)
+        yield _PrefetchedItem(None, source.last_evaluated_key, end=True)
+
+    def _get_batch_get_source(self, visibility: VisibilityPredicate[Thing]) -> Optional[DynamoItemIterator[Thing]]:
+        if (
+            self._get_visible_items is None
+            or visibility.visible_ids is None
+            or len(visibility.visible_ids) > self._batch_get_threshold
+        ):
+            return None
+        return self._get_visible_items(visibility.visible_ids)
+
+
+def _put_until_closed(queue: Queue[_PrefetchedItem[Thing]], prefetched: _PrefetchedItem[Thing], closed: Event) -> bool:
+    while not closed.is_set():
+        try:
+            queue.put(prefetched, timeout=0.1)
+            return True
+        except Full:
+            continue
+    return False
+
+
 class DateTimeAttribute(Attribute[datetime]):
-    """Represents a datetime attribute."""
+    """Represents a datetime attribute.
+
+    Values are stored in the fixed format DATETIME_FORMAT without a time zone. Since this format is the ISO format with
+    microseconds, values are converted with the ISO methods of datetime, which are much faster than strftime and
+    strptime. Stored values that deviate from the fixed length, e.g. with fewer fractional digits, are parsed with
+    strptime.
+    """
 
     attr_type = STRING
     DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+    _ISO_FORMAT_LENGTH = len("2000-01-01T00:00:00.000000")
 
     def serialize(self, value: datetime) -> str:
         """Convert the date object to a string."""
-        return value.strftime(self.DATETIME_FORMAT)
+        if value.tzinfo is not None:
+            value = value.replace(tzinfo=None)
+        return value.isoformat(timespec="microseconds")
 
     def deserialize(self, value: str) -> datetime:
         """Convert the given string to a date object."""
+        if len(value) == self._ISO_FORMAT_LENGTH and value[10] == "T" and value[19] == ".":
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                pass
         return datetime.strptime(value, self.DATETIME_FORMAT)
 
 
@@ -140,6 +431,15 @@ def create_model(table: str, model: Type[M], module: str) -> Type[M]:
     return type(model.__name__, (model,), {"Meta": Meta, "__module__": module})
 
 
+def transact_write() -> TransactWrite:
+    """Return a transaction whose writes are committed together when its context is exited without an error."""
+    return TransactWrite(
+        connection=Connection(
+            region=Region.preferred(Partition.default()).value, connect_timeout_seconds=1, read_timeout_seconds=3
+        )
+    )
+
+
 def conditional_check_failed(error: PynamoDBException) -> bool:
     """Return if the error is ConditionalCheckFailedException."""
     return error.cause_response_code == "ConditionalCheckFailedException"
@@ -11,7 +11,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import timezone
+from itertools import count
+from itertools import islice
 from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
 from typing import Set
 from typing import Type
 from unittest.mock import call
@@ -22,17 +32,26 @@ from unittest.mock import patch
 import pytest
 from botocore.exceptions import ClientError
 from cdh_core_api.catalog.base import BaseTable
+from cdh_core_api.catalog.base import BYTES_PER_SCAN_SEGMENT
 from cdh_core_api.catalog.base import catch_dynamo_errors
+from cdh_core_api.catalog.base import DateTimeAttribute
 from cdh_core_api.catalog.base import DynamoInternalServerError
 from cdh_core_api.catalog.base import DynamoItemIterator
+from cdh_core_api.catalog.base import get_scan_segments
 from cdh_core_api.catalog.base import LastEvaluatedKey
+from cdh_core_api.catalog.base import MAX_SCAN_SEGMENTS
 from cdh_core_api.catalog.base import NUM_RETRIES
+from cdh_core_api.catalog.base import PrefetchingDynamoItemIterator
+from cdh_core_api.catalog.base import ReadStatistics
 from cdh_core_api.catalog.base import SECONDS_BETWEEN_RETRIES
 from cdh_core_api.catalog.base import ThrottlingException
+from cdh_core_api.catalog.base import VisibilityPredicate
+from cdh_core_api.services.parallel_executor import ParallelExecutor
 from pynamodb.attributes import Attribute
 from pynamodb.exceptions import GetError
 from pynamodb.exceptions import QueryError
 from pynamodb.exceptions import ScanError
+from pynamodb.exceptions import TableError
 from pynamodb.models import Model
 
 from cdh_core_dev_tools.testing.builder import Builder
@@ -44,6 +63,30 @@ def build_last_evaluated_key() -> LastEvaluatedKey:
     )
 
 
+@contextmanager
+def simulate_scan_segments(model: Type[Model], total_segments: int) -> Iterator[None]:
+    """Split the items of a scan among the segments of a parallel scan, moto ignores Segment and TotalSegments."""
+    scan = model.scan
+
+    def scan_segment(segment: Optional[int] = None, total_segments: Optional[int] = None, **kwargs: Any) -> Any:
+        result = scan(**kwargs)
+        if segment is None or total_segments is None:
+            return result
+        items = [item for index, item in enumerate(result) if index % total_segments == segment]
+        # the items read by DynamoDB are split among the segments like the returned ones
+        read_count = len(range(segment, result.page_iter.total_scanned_count, total_segments))
+        segment_result = MagicMock(total_count=len(items))
+        segment_result.__iter__.return_value = iter(items)
+        segment_result.page_iter.total_scanned_count = read_count
+        return segment_result
+
+    with patch.object(model, "scan", side_effect=scan_segment) as mocked_scan, patch(
+        "cdh_core_api.catalog.base.get_scan_segments", return_value=total_segments
+    ):
+        yield
+    assert {call.kwargs.get("total_segments") for call in mocked_scan.call_args_list} == {total_segments}
+
+
 class TestDynamoErrorDecorator:
     @patch("time.sleep")
     def test_retryable_dynamo_error(self, mocked_sleep: Mock) -> None:
@@ -181,6 +224,305 @@ class TestDynamoItemIterator:
             next(iterator)
 
 
+class TestPrefetchingDynamoItemIterator:
+    def setup_method(self) -> None:
+        self.parallel_executor = ParallelExecutor(max_workers=2, trace=False)
+
+    @staticmethod
+    def build_source(items: List[int]) -> DynamoItemIterator[int]:
+        raw_items = iter(items)
+        keys: List[Optional[LastEvaluatedKey]] = [None]
+
+        def get_next() -> Iterator[int]:
+            for item in raw_items:
+                keys.append(LastEvaluatedKey({"item": {"N": str(item)}}))
+                yield item
+            keys.append(None)
+
+        return DynamoItemIterator(items=get_next(), get_last_evaluated_key=lambda: keys[-1])
+
+    def test_iterate_visible_items(self) -> None:
+        iterator = PrefetchingDynamoItemIterator(
+            source=self.build_source(list(range(10))),
+            get_visibility=lambda: VisibilityPredicate(lambda item: item % 2 == 0),
+            parallel_executor=self.parallel_executor,
+            page_size=10,
+        )
+
+        assert list(iterator) == [0, 2, 4, 6, 8]
+        assert iterator.last_evaluated_key is None
+
+    def test_last_evaluated_key_of_last_returned_item(self) -> None:
+        iterator = PrefetchingDynamoItemIterator(
+            source=self.build_source(list(range(10))),
+            get_visibility=lambda: VisibilityPredicate(lambda item: item % 2 == 0),
+            parallel_executor=self.parallel_executor,
+            page_size=10,
+        )
+
+        assert list(islice(iterator, 2)) == [0, 2]
+        iterator.close()
+
+        assert iterator.last_evaluated_key == {"item": {"N": "2"}}
+
+    def test_last_evaluated_key_before_iteration(self) -> None:
+        source = DynamoItemIterator[int](items=iter([]), get_last_evaluated_key=build_last_evaluated_key)
+        iterator = PrefetchingDynamoItemIterator(
+            source=source, get_visibility=Mock(), parallel_executor=self.parallel_executor, page_size=10
+        )
+
+        assert iterator.last_evaluated_key is not None
+        assert not list(iterator)
+
+    @staticmethod
+    def build_endless_source(read_items: List[int]) -> DynamoItemIterator[int]:
+        def read() -> Iterator[int]:
+            for item in count():
+                read_items.append(item)
+                yield item
+
+        return DynamoItemIterator(items=read(), get_last_evaluated_key=lambda: None)
+
+    def test_reads_ahead_at_most_one_page(self) -> None:
+        read_items: List[int] = []
+
+        iterator = PrefetchingDynamoItemIterator(
+            source=self.build_endless_source(read_items),
+            get_visibility=lambda: VisibilityPredicate(lambda _: True),
+            parallel_executor=self.parallel_executor,
+            page_size=5,
+        )
+        assert next(iterator) == 0
+        iterator.close()
+        time.sleep(0.3)
+
+        assert 5 <= len(read_items) <= 7
+
+    def test_close_stops_reading_invisible_items(self) -> None:
+        read_items: List[int] = []
+
+        iterator = PrefetchingDynamoItemIterator(
+            source=self.build_endless_source(read_items),
+            get_visibility=lambda: VisibilityPredicate(lambda item: item == 0),
+            parallel_executor=self.parallel_executor,
+            page_size=5,
+        )
+        assert next(iterator) == 0
+        iterator.close()
+        time.sleep(0.1)
+        number_of_read_items = len(read_items)
+        time.sleep(0.1)
+
+        assert len(read_items) == number_of_read_items
+
+    def test_reads_on_request_if_executor_is_not_concurrent(self) -> None:
+        read_items: List[int] = []
+
+        iterator = PrefetchingDynamoItemIterator(
+            source=self.build_endless_source(read_items),
+            get_visibility=lambda: VisibilityPredicate(lambda _: True),
+            parallel_executor=ParallelExecutor(max_workers=1, trace=False),
+            page_size=5,
+        )
+
+        assert list(islice(iterator, 3)) == [0, 1, 2]
+        assert read_items == [0, 1, 2]
+
+    def test_error_is_raised_by_next(self) -> None:
+        items = MagicMock()
+        items.__next__.side_effect = ValueError
+        source = DynamoItemIterator(items=items, get_last_evaluated_key=build_last_evaluated_key)
+
+        iterator = PrefetchingDynamoItemIterator(
+            source=source, get_visibility=Mock(), parallel_executor=self.parallel_executor, page_size=10
+        )
+
+        with pytest.raises(ValueError):
+            next(iterator)
+
+    @pytest.mark.parametrize("number_of_visible_ids", [3, 4])
+    def test_switch_to_visible_items(self, number_of_visible_ids: int) -> None:
+        visible_ids = frozenset(str(item) for item in range(number_of_visible_ids))
+        get_visible_items = Mock(return_value=self.build_source([2]))
+
+        iterator = PrefetchingDynamoItemIterator(
+            source=self.build_source(list(range(10))),
+            get_visibility=lambda: VisibilityPredicate(lambda item: str(item) in visible_ids, visible_ids),
+            parallel_executor=self.parallel_executor,
+            page_size=10,
+            get_visible_items=get_visible_items,
+            batch_get_threshold=3,
+        )
+
+        if number_of_visible_ids <= 3:
+            assert list(iterator) == [2]
+            get_visible_items.assert_called_once_with(visible_ids)
+        else:
+            assert list(iterator) == [0, 1, 2, 3]
+            get_visible_items.assert_not_called()
+
+    def test_keep_source_if_visible_items_are_unavailable(self) -> None:
+        iterator = PrefetchingDynamoItemIterator(
+            source=self.build_source(list(range(3))),
+            get_visibility=lambda: VisibilityPredicate(lambda _: True, frozenset()),
+            parallel_executor=self.parallel_executor,
+            page_size=10,
+            get_visible_items=Mock(return_value=None),
+        )
+
+        assert list(iterator) == [0, 1, 2]
+
+
+class TestParallelScan:
+    @staticmethod
+    def build_model(items_by_segment: Dict[Optional[int], Iterator[int]]) -> Mock:
+        model = Mock()
+        model.scan.side_effect = lambda segment=None, **_: items_by_segment[segment]
+        return model
+
+    def test_items_of_all_segments(self) -> None:
+        model = self.build_model({0: iter([0, 1]), 1: iter([]), 2: iter([2, 3, 4])})
+        filter_condition = Mock()
+
+        items: Iterator[int] = BaseTable._parallel_scan(  # pylint: disable=protected-access
+            model, consistent_read=True, filter_condition=filter_condition, total_segments=3, max_workers=2
+        )
+
+        assert sorted(items) == [0, 1, 2, 3, 4]
+        model.scan.assert_has_calls(
+            [
+                call(
+                    consistent_read=True,
+                    filter_condition=filter_condition,
+                    attributes_to_get=None,
+                    segment=segment,
+                    total_segments=3,
+                )
+                for segment in range(3)
+            ],
+            any_order=True,
+        )
+
+    def test_single_segment_is_scanned_directly(self) -> None:
+        model = self.build_model({None: iter([0, 1])})
+
+        items: Iterator[int] = BaseTable._parallel_scan(  # pylint: disable=protected-access
+            model, consistent_read=False, total_segments=1
+        )
+
+        assert list(items) == [0, 1]
+        model.scan.assert_called_once_with(consistent_read=False, filter_condition=None, attributes_to_get=None)
+
+    def test_dynamo_error_converted(self) -> None:
+        client_error = ClientError(error_response={"Error": {"Code": "ThrottlingException"}}, operation_name="")
+
+        def failing_segment() -> Iterator[int]:
+            yield 1
+            raise ScanError("", client_error)
+
+        model = self.build_model({0: iter([0]), 1: failing_segment()})
+
+        with pytest.raises(ThrottlingException):
+            list(BaseTable._parallel_scan(model, True, total_segments=2))  # pylint: disable=protected-access
+
+    def test_stop_reading_when_closed(self) -> None:
+        produced = count()
+        model = self.build_model({0: (next(produced) for _ in count()), 1: iter([])})
+        items: Iterator[int] = BaseTable._parallel_scan(  # pylint: disable=protected-access
+            model, consistent_read=True, total_segments=2, buffer_size=1
+        )
+
+        assert len(list(islice(items, 3))) == 3
+        items.close()  # type: ignore[attr-defined]
+        time.sleep(0.3)
+        number_produced = next(produced)
+        time.sleep(0.3)
+
+        assert next(produced) == number_produced + 1
+
+    def test_statistics_of_all_segments(self) -> None:
+        def build_result(items: List[int], read_count: int) -> MagicMock:
+            result = MagicMock(total_count=len(items))
+            result.__iter__.return_value = iter(items)
+            result.page_iter.total_scanned_count = read_count
+            return result
+
+        model = Mock()
+        results = {0: build_result([0, 1], read_count=5), 1: build_result([], read_count=3)}
+        model.scan.side_effect = lambda segment, **_: results[segment]
+        statistics = ReadStatistics()
+
+        items: List[int] = list(
+            BaseTable._parallel_scan(  # pylint: disable=protected-access
+                model, consistent_read=True, total_segments=2, statistics=statistics
+            )
+        )
+
+        assert sorted(items) == [0, 1]
+        assert (statistics.read_count, statistics.returned_count) == (8, 2)
+
+
+class TestGetScanSegments:
+    @pytest.mark.parametrize(
+        "table_size, segments",
+        [(0, 1), (BYTES_PER_SCAN_SEGMENT, 1), (3 * BYTES_PER_SCAN_SEGMENT - 1, 3), (10**12, MAX_SCAN_SEGMENTS)],
+    )
+    def test_segments_depend_on_table_size(self, table_size: int, segments: int) -> None:
+        model = Mock()
+        model.Meta.table_name = Builder.build_random_string()
+        model.describe_table.return_value = {"TableSizeBytes": table_size}
+
+        assert get_scan_segments(model) == segments
+
+    def test_segments_are_cached(self) -> None:
+        model = Mock()
+        model.Meta.table_name = Builder.build_random_string()
+        model.describe_table.return_value = {"TableSizeBytes": 2 * BYTES_PER_SCAN_SEGMENT}
+
+        assert get_scan_segments(model) == get_scan_segments(model) == 2
+        model.describe_table.assert_called_once()
+
+    def test_single_segment_if_table_cannot_be_described(self) -> None:
+        model = Mock()
+        model.Meta.table_name = Builder.build_random_string()
+        model.describe_table.side_effect = TableError("AccessDenied")
+
+        assert get_scan_segments(model) == 1
+
+
+class TestDateTimeAttribute:
+    @pytest.mark.parametrize(
+        "value",
+        [
+            datetime(2022, 3, 4, 5, 6, 7, 891011),
+            datetime(2022, 3, 4),
+            datetime(2022, 3, 4, 5, 6, 7, 8, tzinfo=timezone.utc),
+        ],
+    )
+    def test_same_format_as_strftime(self, value: datetime) -> None:
+        serialized = DateTimeAttribute().serialize(value)
+
+        assert serialized == value.strftime(DateTimeAttribute.DATETIME_FORMAT)
+        assert DateTimeAttribute().deserialize(serialized) == value.replace(tzinfo=None)
+
+    @pytest.mark.parametrize("value", ["2022-03-04T05:06:07.891011", "2022-03-04T05:06:07.5"])
+    def test_same_result_as_strptime(self, value: str) -> None:
+        assert DateTimeAttribute().deserialize(value) == datetime.strptime(value, DateTimeAttribute.DATETIME_FORMAT)
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "2022-03-04T05:06:07",
+            "2022-03-04 05:06:07.891011",
+            "2022-03-04T05:06:07.8910+0",
+            "2022-13-04T05:06:07.891011",
+        ],
+    )
+    def test_invalid_value(self, value: str) -> None:
+        with pytest.raises(ValueError):
+            DateTimeAttribute().deserialize(value)
+
+
 def get_nullable_attributes(model: Type[Model]) -> Set[str]:
     """Return all nullable attributes."""
     return {name for name, attr in model.get_attributes().items() if attr.null}
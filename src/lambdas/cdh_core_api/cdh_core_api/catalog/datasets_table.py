@@ -20,11 +20,14 @@ from datetime import datetime
 from logging import getLogger
 from typing import Any
 from typing import cast
+from typing import Collection
 from typing import Dict
 from typing import FrozenSet
+from typing import Iterable
 from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Set
 
 from cdh_core_api.catalog.base import BaseTable
@@ -44,7 +47,10 @@ from pynamodb.exceptions import PutError
 from pynamodb.exceptions import UpdateError
 from pynamodb.expressions.condition import Comparison
 from pynamodb.expressions.update import Action
+from pynamodb.indexes import AllProjection
+from pynamodb.indexes import GlobalSecondaryIndex
 from pynamodb.models import Model
+from pynamodb.pagination import ResultIterator
 from pynamodb_attributes import IntegerAttribute
 from pynamodb_attributes import UnicodeEnumAttribute
 
@@ -73,6 +79,8 @@ from cdh_core.optionals import apply_if_not_none
 from cdh_core.primitives.account_id import AccountId
 
 LOG = getLogger(__name__)
+# marks a LastEvaluatedKey that was issued while reading a given set of datasets in the order of their ids
+BATCH_GET_KEY_MARKER = "batch_get"
 
 
 class _DatasetAccountPermissionAttribute(MapAttribute[str, Any]):
@@ -118,6 +126,24 @@ class _DatasetLineageAttribute(MapAttribute[str, Any]):
         return DatasetLineage(upstream=cast(Set[DatasetId], self.upstream or set()))
 
 
+class _DatasetHubIndex(GlobalSecondaryIndex["_DatasetModel"]):  # type: ignore[no-untyped-call]
+    class Meta:
+        index_name = "hub-index"
+        projection = AllProjection()
+
+    hub = UnicodeAttribute(hash_key=True)
+    id = UnicodeAttribute(range_key=True)
+
+
+class _DatasetOwnerIndex(GlobalSecondaryIndex["_DatasetModel"]):  # type: ignore[no-untyped-call]
+    class Meta:
+        index_name = "owner-index"
+        projection = AllProjection()
+
+    owner_account_id = UnicodeAttribute(hash_key=True)
+    id = UnicodeAttribute(range_key=True)
+
+
 class _DatasetModel(Model):
     id = UnicodeAttribute(hash_key=True)
     business_object = LazyEnumAttribute[BusinessObject](lambda: BusinessObject)
@@ -150,6 +176,8 @@ class _DatasetModel(Model):
     support_group = UnicodeAttribute(null=True)
     status = LazyEnumAttribute[DatasetStatus](lambda: DatasetStatus)
     purpose = UnicodeSetAttribute()
+    hub_index = _DatasetHubIndex()
+    owner_index = _DatasetOwnerIndex()
 
     def dataset(self) -> Dataset:
         """Create a dataset from the model."""
@@ -177,14 +205,7 @@ class _DatasetModel(Model):
             layer=self.layer,
             lineage=self.lineage.lineage,
             name=self.name,
-            permissions=frozenset(
-                {
-                    DatasetAccountPermission(
-                        account_id=AccountId(p.account_id), stage=p.stage, region=p.region, sync_type=p.sync_type
-                    )
-                    for p in self.permissions
-                }
-            ),
+            permissions=self.dataset_account_permissions(),
             preview_available=self.preview_available,
             retention_period=self.retention_period if self.retention_period else RetentionPeriod.undefined,
             source_identifier=SourceIdentifier(self.source_identifier),
@@ -198,6 +219,17 @@ class _DatasetModel(Model):
             quality_score=self.quality_score,
         )
 
+    def dataset_account_permissions(self) -> FrozenSet[DatasetAccountPermission]:
+        """Convert the permissions of the model."""
+        return frozenset(
+            {
+                DatasetAccountPermission(
+                    account_id=AccountId(p.account_id), stage=p.stage, region=p.region, sync_type=p.sync_type
+                )
+                for p in self.permissions
+            }
+        )
+
     @classmethod
     def from_dataset(cls, dataset: Dataset) -> "_DatasetModel":
         """Create a model based on a dataset object."""
@@ -234,6 +266,68 @@ class _DatasetModel(Model):
         )
 
 
+class DatasetSummary:
+    """A dataset of which only a few attributes were read from DynamoDB.
+
+    The attributes in ATTRIBUTES are always read, other attributes only if they were requested. Accessing an attribute
+    that was not read raises an AttributeError. Nested attributes are converted when they are accessed for the first
+    time, so summaries of datasets that are merely counted or filtered by ID never pay for their conversion.
+    """
+
+    ATTRIBUTES = frozenset({"id", "hub", "name", "owner_account_id"})
+    OPTIONAL_ATTRIBUTES = frozenset({"lineage", "permissions"})
+
+    def __init__(self, model: _DatasetModel, attributes: FrozenSet[str]):
+        self._model = model
+        self._attributes = attributes
+        self._lineage: Optional[DatasetLineage] = None
+        self._permissions: Optional[FrozenSet[DatasetAccountPermission]] = None
+
+    @property
+    def id(self) -> DatasetId:  # pylint: disable=invalid-name
+        """Return the id of the dataset."""
+        return DatasetId(self._model.id)
+
+    @property
+    def hub(self) -> Hub:
+        """Return the hub of the dataset."""
+        return Hub(self._model.hub)
+
+    @property
+    def name(self) -> str:
+        """Return the name of the dataset."""
+        return self._model.name
+
+    @property
+    def owner_account_id(self) -> AccountId:
+        """Return the id of the account that owns the dataset."""
+        return AccountId(self._model.owner_account_id)
+
+    @property
+    def lineage(self) -> DatasetLineage:
+        """Return the lineage of the dataset, if it was read."""
+        if self._lineage is None:
+            self._check_read("lineage")
+            self._lineage = self._model.lineage.lineage
+        return self._lineage
+
+    @property
+    def permissions(self) -> FrozenSet[DatasetAccountPermission]:
+        """Return the account permissions of the dataset, if they were read."""
+        if self._permissions is None:
+            self._check_read("permissions")
+            self._permissions = self._model.dataset_account_permissions()
+        return self._permissions
+
+    def _check_read(self, attribute: str) -> None:
+        if attribute not in self._attributes:
+            raise AttributeError(f"The attribute {attribute} was not read for dataset {self._model.id}")
+
+    def __repr__(self) -> str:
+        """Return the representation of the summary."""
+        return f"DatasetSummary(id={self._model.id!r}, attributes={sorted(self._attributes)})"
+
+
 # pylint: disable=no-member
 class DatasetsTable(BaseTable):
     """Represents the DynamoDB table for datasets."""
@@ -252,33 +346,222 @@ class DatasetsTable(BaseTable):
             raise DatasetNotFound(dataset_id) from error
 
     def list(
-        self, hub: Optional[Hub] = None, owner: Optional[AccountId] = None, consistent_read: bool = True
+        self,
+        hub: Optional[Hub] = None,
+        owner: Optional[AccountId] = None,
+        consistent_read: bool = True,
+        parallel_scan: bool = False,
     ) -> List[Dataset]:
-        """Return a list of all matching datasets."""
-        return list(self.get_datasets_iterator(hub=hub, owner=owner, consistent_read=consistent_read))
+        """Return a list of all matching datasets.
+
+        If `parallel_scan` is set and the datasets cannot be read from an index, the table is scanned in parallel
+        segments and the datasets are returned in no particular order.
+        """
+        return list(self.iter_list(hub=hub, owner=owner, consistent_read=consistent_read, parallel_scan=parallel_scan))
+
+    def iter_list(
+        self,
+        hub: Optional[Hub] = None,
+        owner: Optional[AccountId] = None,
+        consistent_read: bool = True,
+        parallel_scan: bool = False,
+    ) -> Iterator[Dataset]:
+        """Yield all matching datasets as they are read, so that they are not held in memory at once, see `list`."""
+        models = iter(
+            self._list_models(hub=hub, owner=owner, consistent_read=consistent_read, parallel_scan=parallel_scan)
+        )
+        # the iteration cannot be resumed, the DynamoItemIterator only converts the errors of DynamoDB
+        return DynamoItemIterator(items=(model.dataset() for model in models), get_last_evaluated_key=lambda: None)
+
+    def list_summaries(  # pylint: disable=too-many-arguments
+        self,
+        hub: Optional[Hub] = None,
+        owner: Optional[AccountId] = None,
+        attributes: Collection[str] = (),
+        consistent_read: bool = True,
+        parallel_scan: bool = False,
+    ) -> List[DatasetSummary]:
+        """Return summaries of all matching datasets.
+
+        Only the attributes of DatasetSummary.ATTRIBUTES and the given `attributes` are read from DynamoDB, which
+        saves read bandwidth and the conversion of all other attributes. See `list` for the meaning of `parallel_scan`.
+        """
+        if unsupported := set(attributes) - DatasetSummary.ATTRIBUTES - DatasetSummary.OPTIONAL_ATTRIBUTES:
+            raise ValueError(f"Dataset summaries do not support the attributes {sorted(unsupported)}")
+        projected_attributes = DatasetSummary.ATTRIBUTES.union(attributes)
+        return [
+            DatasetSummary(model, projected_attributes)
+            for model in self._list_models(
+                hub=hub,
+                owner=owner,
+                consistent_read=consistent_read,
+                parallel_scan=parallel_scan,
+                attributes_to_get=sorted(projected_attributes),
+            )
+        ]
+
+    def _list_models(  # pylint: disable=too-many-arguments
+        self,
+        hub: Optional[Hub],
+        owner: Optional[AccountId],
+        consistent_read: bool,
+        parallel_scan: bool,
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> Iterable[_DatasetModel]:
+        if self._can_query_index(hub=hub, owner=owner, consistent_read=consistent_read, last_evaluated_key=None):
+            return self._query_index(hub=hub, owner=owner, last_evaluated_key=None, attributes_to_get=attributes_to_get)
+        if parallel_scan:
+            return self._parallel_scan(
+                self._model,
+                consistent_read=consistent_read,
+                filter_condition=self._get_scan_filter(hub, owner),
+                attributes_to_get=attributes_to_get,
+            )
+        return self._scan(
+            hub=hub,
+            owner=owner,
+            consistent_read=consistent_read,
+            last_evaluated_key=None,
+            attributes_to_get=attributes_to_get,
+        )
 
-    def get_datasets_iterator(
+    def get_datasets_iterator(  # pylint: disable=too-many-arguments
         self,
         hub: Optional[Hub] = None,
         owner: Optional[AccountId] = None,
         consistent_read: bool = True,
         last_evaluated_key: Optional[LastEvaluatedKey] = None,
+        dataset_ids: Optional[Collection[str]] = None,
     ) -> DynamoItemIterator[Dataset]:
-        """Get an iterator over all matching datasets."""
+        """Get an iterator over all matching datasets.
+
+        Eventually consistent reads filtered by owner or hub query the corresponding global secondary index instead of
+        scanning the whole table. Global secondary indexes do not support consistent reads, so these still use a scan.
+
+        If `dataset_ids` is given, only these datasets are read via batch requests, in the order of their IDs. A
+        LastEvaluatedKey issued by such an iteration can only be resumed by another one, see `is_batch_get_key`.
+        """
+        if dataset_ids is not None:
+            return self._get_datasets_iterator_by_ids(
+                dataset_ids=dataset_ids,
+                hub=hub,
+                owner=owner,
+                consistent_read=consistent_read,
+                last_evaluated_key=last_evaluated_key,
+            )
+        if self.is_batch_get_key(last_evaluated_key):
+            raise ValueError("A LastEvaluatedKey issued while reading given dataset ids requires these ids to resume")
+        if self._can_query_index(
+            hub=hub, owner=owner, consistent_read=consistent_read, last_evaluated_key=last_evaluated_key
+        ):
+            result_iterator = self._query_index(hub=hub, owner=owner, last_evaluated_key=last_evaluated_key)
+        else:
+            result_iterator = self._scan(
+                hub=hub, owner=owner, consistent_read=consistent_read, last_evaluated_key=last_evaluated_key
+            )
+        return DynamoItemIterator(
+            items=(model.dataset() for model in result_iterator),
+            get_last_evaluated_key=lambda: apply_if_not_none(LastEvaluatedKey)(result_iterator.last_evaluated_key),
+        )
+
+    @staticmethod
+    def is_batch_get_key(last_evaluated_key: Optional[LastEvaluatedKey]) -> bool:
+        """Return whether the LastEvaluatedKey was issued while reading given dataset ids."""
+        return last_evaluated_key is not None and BATCH_GET_KEY_MARKER in last_evaluated_key
+
+    def _get_datasets_iterator_by_ids(  # pylint: disable=too-many-arguments
+        self,
+        dataset_ids: Collection[str],
+        hub: Optional[Hub],
+        owner: Optional[AccountId],
+        consistent_read: bool,
+        last_evaluated_key: Optional[LastEvaluatedKey],
+    ) -> DynamoItemIterator[Dataset]:
+        start_after = last_evaluated_key["id"]["S"] if last_evaluated_key else ""
+        models = self._model.batch_get(
+            items=sorted(dataset_id for dataset_id in set(dataset_ids) if dataset_id > start_after),
+            consistent_read=consistent_read,
+        )
+        datasets = sorted(
+            (
+                dataset
+                for dataset in (model.dataset() for model in models)
+                if (hub is None or dataset.hub is hub) and (owner is None or dataset.owner_account_id == owner)
+            ),
+            key=lambda dataset: dataset.id,
+        )
+        current_last_evaluated_key = last_evaluated_key
+
+        def items() -> Iterator[Dataset]:
+            nonlocal current_last_evaluated_key
+            for dataset in datasets:
+                current_last_evaluated_key = LastEvaluatedKey(
+                    {"id": {"S": dataset.id}, BATCH_GET_KEY_MARKER: {"BOOL": True}}
+                )
+                yield dataset
+            current_last_evaluated_key = None
+
+        return DynamoItemIterator(items=items(), get_last_evaluated_key=lambda: current_last_evaluated_key)
+
+    @staticmethod
+    def _can_query_index(
+        hub: Optional[Hub],
+        owner: Optional[AccountId],
+        consistent_read: bool,
+        last_evaluated_key: Optional[LastEvaluatedKey],
+    ) -> bool:
+        if consistent_read or not (hub or owner):
+            return False
+        # A LastEvaluatedKey issued by a scan (e.g. in a NextPageToken created before the index existed) lacks the
+        # index key and can only be resumed by a scan.
+        index_hash_key = "owner_account_id" if owner else "hub"
+        return last_evaluated_key is None or index_hash_key in last_evaluated_key
+
+    def _query_index(
+        self,
+        hub: Optional[Hub],
+        owner: Optional[AccountId],
+        last_evaluated_key: Optional[LastEvaluatedKey],
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> ResultIterator[_DatasetModel]:
+        if owner:
+            return self._model.query(
+                hash_key=owner,
+                index_name=_DatasetOwnerIndex.Meta.index_name,
+                filter_condition=(_DatasetModel.hub == hub) if hub else None,
+                last_evaluated_key=last_evaluated_key,
+                attributes_to_get=attributes_to_get,
+            )
+        return self._model.query(
+            hash_key=cast(Hub, hub).value,
+            index_name=_DatasetHubIndex.Meta.index_name,
+            last_evaluated_key=last_evaluated_key,
+            attributes_to_get=attributes_to_get,
+        )
+
+    def _scan(  # pylint: disable=too-many-arguments
+        self,
+        hub: Optional[Hub],
+        owner: Optional[AccountId],
+        consistent_read: bool,
+        last_evaluated_key: Optional[LastEvaluatedKey],
+        attributes_to_get: Optional[Sequence[str]] = None,
+    ) -> ResultIterator[_DatasetModel]:
+        return self._model.scan(
+            consistent_read=consistent_read,
+            filter_condition=self._get_scan_filter(hub, owner),
+            last_evaluated_key=last_evaluated_key,
+            attributes_to_get=attributes_to_get,
+        )
+
+    @staticmethod
+    def _get_scan_filter(hub: Optional[Hub], owner: Optional[AccountId]) -> Optional[Comparison]:
         filter_expression: Optional[Comparison] = None
         if hub:
             filter_expression &= _DatasetModel.hub == hub
         if owner:
             filter_expression &= _DatasetModel.owner_account_id == owner
-        result_iterator = self._model.scan(
-            consistent_read=consistent_read,
-            filter_condition=filter_expression,
-            last_evaluated_key=last_evaluated_key,
-        )
-        return DynamoItemIterator(
-            items=(model.dataset() for model in result_iterator),
-            get_last_evaluated_key=lambda: apply_if_not_none(LastEvaluatedKey)(result_iterator.last_evaluated_key),
-        )
+        return filter_expression
 
     def create(self, dataset: Dataset) -> None:
         """Create a dataset."""
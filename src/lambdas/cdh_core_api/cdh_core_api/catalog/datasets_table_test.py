@@ -28,10 +28,12 @@ import pytest
 from asserts import assert_count_equal
 from cdh_core_api.catalog.base_test import get_attributes_of_type
 from cdh_core_api.catalog.base_test import get_nullable_attributes
+from cdh_core_api.catalog.base_test import simulate_scan_segments
 from cdh_core_api.catalog.datasets_table import _DatasetModel
 from cdh_core_api.catalog.datasets_table import DatasetAlreadyExists
 from cdh_core_api.catalog.datasets_table import DatasetNotFound
 from cdh_core_api.catalog.datasets_table import DatasetsTable
+from cdh_core_api.catalog.datasets_table import DatasetSummary
 from cdh_core_api.catalog.datasets_table import DatasetUpdateInconsistent
 from mypy_boto3_dynamodb.service_resource import Table
 from pynamodb.attributes import UnicodeAttribute
@@ -107,6 +109,86 @@ def test_list_with_hubs(mock_datasets_dynamo_table: Table, resource_name_prefix:
     assert {dataset.id for dataset in datasets} == {dataset.id for dataset in expected_datasets}
 
 
+def test_list_with_hubs_parallel_scan(mock_datasets_dynamo_table: Table, resource_name_prefix: str) -> None:
+    expected_datasets = [build_dataset(name=f"dataset{i}") for i in range(5)]
+    other_hub = Builder.get_random_element(
+        to_choose_from=list(Hub), exclude={dataset.hub for dataset in expected_datasets}
+    )
+    with mock_datasets_dynamo_table.batch_writer() as batch:
+        for dataset in expected_datasets + [build_dataset(hub=other_hub)]:
+            batch.put_item(build_dynamo_json(dataset))
+    datasets_table = DatasetsTable(resource_name_prefix)
+
+    with simulate_scan_segments(datasets_table._model, total_segments=3):  # pylint: disable=protected-access
+        datasets = datasets_table.list(hub=Hub("global"), parallel_scan=True)
+
+    assert sorted(dataset.id for dataset in datasets) == sorted(dataset.id for dataset in expected_datasets)
+
+
+def test_iter_list_parallel_scan(mock_datasets_dynamo_table: Table, resource_name_prefix: str) -> None:
+    expected_datasets = [build_dataset(hub=Hub("global")) for _ in range(5)]
+    other_hub = Builder.get_random_element(to_choose_from=list(Hub), exclude={Hub("global")})
+    with mock_datasets_dynamo_table.batch_writer() as batch:
+        for dataset in expected_datasets + [build_dataset(hub=other_hub)]:
+            batch.put_item(build_dynamo_json(dataset))
+    datasets_table = DatasetsTable(resource_name_prefix)
+
+    with simulate_scan_segments(datasets_table._model, total_segments=3):  # pylint: disable=protected-access
+        datasets = datasets_table.iter_list(hub=Hub("global"), parallel_scan=True)
+        dataset_ids = sorted(dataset.id for dataset in datasets)
+
+    assert dataset_ids == sorted(dataset.id for dataset in expected_datasets)
+
+
+class TestListSummaries:
+    @pytest.fixture(autouse=True)
+    def dynamo_setup(self, mock_datasets_dynamo_table: Table, resource_name_prefix: str) -> None:
+        self.datasets = [build_dataset() for _ in range(3)]
+        with mock_datasets_dynamo_table.batch_writer() as batch:
+            for dataset in self.datasets:
+                batch.put_item(build_dynamo_json(dataset))
+        self.datasets_table = DatasetsTable(resource_name_prefix)
+
+    def test_summary_attributes(self) -> None:
+        summaries = self.datasets_table.list_summaries()
+
+        assert sorted((summary.id, summary.hub, summary.name, summary.owner_account_id) for summary in summaries) == (
+            sorted((dataset.id, dataset.hub, dataset.name, dataset.owner_account_id) for dataset in self.datasets)
+        )
+
+    def test_only_projected_attributes_are_read(self) -> None:
+        model = self.datasets_table._model  # pylint: disable=protected-access
+        with patch.object(model, "scan", wraps=model.scan) as scan:  # pylint: disable=no-member
+            summaries = self.datasets_table.list_summaries(attributes=["permissions"])
+
+        assert scan.call_args.kwargs["attributes_to_get"] == ["hub", "id", "name", "owner_account_id", "permissions"]
+        datasets_by_id = {dataset.id: dataset for dataset in self.datasets}
+        for summary in summaries:
+            assert summary.permissions == datasets_by_id[summary.id].permissions
+            assert summary._model.description is None  # pylint: disable=protected-access
+            with pytest.raises(AttributeError):
+                summary.lineage  # pylint: disable=pointless-statement
+
+    def test_filter_by_owner_from_index(self) -> None:
+        owner = self.datasets[0].owner_account_id
+
+        summaries = self.datasets_table.list_summaries(owner=owner, attributes=["lineage"], consistent_read=False)
+
+        assert [(summary.id, summary.lineage) for summary in summaries] == [
+            (self.datasets[0].id, self.datasets[0].lineage)
+        ]
+
+    def test_parallel_scan(self) -> None:
+        with simulate_scan_segments(self.datasets_table._model, total_segments=2):  # pylint: disable=protected-access
+            summaries = self.datasets_table.list_summaries(parallel_scan=True)
+
+        assert sorted(summary.id for summary in summaries) == sorted(dataset.id for dataset in self.datasets)
+
+    def test_unsupported_attribute(self) -> None:
+        with pytest.raises(ValueError):
+            self.datasets_table.list_summaries(attributes=["description"])
+
+
 def test_list_with_owner(mock_datasets_dynamo_table: Table, resource_name_prefix: str) -> None:
     datasets = [build_dataset(name=f"dataset{i}") for i in range(3)]
     expected_datasets = [datasets[0]]
@@ -602,6 +684,121 @@ class TestGetDatasetsIterator:
             assert first_item == second_item
             assert first_iterator.last_evaluated_key == second_iterator.last_evaluated_key
 
+    @pytest.mark.parametrize("mock_config_file", [CONFIG_FILE_MULTIPLE_PARTITIONS_ENVIRONMENTS_HUBS], indirect=True)
+    def test_iterate_filter_by_hub_queries_index(
+        self, mock_config_file: ConfigFile  # pylint: disable=unused-argument
+    ) -> None:
+        hub, other_hub = Builder.choose_without_repetition(list(Hub), 2)
+        expected_datasets = [build_dataset(hub=hub) for _ in range(5)]
+        other_datasets = [build_dataset(hub=other_hub) for _ in range(5)]
+        self._fill_dynamo(datasets=expected_datasets + other_datasets)
+
+        with patch.object(self.datasets_table._model, "scan") as scan:  # pylint: disable=protected-access
+            iterator = self.datasets_table.get_datasets_iterator(hub=hub, consistent_read=False)
+            datasets = list(iterator)
+
+        assert_count_equal(datasets, expected_datasets)
+        assert iterator.last_evaluated_key is None
+        scan.assert_not_called()
+
+    @pytest.mark.parametrize("mock_config_file", [CONFIG_FILE_MULTIPLE_PARTITIONS_ENVIRONMENTS_HUBS], indirect=True)
+    def test_iterate_filter_by_owner_and_hub_queries_index(
+        self, mock_config_file: ConfigFile  # pylint: disable=unused-argument
+    ) -> None:
+        hub, other_hub = Builder.choose_without_repetition(list(Hub), 2)
+        owner = build_account_id()
+        expected_datasets = [build_dataset(hub=hub, owner_account_id=owner) for _ in range(3)]
+        other_datasets = [build_dataset(hub=other_hub, owner_account_id=owner) for _ in range(3)] + [
+            build_dataset(hub=hub) for _ in range(3)
+        ]
+        self._fill_dynamo(datasets=expected_datasets + other_datasets)
+
+        with patch.object(self.datasets_table._model, "scan") as scan:  # pylint: disable=protected-access
+            datasets = list(self.datasets_table.get_datasets_iterator(hub=hub, owner=owner, consistent_read=False))
+
+        assert_count_equal(datasets, expected_datasets)
+        scan.assert_not_called()
+
+    @pytest.mark.parametrize("mock_config_file", [CONFIG_FILE_MULTIPLE_PARTITIONS_ENVIRONMENTS_HUBS], indirect=True)
+    def test_iterate_index_with_last_evaluated_key_resumes(
+        self, mock_config_file: ConfigFile  # pylint: disable=unused-argument
+    ) -> None:
+        hub, other_hub = Builder.choose_without_repetition(list(Hub), 2)
+        expected_datasets = [build_dataset(hub=hub) for _ in range(5)]
+        other_datasets = [build_dataset(hub=other_hub) for _ in range(5)]
+        self._fill_dynamo(datasets=expected_datasets + other_datasets)
+        cutoff = randint(1, len(expected_datasets) - 1)
+        first_iterator = self.datasets_table.get_datasets_iterator(hub=hub, consistent_read=False)
+        for _ in range(cutoff):
+            next(first_iterator)
+
+        second_iterator = self.datasets_table.get_datasets_iterator(
+            last_evaluated_key=first_iterator.last_evaluated_key, hub=hub, consistent_read=False
+        )
+
+        for first_item, second_item in itertools.zip_longest(first_iterator, second_iterator):
+            assert first_item == second_item
+            assert first_iterator.last_evaluated_key == second_iterator.last_evaluated_key
+
+    @pytest.mark.parametrize("mock_config_file", [CONFIG_FILE_MULTIPLE_PARTITIONS_ENVIRONMENTS_HUBS], indirect=True)
+    def test_iterate_resumes_scan_last_evaluated_key_with_scan(
+        self, mock_config_file: ConfigFile  # pylint: disable=unused-argument
+    ) -> None:
+        hub, other_hub = Builder.choose_without_repetition(list(Hub), 2)
+        expected_datasets = [build_dataset(hub=hub) for _ in range(5)]
+        other_datasets = [build_dataset(hub=other_hub) for _ in range(5)]
+        self._fill_dynamo(datasets=expected_datasets + other_datasets)
+        first_iterator = self.datasets_table.get_datasets_iterator(hub=hub)
+        first_datasets = [next(first_iterator)]
+
+        second_iterator = self.datasets_table.get_datasets_iterator(
+            last_evaluated_key=first_iterator.last_evaluated_key, hub=hub, consistent_read=False
+        )
+
+        assert_count_equal(first_datasets + list(second_iterator), expected_datasets)
+
+    @pytest.mark.parametrize("mock_config_file", [CONFIG_FILE_MULTIPLE_PARTITIONS_ENVIRONMENTS_HUBS], indirect=True)
+    def test_iterate_by_ids(self, mock_config_file: ConfigFile) -> None:  # pylint: disable=unused-argument
+        hub, other_hub = Builder.choose_without_repetition(list(Hub), 2)
+        expected_datasets = [build_dataset(hub=hub) for _ in range(5)]
+        other_hub_dataset = build_dataset(hub=other_hub)
+        self._fill_dynamo(datasets=expected_datasets + [other_hub_dataset, build_dataset(hub=hub)])
+
+        iterator = self.datasets_table.get_datasets_iterator(
+            hub=hub,
+            consistent_read=False,
+            dataset_ids=[dataset.id for dataset in expected_datasets] + [other_hub_dataset.id, build_dataset_id()],
+        )
+
+        assert list(iterator) == sorted(expected_datasets, key=lambda dataset: dataset.id)
+        assert iterator.last_evaluated_key is None
+
+    def test_iterate_by_ids_resumes(self) -> None:
+        datasets = [build_dataset() for _ in range(5)]
+        self._fill_dynamo(datasets=datasets)
+        dataset_ids = [dataset.id for dataset in datasets]
+        cutoff = randint(1, len(datasets) - 1)
+        first_iterator = self.datasets_table.get_datasets_iterator(dataset_ids=dataset_ids)
+        first_datasets = [next(first_iterator) for _ in range(cutoff)]
+        assert DatasetsTable.is_batch_get_key(first_iterator.last_evaluated_key)
+
+        second_iterator = self.datasets_table.get_datasets_iterator(
+            dataset_ids=dataset_ids, last_evaluated_key=first_iterator.last_evaluated_key
+        )
+
+        assert first_datasets + list(second_iterator) == sorted(datasets, key=lambda dataset: dataset.id)
+
+    def test_iterate_by_ids_cannot_be_resumed_without_ids(self) -> None:
+        datasets = [build_dataset() for _ in range(5)]
+        self._fill_dynamo(datasets=datasets)
+        first_iterator = self.datasets_table.get_datasets_iterator(dataset_ids=[dataset.id for dataset in datasets])
+        next(first_iterator)
+
+        with pytest.raises(ValueError):
+            self.datasets_table.get_datasets_iterator(
+                last_evaluated_key=first_iterator.last_evaluated_key, consistent_read=False
+            )
+
     def _fill_dynamo(self, datasets: Collection[Dataset]) -> None:
         datasets_shuffled: Sequence[Dataset] = sample(list(datasets), len(datasets))
         with self.mock_datasets_dynamo_table.batch_writer() as batch:
@@ -609,6 +806,10 @@ class TestGetDatasetsIterator:
                 batch.put_item(build_dynamo_json(dataset))
 
 
+def build_dataset_summary(dataset: Dataset, attributes: Collection[str] = ()) -> DatasetSummary:
+    return DatasetSummary(_DatasetModel.from_dataset(dataset), DatasetSummary.ATTRIBUTES.union(attributes))
+
+
 def build_dynamo_json(dataset: Dataset) -> Dict[str, Any]:
     result = {
         "id": dataset.id,
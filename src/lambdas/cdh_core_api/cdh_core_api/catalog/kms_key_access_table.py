@@ -0,0 +1,270 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from contextlib import contextmanager
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+from logging import getLogger
+from typing import FrozenSet
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from cdh_core_api.catalog.base import BaseTable
+from cdh_core_api.catalog.base import create_model
+from cdh_core_api.catalog.base import DateTimeAttribute
+from cdh_core_api.catalog.base import LazyEnumAttribute
+from pynamodb.attributes import UnicodeAttribute
+from pynamodb.attributes import UnicodeSetAttribute
+from pynamodb.exceptions import DoesNotExist
+from pynamodb.models import Model
+from pynamodb.transactions import TransactWrite
+
+from cdh_core.entities.dataset import DatasetId
+from cdh_core.enums.aws import Region
+from cdh_core.enums.resource_properties import Stage
+from cdh_core.primitives.account_id import AccountId
+
+LOG = getLogger(__name__)
+
+# Range key of the item that marks a partition whose entries have been rebuilt at least once
+_REBUILT_MARKER = "#rebuilt"
+
+
+@dataclass(frozen=True)
+class KmsKeyAccess:
+    """The accounts that need access to the shared KMS key of a resource account because of a single S3 resource."""
+
+    resource_account_id: AccountId
+    region: Region
+    dataset_id: DatasetId
+    stage: Stage
+    account_ids_with_read_access: FrozenSet[AccountId]
+    account_ids_with_write_access: FrozenSet[AccountId]
+
+
+class _KmsKeyAccessModel(Model):
+    resource_account_id_region = UnicodeAttribute(hash_key=True)
+    id = UnicodeAttribute(range_key=True)
+    resource_account_id = UnicodeAttribute()
+    region = LazyEnumAttribute[Region](lambda: Region)
+    dataset_id = UnicodeAttribute()
+    stage = LazyEnumAttribute[Stage](lambda: Stage)
+    # DynamoDB does not store empty sets, hence both attributes are nullable
+    account_ids_with_read_access = UnicodeSetAttribute(null=True)
+    account_ids_with_write_access = UnicodeSetAttribute(null=True)
+
+    @property
+    def kms_key_access(self) -> KmsKeyAccess:
+        return KmsKeyAccess(
+            resource_account_id=AccountId(self.resource_account_id),
+            region=self.region,
+            dataset_id=DatasetId(self.dataset_id),
+            stage=self.stage,
+            account_ids_with_read_access=frozenset(
+                AccountId(account_id) for account_id in self.account_ids_with_read_access or set()
+            ),
+            account_ids_with_write_access=frozenset(
+                AccountId(account_id) for account_id in self.account_ids_with_write_access or set()
+            ),
+        )
+
+
+class _KmsKeyAccessRebuiltModel(Model):
+    resource_account_id_region = UnicodeAttribute(hash_key=True)
+    id = UnicodeAttribute(range_key=True)
+    rebuilt_at = DateTimeAttribute()
+
+
+# pylint: disable=no-member
+class KmsKeyAccessTable(BaseTable):
+    """Represents the DynamoDB table that keeps track of the accounts with access to the shared KMS keys.
+
+    The table is a materialized view of the S3 resources and the dataset permissions: each S3 resource contributes
+    one item to the partition of its resource account and region. The union over a partition yields the readers and
+    writers of the shared KMS key, so that the key policy can be regenerated without listing every dataset.
+    A partition is complete only once it has been rebuilt, which is recorded by a marker item, see `is_rebuilt`.
+    """
+
+    def __init__(self, prefix: str = "") -> None:
+        self._model = create_model(f"{prefix}cdh-kms-key-access", model=_KmsKeyAccessModel, module=__name__)
+        self._rebuilt_model = create_model(
+            f"{prefix}cdh-kms-key-access", model=_KmsKeyAccessRebuiltModel, module=__name__
+        )
+
+    def get(self, resource_account_id: AccountId, region: Region, dataset_id: DatasetId, stage: Stage) -> KmsKeyAccess:
+        """Return the KMS key access caused by the S3 resource of the given dataset and stage."""
+        hash_key = self._get_hash_key(resource_account_id, region)
+        range_key = self._get_range_key(dataset_id, stage)
+        try:
+            return self._model.get(hash_key=hash_key, range_key=range_key, consistent_read=True).kms_key_access
+        except DoesNotExist as error:
+            raise KmsKeyAccessNotFound(hash_key, range_key) from error
+
+    def list(self, resource_account_id: AccountId, region: Region) -> List[KmsKeyAccess]:
+        """List all KMS key access entries of a resource account and region."""
+        return [
+            model.kms_key_access
+            for model in self._model.query(
+                hash_key=self._get_hash_key(resource_account_id, region), consistent_read=True
+            )
+            if model.id != _REBUILT_MARKER
+        ]
+
+    def is_rebuilt(self, resource_account_id: AccountId, region: Region) -> bool:
+        """Return whether the entries of a resource account and region have been rebuilt at least once.
+
+        Partitions that were never rebuilt may lack the entries of S3 resources that were created before the table was
+        introduced, so their entries must not be used to regenerate a key policy.
+        """
+        try:
+            self._rebuilt_model.get(
+                hash_key=self._get_hash_key(resource_account_id, region),
+                range_key=_REBUILT_MARKER,
+                consistent_read=True,
+            )
+        except DoesNotExist:
+            return False
+        return True
+
+    def get_account_ids_with_access(
+        self, resource_account_id: AccountId, region: Region
+    ) -> Tuple[Set[AccountId], Set[AccountId]]:
+        """Return the account ids with read access and write access to the shared KMS key."""
+        return self.combine(self.list(resource_account_id, region))
+
+    @staticmethod
+    def combine(kms_key_accesses: List[KmsKeyAccess]) -> Tuple[Set[AccountId], Set[AccountId]]:
+        """Merge the given entries into the account ids with read access and write access."""
+        account_ids_with_read_access: Set[AccountId] = set()
+        account_ids_with_write_access: Set[AccountId] = set()
+        for kms_key_access in kms_key_accesses:
+            account_ids_with_read_access.update(kms_key_access.account_ids_with_read_access)
+            account_ids_with_write_access.update(kms_key_access.account_ids_with_write_access)
+        return account_ids_with_read_access, account_ids_with_write_access
+
+    def put(self, kms_key_access: KmsKeyAccess, transaction: Optional[TransactWrite] = None) -> None:
+        """Create or overwrite the entry of an S3 resource, if a transaction is given when it is committed."""
+        model = self._model(
+            resource_account_id_region=self._get_hash_key(kms_key_access.resource_account_id, kms_key_access.region),
+            id=self._get_range_key(kms_key_access.dataset_id, kms_key_access.stage),
+            resource_account_id=kms_key_access.resource_account_id,
+            region=kms_key_access.region,
+            dataset_id=kms_key_access.dataset_id,
+            stage=kms_key_access.stage,
+            account_ids_with_read_access=set(kms_key_access.account_ids_with_read_access) or None,
+            account_ids_with_write_access=set(kms_key_access.account_ids_with_write_access) or None,
+        )
+        if transaction:
+            transaction.save(model)
+        else:
+            model.save()
+
+    @contextmanager
+    def put_transaction(self, kms_key_access: KmsKeyAccess) -> Iterator[None]:
+        """Create or overwrite the entry of an S3 resource and restore the previous state on failure."""
+        previous: Optional[KmsKeyAccess] = None
+        with suppress(KmsKeyAccessNotFound):
+            previous = self.get(
+                resource_account_id=kms_key_access.resource_account_id,
+                region=kms_key_access.region,
+                dataset_id=kms_key_access.dataset_id,
+                stage=kms_key_access.stage,
+            )
+        self.put(kms_key_access)
+        try:
+            yield
+        except:  # noqa: E722 (bare-except)
+            try:
+                if previous:
+                    self.put(previous)
+                else:
+                    self.delete(
+                        resource_account_id=kms_key_access.resource_account_id,
+                        region=kms_key_access.region,
+                        dataset_id=kms_key_access.dataset_id,
+                        stage=kms_key_access.stage,
+                    )
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception(f"Could not roll back KMS key access entry {kms_key_access}")
+            raise
+
+    def delete(  # pylint: disable=too-many-arguments
+        self,
+        resource_account_id: AccountId,
+        region: Region,
+        dataset_id: DatasetId,
+        stage: Stage,
+        transaction: Optional[TransactWrite] = None,
+    ) -> None:
+        """Delete the entry of an S3 resource, if a transaction is given when it is committed.
+
+        Deleting a non-existing entry is a no-op.
+        """
+        model = self._model(
+            resource_account_id_region=self._get_hash_key(resource_account_id, region),
+            id=self._get_range_key(dataset_id, stage),
+        )
+        if transaction:
+            transaction.delete(model)
+        else:
+            model.delete()
+
+    def rebuild(
+        self, resource_account_id: AccountId, region: Region, kms_key_accesses: List[KmsKeyAccess]
+    ) -> List[KmsKeyAccess]:
+        """Replace all entries of a resource account and region and return the entries that had to be changed.
+
+        Entries that are missing or deviate from the given ones are written, entries without a counterpart are deleted.
+        Afterwards, the partition is marked as rebuilt.
+        """
+        current = {(entry.dataset_id, entry.stage): entry for entry in self.list(resource_account_id, region)}
+        expected = {(entry.dataset_id, entry.stage): entry for entry in kms_key_accesses}
+        changed: List[KmsKeyAccess] = []
+        for key, entry in expected.items():
+            if current.get(key) != entry:
+                self.put(entry)
+                changed.append(entry)
+        for key, entry in current.items():
+            if key not in expected:
+                self.delete(
+                    resource_account_id=resource_account_id,
+                    region=region,
+                    dataset_id=entry.dataset_id,
+                    stage=entry.stage,
+                )
+                changed.append(entry)
+        self._rebuilt_model(
+            resource_account_id_region=self._get_hash_key(resource_account_id, region),
+            id=_REBUILT_MARKER,
+            rebuilt_at=datetime.now(),
+        ).save()
+        return changed
+
+    @staticmethod
+    def _get_hash_key(resource_account_id: AccountId, region: Region) -> str:
+        return f"{resource_account_id}_{region.value}"
+
+    @staticmethod
+    def _get_range_key(dataset_id: DatasetId, stage: Stage) -> str:
+        return f"{dataset_id}_{stage.value}"
+
+
+class KmsKeyAccessNotFound(Exception):
+    """The KMS key access entry was not found."""
+
+    def __init__(self, hash_key: str, range_key: str):
+        super().__init__(f"KMS key access entry {range_key} was not found in {hash_key}")
@@ -0,0 +1,168 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import replace
+from typing import Optional
+
+import pytest
+from asserts import assert_count_equal
+from cdh_core_api.catalog.base import transact_write
+from cdh_core_api.catalog.kms_key_access_table import KmsKeyAccess
+from cdh_core_api.catalog.kms_key_access_table import KmsKeyAccessNotFound
+from cdh_core_api.catalog.kms_key_access_table import KmsKeyAccessTable
+
+from cdh_core.entities.dataset_test import build_dataset_id
+from cdh_core.enums.aws import Region
+from cdh_core.enums.aws_test import build_region
+from cdh_core.enums.resource_properties_test import build_stage
+from cdh_core.primitives.account_id import AccountId
+from cdh_core.primitives.account_id_test import build_account_id
+
+
+def build_kms_key_access(
+    resource_account_id: Optional[AccountId] = None, region: Optional[Region] = None, number_of_readers: int = 3
+) -> KmsKeyAccess:
+    return KmsKeyAccess(
+        resource_account_id=resource_account_id or build_account_id(),
+        region=region or build_region(),
+        dataset_id=build_dataset_id(),
+        stage=build_stage(),
+        account_ids_with_read_access=frozenset(build_account_id() for _ in range(number_of_readers)),
+        account_ids_with_write_access=frozenset({build_account_id(), build_account_id()}),
+    )
+
+
+class TestKmsKeyAccessTable:
+    @pytest.fixture(autouse=True)
+    def dynamo_setup(self, kms_key_access_table: KmsKeyAccessTable) -> None:
+        self.table = kms_key_access_table
+        self.resource_account_id = build_account_id()
+        self.region = build_region()
+
+    def _build(self, number_of_readers: int = 3) -> KmsKeyAccess:
+        return build_kms_key_access(self.resource_account_id, self.region, number_of_readers)
+
+    def test_put_and_get(self) -> None:
+        kms_key_access = self._build()
+        self.table.put(kms_key_access)
+
+        assert (
+            self.table.get(
+                self.resource_account_id, self.region, dataset_id=kms_key_access.dataset_id, stage=kms_key_access.stage
+            )
+            == kms_key_access
+        )
+
+    def test_put_without_readers(self) -> None:
+        kms_key_access = self._build(number_of_readers=0)
+        self.table.put(kms_key_access)
+
+        assert self.table.list(self.resource_account_id, self.region) == [kms_key_access]
+
+    def test_get_non_existing(self) -> None:
+        with pytest.raises(KmsKeyAccessNotFound):
+            self.table.get(self.resource_account_id, self.region, dataset_id=build_dataset_id(), stage=build_stage())
+
+    def test_list_only_returns_partition(self) -> None:
+        kms_key_accesses = [self._build() for _ in range(3)]
+        for kms_key_access in kms_key_accesses:
+            self.table.put(kms_key_access)
+        self.table.put(build_kms_key_access(region=self.region))
+
+        assert_count_equal(self.table.list(self.resource_account_id, self.region), kms_key_accesses)
+
+    def test_get_account_ids_with_access(self) -> None:
+        kms_key_accesses = [self._build() for _ in range(3)]
+        for kms_key_access in kms_key_accesses:
+            self.table.put(kms_key_access)
+
+        readers, writers = self.table.get_account_ids_with_access(self.resource_account_id, self.region)
+
+        assert readers == set().union(*(entry.account_ids_with_read_access for entry in kms_key_accesses))
+        assert writers == set().union(*(entry.account_ids_with_write_access for entry in kms_key_accesses))
+
+    def test_delete(self) -> None:
+        kms_key_access = self._build()
+        self.table.put(kms_key_access)
+
+        self.table.delete(
+            self.resource_account_id, self.region, dataset_id=kms_key_access.dataset_id, stage=kms_key_access.stage
+        )
+
+        assert self.table.list(self.resource_account_id, self.region) == []
+
+    def test_delete_non_existing_is_noop(self) -> None:
+        self.table.delete(self.resource_account_id, self.region, dataset_id=build_dataset_id(), stage=build_stage())
+
+    def test_put_transaction_success(self) -> None:
+        kms_key_access = self._build()
+
+        with self.table.put_transaction(kms_key_access):
+            pass
+
+        assert self.table.list(self.resource_account_id, self.region) == [kms_key_access]
+
+    def test_put_transaction_restores_previous_entry(self) -> None:
+        previous = self._build()
+        self.table.put(previous)
+
+        with pytest.raises(ValueError):
+            with self.table.put_transaction(replace(previous, account_ids_with_read_access=frozenset())):
+                raise ValueError()
+
+        assert self.table.list(self.resource_account_id, self.region) == [previous]
+
+    def test_put_transaction_removes_new_entry(self) -> None:
+        with pytest.raises(ValueError):
+            with self.table.put_transaction(self._build()):
+                raise ValueError()
+
+        assert self.table.list(self.resource_account_id, self.region) == []
+
+    def test_rebuild(self) -> None:
+        unchanged, outdated, orphaned = [self._build() for _ in range(3)]
+        for kms_key_access in [unchanged, outdated, orphaned]:
+            self.table.put(kms_key_access)
+        updated = replace(outdated, account_ids_with_read_access=frozenset({build_account_id()}))
+        missing = self._build()
+
+        changed = self.table.rebuild(self.resource_account_id, self.region, [unchanged, updated, missing])
+
+        assert_count_equal(changed, [updated, missing, orphaned])
+        assert_count_equal(self.table.list(self.resource_account_id, self.region), [unchanged, updated, missing])
+
+    def test_rebuild_marks_partition_as_rebuilt(self) -> None:
+        self.table.put(self._build())
+        assert not self.table.is_rebuilt(self.resource_account_id, self.region)
+
+        self.table.rebuild(self.resource_account_id, self.region, [])
+
+        assert self.table.is_rebuilt(self.resource_account_id, self.region)
+        assert self.table.list(self.resource_account_id, self.region) == []
+
+    def test_put_and_delete_in_transaction(self) -> None:
+        kms_key_access, other = self._build(), self._build()
+        self.table.put(other)
+
+        with transact_write() as transaction:
+            self.table.put(kms_key_access, transaction=transaction)
+            self.table.delete(
+                self.resource_account_id,
+                self.region,
+                dataset_id=other.dataset_id,
+                stage=other.stage,
+                transaction=transaction,
+            )
+            assert self.table.list(self.resource_account_id, self.region) == [other]
+
+        assert self.table.list(self.resource_account_id, self.region) == [kms_key_access]
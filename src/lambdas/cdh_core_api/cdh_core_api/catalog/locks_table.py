@@ -68,9 +68,18 @@ class LocksTable(BaseTable):
         except DoesNotExist as error:
             raise LockNotFound(lock_id) from error
 
-    def list(self) -> List[Lock]:
-        """Return a list of all locks."""
-        return [model.lock() for model in self._model.scan(consistent_read=True)]
+    def list(self, parallel_scan: bool = False) -> List[Lock]:
+        """Return a list of all locks.
+
+        If `parallel_scan` is set, the table is scanned in parallel segments and the locks are returned in no
+        particular order.
+        """
+        models = (
+            self._parallel_scan(self._model, consistent_read=True)
+            if parallel_scan
+            else self._model.scan(consistent_read=True)
+        )
+        return [model.lock() for model in models]
 
     def create(self, lock: Lock) -> None:
         """Create a lock."""
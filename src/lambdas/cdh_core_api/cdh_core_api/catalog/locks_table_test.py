@@ -16,6 +16,7 @@ from typing import Any
 from typing import Dict
 
 import pytest
+from cdh_core_api.catalog.base_test import simulate_scan_segments
 from cdh_core_api.catalog.locks_table import LockAlreadyExists
 from cdh_core_api.catalog.locks_table import LocksTable
 from mypy_boto3_dynamodb.service_resource import Table
@@ -71,6 +72,28 @@ def test_create_existing_lock(resource_name_prefix: str) -> None:
         LocksTable(resource_name_prefix).create(expected_lock)
 
 
+@pytest.mark.usefixtures("mock_locks_dynamo_table")
+def test_list_parallel_scan(resource_name_prefix: str) -> None:
+    locks_table = LocksTable(resource_name_prefix)
+    locks = [
+        Lock(
+            lock_id=Builder.build_random_string(),
+            data={},
+            timestamp=datetime.now(),
+            scope=LockingScope.s3_resource,
+            request_id=Builder.build_request_id(),
+        )
+        for _ in range(3)
+    ]
+    for lock in locks:
+        locks_table.create(lock)
+
+    with simulate_scan_segments(locks_table._model, total_segments=2):  # pylint: disable=protected-access
+        assert sorted(locks_table.list(parallel_scan=True), key=lambda lock: lock.lock_id) == sorted(
+            locks, key=lambda lock: lock.lock_id
+        )
+
+
 def build_dynamo_json(lock: Lock) -> Dict[str, Any]:
     return {
         "lock_id": lock.lock_id,
@@ -13,14 +13,19 @@
 # limitations under the License.
 # pylint: disable=no-member
 from abc import abstractmethod
+from dataclasses import dataclass
 from dataclasses import replace
 from datetime import datetime
+from logging import getLogger
 from typing import Any
+from typing import Callable
 from typing import cast
 from typing import Dict
 from typing import Generic
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 from typing import Union
@@ -32,8 +37,10 @@ from cdh_core_api.catalog.base import DateTimeAttribute
 from cdh_core_api.catalog.base import DynamoItemIterator
 from cdh_core_api.catalog.base import LastEvaluatedKey
 from cdh_core_api.catalog.base import LazyEnumAttribute
+from cdh_core_api.catalog.base import ReadStatistics
 from cdh_core_api.generic_types import GenericGlueSyncResource
 from cdh_core_api.generic_types import GenericS3Resource
+from pynamodb.attributes import Attribute
 from pynamodb.attributes import MapAttribute
 from pynamodb.attributes import UnicodeAttribute
 from pynamodb.attributes import UnicodeSetAttribute
@@ -41,9 +48,13 @@ from pynamodb.exceptions import DoesNotExist
 from pynamodb.exceptions import PutError
 from pynamodb.exceptions import UpdateError
 from pynamodb.expressions.condition import Comparison
+from pynamodb.expressions.condition import Condition
 from pynamodb.expressions.update import Action
+from pynamodb.indexes import AllProjection
+from pynamodb.indexes import GlobalSecondaryIndex
 from pynamodb.models import Model
 from pynamodb.pagination import ResultIterator
+from pynamodb.transactions import TransactWrite
 from pynamodb_attributes import UnicodeEnumAttribute
 
 from cdh_core.entities.arn import Arn
@@ -59,6 +70,7 @@ from cdh_core.enums.resource_properties import Stage
 from cdh_core.optionals import apply_if_not_none
 from cdh_core.primitives.account_id import AccountId
 
+LOG = getLogger(__name__)
 GenericModel = TypeVar("GenericModel")
 
 
@@ -76,6 +88,33 @@ class GlueSyncResourceAttribute(MapAttribute[str, Any]):
     sync_type = UnicodeEnumAttribute(SyncType)
 
 
+class _ResourceHubIndex(GlobalSecondaryIndex["_ResourceAttributeContainer"]):  # type: ignore[no-untyped-call]
+    class Meta:
+        index_name = "hub-index"
+        projection = AllProjection()
+
+    hub = UnicodeAttribute(hash_key=True)
+    id = UnicodeAttribute(range_key=True)
+
+
+class _ResourceAccountIndex(GlobalSecondaryIndex["_ResourceAttributeContainer"]):  # type: ignore[no-untyped-call]
+    class Meta:
+        index_name = "resource-account-index"
+        projection = AllProjection()
+
+    resource_account_id = UnicodeAttribute(hash_key=True)
+    id = UnicodeAttribute(range_key=True)
+
+
+class _ResourceOwnerIndex(GlobalSecondaryIndex["_ResourceAttributeContainer"]):  # type: ignore[no-untyped-call]
+    class Meta:
+        index_name = "owner-index"
+        projection = AllProjection()
+
+    owner_account_id = UnicodeAttribute(hash_key=True)
+    id = UnicodeAttribute(range_key=True)
+
+
 class _ResourceAttributeContainer(Model):
     dataset_id = UnicodeAttribute(hash_key=True)
     id = UnicodeAttribute(range_key=True)
@@ -91,6 +130,23 @@ class _ResourceAttributeContainer(Model):
     type = UnicodeEnumAttribute(ResourceType)
     update_date = DateTimeAttribute()
     owner_account_id = UnicodeAttribute()
+    hub_index = _ResourceHubIndex()
+    resource_account_index = _ResourceAccountIndex()
+    owner_index = _ResourceOwnerIndex()
+
+
+@dataclass(frozen=True)
+class _AccessPath:
+    """Describes how the resources table is read: by a scan, a query on the table or a query on an index."""
+
+    name: str
+    hash_key_attribute: Optional[str] = None
+    hash_key: Optional[str] = None
+    index_name: Optional[str] = None
+
+
+_SCAN = _AccessPath(name="scan")
+_PARALLEL_SCAN = _AccessPath(name="parallel scan")
 
 
 class GenericResourceModel(Generic[GenericS3Resource, GenericGlueSyncResource], _ResourceAttributeContainer):
@@ -165,6 +221,7 @@ class GenericResourcesTable(Generic[GenericS3Resource, GenericGlueSyncResource],
         dataset_id: Optional[str] = None,
         hub: Optional[Hub] = None,  # This must be "None" because DataExplorerSync must be able to see all buckets
         consistent_read: bool = True,
+        parallel_scan: bool = False,
     ) -> List[GenericS3Resource]:
         """List S3 Resources and filter via the parameters passed."""
         return cast(
@@ -177,6 +234,7 @@ class GenericResourcesTable(Generic[GenericS3Resource, GenericGlueSyncResource],
                 hub=hub,
                 resource_type=ResourceType.s3,
                 consistent_read=consistent_read,
+                parallel_scan=parallel_scan,
             ),
         )
 
@@ -188,6 +246,7 @@ class GenericResourcesTable(Generic[GenericS3Resource, GenericGlueSyncResource],
         dataset_id: Optional[str] = None,
         hub: Optional[Hub] = None,
         consistent_read: bool = True,
+        parallel_scan: bool = False,
     ) -> List[GenericGlueSyncResource]:
         """List GlueSync Resources and filter via the parameters passed."""
         return cast(
@@ -200,6 +259,7 @@ class GenericResourcesTable(Generic[GenericS3Resource, GenericGlueSyncResource],
                 hub=hub,
                 resource_type=ResourceType.glue_sync,
                 consistent_read=consistent_read,
+                parallel_scan=parallel_scan,
             ),
         )
 
@@ -213,10 +273,15 @@ class GenericResourcesTable(Generic[GenericS3Resource, GenericGlueSyncResource],
         hub: Optional[Hub] = None,  # This must be "None" because DataExplorerSync must be able to see all buckets
         owner: Optional[AccountId] = None,
         consistent_read: bool = True,
+        parallel_scan: bool = False,
     ) -> List[Resource]:
-        """List S3 and GlueSync Resources and filter via the parameters passed."""
+        """List S3 and GlueSync Resources and filter via the parameters passed.
+
+        If `parallel_scan` is set and the resources would be read by a scan, the table is scanned in parallel segments
+        and the resources are returned in no particular order.
+        """
         return list(
-            self.get_resources_iterator(
+            self.iter_list(
                 region=region,
                 resource_account=resource_account,
                 stage=stage,
@@ -225,9 +290,67 @@ class GenericResourcesTable(Generic[GenericS3Resource, GenericGlueSyncResource],
                 hub=hub,
                 owner=owner,
                 consistent_read=consistent_read,
+                parallel_scan=parallel_scan,
             )
         )
 
+    def iter_list(  # pylint: disable=too-many-arguments
+        self,
+        region: Optional[Region] = None,
+        resource_account: Optional[AccountId] = None,
+        stage: Optional[Stage] = None,
+        dataset_id: Optional[str] = None,
+        resource_type: Optional[ResourceType] = None,
+        hub: Optional[Hub] = None,
+        owner: Optional[AccountId] = None,
+        consistent_read: bool = True,
+        parallel_scan: bool = False,
+    ) -> Iterator[Union[GenericS3Resource, GenericGlueSyncResource]]:
+        """Yield the matching resources as they are read, so that they are not held in memory at once, see `list`."""
+        if parallel_scan and (
+            self._choose_access_path(
+                dataset_id=dataset_id,
+                owner=owner,
+                resource_account=resource_account,
+                hub=hub,
+                consistent_read=consistent_read,
+                last_evaluated_key=None,
+            )
+            is _SCAN
+        ):
+            filter_condition = self._get_filter_condition(
+                access_path=_SCAN,
+                hub=hub,
+                region=region,
+                stage=stage,
+                resource_account=resource_account,
+                resource_type=resource_type,
+                owner=owner,
+            )
+            statistics = ReadStatistics()
+            resources = _to_resources_and_log_access_path(
+                self._parallel_scan(
+                    self._model,
+                    consistent_read=consistent_read,
+                    filter_condition=filter_condition,
+                    statistics=statistics,
+                ),
+                _PARALLEL_SCAN,
+                get_statistics=lambda: statistics,
+            )
+            # the iteration cannot be resumed, the DynamoItemIterator only converts the errors of DynamoDB
+            return DynamoItemIterator(items=resources, get_last_evaluated_key=lambda: None)
+        return self.get_resources_iterator(
+            region=region,
+            resource_account=resource_account,
+            stage=stage,
+            dataset_id=dataset_id,
+            resource_type=resource_type,
+            hub=hub,
+            owner=owner,
+            consistent_read=consistent_read,
+        )
+
     def get_resources_iterator(  # pylint: disable=too-many-arguments
         self,
         region: Optional[Region] = None,
@@ -240,41 +363,137 @@ class GenericResourcesTable(Generic[GenericS3Resource, GenericGlueSyncResource],
         consistent_read: bool = True,
         last_evaluated_key: Optional[LastEvaluatedKey] = None,
     ) -> DynamoItemIterator[Union[GenericS3Resource, GenericGlueSyncResource]]:
-        """Get an iterator over all matching resources."""
-        filter_expression: Optional[Comparison] = None
-        if hub:
-            filter_expression &= GenericResourceModel.hub == hub
-        if region:
-            filter_expression &= GenericResourceModel.region == region
-        if stage:
-            filter_expression &= GenericResourceModel.stage == stage
-        if resource_account:
-            filter_expression &= GenericResourceModel.resource_account_id == resource_account
-        if resource_type:
-            filter_expression &= GenericResourceModel.type == resource_type
-        if owner:
-            filter_expression &= GenericResourceModel.owner_account_id == owner
-        if dataset_id:
-            result_iterator: ResultIterator[Any] = self._model.query(
-                hash_key=dataset_id,
+        """Get an iterator over all matching resources.
+
+        The most selective access path for the given filters is chosen: a query on the table if `dataset_id` is set,
+        otherwise a query on the owner, resource account or hub index. Global secondary indexes do not support
+        consistent reads, so consistent reads without `dataset_id` fall back to a scan.
+        """
+        access_path = self._choose_access_path(
+            dataset_id=dataset_id,
+            owner=owner,
+            resource_account=resource_account,
+            hub=hub,
+            consistent_read=consistent_read,
+            last_evaluated_key=last_evaluated_key,
+        )
+        filter_expression = self._get_filter_condition(
+            access_path=access_path,
+            hub=hub,
+            region=region,
+            stage=stage,
+            resource_account=resource_account,
+            resource_type=resource_type,
+            owner=owner,
+        )
+        if access_path is _SCAN:
+            result_iterator: ResultIterator[Any] = self._model.scan(
                 consistent_read=consistent_read,
                 filter_condition=filter_expression,
                 last_evaluated_key=last_evaluated_key,
             )
         else:
-            result_iterator = self._model.scan(
-                consistent_read=consistent_read,
+            result_iterator = self._model.query(
+                hash_key=access_path.hash_key,
+                range_key_condition=self._get_range_key_condition(
+                    resource_type=resource_type, stage=stage, region=region
+                ),
+                consistent_read=consistent_read and access_path.index_name is None,
+                index_name=access_path.index_name,
                 filter_condition=filter_expression,
                 last_evaluated_key=last_evaluated_key,
             )
         return DynamoItemIterator(
-            items=(model.to_resource() for model in result_iterator),
+            items=_to_resources_and_log_access_path(
+                result_iterator, access_path, get_statistics=lambda: ReadStatistics.of_result(result_iterator)
+            ),
             get_last_evaluated_key=lambda: apply_if_not_none(LastEvaluatedKey)(result_iterator.last_evaluated_key),
         )
 
-    def create(self, resource: Union[GenericS3Resource, GenericGlueSyncResource]) -> None:
-        """Create a model and save it to dynamo db."""
+    @staticmethod
+    def _choose_access_path(  # pylint: disable=too-many-arguments
+        dataset_id: Optional[str],
+        owner: Optional[AccountId],
+        resource_account: Optional[AccountId],
+        hub: Optional[Hub],
+        consistent_read: bool,
+        last_evaluated_key: Optional[LastEvaluatedKey],
+    ) -> _AccessPath:
+        if dataset_id:
+            return _AccessPath(name="table query", hash_key_attribute="dataset_id", hash_key=dataset_id)
+        if consistent_read:
+            return _SCAN
+        # ordered by selectivity: owners usually have fewer resources than shared resource accounts or hubs
+        candidates = [
+            _AccessPath(
+                name=index.Meta.index_name,
+                hash_key_attribute=hash_key_attribute,
+                hash_key=hash_key,
+                index_name=index.Meta.index_name,
+            )
+            for index, hash_key_attribute, hash_key in [
+                (_ResourceOwnerIndex, "owner_account_id", owner),
+                (_ResourceAccountIndex, "resource_account_id", resource_account),
+                (_ResourceHubIndex, "hub", hub.value if hub else None),
+            ]
+            if hash_key
+        ]
+        for candidate in candidates:
+            # A LastEvaluatedKey issued by a scan lacks the index key and can only be resumed by a scan.
+            if last_evaluated_key is None or candidate.hash_key_attribute in last_evaluated_key:
+                return candidate
+        return _SCAN
+
+    @staticmethod
+    def _get_filter_condition(  # pylint: disable=too-many-arguments
+        access_path: _AccessPath,
+        hub: Optional[Hub],
+        region: Optional[Region],
+        stage: Optional[Stage],
+        resource_account: Optional[AccountId],
+        resource_type: Optional[ResourceType],
+        owner: Optional[AccountId],
+    ) -> Optional[Comparison]:
+        filter_conditions: List[Tuple[Attribute[Any], Any]] = [
+            (GenericResourceModel.hub, hub),
+            (GenericResourceModel.region, region),
+            (GenericResourceModel.stage, stage),
+            (GenericResourceModel.resource_account_id, resource_account),
+            (GenericResourceModel.type, resource_type),
+            (GenericResourceModel.owner_account_id, owner),
+        ]
+        filter_expression: Optional[Comparison] = None
+        for attribute, value in filter_conditions:
+            # the hash key of the access path is part of the key condition and must not be filtered on
+            if value and attribute.attr_name != access_path.hash_key_attribute:
+                filter_expression &= attribute == value
+        return filter_expression
+
+    def _get_range_key_condition(
+        self, resource_type: Optional[ResourceType], stage: Optional[Stage], region: Optional[Region]
+    ) -> Optional[Condition]:
+        if resource_type and stage and region:
+            return self._model.id == self._model.get_range_key(resource_type, stage, region)
+        if resource_type and stage:
+            return self._model.id.startswith(f"{resource_type.value}_{stage.value}_")
+        if resource_type:
+            return self._model.id.startswith(f"{resource_type.value}_")
+        return None
+
+    def create(
+        self,
+        resource: Union[GenericS3Resource, GenericGlueSyncResource],
+        transaction: Optional[TransactWrite] = None,
+    ) -> None:
+        """Create a model and save it to dynamo db.
+
+        If a transaction is given, the model is saved when the transaction is committed. A resource that already exists
+        then makes the transaction fail.
+        """
         model = self._model.from_resource(resource)
+        if transaction:
+            transaction.save(model, condition=GenericResourceModel.id.does_not_exist())
+            return
         try:
             model.save(GenericResourceModel.id.does_not_exist())
         except PutError as error:
@@ -344,14 +563,38 @@ class GenericResourcesTable(Generic[GenericS3Resource, GenericGlueSyncResource],
 
         return updated_resource
 
-    def delete(self, resource_type: ResourceType, dataset_id: str, stage: Stage, region: Region) -> None:
-        """Delete resource from DynamoDB."""
+    def delete(  # pylint: disable=too-many-arguments
+        self,
+        resource_type: ResourceType,
+        dataset_id: str,
+        stage: Stage,
+        region: Region,
+        transaction: Optional[TransactWrite] = None,
+    ) -> None:
+        """Delete resource from DynamoDB, if a transaction is given when the transaction is committed."""
         range_key = self._model.get_range_key(resource_type, stage, region)
         try:
             model: Any = self._model.get(hash_key=dataset_id, range_key=range_key, consistent_read=True)
-            model.delete()
         except DoesNotExist as error:
             raise ResourceNotFound(dataset_id, range_key) from error
+        if transaction:
+            transaction.delete(model)
+        else:
+            model.delete()
+
+
+def _to_resources_and_log_access_path(
+    models: Iterator[Any], access_path: _AccessPath, get_statistics: Callable[[], ReadStatistics]
+) -> Iterator[Union[GenericS3Resource, GenericGlueSyncResource]]:
+    try:
+        for model in models:
+            yield model.to_resource()
+    finally:
+        statistics = get_statistics()
+        LOG.info(
+            f"Read resources via {access_path.name}: DynamoDB read {statistics.read_count} "
+            f"items and returned {statistics.returned_count}"
+        )
 
 
 class ResourceModel(GenericResourceModel[S3Resource, GlueSyncResource]):
@@ -26,11 +26,14 @@ from typing import Union
 
 import pytest
 from asserts import assert_count_equal
+from cdh_core_api.catalog.base import transact_write
 from cdh_core_api.catalog.base_test import get_nullable_attributes
+from cdh_core_api.catalog.base_test import simulate_scan_segments
 from cdh_core_api.catalog.resource_table import GenericResourceModel
 from cdh_core_api.catalog.resource_table import ResourceNotFound
 from cdh_core_api.catalog.resource_table import ResourcesTable
 from mypy_boto3_dynamodb.service_resource import Table
+from pynamodb.exceptions import TransactWriteError
 
 from cdh_core.config.config_file import ConfigFile
 from cdh_core.config.config_file_test import CONFIG_FILE_MULTIPLE_PARTITIONS_ENVIRONMENTS_HUBS
@@ -227,6 +230,41 @@ class TestList(ResourceTableTest):
         resources = self.resources_table.list(hub=self.hub)
         assert_count_equal(resources, expected_resource_sets)
 
+    def test_list_parallel_scan(self) -> None:
+        expected_resource_sets = [item for _ in range(3) for item in self.build_resource_set()]
+        other_hub = Builder.get_random_element(list(Hub), exclude={self.hub})
+        self._fill_dynamo(resources=expected_resource_sets + self.build_resource_set(hub=other_hub))
+
+        with simulate_scan_segments(self.resources_table._model, total_segments=4):  # pylint: disable=protected-access
+            resources = self.resources_table.list(hub=self.hub, parallel_scan=True)
+
+        assert_count_equal(resources, expected_resource_sets)
+
+    def test_iter_list_parallel_scan(self) -> None:
+        expected_resources = [item for _ in range(3) for item in self.build_resource_set()]
+        other_hub = Builder.get_random_element(list(Hub), exclude={self.hub})
+        self._fill_dynamo(resources=expected_resources + self.build_resource_set(hub=other_hub))
+
+        with simulate_scan_segments(self.resources_table._model, total_segments=4):  # pylint: disable=protected-access
+            resources = list(self.resources_table.iter_list(hub=self.hub, parallel_scan=True))
+
+        assert_count_equal(resources, expected_resources)
+
+    def test_list_parallel_scan_logs_access_path(self, caplog: pytest.LogCaptureFixture) -> None:
+        expected_resources = self.build_resource_set()
+        other_hub = Builder.get_random_element(list(Hub), exclude={self.hub})
+        foreign_resources = self.build_resource_set(hub=other_hub)
+        self._fill_dynamo(resources=expected_resources + foreign_resources)
+        caplog.set_level("INFO")
+
+        with simulate_scan_segments(self.resources_table._model, total_segments=4):  # pylint: disable=protected-access
+            self.resources_table.list(hub=self.hub, parallel_scan=True)
+
+        assert (
+            f"Read resources via parallel scan: DynamoDB read {len(expected_resources) + len(foreign_resources)} "
+            f"items and returned {len(expected_resources)}"
+        ) in caplog.text
+
     def test_list_with_owner(self) -> None:
         resources = [build_resource() for _ in range(5)]
         expected_resources = [resources[0]]
@@ -285,6 +323,71 @@ class TestList(ResourceTableTest):
         assert len(self.resources_table.list(dataset_id=dataset_3.id)) == 1
         assert len(self.resources_table.list(region=region_1, resource_account=account_id2)) == 1
 
+    @pytest.mark.parametrize("mock_config_file", [CONFIG_FILE_MULTIPLE_PARTITIONS_ENVIRONMENTS_HUBS], indirect=True)
+    def test_list_filters_eventually_consistent(
+        self, mock_config_file: ConfigFile  # pylint: disable=unused-argument
+    ) -> None:
+        account_id1, account_id2 = build_account_id(), build_account_id()
+        hub, other_hub = Builder.choose_without_repetition(list(Hub), 2)
+        dataset_1, dataset_2 = build_dataset(hub=hub), build_dataset(hub=other_hub)
+        region_1, region_2 = sample(list(Region), 2)
+        resources = [
+            build_s3_resource(dataset=dataset_1, region=region_1, stage=Stage.dev, resource_account_id=account_id1),
+            build_s3_resource(dataset=dataset_1, region=region_2, stage=Stage.prod, resource_account_id=account_id2),
+            build_glue_sync_resource(
+                dataset=dataset_1, region=region_1, stage=Stage.dev, resource_account_id=account_id1
+            ),
+            build_s3_resource(dataset=dataset_2, region=region_1, stage=Stage.dev, resource_account_id=account_id1),
+        ]
+        self._fill_dynamo(resources=resources)
+
+        def list_resources(**kwargs: Any) -> List[Resource]:
+            return self.resources_table.list(consistent_read=False, **kwargs)
+
+        assert_count_equal(list_resources(resource_account=account_id1), [resources[0], resources[2], resources[3]])
+        assert_count_equal(
+            list_resources(resource_account=account_id1, resource_type=ResourceType.s3), [resources[0], resources[3]]
+        )
+        assert_count_equal(
+            list_resources(resource_account=account_id1, resource_type=ResourceType.s3, stage=Stage.dev, hub=hub),
+            [resources[0]],
+        )
+        assert_count_equal(
+            list_resources(
+                resource_account=account_id2, resource_type=ResourceType.s3, stage=Stage.prod, region=region_2
+            ),
+            [resources[1]],
+        )
+        assert_count_equal(list_resources(hub=hub), resources[:3])
+        assert_count_equal(list_resources(hub=hub, region=region_1), [resources[0], resources[2]])
+        assert_count_equal(list_resources(owner=resources[3].owner_account_id), [resources[3]])
+        assert_count_equal(
+            list_resources(dataset_id=dataset_1.id, resource_type=ResourceType.glue_sync), [resources[2]]
+        )
+
+    @pytest.mark.parametrize(
+        "kwargs,expected_access_path",
+        [
+            ({}, "scan"),
+            ({"region": build_region(), "stage": build_stage()}, "scan"),
+            ({"hub": build_hub(), "consistent_read": True}, "scan"),
+            ({"hub": build_hub()}, "hub-index"),
+            ({"hub": build_hub(), "resource_account": build_account_id()}, "resource-account-index"),
+            ({"resource_account": build_account_id(), "owner": build_account_id()}, "owner-index"),
+            ({"dataset_id": "some_dataset", "owner": build_account_id()}, "table query"),
+        ],
+    )
+    def test_list_logs_access_path(
+        self, caplog: pytest.LogCaptureFixture, kwargs: Dict[str, Any], expected_access_path: str
+    ) -> None:
+        self._fill_dynamo(resources=[build_resource() for _ in range(3)])
+        caplog.set_level("INFO")
+
+        list_kwargs: Dict[str, Any] = {"consistent_read": False, **kwargs}
+        self.resources_table.list(**list_kwargs)
+
+        assert f"Read resources via {expected_access_path}:" in caplog.text
+
     def test_list_s3(self) -> None:
         s3_resources = [build_s3_resource() for _ in range(randint(3, 5))]
         glue_sync_resources = [build_glue_sync_resource() for _ in range(randint(3, 5))]
@@ -398,6 +501,43 @@ class TestGetResourceIterator(ResourceTableTest):
             assert first_item == second_item
             assert first_iterator.last_evaluated_key == second_iterator.last_evaluated_key
 
+    def test_iterate_index_with_last_evaluated_key_resumes(self) -> None:
+        resource_account_id = build_account_id()
+        expected_resources = [build_resource(resource_account_id=resource_account_id) for _ in range(10)]
+        self._fill_dynamo(resources=expected_resources + [build_resource() for _ in range(5)])
+        cutoff = randint(1, len(expected_resources) - 1)
+        first_iterator = self.resources_table.get_resources_iterator(
+            resource_account=resource_account_id, consistent_read=False
+        )
+        for _ in range(cutoff):
+            next(first_iterator)
+        assert "resource_account_id" in first_iterator.last_evaluated_key  # type: ignore[operator]
+
+        second_iterator = self.resources_table.get_resources_iterator(
+            last_evaluated_key=first_iterator.last_evaluated_key,
+            resource_account=resource_account_id,
+            consistent_read=False,
+        )
+
+        for first_item, second_item in itertools.zip_longest(first_iterator, second_iterator):
+            assert first_item == second_item
+            assert first_iterator.last_evaluated_key == second_iterator.last_evaluated_key
+
+    def test_iterate_resumes_scan_last_evaluated_key_with_scan(self) -> None:
+        resource_account_id = build_account_id()
+        expected_resources = [build_resource(resource_account_id=resource_account_id) for _ in range(5)]
+        self._fill_dynamo(resources=expected_resources + [build_resource() for _ in range(5)])
+        first_iterator = self.resources_table.get_resources_iterator(resource_account=resource_account_id)
+        first_resources = [next(first_iterator)]
+
+        second_iterator = self.resources_table.get_resources_iterator(
+            last_evaluated_key=first_iterator.last_evaluated_key,
+            resource_account=resource_account_id,
+            consistent_read=False,
+        )
+
+        assert_count_equal(first_resources + list(second_iterator), expected_resources)
+
     def _fill_dynamo(self, resources: Collection[Resource]) -> None:
         resources_shuffled: Sequence[Resource] = sample(list(resources), len(resources))
         with self.mock_resources_dynamo_table.batch_writer() as batch:
@@ -450,6 +590,37 @@ class TestDelete(ResourceTableTest):
         with pytest.raises(ResourceNotFound):
             self.resources_table.delete(resource.type, resource.dataset_id, resource.stage, resource.region)
 
+    def test_delete_in_transaction(self) -> None:
+        resource = build_resource(ResourceType.s3)
+        self.resources_table.create(resource)
+
+        with transact_write() as transaction:
+            self.resources_table.delete(
+                resource.type, resource.dataset_id, resource.stage, resource.region, transaction=transaction
+            )
+            assert self.resources_table.list() == [resource]
+
+        assert not self.resources_table.list()
+
+
+class TestCreate(ResourceTableTest):
+    def test_create_in_transaction(self) -> None:
+        resource = build_resource(ResourceType.s3)
+
+        with transact_write() as transaction:
+            self.resources_table.create(resource, transaction=transaction)
+            assert not self.resources_table.list()
+
+        assert self.resources_table.list() == [resource]
+
+    def test_create_existing_in_transaction_fails(self) -> None:
+        resource = build_resource(ResourceType.s3)
+        self.resources_table.create(resource)
+
+        with pytest.raises(TransactWriteError):
+            with transact_write() as transaction:
+                self.resources_table.create(resource, transaction=transaction)
+
 
 def _get_dynamo_json_common_dict(resource: Resource) -> Dict[str, Any]:
     update_date = resource.update_date or resource.creation_date
@@ -29,6 +29,7 @@ from cdh_core.entities.account_store import AccountStore
 from cdh_core.entities.accounts import AccountRoleType
 from cdh_core.entities.accounts import SecurityAccount
 from cdh_core.entities.arn import Arn
+from cdh_core.entities.catalog_export import CatalogExportEntityType
 from cdh_core.entities.lambda_context import LambdaContext
 from cdh_core.enums.accounts import AccountPurpose
 from cdh_core.enums.accounts import AccountType
@@ -66,11 +67,13 @@ class Config:
     authorization_api_params: AuthApi
     encryption_key: str
     result_page_size: int
+    export_bucket_name: Optional[str] = None
 
     ENUMS_TO_EXPOSE = [
         AccountType,
         Affiliation,
         BusinessObject,
+        CatalogExportEntityType,
         Confidentiality,
         ExternalLinkType,
         DatasetPurpose,
@@ -117,6 +120,7 @@ class Config:
             ),
             encryption_key=os.environ["ENCRYPTION_KEY_NAME"],
             result_page_size=int(os.environ["RESULT_PAGE_SIZE"]),
+            export_bucket_name=os.environ.get("EXPORT_BUCKET_NAME") or None,
         )
 
     @property
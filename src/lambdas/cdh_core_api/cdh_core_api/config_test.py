@@ -50,6 +50,7 @@ def build_config(
     use_authorization: bool = True,
     encryption_key: Optional[str] = None,
     result_page_size: int = 42,
+    export_bucket_name: Optional[str] = None,
 ) -> Config:
     region: Region = Region.preferred(partition or build_partition())
     dataset_topic_arn = build_arn(
@@ -70,6 +71,7 @@ def build_config(
         account_store=account_store if account_store else build_account_store(),
         encryption_key=encryption_key or Builder.build_random_string(),
         result_page_size=result_page_size,
+        export_bucket_name=export_bucket_name,
     )
 
 
@@ -92,6 +94,7 @@ class TestConfig:
         users_url = Builder.build_random_url()
         encryption_key = "encryption-key"
         result_page_size = 42
+        export_bucket_name = Builder.build_random_string()
         monkeypatch.setenv("ENVIRONMENT", env.value)
         monkeypatch.setenv("RESOURCE_NAME_PREFIX", prefix)
         monkeypatch.setenv("DATASET_NOTIFICATION_TOPIC", str(dataset_notification_topic))
@@ -102,6 +105,7 @@ class TestConfig:
         monkeypatch.setenv("USERS_API_URL", users_url)
         monkeypatch.setenv("ENCRYPTION_KEY_NAME", encryption_key)
         monkeypatch.setenv("RESULT_PAGE_SIZE", str(result_page_size))
+        monkeypatch.setenv("EXPORT_BUCKET_NAME", export_bucket_name)
 
         config = Config.from_environment_and_context(
             Mock(invoked_function_arn=str(invoked_function_arn)), account_store
@@ -121,6 +125,7 @@ class TestConfig:
             account_store=account_store,
             encryption_key=encryption_key,
             result_page_size=result_page_size,
+            export_bucket_name=export_bucket_name,
         )
 
     def test_disable_core_api(self, monkeypatch: Any) -> None:
@@ -20,6 +20,7 @@ import pytest
 from cdh_core_api.catalog.accounts_table import AccountsTable
 from cdh_core_api.catalog.datasets_table import DatasetsTable
 from cdh_core_api.catalog.filter_packages_table import FilterPackagesTable
+from cdh_core_api.catalog.kms_key_access_table import KmsKeyAccessTable
 from cdh_core_api.catalog.resource_table import ResourcesTable
 from mypy_boto3_dynamodb.service_resource import Table
 
@@ -45,8 +46,24 @@ def mock_datasets_dynamo_table(  # pylint: disable=unused-argument
     table_name = resource_name_prefix + "cdh-datasets"
     return boto3.resource("dynamodb", region_name=_DYNAMO_DB_REGION).create_table(
         TableName=table_name,
-        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+        AttributeDefinitions=[
+            {"AttributeName": "id", "AttributeType": "S"},
+            {"AttributeName": "hub", "AttributeType": "S"},
+            {"AttributeName": "owner_account_id", "AttributeType": "S"},
+        ],
         KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": index_name,
+                "KeySchema": [
+                    {"AttributeName": hash_key, "KeyType": "HASH"},
+                    {"AttributeName": "id", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+                "ProvisionedThroughput": {"ReadCapacityUnits": 123, "WriteCapacityUnits": 123},
+            }
+            for index_name, hash_key in [("hub-index", "hub"), ("owner-index", "owner_account_id")]
+        ],
         BillingMode="PROVISIONED",
         ProvisionedThroughput={"ReadCapacityUnits": 123, "WriteCapacityUnits": 123},
     )
@@ -95,6 +112,25 @@ def mock_resources_dynamo_table(
         AttributeDefinitions=[
             {"AttributeName": "dataset_id", "AttributeType": "S"},
             {"AttributeName": "id", "AttributeType": "S"},
+            {"AttributeName": "hub", "AttributeType": "S"},
+            {"AttributeName": "resource_account_id", "AttributeType": "S"},
+            {"AttributeName": "owner_account_id", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": index_name,
+                "KeySchema": [
+                    {"AttributeName": hash_key, "KeyType": "HASH"},
+                    {"AttributeName": "id", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+                "ProvisionedThroughput": {"ReadCapacityUnits": 123, "WriteCapacityUnits": 123},
+            }
+            for index_name, hash_key in [
+                ("hub-index", "hub"),
+                ("resource-account-index", "resource_account_id"),
+                ("owner-index", "owner_account_id"),
+            ]
         ],
         ProvisionedThroughput={"ReadCapacityUnits": 123, "WriteCapacityUnits": 123},
     )
@@ -120,6 +156,26 @@ def mock_filter_packages_dynamo_table(
     )
 
 
+@pytest.fixture()
+def mock_kms_key_access_dynamo_table(
+    mock_dynamodb: None, resource_name_prefix: str  # pylint: disable=unused-argument  # noqa: F811
+) -> Table:
+    """Mock a KMS key access dynamo table with moto."""
+    table_name = resource_name_prefix + "cdh-kms-key-access"
+    return boto3.resource("dynamodb", region_name=_DYNAMO_DB_REGION).create_table(
+        TableName=table_name,
+        KeySchema=[
+            {"AttributeName": "resource_account_id_region", "KeyType": "HASH"},
+            {"AttributeName": "id", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "resource_account_id_region", "AttributeType": "S"},
+            {"AttributeName": "id", "AttributeType": "S"},
+        ],
+        ProvisionedThroughput={"ReadCapacityUnits": 123, "WriteCapacityUnits": 123},
+    )
+
+
 @pytest.fixture()
 def accounts_table(
     mock_accounts_dynamo_table: Any, resource_name_prefix: str  # pylint: disable=unused-argument  # noqa: F811
@@ -150,3 +206,11 @@ def filter_packages_table(
 ) -> FilterPackagesTable:
     """Mock the ResourcesTable with moto."""
     return FilterPackagesTable(resource_name_prefix)
+
+
+@pytest.fixture()
+def kms_key_access_table(
+    mock_kms_key_access_dynamo_table: Any, resource_name_prefix: str  # pylint: disable=unused-argument  # noqa: F811
+) -> KmsKeyAccessTable:
+    """Mock the KmsKeyAccessTable with moto."""
+    return KmsKeyAccessTable(resource_name_prefix)
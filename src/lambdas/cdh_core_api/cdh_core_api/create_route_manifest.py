@@ -0,0 +1,51 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import argparse
+import importlib
+import json
+import pkgutil
+
+import cdh_core_api.endpoints
+from cdh_core_api.api.route_collection import ROUTE_MANIFEST_PATH
+from cdh_core_api.api.route_collection import RouteManifest
+from cdh_core_api.app import coreapi
+
+
+def create_route_manifest() -> RouteManifest:
+    """Import all endpoint modules and return the manifest of the registered routes."""
+    for module in pkgutil.iter_modules(cdh_core_api.endpoints.__path__, prefix=f"{cdh_core_api.endpoints.__name__}."):
+        if not module.name.endswith("_test"):
+            importlib.import_module(module.name)
+    return coreapi.get_route_manifest()
+
+
+def _parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        "Create the manifest which maps the routes of the Core API to the modules of their handlers"
+    )
+    parser.add_argument(
+        "--store", help="Store the generated manifest in cdh_core_api/route_manifest.json", action="store_true"
+    )
+    parser.add_argument("--path", help="Output path if '--store' has been selected", default=ROUTE_MANIFEST_PATH)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = _parse_arguments()
+    manifest = json.dumps(create_route_manifest(), indent=2) + "\n"
+    if arguments.store:
+        with open(arguments.path, "w", encoding="UTF-8") as file:
+            file.write(manifest)
+    else:
+        print(manifest, end="")  # noqa: T201
@@ -0,0 +1,22 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from cdh_core_api.api.route_collection import load_route_manifest
+from cdh_core_api.create_route_manifest import create_route_manifest
+
+
+def test_stored_route_manifest_is_up_to_date() -> None:
+    assert load_route_manifest() == create_route_manifest(), (
+        "The route manifest is outdated, store the new one with "
+        "python src/lambdas/cdh_core_api/cdh_core_api/create_route_manifest.py --store"
+    )
@@ -11,13 +11,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Contains the API endpoints and registers them automatically."""
-import cdh_core_api.endpoints.accounts
-import cdh_core_api.endpoints.api_info
-import cdh_core_api.endpoints.business_objects
-import cdh_core_api.endpoints.config
-import cdh_core_api.endpoints.dataset_account_permissions
-import cdh_core_api.endpoints.datasets
-import cdh_core_api.endpoints.filter_packages
-import cdh_core_api.endpoints.resources
-import cdh_core_api.endpoints.stats
+"""Contains the API endpoints and registers them automatically, unless they are imported lazily per route."""
+from cdh_core_api.app import coreapi
+
+if not coreapi.lazy_endpoint_imports:
+    import cdh_core_api.endpoints.accounts
+    import cdh_core_api.endpoints.api_info
+    import cdh_core_api.endpoints.business_objects
+    import cdh_core_api.endpoints.config
+    import cdh_core_api.endpoints.dataset_account_permissions
+    import cdh_core_api.endpoints.datasets
+    import cdh_core_api.endpoints.exports
+    import cdh_core_api.endpoints.filter_packages
+    import cdh_core_api.endpoints.resources
+    import cdh_core_api.endpoints.stats
@@ -162,6 +162,7 @@ def get_datasets_cross_hub(
     response_dataset_builder: ResponseDatasetBuilder,
 ) -> JsonResponse:
     """List visible datasets specified in query parameter `ids`."""
+    response_dataset_builder.prefetch_participants(query.ids, requester_identity)
     return JsonResponse(
         body=ResponseDatasets(
             datasets=response_dataset_builder(
@@ -189,6 +190,7 @@ def get_dataset(
     response_dataset_builder: ResponseDatasetBuilder,
 ) -> JsonResponse:
     """Return the dataset with the ID `dataset_id`, if it is visible."""
+    response_dataset_builder.prefetch_participants([path.datasetId], requester_identity)
     dataset = fetch_dataset(hub=path.hub, dataset_id=path.datasetId, visible_data_loader=visible_data_loader)
     return JsonResponse(
         body=unwrap_singleton(response_dataset_builder(datasets=[dataset], requester_identity=requester_identity))
@@ -0,0 +1,106 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from cdh_core_api.api.openapi_spec.openapi import OpenApiEnum
+from cdh_core_api.api.openapi_spec.openapi import OpenApiSchema
+from cdh_core_api.api.openapi_spec.openapi import OpenApiTypes
+from cdh_core_api.api.openapi_spec.openapi_schemas import HUB_SCHEMA
+from cdh_core_api.app import coreapi
+from cdh_core_api.app import openapi
+from cdh_core_api.services.catalog_exporter import CatalogExporter
+from cdh_core_api.services.full_vision_check import FullVisionCheck
+from cdh_core_api.validation.common_paths import HubPath
+
+from cdh_core.entities.accounts import Account
+from cdh_core.entities.catalog_export import CatalogExportEntityType
+from cdh_core.entities.request import Request
+from cdh_core.entities.resource import GlueSyncResource
+from cdh_core.entities.resource import S3Resource
+from cdh_core.entities.response import JsonResponse
+from cdh_core.enums.hubs import Hub
+from cdh_core.exceptions.http import ForbiddenError
+
+CATALOG_EXPORT_ENTITY_TYPE_SCHEMA = OpenApiEnum.from_enum_type(CatalogExportEntityType)
+
+CATALOG_EXPORT_PART_SCHEMA = OpenApiSchema(
+    "CatalogExportPart",
+    {
+        "entityType": openapi.link(CATALOG_EXPORT_ENTITY_TYPE_SCHEMA),
+        "key": OpenApiTypes.STRING,
+        "itemCount": OpenApiTypes.INTEGER,
+        "url": OpenApiTypes.optional_string_with_description(
+            description="Pre-signed url of the gzip compressed NDJSON object, valid for one hour"
+        ),
+    },
+)
+
+CATALOG_EXPORT_SCHEMA = OpenApiSchema(
+    "CatalogExport",
+    {
+        "exportId": OpenApiTypes.STRING,
+        "hub": openapi.link(HUB_SCHEMA),
+        "startedAt": OpenApiTypes.DATE_TIME,
+        "complete": OpenApiTypes.BOOLEAN,
+        "parts": OpenApiTypes.array_of(openapi.link(CATALOG_EXPORT_PART_SCHEMA)),
+    },
+)
+
+
+@coreapi.route("/{hub}/exports", ["POST"])
+@openapi.response(HTTPStatus.ACCEPTED, CATALOG_EXPORT_SCHEMA)
+@openapi.internal_endpoint()
+def create_catalog_export(
+    path: HubPath,
+    request: Request,
+    full_vision_check: FullVisionCheck,
+    catalog_exporter: CatalogExporter[Account, S3Resource, GlueSyncResource],
+) -> JsonResponse:
+    """
+    Start writing a snapshot of all datasets, resources and accounts of a hub to S3.
+
+    The export is written in the background, GET /{hub}/exports/{exportId} returns it as complete once it is done.
+    The entities are stored as gzip compressed NDJSON in several parts per entity type, which can be downloaded with
+    the pre-signed urls of the complete export. Only requesters that can see all entities may create exports.
+    """
+    _check_requester_may_export(request, full_vision_check)
+    return JsonResponse(body=catalog_exporter.start_export(path.hub), status_code=HTTPStatus.ACCEPTED)
+
+
+@dataclass(frozen=True)
+class CatalogExportPath:
+    """Represents the path parameters required to call the GET /{hub}/exports/{exportId} endpoint."""
+
+    hub: Hub
+    exportId: str  # pylint: disable=invalid-name
+
+
+@coreapi.route("/{hub}/exports/{exportId}", ["GET"])
+@openapi.response(HTTPStatus.OK, CATALOG_EXPORT_SCHEMA)
+@openapi.internal_endpoint()
+def get_catalog_export(
+    path: CatalogExportPath,
+    request: Request,
+    full_vision_check: FullVisionCheck,
+    catalog_exporter: CatalogExporter[Account, S3Resource, GlueSyncResource],
+) -> JsonResponse:
+    """Return an export of a hub with newly pre-signed urls of the parts written so far."""
+    _check_requester_may_export(request, full_vision_check)
+    return JsonResponse(body=catalog_exporter.get_export(path.hub, path.exportId))
+
+
+def _check_requester_may_export(request: Request, full_vision_check: FullVisionCheck) -> None:
+    if not full_vision_check(request.requester_arn):
+        raise ForbiddenError(f"Requester {request.requester_arn} is not authorized to export the catalog.")
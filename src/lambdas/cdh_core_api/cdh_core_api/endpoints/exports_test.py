@@ -0,0 +1,80 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from http import HTTPStatus
+from unittest.mock import Mock
+
+import pytest
+from cdh_core_api.endpoints.exports import CatalogExportPath
+from cdh_core_api.endpoints.exports import create_catalog_export
+from cdh_core_api.endpoints.exports import get_catalog_export
+from cdh_core_api.services.catalog_exporter import CatalogExporter
+from cdh_core_api.services.full_vision_check import FullVisionCheck
+from cdh_core_api.validation.common_paths import HubPath
+
+from cdh_core.entities.request import Request
+from cdh_core.enums.hubs_test import build_hub
+from cdh_core.exceptions.http import ForbiddenError
+
+
+class TestCatalogExports:
+    def setup_method(self) -> None:
+        self.hub = build_hub()
+        self.request = Mock(Request)
+        self.full_vision_check = Mock(FullVisionCheck, return_value=True)
+        self.catalog_exporter = Mock(CatalogExporter)
+
+    def test_create_export(self) -> None:
+        response = create_catalog_export(
+            path=HubPath(self.hub),
+            request=self.request,
+            full_vision_check=self.full_vision_check,
+            catalog_exporter=self.catalog_exporter,
+        )
+
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert response.body == self.catalog_exporter.start_export.return_value
+        self.catalog_exporter.start_export.assert_called_once_with(self.hub)
+        assert self.full_vision_check.call_args.args == (self.request.requester_arn,)
+
+    def test_get_export(self) -> None:
+        response = get_catalog_export(
+            path=CatalogExportPath(self.hub, "export-id"),
+            request=self.request,
+            full_vision_check=self.full_vision_check,
+            catalog_exporter=self.catalog_exporter,
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.body == self.catalog_exporter.get_export.return_value
+        self.catalog_exporter.get_export.assert_called_once_with(self.hub, "export-id")
+
+    def test_requester_without_full_vision_may_not_export(self) -> None:
+        self.full_vision_check.return_value = False
+
+        with pytest.raises(ForbiddenError):
+            create_catalog_export(
+                path=HubPath(self.hub),
+                request=self.request,
+                full_vision_check=self.full_vision_check,
+                catalog_exporter=self.catalog_exporter,
+            )
+        with pytest.raises(ForbiddenError):
+            get_catalog_export(
+                path=CatalogExportPath(self.hub, "export-id"),
+                request=self.request,
+                full_vision_check=self.full_vision_check,
+                catalog_exporter=self.catalog_exporter,
+            )
+        self.catalog_exporter.start_export.assert_not_called()
+        self.catalog_exporter.get_export.assert_not_called()
@@ -0,0 +1,41 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Contains the jobs of the Core API, see Application.job."""
+from typing import Any
+from typing import Dict
+
+from cdh_core_api.app import coreapi
+from cdh_core_api.services.catalog_exporter import CatalogExporter
+from cdh_core_api.services.catalog_exporter import EXPORT_JOB
+from cdh_core_api.services.s3_resource_manager import S3ResourceManager
+
+from cdh_core.entities.accounts import Account
+from cdh_core.entities.resource import GlueSyncResource
+from cdh_core.entities.resource import S3Resource
+from cdh_core.enums.hubs import Hub
+
+
+@coreapi.job("check_kms_key_access_consistency")
+def check_kms_key_access_consistency(s3_resource_manager: S3ResourceManager[S3Resource]) -> Dict[str, Any]:
+    """Rebuild the KMS key access entries of all resource accounts and report how many entries were corrected."""
+    return {"correctedEntries": len(s3_resource_manager.check_kms_key_access_consistency())}
+
+
+@coreapi.job(EXPORT_JOB)
+def export_catalog(
+    event: Dict[str, Any], catalog_exporter: CatalogExporter[Account, S3Resource, GlueSyncResource]
+) -> Dict[str, Any]:
+    """Write the parts of an export started by POST /{hub}/exports and report how many items it contains."""
+    export = catalog_exporter.export(Hub(event["hub"]), event["exportId"])
+    return {"exportId": export.export_id, "itemCount": sum(part.item_count for part in export.parts)}
@@ -0,0 +1,42 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest.mock import Mock
+
+from cdh_core_api.jobs import check_kms_key_access_consistency
+from cdh_core_api.jobs import export_catalog
+from cdh_core_api.services.catalog_exporter import CatalogExporter
+from cdh_core_api.services.catalog_exporter import EXPORT_JOB
+from cdh_core_api.services.s3_resource_manager import S3ResourceManager
+
+from cdh_core.entities.catalog_export_test import build_catalog_export
+from cdh_core.enums.hubs_test import build_hub
+
+
+def test_check_kms_key_access_consistency() -> None:
+    s3_resource_manager = Mock(S3ResourceManager)
+    s3_resource_manager.check_kms_key_access_consistency.return_value = [Mock(), Mock()]
+
+    assert check_kms_key_access_consistency(s3_resource_manager) == {"correctedEntries": 2}
+
+
+def test_export_catalog() -> None:
+    hub = build_hub()
+    export = build_catalog_export(hub=hub)
+    catalog_exporter = Mock(CatalogExporter)
+    catalog_exporter.export.return_value = export
+
+    result = export_catalog({"job": EXPORT_JOB, "hub": hub.value, "exportId": export.export_id}, catalog_exporter)
+
+    assert result == {"exportId": export.export_id, "itemCount": sum(part.item_count for part in export.parts)}
+    catalog_exporter.export.assert_called_once_with(hub, export.export_id)
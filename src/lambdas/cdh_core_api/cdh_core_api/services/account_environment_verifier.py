@@ -39,7 +39,7 @@ class AccountEnvironmentVerifier(Generic[GenericAccount, GenericUpdateAccountBod
     ) -> None:
         """Verify the environment of an account by assuming its metadata role."""
         try:
-            self._metadata_role_assumer.assume(account_spec)
+            self._metadata_role_assumer.assume(account_spec, cached=False)
         except CannotAssumeMetadataRole as err:
             raise AccountEnvironmentVerificationFailed(account_spec.account_id) from err
         except UnsupportedAssumeMetadataRole as err:
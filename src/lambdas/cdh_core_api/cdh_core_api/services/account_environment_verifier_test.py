@@ -51,7 +51,7 @@ class TestAccountEnvironmentVerifier:
             strict=strict,
         )
 
-        self.metadata_role_assumer.assume.assert_called_once_with(self.account_spec)
+        self.metadata_role_assumer.assume.assert_called_once_with(self.account_spec, cached=False)
 
     def test_role_unsupported(self, strict: bool) -> None:
         self.metadata_role_assumer.assume.side_effect = UnsupportedAssumeMetadataRole(self.account_spec)
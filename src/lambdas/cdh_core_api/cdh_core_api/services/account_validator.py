@@ -122,7 +122,7 @@ class AccountValidator(Generic[GenericAccount, GenericUpdateAccountBody]):
         :param account to be deregistered
         :raises ForbiddenError if the account still owns datasets or resources
         """
-        owned_dataset_ids = [dataset.id for dataset in self._datasets_table.list(owner=account.id)]
+        owned_dataset_ids = [dataset.id for dataset in self._datasets_table.list_summaries(owner=account.id)]
         owned_resources_info = [
             (resource.type.value, resource.dataset_id, resource.stage.value, resource.region.value)
             for resource in self._resources_table.list(owner=account.id)
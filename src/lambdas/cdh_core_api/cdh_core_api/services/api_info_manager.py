@@ -13,6 +13,7 @@
 # limitations under the License.
 from functools import lru_cache
 from typing import Any
+from typing import Callable
 from typing import cast
 from typing import Dict
 
@@ -27,11 +28,15 @@ from cdh_core.enums.aws import Partition
 class ApiInfoManager:
     """Handles the Openapi Spec handling."""
 
-    def __init__(self, config: Config, openapi: OpenApiSpecCollector):
+    def __init__(
+        self, config: Config, openapi: OpenApiSpecCollector, import_all_routes: Callable[[], None] = lambda: None
+    ):
         self._config = config
         self._openapi = openapi
+        self._import_all_routes = import_all_routes
 
     def _create_openapi_spec(self) -> str:
+        self._import_all_routes()  # the spec must contain the routes of the endpoint modules not imported yet
         generator = OpenApiSpecGenerator.from_collector(self._openapi)
         return generator.generate(self._config.environment.get_domain(Partition.default()))
 
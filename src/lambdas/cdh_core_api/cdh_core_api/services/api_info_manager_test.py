@@ -14,6 +14,7 @@
 import json
 from typing import Any
 from typing import Dict
+from unittest.mock import Mock
 
 from cdh_core_api.api.openapi_spec.openapi import OpenApiSpecCollector
 from cdh_core_api.config_test import build_config
@@ -46,6 +47,14 @@ class TestApiInfoManager:
             f"{config.prefix}cdh-core-api",
         )
 
+    def test_get_imports_all_routes(self) -> None:
+        import_all_routes = Mock()
+        api_info_manager = ApiInfoManager(build_config(), self.openapi, import_all_routes=import_all_routes)
+
+        api_info_manager.get()
+
+        import_all_routes.assert_called_once_with()
+
     def _validate_spec(self, spec: Dict[str, Any], url: str, title: str) -> None:
         spec_json = json.dumps(spec)
         assert len(spec_json) > 0
@@ -0,0 +1,251 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from collections import OrderedDict
+from copy import copy
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Mapping
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import TypeVar
+
+from cdh_core_api.jwt_helper import extract_jwt_user_id
+from cdh_core_api.services.authorization_api import AuthorizationApi
+
+from cdh_core.entities.arn import Arn
+from cdh_core.entities.dataset import DatasetId
+from cdh_core.entities.request import Cookie
+from cdh_core.enums.hubs import Hub
+from cdh_core.primitives.account_id import AccountId
+from cdh_core.services.external_api import ExternalApiSession
+
+T = TypeVar("T")
+RequesterKey = Tuple[str, Optional[str], Optional[str]]
+
+DEFAULT_TTL_SECONDS: Mapping[str, float] = {
+    "get_visible_account_ids": 60,
+    "is_account_visible": 60,
+    "get_visible_dataset_ids": 30,
+    "is_dataset_visible": 30,
+    "get_visible_hubs": 300,
+    "is_hub_visible": 300,
+    "get_user_id": 300,
+}
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def build_requester_key(requester: Arn, jwt: Optional[Cookie]) -> RequesterKey:
+    """Return the key under which the answers for a requester are cached.
+
+    Besides the requester ARN and the JWT subject, the key contains a digest of the JWT: the subject is extracted
+    without verifying the token, so a forged token must never be answered from the entries of a genuine one.
+    """
+    if jwt is None:
+        return str(requester), None, None
+    return str(requester), extract_jwt_user_id(jwt), hashlib.sha256(jwt.value.encode("UTF-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class _Entry:
+    value: Any
+    expires_at: float
+
+
+class AuthorizationApiCache:
+    """Caches answers of the Authorization API across the requests handled by a warm lambda container.
+
+    Every call type has its own time to live, a TTL of zero disables the cross-request caching of that call type.
+    The number of entries is bounded, the least recently used entry is evicted first.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[Mapping[str, float]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl_seconds = {**DEFAULT_TTL_SECONDS, **(ttl_seconds or {})}
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Tuple[Any, ...], _Entry] = OrderedDict()
+        self._statistics: Counter[str] = Counter()
+        self._lock = Lock()
+
+    @classmethod
+    def from_environment(cls) -> AuthorizationApiCache:
+        """Create a cache configured by the optional environment variables.
+
+        AUTHORIZATION_API_CACHE_TTL_SECONDS is a JSON object mapping call types to TTLs in seconds and overrides the
+        defaults, AUTHORIZATION_API_CACHE_MAX_ENTRIES bounds the number of entries.
+        """
+        return cls(
+            ttl_seconds=json.loads(os.environ.get("AUTHORIZATION_API_CACHE_TTL_SECONDS") or "{}"),
+            max_entries=int(os.environ.get("AUTHORIZATION_API_CACHE_MAX_ENTRIES") or DEFAULT_MAX_ENTRIES),
+        )
+
+    def for_request(self, requester: RequesterKey, mutating: bool) -> AuthorizationApiRequestCache:
+        """Return the cache to be used while handling a single request.
+
+        A mutating request invalidates the entries of the requester and bypasses the cache entirely: the request may
+        change the visibility and poll for the change to take effect, so none of its answers must be reused.
+        """
+        if mutating:
+            self.invalidate(requester)
+        return AuthorizationApiRequestCache(cache=self, requester=requester, shared=not mutating)
+
+    def get(self, requester: RequesterKey, call_type: str, arguments: Hashable) -> Tuple[bool, Any]:
+        """Return whether a valid entry exists and its value."""
+        key = (*requester, call_type, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry.value
+
+    def put(self, requester: RequesterKey, call_type: str, arguments: Hashable, value: Any) -> None:
+        """Store a value unless caching is disabled for the call type."""
+        ttl = self._ttl_seconds.get(call_type, 0)
+        if ttl <= 0:
+            return
+        key = (*requester, call_type, arguments)
+        with self._lock:
+            self._entries[key] = _Entry(value=value, expires_at=self._clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._statistics["evictions"] += 1
+
+    def invalidate(self, requester: RequesterKey) -> None:
+        """Drop all entries of the requester, regardless of the JWT used."""
+        arn, jwt_subject, _ = requester
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == arn and key[1] == jwt_subject]:
+                del self._entries[key]
+
+    def count(self, event: str) -> None:
+        """Increment the counter of the given event."""
+        with self._lock:
+            self._statistics[event] += 1
+
+    def pop_statistics(self) -> Dict[str, int]:
+        """Return the hit and miss counters since the last call and reset them."""
+        with self._lock:
+            statistics = {
+                f"auth_cache_{event}": self._statistics[event]
+                for event in ["request_hits", "hits", "misses", "evictions"]
+            }
+            self._statistics.clear()
+        return statistics
+
+
+class AuthorizationApiRequestCache:
+    """Memoizes the answers within a single request and falls back to the cross-request cache.
+
+    If the cache is not shared, every call is passed through to the Authorization API.
+    """
+
+    def __init__(self, cache: AuthorizationApiCache, requester: RequesterKey, shared: bool):
+        self._cache = cache
+        self._requester = requester
+        self._shared = shared
+        self._memo: Dict[Tuple[str, Hashable], Any] = {}
+
+    def get_or_load(self, call_type: str, arguments: Hashable, load: Callable[[], T]) -> T:
+        """Return the cached answer of the call or load and cache it."""
+        if not self._shared:
+            return load()
+        key = (call_type, arguments)
+        if key in self._memo:
+            self._cache.count("request_hits")
+            return copy(self._memo[key])  # type: ignore[no-any-return]
+        found, value = self._cache.get(self._requester, call_type, arguments)
+        if found:
+            self._cache.count("hits")
+            self._memo[key] = value
+            return copy(value)  # type: ignore[no-any-return]
+        self._cache.count("misses")
+        loaded = load()
+        self._memo[key] = loaded
+        self._cache.put(self._requester, call_type, arguments, loaded)
+        return copy(loaded)
+
+
+class CachingAuthorizationApi(AuthorizationApi):
+    """Serves the visibility answers of the Authorization API from an AuthorizationApiRequestCache."""
+
+    def __init__(
+        self,
+        session: ExternalApiSession,
+        requester: Arn,
+        jwt: Optional[Cookie],
+        cache: AuthorizationApiRequestCache,
+    ):
+        super().__init__(session=session, requester=requester, jwt=jwt)
+        self._cache = cache
+
+    def get_visible_account_ids(self) -> Set[AccountId]:
+        """Return the ids of all accounts that the requester is allowed to see."""
+        return self._cache.get_or_load("get_visible_account_ids", (), super().get_visible_account_ids)
+
+    def is_account_visible(self, account_id: AccountId) -> bool:
+        """Check whether the requester is allowed to see the given account."""
+        load = super().is_account_visible
+        return self._cache.get_or_load("is_account_visible", account_id, lambda: load(account_id))
+
+    def get_visible_dataset_ids(
+        self, hub: Optional[Hub] = None, dataset_ids: Optional[Iterable[DatasetId]] = None
+    ) -> Set[DatasetId]:
+        """Return the ids of all datasets that the requester is allowed to see."""
+        load = super().get_visible_dataset_ids
+        dataset_id_set = frozenset(dataset_ids) if dataset_ids is not None else None
+        return self._cache.get_or_load(
+            "get_visible_dataset_ids",
+            (hub, dataset_id_set),
+            lambda: load(hub, sorted(dataset_id_set) if dataset_id_set is not None else None),
+        )
+
+    def is_dataset_visible(self, dataset_id: DatasetId) -> bool:
+        """Check whether the requester is allowed to see the given dataset."""
+        load = super().is_dataset_visible
+        return self._cache.get_or_load("is_dataset_visible", dataset_id, lambda: load(dataset_id))
+
+    def get_visible_hubs(self) -> Set[Hub]:
+        """Return all hubs that the requester is allowed to see."""
+        return self._cache.get_or_load("get_visible_hubs", (), super().get_visible_hubs)
+
+    def is_hub_visible(self, hub: Hub) -> bool:
+        """Check whether the requester is allowed to see the given hub."""
+        load = super().is_hub_visible
+        return self._cache.get_or_load("is_hub_visible", hub, lambda: load(hub))
+
+    def get_user_id(self) -> Optional[str]:
+        """Get the user id of the requester from the jwt."""
+        return self._cache.get_or_load("get_user_id", (), super().get_user_id)
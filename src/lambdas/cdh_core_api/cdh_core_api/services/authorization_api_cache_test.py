@@ -0,0 +1,236 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import base64
+import json
+from typing import Optional
+from unittest.mock import MagicMock
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from cdh_core_api.services.authorization_api_cache import AuthorizationApiCache
+from cdh_core_api.services.authorization_api_cache import build_requester_key
+from cdh_core_api.services.authorization_api_cache import CachingAuthorizationApi
+from cdh_core_api.services.authorization_api_cache import RequesterKey
+
+from cdh_core.entities.arn_test import build_arn
+from cdh_core.entities.dataset_test import build_dataset_id
+from cdh_core.entities.request import Cookie
+from cdh_core.enums.hubs_test import build_hub
+from cdh_core.services.external_api import ExternalApiSession
+from cdh_core_dev_tools.testing.builder import Builder
+
+
+def build_jwt(user_id: str, signature: Optional[str] = None) -> Cookie:
+    payload = base64.b64encode(json.dumps({"id": user_id}).encode()).decode().rstrip("=")
+    return Cookie("jwt", f"header.{payload}.{signature or Builder.build_random_string()}")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestBuildRequesterKey:
+    def test_without_jwt(self) -> None:
+        arn = build_arn("iam")
+        assert build_requester_key(arn, None) == (str(arn), None, None)
+
+    def test_same_subject_different_token(self) -> None:
+        arn = build_arn("iam")
+        user_id = Builder.build_random_string()
+        first = build_requester_key(arn, build_jwt(user_id))
+        second = build_requester_key(arn, build_jwt(user_id))
+
+        assert first[:2] == second[:2] == (str(arn), user_id)
+        assert first != second
+
+
+class TestAuthorizationApiCache:
+    def setup_method(self) -> None:
+        self.clock = FakeClock()
+        self.cache = AuthorizationApiCache(ttl_seconds={"is_dataset_visible": 10}, max_entries=2, clock=self.clock)
+        self.requester: RequesterKey = (str(build_arn("iam")), Builder.build_random_string(), None)
+
+    def test_get_missing(self) -> None:
+        assert self.cache.get(self.requester, "is_dataset_visible", build_dataset_id()) == (False, None)
+
+    def test_put_and_get(self) -> None:
+        dataset_id = build_dataset_id()
+        self.cache.put(self.requester, "is_dataset_visible", dataset_id, True)
+
+        assert self.cache.get(self.requester, "is_dataset_visible", dataset_id) == (True, True)
+        assert self.cache.get(self.requester, "is_dataset_visible", build_dataset_id()) == (False, None)
+
+    def test_entries_expire(self) -> None:
+        dataset_id = build_dataset_id()
+        self.cache.put(self.requester, "is_dataset_visible", dataset_id, True)
+
+        self.clock.now = 10
+        assert self.cache.get(self.requester, "is_dataset_visible", dataset_id) == (False, None)
+
+    def test_zero_ttl_disables_caching(self) -> None:
+        cache = AuthorizationApiCache(ttl_seconds={"get_user_id": 0})
+        cache.put(self.requester, "get_user_id", (), "user")
+
+        assert cache.get(self.requester, "get_user_id", ()) == (False, None)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        dataset_ids = [build_dataset_id() for _ in range(3)]
+        self.cache.put(self.requester, "is_dataset_visible", dataset_ids[0], True)
+        self.cache.put(self.requester, "is_dataset_visible", dataset_ids[1], True)
+        self.cache.get(self.requester, "is_dataset_visible", dataset_ids[0])
+
+        self.cache.put(self.requester, "is_dataset_visible", dataset_ids[2], True)
+
+        assert self.cache.get(self.requester, "is_dataset_visible", dataset_ids[0]) == (True, True)
+        assert self.cache.get(self.requester, "is_dataset_visible", dataset_ids[1]) == (False, None)
+        assert self.cache.pop_statistics()["auth_cache_evictions"] == 1
+
+    def test_invalidate_ignores_jwt_digest(self) -> None:
+        dataset_id = build_dataset_id()
+        other_token = (self.requester[0], self.requester[1], "digest")
+        other_requester: RequesterKey = (str(build_arn("iam")), self.requester[1], None)
+        self.cache = AuthorizationApiCache(ttl_seconds={"is_dataset_visible": 10}, clock=self.clock)
+        for requester in [self.requester, other_token, other_requester]:
+            self.cache.put(requester, "is_dataset_visible", dataset_id, True)
+
+        self.cache.invalidate(self.requester)
+
+        assert self.cache.get(self.requester, "is_dataset_visible", dataset_id) == (False, None)
+        assert self.cache.get(other_token, "is_dataset_visible", dataset_id) == (False, None)
+        assert self.cache.get(other_requester, "is_dataset_visible", dataset_id) == (True, True)
+
+    def test_request_cache_memoizes_and_shares(self) -> None:
+        load = Mock(return_value={build_dataset_id()})
+        first_request = self.cache.for_request(self.requester, mutating=False)
+        first_request.get_or_load("get_visible_dataset_ids", (), load)
+        first_request.get_or_load("get_visible_dataset_ids", (), load)
+        second_request = self.cache.for_request(self.requester, mutating=False)
+
+        result = second_request.get_or_load("get_visible_dataset_ids", (), load)
+
+        assert result == load.return_value
+        load.assert_called_once()
+        assert self.cache.pop_statistics() == {
+            "auth_cache_request_hits": 1,
+            "auth_cache_hits": 1,
+            "auth_cache_misses": 1,
+            "auth_cache_evictions": 0,
+        }
+        assert self.cache.pop_statistics()["auth_cache_misses"] == 0
+
+    def test_returned_sets_are_copies(self) -> None:
+        request_cache = self.cache.for_request(self.requester, mutating=False)
+        request_cache.get_or_load("get_visible_hubs", (), lambda: {build_hub()}).clear()
+
+        assert request_cache.get_or_load("get_visible_hubs", (), Mock()) != set()
+
+    def test_mutating_request_invalidates_and_bypasses_shared_entries(self) -> None:
+        dataset_id = build_dataset_id()
+        self.cache.put(self.requester, "is_dataset_visible", dataset_id, False)
+
+        request_cache = self.cache.for_request(self.requester, mutating=True)
+        assert request_cache.get_or_load("is_dataset_visible", dataset_id, lambda: True) is True
+
+        assert self.cache.get(self.requester, "is_dataset_visible", dataset_id) == (False, None)
+
+    def test_mutating_request_does_not_memoize(self) -> None:
+        dataset_id = build_dataset_id()
+        load = Mock(side_effect=[False, True])
+        request_cache = self.cache.for_request(self.requester, mutating=True)
+
+        assert request_cache.get_or_load("is_dataset_visible", dataset_id, load) is False
+        assert request_cache.get_or_load("is_dataset_visible", dataset_id, load) is True
+
+    def test_errors_are_not_cached(self) -> None:
+        request_cache = self.cache.for_request(self.requester, mutating=False)
+        dataset_id = build_dataset_id()
+        with pytest.raises(ValueError):
+            request_cache.get_or_load("is_dataset_visible", dataset_id, Mock(side_effect=ValueError))
+
+        assert request_cache.get_or_load("is_dataset_visible", dataset_id, lambda: True) is True
+
+    def test_from_environment(self) -> None:
+        with patch.dict(
+            "os.environ",
+            {"AUTHORIZATION_API_CACHE_TTL_SECONDS": '{"get_user_id": 0}', "AUTHORIZATION_API_CACHE_MAX_ENTRIES": "5"},
+        ):
+            cache = AuthorizationApiCache.from_environment()
+        cache.put(self.requester, "get_user_id", (), "user")
+        cache.put(self.requester, "get_visible_hubs", (), set())
+
+        assert cache.get(self.requester, "get_user_id", ()) == (False, None)
+        assert cache.get(self.requester, "get_visible_hubs", ()) == (True, set())
+
+
+class TestCachingAuthorizationApi:
+    def setup_method(self) -> None:
+        self.requests_session = MagicMock()
+        self.cache = AuthorizationApiCache()
+        self.requester = build_arn("iam")
+        self.jwt = build_jwt(Builder.build_random_string())
+
+    def build_api(self, mutating: bool = False) -> CachingAuthorizationApi:
+        return CachingAuthorizationApi(
+            session=ExternalApiSession(
+                request_session_factory=lambda: self.requests_session,
+                api_url="https://authorization.test",
+                timeout=(0.4, 0.4),
+            ),
+            requester=self.requester,
+            jwt=self.jwt,
+            cache=self.cache.for_request(build_requester_key(self.requester, self.jwt), mutating=mutating),
+        )
+
+    def test_is_dataset_visible_is_cached_across_requests(self) -> None:
+        dataset_id = build_dataset_id()
+        self.requests_session.get.return_value.json.return_value = {"granted": True}
+
+        assert self.build_api().is_dataset_visible(dataset_id)
+        assert self.build_api().is_dataset_visible(dataset_id)
+
+        self.requests_session.get.assert_called_once()
+
+    def test_get_visible_dataset_ids_key_ignores_order(self) -> None:
+        dataset_ids = [build_dataset_id() for _ in range(3)]
+        self.requests_session.get.return_value.json.return_value = {"datasets": [{"id": dataset_ids[0]}]}
+        api = self.build_api()
+
+        assert api.get_visible_dataset_ids(dataset_ids=iter(dataset_ids)) == {dataset_ids[0]}
+        assert api.get_visible_dataset_ids(dataset_ids=reversed(dataset_ids)) == {dataset_ids[0]}
+
+        self.requests_session.get.assert_called_once()
+        assert self.requests_session.get.call_args.kwargs["params"] == {"dataset_ids": ",".join(sorted(dataset_ids))}
+
+    def test_different_arguments_are_cached_separately(self) -> None:
+        self.requests_session.get.return_value.json.return_value = {"granted": True}
+        api = self.build_api()
+
+        api.is_hub_visible(build_hub())
+        api.is_account_visible(Builder.build_random_digit_string(12))  # type: ignore[arg-type]
+
+        assert self.requests_session.get.call_count == 2
+
+    def test_mutating_request_calls_api(self) -> None:
+        self.requests_session.get.return_value.json.return_value = {"user": {"id": "me"}}
+        assert self.build_api().get_user_id() == "me"
+
+        assert self.build_api(mutating=True).get_user_id() == "me"
+        assert self.build_api().get_user_id() == "me"
+
+        assert self.requests_session.get.call_count == 3
@@ -0,0 +1,255 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import gzip
+import re
+from concurrent.futures import Future
+from dataclasses import replace
+from datetime import datetime
+from logging import getLogger
+from threading import Lock
+from typing import Callable
+from typing import Dict
+from typing import Generic
+from typing import Iterable
+from typing import List
+from uuid import uuid4
+
+from cdh_core_api.catalog.accounts_table import GenericAccountsTable
+from cdh_core_api.catalog.datasets_table import DatasetsTable
+from cdh_core_api.catalog.resource_table import GenericResourcesTable
+from cdh_core_api.config import Config
+from cdh_core_api.generic_types import GenericAccount
+from cdh_core_api.generic_types import GenericGlueSyncResource
+from cdh_core_api.generic_types import GenericS3Resource
+from cdh_core_api.services.parallel_executor import ParallelExecutor
+
+from cdh_core.aws_clients.lambda_client import LambdaClient
+from cdh_core.aws_clients.s3_client import ObjectNotFound
+from cdh_core.aws_clients.s3_client import S3Client
+from cdh_core.entities.accounts import ResponseAccountWithoutCosts
+from cdh_core.entities.catalog_export import CatalogExport
+from cdh_core.entities.catalog_export import CatalogExportEntityType
+from cdh_core.entities.catalog_export import CatalogExportPart
+from cdh_core.entities.response import GZIP_COMPRESSION_LEVEL
+from cdh_core.entities.serializer_factory import SerializerFactory
+from cdh_core.enums.hubs import Hub
+from cdh_core.exceptions.http import NotFoundError
+from cdh_core.exceptions.http import ServiceUnavailableError
+
+LOG = getLogger(__name__)
+
+EXPORT_JOB = "export_catalog"
+EXPORT_PART_MAX_ITEMS = 5000
+PRESIGNED_URL_EXPIRY_SECONDS = 3600
+_EXPORT_ID_PATTERN = re.compile(r"^\d{8}T\d{6}Z-[0-9a-f]{8}$")
+
+
+class CatalogExporter(Generic[GenericAccount, GenericS3Resource, GenericGlueSyncResource]):
+    """Writes snapshots of the datasets, resources and accounts of a hub to S3 as gzip compressed NDJSON.
+
+    An export is started by writing its manifest and invoking the job EXPORT_JOB of the Core API lambda asynchronously,
+    which writes the parts and completes the manifest. Every kind of entity is read with a consistent parallel scan,
+    the three scans run concurrently on the ParallelExecutor. The entities are written in parts of at most
+    `part_max_items` lines, so only one part per kind is held in memory. After every part the manifest of the export is
+    rewritten as a checkpoint, so consumers can tell a complete export from an unfinished one. Each entity is read
+    consistently, but the scans are not an atomic snapshot across items: changes made while an export runs may or may
+    not be contained.
+    Dataset participants are not exported, since they would have to be requested from the Authorization API.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        config: Config,
+        s3_client: S3Client,
+        lambda_client: LambdaClient,
+        function_arn: str,
+        accounts_table: GenericAccountsTable[GenericAccount],
+        datasets_table: DatasetsTable,
+        resources_table: GenericResourcesTable[GenericS3Resource, GenericGlueSyncResource],
+        parallel_executor: ParallelExecutor,
+        part_max_items: int = EXPORT_PART_MAX_ITEMS,
+    ):
+        self._config = config
+        self._s3_client = s3_client
+        self._lambda_client = lambda_client
+        self._function_arn = function_arn
+        self._accounts_table = accounts_table
+        self._datasets_table = datasets_table
+        self._resources_table = resources_table
+        self._parallel_executor = parallel_executor
+        self._part_max_items = part_max_items
+
+    def start_export(self, hub: Hub) -> CatalogExport:
+        """Write the manifest of a new export of the given hub and invoke the job which writes its parts."""
+        bucket = self._get_bucket()
+        export = CatalogExport(
+            export_id=f"{datetime.utcnow():%Y%m%dT%H%M%SZ}-{uuid4().hex[:8]}",
+            hub=hub,
+            started_at=datetime.now(),
+            complete=False,
+            parts=[],
+        )
+        self._write_manifest(bucket, export)
+        self._lambda_client.invoke_lambda_async(
+            self._function_arn, {"job": EXPORT_JOB, "hub": hub.value, "exportId": export.export_id}
+        )
+        return export
+
+    def export(self, hub: Hub, export_id: str) -> CatalogExport:
+        """Write the parts of a started export of the given hub and mark it as complete."""
+        bucket = self._get_bucket()
+        export = self._read_manifest(bucket, hub, export_id)
+        if export.complete:
+            LOG.info(f"Export {export_id} of hub {hub.value} is already complete")
+            return export
+        # Lambda retries failed asynchronous invocations, the parts of a failed run are overwritten since their keys
+        # only depend on their position
+        checkpoint = _Checkpoint(
+            replace(export, parts=[]), write_manifest=lambda export: self._write_manifest(bucket, export)
+        )
+        checkpoint.save()
+        readers: Dict[CatalogExportEntityType, Callable[[Hub], Iterable[bytes]]] = {
+            CatalogExportEntityType.datasets: self._read_datasets,
+            CatalogExportEntityType.resources: self._read_resources,
+            CatalogExportEntityType.accounts: self._read_accounts,
+        }
+        futures = [
+            self._submit_write_parts(bucket, checkpoint, entity_type, read) for entity_type, read in readers.items()
+        ]
+        for future in futures:
+            future.result()
+        export = checkpoint.complete()
+        LOG.info(f"Exported {sum(part.item_count for part in export.parts)} items of hub {hub.value} as {export_id}")
+        return export
+
+    def get_export(self, hub: Hub, export_id: str) -> CatalogExport:
+        """Return an export of the given hub with pre-signed urls of the parts written so far."""
+        bucket = self._get_bucket()
+        return self._with_urls(bucket, self._read_manifest(bucket, hub, export_id))
+
+    def _get_bucket(self) -> str:
+        if not self._config.export_bucket_name:
+            raise ServiceUnavailableError("Catalog exports are not enabled in this environment")
+        return self._config.export_bucket_name
+
+    def _read_manifest(self, bucket: str, hub: Hub, export_id: str) -> CatalogExport:
+        if not _EXPORT_ID_PATTERN.match(export_id):
+            raise NotFoundError(f"Export {export_id} of hub {hub.value} was not found")
+        try:
+            manifest = self._s3_client.get_object_body(bucket, _get_manifest_key(hub, export_id))
+        except ObjectNotFound as error:
+            raise NotFoundError(f"Export {export_id} of hub {hub.value} was not found") from error
+        return CatalogExport.from_json(manifest)
+
+    def _read_datasets(self, hub: Hub) -> Iterable[bytes]:
+        for dataset in self._datasets_table.iter_list(hub=hub, parallel_scan=True):
+            yield SerializerFactory.dumps(dataset)
+
+    def _read_resources(self, hub: Hub) -> Iterable[bytes]:
+        for resource in self._resources_table.iter_list(hub=hub, parallel_scan=True):
+            yield SerializerFactory.dumps(resource.to_payload())
+
+    def _read_accounts(self, hub: Hub) -> Iterable[bytes]:
+        for account in self._accounts_table.iter_all_accounts(hub=hub, parallel_scan=True):
+            yield SerializerFactory.dumps(account.to_response_account(ResponseAccountWithoutCosts))
+
+    def _submit_write_parts(
+        self,
+        bucket: str,
+        checkpoint: "_Checkpoint",
+        entity_type: CatalogExportEntityType,
+        read: Callable[[Hub], Iterable[bytes]],
+    ) -> Future[None]:
+        return self._parallel_executor.submit(
+            f"export {entity_type.value}", lambda: self._write_parts(bucket, checkpoint, entity_type, read)
+        )
+
+    def _write_parts(
+        self,
+        bucket: str,
+        checkpoint: "_Checkpoint",
+        entity_type: CatalogExportEntityType,
+        read: Callable[[Hub], Iterable[bytes]],
+    ) -> None:
+        export = checkpoint.export
+        lines: List[bytes] = []
+        part_number = 0
+        for line in read(export.hub):
+            lines.append(line)
+            if len(lines) == self._part_max_items:
+                checkpoint.add_part(self._write_part(bucket, export, entity_type, part_number, lines))
+                lines = []
+                part_number += 1
+        if lines or part_number == 0:
+            checkpoint.add_part(self._write_part(bucket, export, entity_type, part_number, lines))
+
+    def _write_part(  # pylint: disable=too-many-arguments
+        self,
+        bucket: str,
+        export: CatalogExport,
+        entity_type: CatalogExportEntityType,
+        part_number: int,
+        lines: List[bytes],
+    ) -> CatalogExportPart:
+        key = f"{_get_export_prefix(export.hub, export.export_id)}/{entity_type.value}-{part_number:05d}.ndjson.gz"
+        body = gzip.compress(b"".join(line + b"\n" for line in lines), compresslevel=GZIP_COMPRESSION_LEVEL, mtime=0)
+        self._s3_client.put_object(bucket, key, body, content_type="application/x-ndjson", content_encoding="gzip")
+        return CatalogExportPart(entity_type=entity_type, key=key, item_count=len(lines))
+
+    def _write_manifest(self, bucket: str, export: CatalogExport) -> None:
+        self._s3_client.put_object(
+            bucket,
+            _get_manifest_key(export.hub, export.export_id),
+            SerializerFactory.dumps(export),
+            content_type="application/json",
+        )
+
+    def _with_urls(self, bucket: str, export: CatalogExport) -> CatalogExport:
+        return export.with_urls(
+            lambda key: self._s3_client.generate_presigned_get_url(
+                bucket, key, expires_in_seconds=PRESIGNED_URL_EXPIRY_SECONDS
+            )
+        )
+
+
+class _Checkpoint:
+    """Collects the written parts of an export and rewrites its manifest after each of them."""
+
+    def __init__(self, export: CatalogExport, write_manifest: Callable[[CatalogExport], None]):
+        self.export = export
+        self._write_manifest = write_manifest
+        self._lock = Lock()
+
+    def save(self) -> None:
+        with self._lock:
+            self._write_manifest(self.export)
+
+    def add_part(self, part: CatalogExportPart) -> None:
+        with self._lock:
+            self.export = replace(self.export, parts=[*self.export.parts, part])
+            self._write_manifest(self.export)
+
+    def complete(self) -> CatalogExport:
+        with self._lock:
+            self.export = replace(self.export, complete=True)
+            self._write_manifest(self.export)
+            return self.export
+
+
+def _get_export_prefix(hub: Hub, export_id: str) -> str:
+    return f"{hub.value}/{export_id}"
+
+
+def _get_manifest_key(hub: Hub, export_id: str) -> str:
+    return f"{_get_export_prefix(hub, export_id)}/manifest.json"
@@ -0,0 +1,205 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import gzip
+import json
+from dataclasses import replace
+from typing import Any
+from typing import Dict
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+from cdh_core_api.catalog.accounts_table import AccountsTable
+from cdh_core_api.catalog.datasets_table import DatasetsTable
+from cdh_core_api.catalog.resource_table import ResourcesTable
+from cdh_core_api.config_test import build_config
+from cdh_core_api.services.catalog_exporter import CatalogExporter
+from cdh_core_api.services.catalog_exporter import EXPORT_JOB
+from cdh_core_api.services.parallel_executor import ParallelExecutor
+
+from cdh_core.aws_clients.lambda_client import LambdaClient
+from cdh_core.aws_clients.s3_client import ObjectNotFound
+from cdh_core.aws_clients.s3_client import S3Client
+from cdh_core.entities.accounts import Account
+from cdh_core.entities.accounts import ResponseAccountWithoutCosts
+from cdh_core.entities.accounts_test import build_account
+from cdh_core.entities.catalog_export import CatalogExport
+from cdh_core.entities.catalog_export import CatalogExportEntityType
+from cdh_core.entities.dataset import Dataset
+from cdh_core.entities.dataset_test import build_dataset
+from cdh_core.entities.resource import GlueSyncResource
+from cdh_core.entities.resource import ResourcePayload
+from cdh_core.entities.resource import S3Resource
+from cdh_core.entities.resource_test import build_s3_resource
+from cdh_core.enums.hubs_test import build_hub
+from cdh_core.exceptions.http import NotFoundError
+from cdh_core.exceptions.http import ServiceUnavailableError
+from cdh_core_dev_tools.testing.builder import Builder
+
+
+class TestCatalogExporter:
+    def setup_method(self) -> None:
+        self.hub = build_hub()
+        self.bucket = Builder.build_random_string()
+        self.objects: Dict[str, bytes] = {}
+        self.s3_client = Mock(S3Client)
+        self.s3_client.put_object.side_effect = self._put_object
+        self.s3_client.get_object_body.side_effect = self._get_object_body
+        self.s3_client.generate_presigned_get_url.side_effect = lambda bucket, key, expires_in_seconds: f"url/{key}"
+        self.datasets = [build_dataset(hub=self.hub) for _ in range(5)]
+        self.resources = [build_s3_resource(dataset=dataset) for dataset in self.datasets[:2]]
+        self.accounts = [build_account(hub=self.hub), build_account(hub=self.hub)]
+        self.datasets_table = Mock(DatasetsTable)
+        self.datasets_table.iter_list.side_effect = lambda **_: iter(self.datasets)
+        self.resources_table = Mock(ResourcesTable)
+        self.resources_table.iter_list.side_effect = lambda **_: iter(self.resources)
+        self.accounts_table = Mock(AccountsTable)
+        self.accounts_table.iter_all_accounts.side_effect = lambda **_: iter(self.accounts)
+        self.lambda_client = Mock(LambdaClient)
+        self.function_arn = Builder.build_random_string()
+        self.exporter = CatalogExporter[Account, S3Resource, GlueSyncResource](
+            config=build_config(export_bucket_name=self.bucket),
+            s3_client=self.s3_client,
+            lambda_client=self.lambda_client,
+            function_arn=self.function_arn,
+            accounts_table=self.accounts_table,
+            datasets_table=self.datasets_table,
+            resources_table=self.resources_table,
+            parallel_executor=ParallelExecutor(max_workers=1),
+            part_max_items=2,
+        )
+
+    def _put_object(self, bucket: str, key: str, body: bytes, **_: Any) -> None:
+        assert bucket == self.bucket
+        self.objects[key] = body
+
+    def _get_object_body(self, bucket: str, key: str) -> bytes:
+        if key not in self.objects:
+            raise ObjectNotFound(bucket, key)
+        return self.objects[key]
+
+    def _read_lines(self, export: CatalogExport, entity_type: CatalogExportEntityType) -> List[Dict[str, Any]]:
+        return [
+            json.loads(line)
+            for part in export.get_parts(entity_type)
+            for line in gzip.decompress(self.objects[part.key]).splitlines()
+        ]
+
+    def _export(self) -> CatalogExport:
+        started = self.exporter.start_export(self.hub)
+        self.exporter.export(self.hub, started.export_id)
+        return self.exporter.get_export(self.hub, started.export_id)
+
+    def test_start_export_invokes_job(self) -> None:
+        export = self.exporter.start_export(self.hub)
+
+        assert not export.complete
+        assert not export.parts
+        assert self.exporter.get_export(self.hub, export.export_id) == export
+        self.lambda_client.invoke_lambda_async.assert_called_once_with(
+            self.function_arn, {"job": EXPORT_JOB, "hub": self.hub.value, "exportId": export.export_id}
+        )
+        self.datasets_table.iter_list.assert_not_called()
+
+    def test_export_writes_all_entities_in_parts(self) -> None:
+        export = self._export()
+
+        assert export.complete
+        assert export.hub is self.hub
+        assert [part.item_count for part in export.get_parts(CatalogExportEntityType.datasets)] == [2, 2, 1]
+        assert [part.item_count for part in export.get_parts(CatalogExportEntityType.resources)] == [2]
+        assert [part.item_count for part in export.get_parts(CatalogExportEntityType.accounts)] == [2]
+        assert all(part.url == f"url/{part.key}" for part in export.parts)
+        assert [
+            Dataset.from_dict(item) for item in self._read_lines(export, CatalogExportEntityType.datasets)
+        ] == self.datasets
+        assert [
+            ResourcePayload.from_dict(item) for item in self._read_lines(export, CatalogExportEntityType.resources)
+        ] == [resource.to_payload() for resource in self.resources]
+        assert [
+            ResponseAccountWithoutCosts.from_dict(item)
+            for item in self._read_lines(export, CatalogExportEntityType.accounts)
+        ] == [account.to_response_account(ResponseAccountWithoutCosts) for account in self.accounts]
+        self.datasets_table.iter_list.assert_called_once_with(hub=self.hub, parallel_scan=True)
+        self.resources_table.iter_list.assert_called_once_with(hub=self.hub, parallel_scan=True)
+        self.accounts_table.iter_all_accounts.assert_called_once_with(hub=self.hub, parallel_scan=True)
+
+    def test_manifest_is_written_after_every_part(self) -> None:
+        manifests: List[CatalogExport] = []
+
+        def put_object(bucket: str, key: str, body: bytes, content_type: str, content_encoding: Any = None) -> None:
+            self._put_object(bucket, key, body, content_type=content_type, content_encoding=content_encoding)
+            if key.endswith("manifest.json"):
+                manifests.append(CatalogExport.from_json(body))
+
+        self.s3_client.put_object.side_effect = put_object
+
+        export = self._export()
+
+        assert [len(manifest.parts) for manifest in manifests] == [0, 0, 1, 2, 3, 4, 5, 5]
+        assert [manifest.complete for manifest in manifests] == [False] * 7 + [True]
+        assert all(part.url is None for part in manifests[-1].parts)
+        assert manifests[-1].parts == [replace(part, url=None) for part in export.parts]
+
+    def test_empty_entity_types_get_an_empty_part(self) -> None:
+        self.resources = []
+
+        export = self._export()
+
+        assert [part.item_count for part in export.get_parts(CatalogExportEntityType.resources)] == [0]
+        assert self._read_lines(export, CatalogExportEntityType.resources) == []
+
+    def test_retried_export_overwrites_the_parts_of_the_failed_run(self) -> None:
+        started = self.exporter.start_export(self.hub)
+        self.resources_table.iter_list.side_effect = [Exception("throttled"), iter(self.resources)]
+        with pytest.raises(Exception, match="throttled"):
+            self.exporter.export(self.hub, started.export_id)
+        keys = set(self.objects)
+
+        export = self.exporter.export(self.hub, started.export_id)
+
+        assert export.complete
+        assert len(export.parts) == len({part.key for part in export.parts}) == 5
+        assert set(self.objects) >= keys
+
+    def test_complete_export_is_not_written_again(self) -> None:
+        export = self._export()
+        self.s3_client.put_object.reset_mock()
+
+        assert self.exporter.export(self.hub, export.export_id) == replace(
+            export, parts=[replace(part, url=None) for part in export.parts]
+        )
+        self.s3_client.put_object.assert_not_called()
+
+    @pytest.mark.parametrize("export_id", ["20260101T120000Z-0123abcd", "../manifest", ""])
+    def test_get_unknown_export(self, export_id: str) -> None:
+        with pytest.raises(NotFoundError):
+            self.exporter.get_export(self.hub, export_id)
+
+    def test_exports_disabled_without_bucket(self) -> None:
+        exporter = CatalogExporter[Account, S3Resource, GlueSyncResource](
+            config=build_config(),
+            s3_client=self.s3_client,
+            lambda_client=self.lambda_client,
+            function_arn=self.function_arn,
+            accounts_table=self.accounts_table,
+            datasets_table=self.datasets_table,
+            resources_table=self.resources_table,
+            parallel_executor=ParallelExecutor(max_workers=1),
+        )
+
+        with pytest.raises(ServiceUnavailableError):
+            exporter.start_export(self.hub)
+        self.s3_client.put_object.assert_not_called()
+        self.lambda_client.invoke_lambda_async.assert_not_called()
@@ -88,7 +88,10 @@ class DatasetManager:
         )
 
     def _remove_dataset_id_from_lineage(self, dataset_id: DatasetId, sns_publisher: SnsPublisher) -> None:
-        for dataset in self.datasets_table.list():
+        for summary in self.datasets_table.list_summaries(attributes=["lineage"], parallel_scan=True):
+            if dataset_id not in summary.lineage.upstream:
+                continue
+            dataset = self.datasets_table.get(summary.id)
             updated_lineage = {
                 other_dataset_id for other_dataset_id in dataset.lineage.upstream if dataset_id != other_dataset_id
             }
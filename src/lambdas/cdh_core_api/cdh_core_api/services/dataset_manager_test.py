@@ -26,6 +26,7 @@ from cdh_core_api.bodies.datasets_test import build_update_dataset_body
 from cdh_core_api.catalog.datasets_table import DatasetAlreadyExists
 from cdh_core_api.catalog.datasets_table import DatasetNotFound
 from cdh_core_api.catalog.datasets_table import DatasetsTable
+from cdh_core_api.catalog.datasets_table_test import build_dataset_summary
 from cdh_core_api.catalog.resource_table import ResourcesTable
 from cdh_core_api.config_test import build_config
 from cdh_core_api.services.data_explorer import DataExplorerSync
@@ -130,7 +131,7 @@ class TestDeleteDataset(DatasetManagerTestCase):
         self.sns_publisher = Mock(SnsPublisher)
 
     def test_delete_dataset(self) -> None:
-        self.datasets_table.list.return_value = []
+        self.datasets_table.list_summaries.return_value = []
 
         self.dataset_manager.delete_dataset(dataset=self.dataset, sns_publisher=self.sns_publisher)
 
@@ -147,7 +148,11 @@ class TestDeleteDataset(DatasetManagerTestCase):
                 lineage=DatasetLineage({self.dataset.id}),
             ),
         ]
-        self.datasets_table.list.return_value = all_datasets
+        unrelated_dataset = build_dataset(lineage=DatasetLineage(random_dataset_ids))
+        self.datasets_table.list_summaries.return_value = [
+            build_dataset_summary(dataset, ["lineage"]) for dataset in [*all_datasets, unrelated_dataset]
+        ]
+        self.datasets_table.get.side_effect = {dataset.id: dataset for dataset in all_datasets}.__getitem__
         updated_datasets = [build_dataset() for _ in all_datasets]
         self.datasets_table.update.side_effect = updated_datasets
 
@@ -181,7 +186,9 @@ class TestDeleteDataset(DatasetManagerTestCase):
         ]
 
         self.datasets_table.delete.assert_called_once_with(self.dataset.id)
+        self.datasets_table.list_summaries.assert_called_once_with(attributes=["lineage"], parallel_scan=True)
         self.datasets_table.update.assert_has_calls(expected_update_calls)
+        assert self.datasets_table.update.call_count == len(all_datasets)
         self.sns_publisher.publish.assert_has_calls(expected_sns_publish_calls)
         self.lock_service.release_lock.assert_called_once_with(self.lock)
 
@@ -14,6 +14,9 @@
 from contextlib import suppress
 from logging import getLogger
 from typing import Generic
+from typing import Iterable
+from typing import List
+from typing import Tuple
 
 from cdh_core_api.catalog.accounts_table import AccountNotFound
 from cdh_core_api.catalog.accounts_table import GenericAccountsTable
@@ -274,12 +277,11 @@ class DatasetPermissionsManager(Generic[GenericAccount, GenericS3Resource, Gener
         Do nothing if the target account is no longer registered with the CDH or a conflicting database exists in the
         target account.
         """
-        for permission in dataset.filter_permissions(stage=stage, region=region, sync_type=SyncType.resource_link):
-            try:
-                account = self._accounts_table.get(permission.account_id)
-            except AccountNotFound:
-                continue
-
+        permissions_with_accounts = self._get_permissions_with_accounts(
+            dataset.filter_permissions(stage=stage, region=region, sync_type=SyncType.resource_link)
+        )
+        self._resource_link.prefetch_sessions([account for _, account in permissions_with_accounts])
+        for permission, account in permissions_with_accounts:
             with suppress(ConflictingGlueDatabases):
                 self.update_metadata_sync(
                     permission=permission, dataset=dataset, account=account, action=DatasetAccountPermissionAction.add
@@ -291,12 +293,17 @@ class DatasetPermissionsManager(Generic[GenericAccount, GenericS3Resource, Gener
 
         Do nothing if the target account is no longer registered with the CDH.
         """
-        for permission in dataset.filter_permissions(stage=glue_sync.stage, region=glue_sync.region):
-            try:
-                account = self._accounts_table.get(permission.account_id)
-            except AccountNotFound:
-                continue
-
+        permissions_with_accounts = self._get_permissions_with_accounts(
+            dataset.filter_permissions(stage=glue_sync.stage, region=glue_sync.region)
+        )
+        self._resource_link.prefetch_sessions(
+            [
+                account
+                for permission, account in permissions_with_accounts
+                if permission.sync_type is SyncType.resource_link
+            ]
+        )
+        for permission, account in permissions_with_accounts:
             if permission.sync_type is not SyncType.resource_link:
                 LOG.error(
                     f"Permission sync-type {permission.sync_type.value} for dataset {dataset.id} in account "
@@ -314,9 +321,24 @@ class DatasetPermissionsManager(Generic[GenericAccount, GenericS3Resource, Gener
                 target_account_id=account.id, source_database=glue_sync.glue_database
             )
 
+    def _get_permissions_with_accounts(
+        self, permissions: Iterable[DatasetAccountPermission]
+    ) -> List[Tuple[DatasetAccountPermission, GenericAccount]]:
+        """Return the permissions together with their accounts, skipping accounts no longer registered."""
+        permissions_with_accounts = []
+        for permission in permissions:
+            try:
+                permissions_with_accounts.append((permission, self._accounts_table.get(permission.account_id)))
+            except AccountNotFound:
+                continue
+        return permissions_with_accounts
+
     def remove_permissions_across_datasets(self, account: GenericAccount) -> None:
         """Remove all dataset access permissions for a given account."""
-        for dataset in self._datasets_table.list():
+        for summary in self._datasets_table.list_summaries(attributes=["permissions"], parallel_scan=True):
+            if not any(account.id == permission.account_id for permission in summary.permissions):
+                continue
+            dataset = self._datasets_table.get(summary.id)
             for permission in dataset.permissions:
                 if account.id == permission.account_id:
                     s3_resource = self._resources_table.get_s3(
@@ -20,6 +20,7 @@ import pytest
 from cdh_core_api.catalog.accounts_table import AccountNotFound
 from cdh_core_api.catalog.accounts_table import AccountsTable
 from cdh_core_api.catalog.datasets_table import DatasetsTable
+from cdh_core_api.catalog.datasets_table_test import build_dataset_summary
 from cdh_core_api.catalog.resource_table import ResourceNotFound
 from cdh_core_api.catalog.resource_table import ResourcesTable
 from cdh_core_api.config_test import build_config
@@ -579,6 +580,7 @@ class TestDeleteMetadataSyncsForGlueSyncInternal(BaseDatasetPermissionsManagerTe
 
         self.dataset_permissions_manager.delete_metadata_syncs_for_glue_sync(self.glue_sync, self.dataset)
 
+        self.resource_link.prefetch_sessions.assert_called_once_with(self.accounts)
         self.resource_link.delete_resource_link.assert_has_calls(
             [
                 call(target_account_id=account.id, source_database=self.glue_sync.glue_database)
@@ -634,11 +636,11 @@ class TestRemovePermissionAcrossDatasets(BaseDatasetPermissionsManagerTest):
             dataset=second_dataset_with_access, stage=second_permission.stage, region=second_permission.region
         )
         dataset_without_access = build_dataset(permissions=frozenset())
-        self.datasets_table.list.return_value = [
-            first_dataset_with_access,
-            second_dataset_with_access,
-            dataset_without_access,
+        datasets = [first_dataset_with_access, second_dataset_with_access, dataset_without_access]
+        self.datasets_table.list_summaries.return_value = [
+            build_dataset_summary(dataset, ["permissions"]) for dataset in datasets
         ]
+        self.datasets_table.get.side_effect = {dataset.id: dataset for dataset in datasets}.get
         self.resources_table.get_s3.side_effect = lambda dataset_id, stage, region: {
             (first_dataset_with_access.id, first_permission.stage, first_permission.region): first_s3_resource,
             (second_dataset_with_access.id, second_permission.stage, second_permission.region): second_s3_resource,
@@ -647,6 +649,11 @@ class TestRemovePermissionAcrossDatasets(BaseDatasetPermissionsManagerTest):
 
         self.dataset_permissions_manager.remove_permissions_across_datasets(self.account)
 
+        self.datasets_table.list_summaries.assert_called_once_with(attributes=["permissions"], parallel_scan=True)
+        assert {get_call.args[0] for get_call in self.datasets_table.get.call_args_list} == {
+            first_dataset_with_access.id,
+            second_dataset_with_access.id,
+        }
         self.dataset_permissions_manager.add_or_remove_permission.assert_has_calls(
             [
                 call(
@@ -12,9 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from abc import abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass
 from logging import getLogger
+from typing import Dict
 from typing import Generic
+from typing import Iterable
+from typing import Set
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 
@@ -38,6 +43,7 @@ from cdh_core.primitives.account_id import AccountId
 LOG = getLogger(__name__)
 
 T = TypeVar("T")
+_SESSION_NAME = "MetadataRoleAssumer"
 
 
 @dataclass(frozen=True)
@@ -118,28 +124,35 @@ class MetadataRoleAssumer(Generic[GenericAccount, GenericUpdateAccountBody]):
         if not account_spec.supports_metadata_role():
             raise UnsupportedAssumeMetadataRole(account_spec)
 
-    def _retrieve_session(self, api_account: BaseAccount) -> BotocoreSessionWrapper:
-        return self._assume_role_session_provider.get_session_wrapped(
-            account_id=api_account.id, account_purpose=api_account.purpose
-        )
-
-    def assume(
+    def _get_api_account(
         self, account_spec: GenericAssumableAccountSpec[GenericAccount, GenericUpdateAccountBody]
-    ) -> BotocoreSessionWrapper:
-        """Assumes the metadata role in the specified account."""
-        self._check_account_information(account_spec)
-
-        api_account = self._account_store.query_account(
+    ) -> BaseAccount:
+        return self._account_store.query_account(
             environments=self._config.environment,
             account_purposes=AccountPurpose("api"),
             partitions=account_spec.hub.partition,
         )
 
-        api_session = self._retrieve_session(api_account)
+    def assume(
+        self,
+        account_spec: GenericAssumableAccountSpec[GenericAccount, GenericUpdateAccountBody],
+        cached: bool = True,
+    ) -> BotocoreSessionWrapper:
+        """Assumes the metadata role in the specified account.
 
+        The session is cached across requests, pass `cached=False` to verify that the role can currently be assumed.
+        """
+        self._check_account_information(account_spec)
+        api_account = self._get_api_account(account_spec)
         metadata_role_arn = self._get_metadata_role_arn(account_spec)
         try:
-            return api_session.assume_role(role_arn=metadata_role_arn, session_name="MetadataRoleAssumer")
+            return self._assume_role_session_provider.get_role_session(
+                account_id=api_account.id,
+                account_purpose=api_account.purpose,
+                role_arn=metadata_role_arn,
+                session_name=_SESSION_NAME,
+                cached=cached,
+            )
         except Exception as err:
             raise CannotAssumeMetadataRole(role_arn=metadata_role_arn) from err
 
@@ -148,6 +161,22 @@ class MetadataRoleAssumer(Generic[GenericAccount, GenericUpdateAccountBody]):
         account_spec = self._assumable_account_spec_cls.from_account(account)
         return self.assume(account_spec)
 
+    def prefetch_accounts(self, accounts: Iterable[GenericAccount]) -> None:
+        """Assume the metadata roles in the given accounts concurrently, so that their sessions are cached when used."""
+        role_arns_per_api_account: Dict[Tuple[AccountId, AccountPurpose], Set[Arn]] = defaultdict(set)
+        for account in accounts:
+            account_spec = self._assumable_account_spec_cls.from_account(account)
+            if not account_spec.supports_metadata_role():
+                continue
+            api_account = self._get_api_account(account_spec)
+            role_arns_per_api_account[(api_account.id, api_account.purpose)].add(
+                self._get_metadata_role_arn(account_spec)
+            )
+        for (account_id, account_purpose), role_arns in role_arns_per_api_account.items():
+            self._assume_role_session_provider.prefetch_role_sessions(
+                account_id=account_id, account_purpose=account_purpose, role_arns=role_arns, session_name=_SESSION_NAME
+            )
+
 
 class UnsupportedAssumeMetadataRole(Exception):
     """Signals the metadata role is not supported in the requested account."""
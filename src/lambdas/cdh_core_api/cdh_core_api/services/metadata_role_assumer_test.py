@@ -28,10 +28,12 @@ from cdh_core.entities.account_store_test import build_account_store
 from cdh_core.entities.accounts import Account
 from cdh_core.entities.accounts_test import build_account
 from cdh_core.entities.accounts_test import build_base_account
+from cdh_core.entities.arn import Arn
 from cdh_core.entities.arn_test import build_role_arn
 from cdh_core.enums.accounts import AccountPurpose
 from cdh_core.enums.accounts import AccountType
 from cdh_core.enums.hubs_test import build_hub
+from cdh_core.primitives.account_id import AccountId
 from cdh_core.primitives.account_id_test import build_account_id
 from cdh_core_dev_tools.testing.builder import Builder
 
@@ -54,25 +56,27 @@ class TestMetadataRoleAssumer:
             lambda_account_id=self.api_account.id,
         )
         self.assume_role_session_provider = Mock(AssumeRoleSessionProvider)
-        self.api_session = Mock(BotocoreSessionWrapper)
-        self.assume_role_session_provider.get_session_wrapped.return_value = self.api_session
+        self.metadata_session = Mock(BotocoreSessionWrapper)
+        self.assume_role_session_provider.get_role_session.return_value = self.metadata_session
         self.metadata_role_assumer: MetadataRoleAssumer[Account, UpdateAccountBody] = MetadataRoleAssumer(
             self.assume_role_session_provider, self.account_store, AssumableAccountSpec, self.config
         )
 
+    @pytest.mark.parametrize("cached", [False, True])
     @patch.object(MetadataRoleAssumer, "_get_metadata_role_arn")
-    def test_assume_successful(self, mocked_get_metadata_role_arn: Mock) -> None:
+    def test_assume_successful(self, mocked_get_metadata_role_arn: Mock, cached: bool) -> None:
         metadata_role_arn = build_role_arn()
         mocked_get_metadata_role_arn.return_value = metadata_role_arn
 
-        self.metadata_role_assumer.assume(account_spec=self.account_spec)
+        assert self.metadata_role_assumer.assume(account_spec=self.account_spec, cached=cached) is self.metadata_session
 
-        self.assume_role_session_provider.get_session_wrapped.assert_called_once_with(
-            account_id=self.api_account.id, account_purpose=self.api_account.purpose
-        )
         mocked_get_metadata_role_arn.assert_called_once_with(self.account_spec)
-        self.api_session.assume_role.assert_called_once_with(
-            role_arn=metadata_role_arn, session_name="MetadataRoleAssumer"
+        self.assume_role_session_provider.get_role_session.assert_called_once_with(
+            account_id=self.api_account.id,
+            account_purpose=self.api_account.purpose,
+            role_arn=metadata_role_arn,
+            session_name="MetadataRoleAssumer",
+            cached=cached,
         )
 
     def test_assume_not_supported_for_type_technical(self) -> None:
@@ -87,7 +91,7 @@ class TestMetadataRoleAssumer:
             )
 
     def test_assume_role_fails(self) -> None:
-        self.api_session.assume_role.side_effect = Exception()
+        self.assume_role_session_provider.get_role_session.side_effect = Exception()
         with pytest.raises(CannotAssumeMetadataRole):
             self.metadata_role_assumer.assume(account_spec=self.account_spec)
 
@@ -96,3 +100,26 @@ class TestMetadataRoleAssumer:
         account = build_account()
         self.metadata_role_assumer.assume_account(account)
         mocked_assume.assert_called_once_with(AssumableAccountSpec.from_account(account))
+
+    @patch.object(MetadataRoleAssumer, "_get_metadata_role_arn")
+    def test_prefetch_accounts(self, mocked_get_metadata_role_arn: Mock) -> None:
+        mocked_get_metadata_role_arn.side_effect = lambda account_spec: self._build_metadata_role_arn(
+            account_spec.account_id
+        )
+        accounts = [
+            build_account(hub=self.hub, account_type=self.account_type),
+            build_account(hub=self.hub, account_type=self.account_type),
+            build_account(hub=self.hub, account_type=AccountType.technical),
+        ]
+
+        self.metadata_role_assumer.prefetch_accounts(accounts)
+
+        self.assume_role_session_provider.prefetch_role_sessions.assert_called_once_with(
+            account_id=self.api_account.id,
+            account_purpose=self.api_account.purpose,
+            role_arns={self._build_metadata_role_arn(account.id) for account in accounts[:2]},
+            session_name="MetadataRoleAssumer",
+        )
+
+    def _build_metadata_role_arn(self, account_id: AccountId) -> Arn:
+        return build_role_arn(name="metadata", account_id=account_id, partition=self.hub.partition)
@@ -21,6 +21,7 @@ from cdh_core_api.services.encryption_service import EncryptionService
 from marshmallow import ValidationError
 
 from cdh_core.dataclasses_json_cdh.dataclasses_json_cdh import DataClassJsonCDHMixin
+from cdh_core.entities.serializer_factory import SerializerFactory
 
 
 class NextPageTokenContext(Enum):
@@ -66,4 +67,4 @@ class PaginationService:
         if last_evaluated_key is None:
             return None
         token = PaginationService.NextPageToken(last_evaluated_key=last_evaluated_key, context=context)
-        return self._encryption_service.encrypt(token.to_json())
+        return self._encryption_service.encrypt(SerializerFactory.dumps(token).decode("utf-8"))
@@ -91,9 +91,10 @@ class TestPaginationService:
             )
             == encrypted_token
         )
-        self.encryption_service.encrypt.assert_called_once_with(
-            PaginationService.NextPageToken(last_evaluated_key=last_evaluated_key, context=context).to_json()
-        )
+        self.encryption_service.encrypt.assert_called_once()
+        assert PaginationService.NextPageToken.from_json(
+            self.encryption_service.encrypt.call_args.args[0]
+        ) == PaginationService.NextPageToken(last_evaluated_key=last_evaluated_key, context=context)
 
     def test_issue_token_none(self) -> None:
         context = Builder.get_random_element(list(NextPageTokenContext))
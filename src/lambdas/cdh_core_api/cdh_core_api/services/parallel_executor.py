@@ -0,0 +1,92 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import os
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import TypeVar
+
+from aws_xray_sdk.core import AWSXRayRecorder
+from aws_xray_sdk.core import xray_recorder
+from aws_xray_sdk.core.lambda_launcher import check_in_lambda
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class ParallelExecutor:
+    """Runs independent I/O calls of a request concurrently on a thread pool owned by the lambda container.
+
+    Every call is recorded in its own X-Ray subsegment below the entity that was active when the call was submitted,
+    so that the overlap of the calls is visible in the trace.
+    With at most one worker, calls are executed directly when they are submitted.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        recorder: AWSXRayRecorder = xray_recorder,
+        trace: Optional[bool] = None,
+    ):
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parallel-executor")
+            if max_workers > 1
+            else None
+        )
+        self._recorder = recorder
+        self._trace = check_in_lambda() if trace is None else trace
+
+    @classmethod
+    def from_environment(cls) -> ParallelExecutor:
+        """Create an executor whose pool size can be set by the optional environment variable PARALLEL_MAX_WORKERS."""
+        return cls(max_workers=int(os.environ.get("PARALLEL_MAX_WORKERS") or DEFAULT_MAX_WORKERS))
+
+    @property
+    def is_concurrent(self) -> bool:
+        """Return whether submitted calls run on the thread pool instead of directly."""
+        return self._executor is not None
+
+    def submit(self, name: str, func: Callable[[], T]) -> Future[T]:
+        """Start the call and return a future of its result."""
+        if self._executor is None:
+            return self._run_inline(func)
+        parent = self._recorder.get_trace_entity() if self._trace else None
+        return self._executor.submit(lambda: self._run_traced(name, func, parent))
+
+    @staticmethod
+    def _run_inline(func: Callable[[], T]) -> Future[T]:
+        future: Future[T] = Future()
+        try:
+            future.set_result(func())
+        except Exception as error:  # pylint: disable=broad-except
+            future.set_exception(error)
+        return future
+
+    def _run_traced(self, name: str, func: Callable[[], T], parent: Any) -> T:
+        if parent is None:
+            return func()
+        # initializes the context of the worker thread before the entity of the submitting thread is attached
+        self._recorder.get_trace_entity()
+        self._recorder.set_trace_entity(parent)
+        self._recorder.begin_subsegment(name)
+        try:
+            return func()
+        finally:
+            self._recorder.end_subsegment()
+            self._recorder.clear_trace_entities()
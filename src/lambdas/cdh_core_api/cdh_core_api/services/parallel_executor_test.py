@@ -0,0 +1,77 @@
+# Copyright (C) 2022, Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+from aws_xray_sdk.core import AWSXRayRecorder
+from cdh_core_api.services.parallel_executor import ParallelExecutor
+
+
+class TestParallelExecutor:
+    def test_calls_overlap(self) -> None:
+        executor = ParallelExecutor(max_workers=2, trace=False)
+        assert executor.is_concurrent
+        barrier = threading.Barrier(2, timeout=5)
+
+        futures = [executor.submit("wait", barrier.wait) for _ in range(2)]
+
+        assert {future.result() for future in futures} == {0, 1}
+
+    def test_exceptions_are_raised_by_result(self) -> None:
+        executor = ParallelExecutor(max_workers=2, trace=False)
+
+        future = executor.submit("fail", Mock(side_effect=ValueError))
+
+        with pytest.raises(ValueError):
+            future.result()
+
+    def test_single_worker_runs_inline(self) -> None:
+        executor = ParallelExecutor(max_workers=1, trace=False)
+        thread_names = []
+
+        future = executor.submit("inline", lambda: thread_names.append(threading.current_thread().name))
+        failed = executor.submit("fail", Mock(side_effect=ValueError))
+
+        assert not executor.is_concurrent
+        assert future.done()
+        assert thread_names == [threading.current_thread().name]
+        assert isinstance(failed.exception(), ValueError)
+
+    def test_call_is_traced_below_submitting_entity(self) -> None:
+        recorder = Mock(AWSXRayRecorder)
+        func = Mock()
+        recorder.attach_mock(func, "func")
+        executor = ParallelExecutor(max_workers=2, recorder=recorder, trace=True)
+
+        executor.submit("traced", func).result()
+
+        assert [name for name, _, _ in recorder.mock_calls] == [
+            "get_trace_entity",
+            "get_trace_entity",
+            "set_trace_entity",
+            "begin_subsegment",
+            "func",
+            "end_subsegment",
+            "clear_trace_entities",
+        ]
+        recorder.set_trace_entity.assert_called_once_with(recorder.get_trace_entity.return_value)
+        recorder.begin_subsegment.assert_called_once_with("traced")
+
+    def test_from_environment(self) -> None:
+        with patch.dict("os.environ", {"PARALLEL_MAX_WORKERS": "1"}):
+            executor = ParallelExecutor.from_environment()
+
+        assert executor.submit("inline", lambda: 42).done()
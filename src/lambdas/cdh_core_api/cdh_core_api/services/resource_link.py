@@ -15,6 +15,7 @@ from contextlib import suppress
 from functools import lru_cache
 from logging import getLogger
 from typing import Any
+from typing import List
 from typing import Optional
 
 from cdh_core_api.catalog.accounts_table import GenericAccountsTable
@@ -79,6 +80,11 @@ class ResourceLink:
             )
             raise GlueEncryptionFailed(target_account_id, source_database.region, source_database.name) from err
 
+    def prefetch_sessions(self, target_accounts: List[GenericAccount]) -> None:
+        """Assume the metadata roles in the given target accounts concurrently before resource links are modified."""
+        if len(target_accounts) > 1:
+            self._metadata_role_assumer.prefetch_accounts(target_accounts)
+
     def _get_glue_client(self, target_account_id: AccountId, region: Region) -> GlueClient:
         return GlueClient(boto3_glue_client=self._get_boto_client(target_account_id=target_account_id, region=region))
 
@@ -23,6 +23,7 @@ from cdh_core.aws_clients.factory import AwsClientFactory
 from cdh_core.aws_clients.glue_client import GlueClient
 from cdh_core.aws_clients.glue_client import GlueDatabaseNotFound
 from cdh_core.aws_clients.glue_client import GlueEncryptionException
+from cdh_core.entities.accounts_test import build_account
 from cdh_core.entities.glue_database_test import build_glue_database
 from cdh_core.entities.resource_test import build_glue_sync_resource
 from cdh_core.enums.aws_test import build_region
@@ -110,3 +111,15 @@ class TestResourceLink:
         with pytest.raises(GlueEncryptionFailed):
             self.resource_link.create_resource_link(self.target_account_id, self.glue_database)
         self.glue_client.add_deletion_protection.assert_not_called()
+
+    def test_prefetch_sessions(self) -> None:
+        accounts = [build_account() for _ in range(2)]
+
+        self.resource_link.prefetch_sessions(accounts)
+
+        self.metadata_role_assumer.prefetch_accounts.assert_called_once_with(accounts)
+
+    def test_prefetch_single_session_is_skipped(self) -> None:
+        self.resource_link.prefetch_sessions([build_account()])
+
+        self.metadata_role_assumer.prefetch_accounts.assert_not_called()
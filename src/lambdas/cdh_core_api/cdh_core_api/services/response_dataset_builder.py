@@ -11,14 +11,20 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from concurrent.futures import Future
 from logging import getLogger
 from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
 from typing import List
+from typing import Optional
 
 from cdh_core_api.config import Config
 from cdh_core_api.services.authorization_api import AuthorizationApi
+from cdh_core_api.services.parallel_executor import ParallelExecutor
 from cdh_core_api.services.phone_book import PhoneBook
 
+from cdh_core.entities.arn import Arn
 from cdh_core.entities.dataset import Dataset
 from cdh_core.entities.dataset import DatasetId
 from cdh_core.entities.dataset import ResponseDataset
@@ -31,10 +37,31 @@ LOG = getLogger(__name__)
 class ResponseDatasetBuilder:
     """Builds the `ResponseDataset`s corresponding to given `Dataset`s."""
 
-    def __init__(self, config: Config, authorization_api: AuthorizationApi, phone_book: PhoneBook) -> None:
+    def __init__(
+        self,
+        config: Config,
+        authorization_api: AuthorizationApi,
+        phone_book: PhoneBook,
+        parallel_executor: ParallelExecutor,
+    ) -> None:
         self._config = config
         self._authorization_api = authorization_api
         self._phone_book = phone_book
+        self._parallel_executor = parallel_executor
+        self._prefetched_participants: Dict[FrozenSet[DatasetId], Future[Dict[DatasetId, DatasetParticipants]]] = {}
+
+    def prefetch_participants(self, dataset_ids: Iterable[DatasetId], requester_identity: RequesterIdentity) -> None:
+        """Start loading the participants of the given datasets while the datasets themselves are being loaded.
+
+        The participants are used by subsequent calls whose datasets are among the given ones.
+        """
+        if not self._is_using_participants(requester_identity.arn):
+            return
+        dataset_id_set = frozenset(dataset_ids)
+        self._prefetched_participants[dataset_id_set] = self._parallel_executor.submit(
+            "dataset participants",
+            lambda: self._authorization_api.get_datasets_participants(dataset_ids=sorted(dataset_id_set)),
+        )
 
     def __call__(
         self,
@@ -61,16 +88,32 @@ class ResponseDatasetBuilder:
         self, datasets: List[Dataset], requester_identity: RequesterIdentity
     ) -> Dict[DatasetId, DatasetParticipants]:
         requester_arn = requester_identity.arn
-        if not self._config.authorization_api_params.active or self._phone_book.is_authorization_role(requester_arn):
+        if not self._is_using_participants(requester_arn):
             return {}
-        datasets_participants = self._authorization_api.get_datasets_participants(
-            dataset_ids=[dataset.id for dataset in datasets]
-        )
-        if len(datasets_participants) != len(datasets):
-            missing_dataset_ids = [dataset.id for dataset in datasets if dataset.id not in datasets_participants]
+        dataset_ids = [dataset.id for dataset in datasets]
+        datasets_participants = self._get_prefetched_participants(dataset_ids)
+        if datasets_participants is None:
+            datasets_participants = self._authorization_api.get_datasets_participants(dataset_ids=dataset_ids)
+        if missing_dataset_ids := [dataset_id for dataset_id in dataset_ids if dataset_id not in datasets_participants]:
             jwt_user_id = requester_identity.jwt_user_id
             LOG.warning(
                 f"The auth api did not send dataset participants for {missing_dataset_ids} for {jwt_user_id=} and "
                 f"{requester_arn=}"
             )
         return datasets_participants
+
+    def _get_prefetched_participants(
+        self, dataset_ids: List[DatasetId]
+    ) -> Optional[Dict[DatasetId, DatasetParticipants]]:
+        for prefetched_dataset_ids, future in self._prefetched_participants.items():
+            if prefetched_dataset_ids.issuperset(dataset_ids):
+                try:
+                    return future.result()
+                except Exception:  # pylint: disable=broad-except
+                    LOG.exception(f"Prefetching the participants of {sorted(prefetched_dataset_ids)} failed")
+        return None
+
+    def _is_using_participants(self, requester_arn: Arn) -> bool:
+        return self._config.authorization_api_params.active and not self._phone_book.is_authorization_role(
+            requester_arn
+        )
@@ -16,6 +16,7 @@ from unittest.mock import Mock
 from asserts import assert_count_equal
 from cdh_core_api.config_test import build_config
 from cdh_core_api.services.authorization_api import AuthorizationApi
+from cdh_core_api.services.parallel_executor import ParallelExecutor
 from cdh_core_api.services.phone_book import PhoneBook
 from cdh_core_api.services.response_dataset_builder import ResponseDatasetBuilder
 
@@ -41,6 +42,7 @@ class TestBuildResponseDatasetsIncludingPermissions:
             config=self.config,
             authorization_api=self.authorization_api,
             phone_book=self.phone_book,
+            parallel_executor=ParallelExecutor(max_workers=2, trace=False),
         )
 
     def test_use_participants_from_authorization(self) -> None:
@@ -60,6 +62,7 @@ class TestBuildResponseDatasetsIncludingPermissions:
             config=config,
             authorization_api=self.authorization_api,
             phone_book=self.phone_book,
+            parallel_executor=ParallelExecutor(max_workers=2, trace=False),
         )
 
         response_datasets = response_dataset_builder(
@@ -111,3 +114,48 @@ class TestBuildResponseDatasetsIncludingPermissions:
         self.authorization_api.get_datasets_participants.assert_called_once_with(
             dataset_ids=[dataset.id for dataset in self.datasets]
         )
+
+    def test_use_prefetched_participants(self) -> None:
+        other_dataset = build_dataset()
+        self.response_dataset_builder.prefetch_participants(
+            [other_dataset.id, *(dataset.id for dataset in self.datasets)], self.requester_identity
+        )
+
+        response_datasets = self.response_dataset_builder(
+            datasets=self.datasets,
+            requester_identity=self.requester_identity,
+        )
+
+        assert_count_equal(
+            response_datasets,
+            [ResponseDataset.from_dataset(dataset, self.dataset_participants[dataset.id]) for dataset in self.datasets],
+        )
+        self.authorization_api.get_datasets_participants.assert_called_once_with(
+            dataset_ids=sorted([other_dataset.id, *(dataset.id for dataset in self.datasets)])
+        )
+
+    def test_prefetch_does_not_cover_datasets(self) -> None:
+        self.response_dataset_builder.prefetch_participants([self.datasets[0].id], self.requester_identity)
+
+        self.response_dataset_builder(datasets=self.datasets, requester_identity=self.requester_identity)
+
+        self.authorization_api.get_datasets_participants.assert_called_with(
+            dataset_ids=[dataset.id for dataset in self.datasets]
+        )
+        assert self.authorization_api.get_datasets_participants.call_count == 2
+
+    def test_failed_prefetch_is_retried(self) -> None:
+        self.authorization_api.get_datasets_participants.side_effect = [Exception(), self.dataset_participants]
+        self.response_dataset_builder.prefetch_participants(
+            [dataset.id for dataset in self.datasets], self.requester_identity
+        )
+
+        response_datasets = self.response_dataset_builder(
+            datasets=self.datasets,
+            requester_identity=self.requester_identity,
+        )
+
+        assert_count_equal(
+            response_datasets,
+            [ResponseDataset.from_dataset(dataset, self.dataset_participants[dataset.id]) for dataset in self.datasets],
+        )
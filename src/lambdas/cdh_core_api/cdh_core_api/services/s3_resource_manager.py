@@ -14,13 +14,18 @@
 from contextlib import ExitStack
 from datetime import datetime
 from logging import getLogger
+from typing import Dict
+from typing import FrozenSet
 from typing import Generic
 from typing import List
 from typing import Set
 from typing import Tuple
 from typing import Type
 
+from cdh_core_api.catalog.base import transact_write
 from cdh_core_api.catalog.datasets_table import DatasetsTable
+from cdh_core_api.catalog.kms_key_access_table import KmsKeyAccess
+from cdh_core_api.catalog.kms_key_access_table import KmsKeyAccessTable
 from cdh_core_api.catalog.resource_table import GenericResourcesTable
 from cdh_core_api.config import Config
 from cdh_core_api.generic_types import GenericGlueSyncResource
@@ -56,6 +61,7 @@ class S3ResourceManager(Generic[GenericS3Resource]):
         self,
         resources_table: GenericResourcesTable[GenericS3Resource, GenericGlueSyncResource],
         datasets_table: DatasetsTable,
+        kms_key_access_table: KmsKeyAccessTable,
         config: Config,
         s3_bucket_manager: S3BucketManager,
         kms_service: KmsService,
@@ -66,6 +72,7 @@ class S3ResourceManager(Generic[GenericS3Resource]):
     ):
         self._resources_table = resources_table
         self._datasets_table = datasets_table
+        self._kms_key_access_table = kms_key_access_table
         self._config = config
         self._s3_bucket_manager = s3_bucket_manager
         self._sns_topic_manager = sns_topic_manager
@@ -104,11 +111,20 @@ class S3ResourceManager(Generic[GenericS3Resource]):
             owner_id=owner_account_id,
         )
         kms_key = self._kms_service.get_shared_key(resource_account=resource_account, region=specification.region)
+        self._ensure_kms_key_access_is_rebuilt(resource_account_id=resource_account.id, region=region)
+        kms_key_access = KmsKeyAccess(
+            resource_account_id=resource_account.id,
+            region=region,
+            dataset_id=dataset.id,
+            stage=stage,
+            account_ids_with_read_access=dataset.get_account_ids_with_read_access(stage=stage, region=region),
+            account_ids_with_write_access=frozenset({owner_account_id, resource_account.id}),
+        )
         kms_readers, kms_writers = self._get_reader_and_writer_account_ids(
             kms_key=kms_key, resource_account_id=resource_account.id
         )
-
-        kms_writers.add(specification.owner_id)
+        kms_readers.update(kms_key_access.account_ids_with_read_access)
+        kms_writers.update(kms_key_access.account_ids_with_write_access)
         try:
             self._kms_service.regenerate_key_policy(
                 kms_key=kms_key,
@@ -141,7 +157,9 @@ class S3ResourceManager(Generic[GenericS3Resource]):
             update_date=now,
             owner_account_id=owner_account_id,
         )
-        self._resources_table.create(s3_resource)
+        with transact_write() as transaction:
+            self._resources_table.create(s3_resource, transaction=transaction)
+            self._kms_key_access_table.put(kms_key_access, transaction=transaction)
         self._data_explorer_sync.update_bucket_access_for_data_explorer(dataset, s3_resource)
         self._lock_service.release_lock(lock)
         return s3_resource
@@ -163,12 +181,24 @@ class S3ResourceManager(Generic[GenericS3Resource]):
             self._lock_service.release_lock(lock)
             raise ForbiddenError(f"S3 bucket {s3_resource.name} cannot be deleted as it is not empty.") from err
 
-        self._resources_table.delete(
-            resource_type=ResourceType.s3,
-            dataset_id=s3_resource.dataset_id,
-            stage=s3_resource.stage,
-            region=s3_resource.region,
+        self._ensure_kms_key_access_is_rebuilt(
+            resource_account_id=s3_resource.resource_account_id, region=s3_resource.region
         )
+        with transact_write() as transaction:
+            self._resources_table.delete(
+                resource_type=ResourceType.s3,
+                dataset_id=s3_resource.dataset_id,
+                stage=s3_resource.stage,
+                region=s3_resource.region,
+                transaction=transaction,
+            )
+            self._kms_key_access_table.delete(
+                resource_account_id=s3_resource.resource_account_id,
+                region=s3_resource.region,
+                dataset_id=s3_resource.dataset_id,
+                stage=s3_resource.stage,
+                transaction=transaction,
+            )
         self._sns_topic_manager.delete_topic(topic_arn=s3_resource.sns_topic_arn)
         self._lock_service.release_lock(lock)
 
@@ -203,9 +233,7 @@ class S3ResourceManager(Generic[GenericS3Resource]):
             region=s3_resource.region,
         )
         kms_key: KmsKey = KmsKey.parse_from_arn(s3_resource.kms_key_arn)
-        kms_readers, kms_writers = self._get_reader_and_writer_account_ids(
-            kms_key=kms_key, resource_account_id=resource_account.id
-        )
+        self._ensure_kms_key_access_is_rebuilt(resource_account_id=resource_account.id, region=kms_key.region)
         with ExitStack() as stack:
             stack.enter_context(
                 self._s3_bucket_manager.update_bucket_policy_read_access_statement_transaction(
@@ -219,6 +247,14 @@ class S3ResourceManager(Generic[GenericS3Resource]):
                     account_ids_with_read_access=sorted(list(account_ids_with_read_access)),
                 )
             )
+            stack.enter_context(
+                self._kms_key_access_table.put_transaction(
+                    self._build_kms_key_access(s3_resource, account_ids_with_read_access)
+                )
+            )
+            kms_readers, kms_writers = self._get_reader_and_writer_account_ids(
+                kms_key=kms_key, resource_account_id=resource_account.id
+            )
             self._kms_service.regenerate_key_policy(
                 kms_key=kms_key,
                 resource_account=resource_account,
@@ -227,31 +263,90 @@ class S3ResourceManager(Generic[GenericS3Resource]):
             )
             return
 
-    def _get_reader_and_writer_account_ids(
-        self, kms_key: KmsKey, resource_account_id: AccountId
-    ) -> Tuple[Set[AccountId], Set[AccountId]]:
-        s3_resources = self._resources_table.list_s3(resource_account=resource_account_id, region=kms_key.region)
+    def rebuild_kms_key_access(self, resource_account_id: AccountId, region: Region) -> List[KmsKeyAccess]:
+        """Recompute the KMS key access entries of a resource account and region from scratch.
 
-        return self._get_reader_and_writer_account_ids_for_s3_resources(s3_resources)
+        The entries are derived from the S3 resources and the permissions of their datasets. Deviating entries are
+        corrected and returned, so the method doubles as a consistency check of the materialized view. Afterwards, the
+        partition is marked as rebuilt.
+        """
+        s3_resources = self._resources_table.list_s3(
+            resource_account=resource_account_id, region=region, parallel_scan=True
+        )
+        return self._rebuild_kms_key_access_partitions({(resource_account_id, region): s3_resources})
 
-    def _get_reader_and_writer_account_ids_for_s3_resources(
-        self, s3_resources: List[GenericS3Resource]
-    ) -> Tuple[Set[AccountId], Set[AccountId]]:
-        account_ids_with_read_access_combined: Set[AccountId] = set()
-        account_ids_with_write_access_combined: Set[AccountId] = set()
+    def check_kms_key_access_consistency(self) -> List[KmsKeyAccess]:
+        """Rebuild the KMS key access entries of all resource accounts and return the entries that were corrected.
 
-        datasets_dict = {dataset.id: dataset for dataset in self._datasets_table.list()}
-        for s3_resource in s3_resources:
-            account_ids_with_write_access_combined.update(
-                {s3_resource.owner_account_id, s3_resource.resource_account_id}
+        This runs as a scheduled job, see `cdh_core_api.jobs`, and its first run backfills all partitions. The resources
+        table is scanned only once for all partitions.
+        """
+        partitions: Dict[Tuple[AccountId, Region], List[GenericS3Resource]] = {
+            (resource_account.id, region): []
+            for resource_account in self._config.account_store.query_resource_accounts(
+                environments=self._config.environment
             )
-            try:
-                dataset = datasets_dict[s3_resource.dataset_id]
-            except KeyError:
-                LOG.error(f"No dataset found for s3 resource {s3_resource}")
-                continue
+            for region in resource_account.hub.regions
+        }
+        for s3_resource in self._resources_table.list_s3(parallel_scan=True):
+            partition = partitions.get((s3_resource.resource_account_id, s3_resource.region))
+            if partition is not None:
+                partition.append(s3_resource)
+        changed = self._rebuild_kms_key_access_partitions(partitions)
+        LOG.info(f"KMS key access consistency check finished, {len(changed)} entries were corrected")
+        return changed
 
-            account_ids_with_read_access_combined.update(
-                dataset.get_account_ids_with_read_access(stage=s3_resource.stage, region=s3_resource.region)
+    def _rebuild_kms_key_access_partitions(
+        self, partitions: Dict[Tuple[AccountId, Region], List[GenericS3Resource]]
+    ) -> List[KmsKeyAccess]:
+        dataset_ids = sorted(
+            {s3_resource.dataset_id for s3_resources in partitions.values() for s3_resource in s3_resources}
+        )
+        datasets_dict = {dataset.id: dataset for dataset in self._datasets_table.batch_get(dataset_ids)}
+        changed: List[KmsKeyAccess] = []
+        for (resource_account_id, region), s3_resources in partitions.items():
+            kms_key_accesses: List[KmsKeyAccess] = []
+            for s3_resource in s3_resources:
+                account_ids_with_read_access: FrozenSet[AccountId] = frozenset()
+                try:
+                    dataset = datasets_dict[s3_resource.dataset_id]
+                except KeyError:
+                    LOG.error(f"No dataset found for s3 resource {s3_resource}")
+                else:
+                    account_ids_with_read_access = dataset.get_account_ids_with_read_access(
+                        stage=s3_resource.stage, region=s3_resource.region
+                    )
+                kms_key_accesses.append(self._build_kms_key_access(s3_resource, account_ids_with_read_access))
+            changed.extend(
+                self._kms_key_access_table.rebuild(
+                    resource_account_id=resource_account_id, region=region, kms_key_accesses=kms_key_accesses
+                )
             )
-        return account_ids_with_read_access_combined, account_ids_with_write_access_combined
+        for kms_key_access in changed:
+            LOG.warning(f"Corrected inconsistent KMS key access entry {kms_key_access}")
+        return changed
+
+    def _get_reader_and_writer_account_ids(
+        self, kms_key: KmsKey, resource_account_id: AccountId
+    ) -> Tuple[Set[AccountId], Set[AccountId]]:
+        return self._kms_key_access_table.get_account_ids_with_access(
+            resource_account_id=resource_account_id, region=kms_key.region
+        )
+
+    def _ensure_kms_key_access_is_rebuilt(self, resource_account_id: AccountId, region: Region) -> None:
+        # Partitions that were never rebuilt lack the entries of the S3 resources created before the view existed
+        if not self._kms_key_access_table.is_rebuilt(resource_account_id=resource_account_id, region=region):
+            self.rebuild_kms_key_access(resource_account_id=resource_account_id, region=region)
+
+    @staticmethod
+    def _build_kms_key_access(
+        s3_resource: GenericS3Resource, account_ids_with_read_access: FrozenSet[AccountId]
+    ) -> KmsKeyAccess:
+        return KmsKeyAccess(
+            resource_account_id=s3_resource.resource_account_id,
+            region=s3_resource.region,
+            dataset_id=s3_resource.dataset_id,
+            stage=s3_resource.stage,
+            account_ids_with_read_access=account_ids_with_read_access,
+            account_ids_with_write_access=frozenset({s3_resource.owner_account_id, s3_resource.resource_account_id}),
+        )
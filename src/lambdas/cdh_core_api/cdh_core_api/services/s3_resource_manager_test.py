@@ -12,16 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from contextlib import suppress
+from dataclasses import replace
 from datetime import datetime
 from typing import Generator
 from typing import List
+from typing import Optional
 from typing import Set
+from typing import Tuple
+from unittest.mock import call
 from unittest.mock import MagicMock
 from unittest.mock import Mock
 from unittest.mock import patch
 
 import pytest
+from asserts import assert_count_equal
 from cdh_core_api.catalog.datasets_table import DatasetsTable
+from cdh_core_api.catalog.kms_key_access_table import KmsKeyAccess
+from cdh_core_api.catalog.kms_key_access_table import KmsKeyAccessTable
 from cdh_core_api.catalog.resource_table import ResourceAlreadyExists
 from cdh_core_api.catalog.resource_table import ResourcesTable
 from cdh_core_api.config_test import build_config
@@ -34,6 +41,7 @@ from cdh_core_api.services.s3_bucket_manager import S3ResourceSpecification
 from cdh_core_api.services.s3_resource_manager import S3ResourceManager
 from cdh_core_api.services.sns_topic_manager import SnsTopicManager
 from freezegun import freeze_time
+from pynamodb.exceptions import TransactWriteError
 
 from cdh_core.aws_clients.kms_client import KmsKey
 from cdh_core.aws_clients.s3_client import BucketNotEmpty
@@ -69,7 +77,7 @@ from cdh_core_dev_tools.testing.builder import Builder
 class CreateBucketTestCase:
     @pytest.fixture(autouse=True)
     def service_setup(
-        self, datasets_table: DatasetsTable, resources_table: ResourcesTable
+        self, datasets_table: DatasetsTable, resources_table: ResourcesTable, kms_key_access_table: KmsKeyAccessTable
     ) -> None:  # pylint: disable=unused-argument
         self.hub = build_hub()
         self.dataset = build_dataset(hub=self.hub)
@@ -83,6 +91,7 @@ class CreateBucketTestCase:
         self.resources_table = resources_table
         self.datasets_table = datasets_table
         self.datasets_table.create(self.dataset)
+        self.kms_key_access_table = kms_key_access_table
         self.kms_service = Mock(KmsService)
 
         self.now = datetime.now()
@@ -116,6 +125,7 @@ class TestCreateBucket(CreateBucketTestCase):
         self.s3_resource_manager = S3ResourceManager(
             resources_table=self.resources_table,
             datasets_table=self.datasets_table,
+            kms_key_access_table=self.kms_key_access_table,
             config=self.config,
             s3_bucket_manager=self.s3_bucket_manager,
             sns_topic_manager=self.sns_topic_manager,
@@ -124,11 +134,16 @@ class TestCreateBucket(CreateBucketTestCase):
             s3_resource_type=S3Resource,
             data_explorer_sync=self.data_explorer_sync,
         )
+        self.expected_kms_key_readers = {
+            *self.kms_key_readers,
+            *self.dataset.get_account_ids_with_read_access(stage=self.stage, region=self.region),
+        }
+        self.expected_kms_key_writers = {*self.kms_key_writers, self.owner_account_id, self.resource_account.id}
         # patch this auxiliary method, as it is tested separately
         with patch.object(
             self.s3_resource_manager,
             "_get_reader_and_writer_account_ids",
-            Mock(return_value=(self.kms_key_readers, self.kms_key_writers)),
+            Mock(side_effect=lambda **_: (set(self.kms_key_readers), set(self.kms_key_writers))),
         ):
             yield
 
@@ -183,8 +198,8 @@ class TestCreateBucket(CreateBucketTestCase):
         self.kms_service.regenerate_key_policy.assert_called_once_with(
             kms_key=self.expected_kms_key,
             resource_account=resource_account,
-            account_ids_with_read_access=self.kms_key_readers,
-            account_ids_with_write_access={*self.kms_key_writers, self.owner_account_id},
+            account_ids_with_read_access=self.expected_kms_key_readers,
+            account_ids_with_write_access=self.expected_kms_key_writers,
         )
         self.sns_topic_manager.create_topic.assert_called_once_with(
             self.expected_spec, topic_name=resource.name, kms_key_arn=self.expected_kms_arn
@@ -195,6 +210,18 @@ class TestCreateBucket(CreateBucketTestCase):
             kms_key=self.expected_kms_key, resource_account_id=self.resource_account.id
         )
         self.data_explorer_sync.update_bucket_access_for_data_explorer.assert_called_once_with(self.dataset, resource)
+        assert self.kms_key_access_table.list(self.resource_account.id, self.region) == [
+            KmsKeyAccess(
+                resource_account_id=self.resource_account.id,
+                region=self.region,
+                dataset_id=self.dataset.id,
+                stage=self.stage,
+                account_ids_with_read_access=self.dataset.get_account_ids_with_read_access(
+                    stage=self.stage, region=self.region
+                ),
+                account_ids_with_write_access=frozenset({self.owner_account_id, self.resource_account.id}),
+            )
+        ]
 
     def test_no_database_entry_if_bucket_creation_fails(self) -> None:
         self.s3_bucket_manager.create_bucket.side_effect = ValueError
@@ -209,6 +236,23 @@ class TestCreateBucket(CreateBucketTestCase):
             )
 
         assert self.resources_table.list() == []
+        assert self.kms_key_access_table.list(self.resource_account.id, self.region) == []
+
+    def test_no_kms_key_access_entry_if_resource_cannot_be_written(self) -> None:
+        # the resource is written after the existence check, e.g. by a concurrent request
+        self.resources_table.create(build_s3_resource(dataset=self.dataset, stage=self.stage, region=self.region))
+        with patch.object(self.resources_table, "exists", Mock(return_value=False)):
+            with pytest.raises(TransactWriteError):
+                self.s3_resource_manager.create_bucket(
+                    dataset=self.dataset,
+                    stage=self.stage,
+                    region=self.region,
+                    resource_account=self.resource_account,
+                    owner_account_id=self.owner_account_id,
+                    user=Builder.build_random_string(),
+                )
+
+        assert self.kms_key_access_table.list(self.resource_account.id, self.region) == []
 
     def test_create_s3_bucket_but_lock_present(self) -> None:
         self.lock_service.acquire_lock.side_effect = ResourceIsLocked(build_lock(), build_lock())
@@ -251,8 +295,8 @@ class TestCreateBucket(CreateBucketTestCase):
         self.kms_service.regenerate_key_policy.assert_called_once_with(
             kms_key=self.expected_kms_key,
             resource_account=resource_account,
-            account_ids_with_read_access=self.kms_key_readers,
-            account_ids_with_write_access={*self.kms_key_writers, self.owner_account_id},
+            account_ids_with_read_access=self.expected_kms_key_readers,
+            account_ids_with_write_access=self.expected_kms_key_writers,
         )
         self.lock_service.release_lock.assert_not_called()
 
@@ -288,8 +332,8 @@ class TestCreateBucket(CreateBucketTestCase):
         self.kms_service.regenerate_key_policy.assert_called_once_with(
             kms_key=self.expected_kms_key,
             resource_account=resource_account,
-            account_ids_with_read_access=self.kms_key_readers,
-            account_ids_with_write_access={*self.kms_key_writers, self.owner_account_id},
+            account_ids_with_read_access=self.expected_kms_key_readers,
+            account_ids_with_write_access=self.expected_kms_key_writers,
         )
         self.sns_topic_manager.create_topic.assert_not_called()
         self.lock_service.release_lock.assert_called_once_with(lock)
@@ -302,6 +346,7 @@ class TestDeleteBucket:
         self.s3_resource = build_s3_resource(dataset=self.dataset)
         self.resources_table = Mock(ResourcesTable)
         self.datasets_table = Mock(DatasetsTable)
+        self.kms_key_access_table = Mock(KmsKeyAccessTable)
         self.kms_service = Mock(KmsService)
 
         self.resource_account = build_resource_account(
@@ -317,6 +362,7 @@ class TestDeleteBucket:
         self.s3_resource_manager = S3ResourceManager(
             resources_table=self.resources_table,
             datasets_table=self.datasets_table,
+            kms_key_access_table=self.kms_key_access_table,
             config=self.config,
             s3_bucket_manager=self.s3_bucket_manager,
             sns_topic_manager=self.sns_topic_manager,
@@ -338,7 +384,8 @@ class TestDeleteBucket:
             self.s3_resource_manager,
             "_get_reader_and_writer_account_ids",
             Mock(return_value=(self.kms_key_readers, self.kms_key_writers)),
-        ):
+        ), patch("cdh_core_api.services.s3_resource_manager.transact_write") as transact_write:
+            self.transaction = transact_write.return_value.__enter__.return_value
             yield
 
     def test_delete_successful(self) -> None:
@@ -351,6 +398,14 @@ class TestDeleteBucket:
             dataset_id=self.dataset.id,
             stage=self.s3_resource.stage,
             region=self.s3_resource.region,
+            transaction=self.transaction,
+        )
+        self.kms_key_access_table.delete.assert_called_once_with(
+            resource_account_id=self.s3_resource.resource_account_id,
+            region=self.s3_resource.region,
+            dataset_id=self.dataset.id,
+            stage=self.s3_resource.stage,
+            transaction=self.transaction,
         )
         self.sns_topic_manager.delete_topic.assert_called_once_with(topic_arn=self.s3_resource.sns_topic_arn)
         self.s3_bucket_manager.delete_bucket.assert_called_once_with(
@@ -439,10 +494,13 @@ class TestUpdateReadAccessTransaction:
         sns_topic_manager.update_policy_transaction.return_value = MagicMock()
         lock_service = Mock(LockService)
         kms_service = Mock(KmsService)
+        kms_key_access_table = Mock(KmsKeyAccessTable)
+        kms_key_access_table.put_transaction.return_value = MagicMock()
         resource_account = Mock()
         s3_resource_manager = S3ResourceManager(
             resources_table=resources_table,
             datasets_table=datasets_table,
+            kms_key_access_table=kms_key_access_table,
             config=Mock(),
             s3_bucket_manager=s3_bucket_manager,
             sns_topic_manager=sns_topic_manager,
@@ -475,6 +533,18 @@ class TestUpdateReadAccessTransaction:
                 owner_account_id=s3_resource.owner_account_id,
                 account_ids_with_read_access=sorted(new_account_ids),
             )
+            kms_key_access_table.put_transaction.assert_called_once_with(
+                KmsKeyAccess(
+                    resource_account_id=s3_resource.resource_account_id,
+                    region=region,
+                    dataset_id=dataset.id,
+                    stage=stage,
+                    account_ids_with_read_access=frozenset(new_account_ids),
+                    account_ids_with_write_access=frozenset(
+                        {s3_resource.owner_account_id, s3_resource.resource_account_id}
+                    ),
+                )
+            )
             kms_service.regenerate_key_policy.assert_called_once_with(
                 kms_key=KmsKey.parse_from_arn(s3_resource.kms_key_arn),
                 resource_account=resource_account,
@@ -485,17 +555,29 @@ class TestUpdateReadAccessTransaction:
 
 class AccountIdsWithKmsAccessTestCase:
     @pytest.fixture(autouse=True)
-    def service_setup(self) -> None:
+    def service_setup(self, kms_key_access_table: KmsKeyAccessTable) -> None:
         self.buckets: List[S3Resource] = []
         self.datasets: List[Dataset] = []
         self.resources_table = Mock(ResourcesTable)
         self.datasets_table = Mock(DatasetsTable)
+        self.kms_key_access_table = kms_key_access_table
         self.resources_table.list_s3.return_value = self.buckets
-        self.datasets_table.list.return_value = self.datasets
+        self.datasets_table.batch_get.return_value = self.datasets
         self.provider_account_id = build_account_id()
         self.provider_key = KmsKey.parse_from_arn(build_kms_key_arn())
         self.kms_service = Mock(KmsService)
 
+    def add_bucket(self, dataset: Dataset, stage: Stage, region: Optional[Region] = None) -> S3Resource:
+        bucket = build_s3_resource(
+            dataset=dataset,
+            stage=stage,
+            region=region or self.provider_key.region,
+            resource_account_id=self.provider_account_id,
+            kms_key_arn=self.provider_key.arn,
+        )
+        self.buckets.append(bucket)
+        return bucket
+
 
 # pylint: disable=protected-access
 class TestAccountIdsWithKmsAccess(AccountIdsWithKmsAccessTestCase):
@@ -504,6 +586,7 @@ class TestAccountIdsWithKmsAccess(AccountIdsWithKmsAccessTestCase):
         s3_resource_manager = S3ResourceManager(
             resources_table=self.resources_table,
             datasets_table=self.datasets_table,
+            kms_key_access_table=self.kms_key_access_table,
             config=Mock(),
             s3_bucket_manager=Mock(),
             sns_topic_manager=Mock(),
@@ -514,52 +597,82 @@ class TestAccountIdsWithKmsAccess(AccountIdsWithKmsAccessTestCase):
         )
         self.s3_resource_manager = s3_resource_manager
 
-    @pytest.mark.parametrize("mock_config_file", [CONFIG_FILE_MULTIPLE_PARTITIONS_ENVIRONMENTS_HUBS], indirect=True)
-    def test_all_matching_buckets_are_added(
-        self, mock_config_file: ConfigFile  # pylint: disable=unused-argument
-    ) -> None:
+    def _get_reader_and_writer_account_ids(self) -> Tuple[Set[AccountId], Set[AccountId]]:
+        self.s3_resource_manager._ensure_kms_key_access_is_rebuilt(
+            resource_account_id=self.provider_account_id, region=self.provider_key.region
+        )
+        return self.s3_resource_manager._get_reader_and_writer_account_ids(
+            kms_key=self.provider_key, resource_account_id=self.provider_account_id
+        )
+
+    def test_all_matching_buckets_are_added(self) -> None:
         expected_accounts_with_read_access: Set[AccountId] = set()
         expected_accounts_with_write_access: Set[AccountId] = set()
         for _ in range(5):
-            permission = build_dataset_account_permission()
+            permission = build_dataset_account_permission(region=self.provider_key.region)
             dataset = build_dataset(permissions=frozenset({permission}))
-            bucket = build_s3_resource(
-                dataset=dataset, stage=permission.stage, region=permission.region, kms_key_arn=self.provider_key.arn
-            )
+            bucket = self.add_bucket(dataset=dataset, stage=permission.stage)
             expected_accounts_with_read_access.add(permission.account_id)
             expected_accounts_with_write_access.update({bucket.owner_account_id, bucket.resource_account_id})
             self.datasets.append(dataset)
-            self.buckets.append(bucket)
 
-        (
-            account_ids_with_read_access,
-            account_ids_with_write_access,
-        ) = self.s3_resource_manager._get_reader_and_writer_account_ids(
-            kms_key=self.provider_key, resource_account_id=self.provider_account_id
-        )
+        account_ids_with_read_access, account_ids_with_write_access = self._get_reader_and_writer_account_ids()
 
         assert account_ids_with_read_access == expected_accounts_with_read_access
         assert account_ids_with_write_access == set(expected_accounts_with_write_access)
         self.resources_table.list_s3.assert_called_once_with(
-            resource_account=self.provider_account_id, region=self.provider_key.region
+            resource_account=self.provider_account_id, region=self.provider_key.region, parallel_scan=True
+        )
+        self.datasets_table.batch_get.assert_called_once_with(sorted(dataset.id for dataset in self.datasets))
+        self.datasets_table.list.assert_not_called()
+
+    def test_rebuilt_view_is_used(self) -> None:
+        kms_key_access = KmsKeyAccess(
+            resource_account_id=self.provider_account_id,
+            region=self.provider_key.region,
+            dataset_id=build_dataset().id,
+            stage=build_stage(),
+            account_ids_with_read_access=frozenset({build_account_id()}),
+            account_ids_with_write_access=frozenset({build_account_id(), self.provider_account_id}),
         )
+        self.kms_key_access_table.rebuild(self.provider_account_id, self.provider_key.region, [kms_key_access])
+
+        assert self._get_reader_and_writer_account_ids() == (
+            set(kms_key_access.account_ids_with_read_access),
+            set(kms_key_access.account_ids_with_write_access),
+        )
+        self.resources_table.list_s3.assert_not_called()
+        self.datasets_table.batch_get.assert_not_called()
+
+    def test_partially_populated_view_is_rebuilt(self) -> None:
+        permission = build_dataset_account_permission(region=self.provider_key.region)
+        dataset = build_dataset(permissions=frozenset({permission}))
+        self.datasets.append(dataset)
+        bucket = self.add_bucket(dataset=dataset, stage=permission.stage)
+        # the entry of another bucket, which was written by the first change after the view was introduced
+        other_bucket = self.add_bucket(dataset=build_dataset(), stage=build_stage())
+        self.kms_key_access_table.put(
+            self.s3_resource_manager._build_kms_key_access(other_bucket, frozenset({build_account_id()}))
+        )
+
+        account_ids_with_read_access, account_ids_with_write_access = self._get_reader_and_writer_account_ids()
+
+        assert account_ids_with_read_access == {permission.account_id}
+        assert account_ids_with_write_access == {
+            bucket.owner_account_id,
+            other_bucket.owner_account_id,
+            self.provider_account_id,
+        }
+        assert self.kms_key_access_table.is_rebuilt(self.provider_account_id, self.provider_key.region)
 
     def test_permissions_for_other_stages_are_ignored(self) -> None:
         stage, other_stage = Builder.choose_without_repetition(Stage, 2)
-        permission = build_dataset_account_permission(stage=other_stage)
+        permission = build_dataset_account_permission(stage=other_stage, region=self.provider_key.region)
         dataset = build_dataset(permissions=frozenset({permission}))
         self.datasets.append(dataset)
-        bucket = build_s3_resource(
-            dataset=dataset, stage=stage, region=permission.region, kms_key_arn=self.provider_key.arn
-        )
-        self.buckets.append(bucket)
+        bucket = self.add_bucket(dataset=dataset, stage=stage)
 
-        (
-            account_ids_with_read_access,
-            account_ids_with_write_access,
-        ) = self.s3_resource_manager._get_reader_and_writer_account_ids(
-            kms_key=self.provider_key, resource_account_id=self.provider_account_id
-        )
+        account_ids_with_read_access, account_ids_with_write_access = self._get_reader_and_writer_account_ids()
 
         assert account_ids_with_read_access == set()
         assert account_ids_with_write_access == {bucket.owner_account_id, bucket.resource_account_id}
@@ -568,21 +681,113 @@ class TestAccountIdsWithKmsAccess(AccountIdsWithKmsAccessTestCase):
     def test_permissions_for_other_regions_are_ignored(
         self, mock_config_file: ConfigFile  # pylint: disable=unused-argument
     ) -> None:
-        region, other_region = Builder.choose_without_repetition(Region, 2)
+        other_region = Builder.get_random_element(Region, exclude={self.provider_key.region})
         permission = build_dataset_account_permission(region=other_region)
         dataset = build_dataset(permissions=frozenset({permission}))
         self.datasets.append(dataset)
-        bucket = build_s3_resource(
-            dataset=dataset, stage=permission.stage, region=region, kms_key_arn=self.provider_key.arn
-        )
-        self.buckets.append(bucket)
+        bucket = self.add_bucket(dataset=dataset, stage=permission.stage)
 
-        (
-            account_ids_with_read_access,
-            account_ids_with_write_access,
-        ) = self.s3_resource_manager._get_reader_and_writer_account_ids(
-            kms_key=self.provider_key, resource_account_id=self.provider_account_id
-        )
+        account_ids_with_read_access, account_ids_with_write_access = self._get_reader_and_writer_account_ids()
 
         assert account_ids_with_read_access == set()
         assert account_ids_with_write_access == {bucket.owner_account_id, bucket.resource_account_id}
+
+    def test_rebuild_corrects_view(self) -> None:
+        permission = build_dataset_account_permission(region=self.provider_key.region)
+        dataset = build_dataset(permissions=frozenset({permission}))
+        self.datasets.append(dataset)
+        bucket = self.add_bucket(dataset=dataset, stage=permission.stage)
+        expected = KmsKeyAccess(
+            resource_account_id=self.provider_account_id,
+            region=self.provider_key.region,
+            dataset_id=dataset.id,
+            stage=permission.stage,
+            account_ids_with_read_access=frozenset({permission.account_id}),
+            account_ids_with_write_access=frozenset({bucket.owner_account_id, self.provider_account_id}),
+        )
+        orphaned = replace(expected, dataset_id=build_dataset().id)
+        self.kms_key_access_table.put(replace(expected, account_ids_with_read_access=frozenset()))
+        self.kms_key_access_table.put(orphaned)
+
+        changed = self.s3_resource_manager.rebuild_kms_key_access(
+            resource_account_id=self.provider_account_id, region=self.provider_key.region
+        )
+
+        assert_count_equal(changed, [expected, orphaned])
+        assert self.kms_key_access_table.list(self.provider_account_id, self.provider_key.region) == [expected]
+
+    def test_rebuild_without_dataset(self) -> None:
+        bucket = self.add_bucket(dataset=build_dataset(), stage=build_stage())
+
+        self.s3_resource_manager.rebuild_kms_key_access(
+            resource_account_id=self.provider_account_id, region=self.provider_key.region
+        )
+
+        assert self.kms_key_access_table.get_account_ids_with_access(
+            self.provider_account_id, self.provider_key.region
+        ) == (set(), {bucket.owner_account_id, self.provider_account_id})
+
+
+class TestCheckKmsKeyAccessConsistency:
+    def test_all_resource_accounts_and_regions_are_rebuilt_with_one_scan(self) -> None:
+        environment = build_environment()
+        resource_accounts = [build_resource_account(environment=environment) for _ in range(3)]
+        config = build_config(account_store=build_account_store(resource_accounts), environment=environment)
+        resources_table = Mock(ResourcesTable)
+        datasets_table = Mock(DatasetsTable)
+        kms_key_access_table = Mock(KmsKeyAccessTable)
+        s3_resource_manager = S3ResourceManager(
+            resources_table=resources_table,
+            datasets_table=datasets_table,
+            kms_key_access_table=kms_key_access_table,
+            config=config,
+            s3_bucket_manager=Mock(),
+            sns_topic_manager=Mock(),
+            lock_service=Mock(),
+            kms_service=Mock(),
+            s3_resource_type=S3Resource,
+            data_explorer_sync=Mock(),
+        )
+        resource_account = resource_accounts[0]
+        permission = build_dataset_account_permission(
+            region=Builder.get_random_element(list(resource_account.hub.regions))
+        )
+        dataset = build_dataset(permissions=frozenset({permission}))
+        s3_resource = build_s3_resource(
+            dataset=dataset,
+            resource_account_id=resource_account.id,
+            region=permission.region,
+            stage=permission.stage,
+        )
+        foreign_s3_resource = build_s3_resource(dataset=dataset)
+        resources_table.list_s3.return_value = [s3_resource, foreign_s3_resource]
+        datasets_table.batch_get.return_value = [dataset]
+        corrected = Mock(KmsKeyAccess)
+        kms_key_access_table.rebuild.return_value = [corrected]
+
+        changed = s3_resource_manager.check_kms_key_access_consistency()
+
+        resources_table.list_s3.assert_called_once_with(parallel_scan=True)
+        datasets_table.batch_get.assert_called_once_with([dataset.id])
+        expected_calls = [
+            call(
+                resource_account_id=account.id,
+                region=region,
+                kms_key_accesses=[
+                    KmsKeyAccess(
+                        resource_account_id=account.id,
+                        region=region,
+                        dataset_id=dataset.id,
+                        stage=permission.stage,
+                        account_ids_with_read_access=frozenset({permission.account_id}),
+                        account_ids_with_write_access=frozenset({s3_resource.owner_account_id, account.id}),
+                    )
+                ]
+                if (account.id, region) == (resource_account.id, permission.region)
+                else [],
+            )
+            for account in config.account_store.query_resource_accounts(environments=config.environment)
+            for region in account.hub.regions
+        ]
+        assert_count_equal(kms_key_access_table.rebuild.call_args_list, expected_calls)
+        assert changed == [corrected] * len(expected_calls)
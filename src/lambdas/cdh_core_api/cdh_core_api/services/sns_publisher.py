@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import json
 from enum import Enum
 from typing import Any
 from typing import Collection
@@ -20,6 +19,8 @@ from typing import Literal
 from typing import overload
 from typing import Union
 
+import orjson
+
 from cdh_core.aws_clients.sns_client import SnsClient
 from cdh_core.entities.accounts import ResponseAccount
 from cdh_core.entities.arn import Arn
@@ -127,6 +128,6 @@ class SnsPublisher:
             self._client.publish_message(
                 sns_arn=topic_arn,
                 message_subject=subject,
-                message_body=json.dumps(data),
+                message_body=orjson.dumps(data).decode("utf-8"),
                 attributes=self._sanitize_attributes(data) if sanitize_attributes else data,
             )
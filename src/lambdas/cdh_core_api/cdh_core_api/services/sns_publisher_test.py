@@ -12,13 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import copy
-import json
 from typing import Any
 from typing import Dict
 from typing import Optional
 from unittest.mock import call
 from unittest.mock import Mock
 
+import orjson
 import pytest
 from cdh_core_api.services.sns_publisher import EntityType
 from cdh_core_api.services.sns_publisher import MessageConsistency
@@ -81,7 +81,7 @@ class TestSnsPublisher:
                 call(
                     sns_arn=topic_arn,
                     message_subject=SnsPublisher.build_subject(EntityType.ACCOUNT, operation),
-                    message_body=json.dumps(expected_body),
+                    message_body=orjson.dumps(expected_body).decode("utf-8"),
                     attributes=expected_body,
                 )
                 for topic_arn in self.topic_arns
@@ -108,7 +108,7 @@ class TestSnsPublisher:
                 call(
                     sns_arn=topic_arn,
                     message_subject=SnsPublisher.build_subject(EntityType.DATASET, operation),
-                    message_body=json.dumps(expected_body),
+                    message_body=orjson.dumps(expected_body).decode("utf-8"),
                     attributes=expected_body,
                 )
                 for topic_arn in self.topic_arns
@@ -135,7 +135,7 @@ class TestSnsPublisher:
                 call(
                     sns_arn=topic_arn,
                     message_subject=SnsPublisher.build_subject(EntityType.RESOURCE, operation),
-                    message_body=json.dumps(expected_body),
+                    message_body=orjson.dumps(expected_body).decode("utf-8"),
                     attributes=sns_attributes,
                 )
                 for topic_arn in self.topic_arns
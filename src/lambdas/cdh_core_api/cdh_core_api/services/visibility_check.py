@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from typing import Callable
+from typing import Dict
 from typing import Iterable
 from typing import Optional
+from typing import Set
 
+from cdh_core_api.catalog.base import VisibilityPredicate
 from cdh_core_api.config import Config
 from cdh_core_api.services.authorization_api import AuthorizationApi
 from cdh_core_api.services.full_vision_check import FullVisionCheck
@@ -32,6 +35,9 @@ class VisibilityCheck:
     Determines if the requester can see a given entity (hub, dataset, account or resource).
 
     Uses the FullVisionCheck to handle special roles and delegates to the AuthorizationApi otherwise.
+
+    Answers of single dataset checks are kept for the rest of the request, and lists of visible datasets fetched by
+    batch checks are reused to answer single checks.
     """
 
     def __init__(
@@ -46,6 +52,8 @@ class VisibilityCheck:
         self._requester = requester
         self._full_vision_check = full_vision_check
         self._full_vision: Optional[bool] = None
+        self._dataset_id_visibility: Dict[DatasetId, bool] = {}
+        self._all_visible_dataset_ids: Optional[Set[DatasetId]] = None
 
     def _has_full_vision(self) -> bool:
         if self._full_vision is None:
@@ -73,6 +81,15 @@ class VisibilityCheck:
         dataset_id_visibility_check = self.get_dataset_id_visibility_check(batch, hub)
         return lambda dataset: dataset_id_visibility_check(dataset.id)
 
+    def get_dataset_visibility_predicate(self, hub: Optional[Hub] = None) -> VisibilityPredicate[Dataset]:
+        """Return a predicate that decides whether a dataset is visible and knows the IDs of all visible datasets."""
+        if self._has_full_vision():
+            return VisibilityPredicate(is_visible=lambda _: True)
+        visible_dataset_ids = self._get_visible_dataset_ids(hub, None)
+        return VisibilityPredicate(
+            is_visible=lambda dataset: dataset.id in visible_dataset_ids, visible_ids=frozenset(visible_dataset_ids)
+        )
+
     def get_dataset_id_visibility_check(
         self, batch: bool, hub: Optional[Hub] = None, dataset_ids: Optional[Iterable[DatasetId]] = None
     ) -> Callable[[DatasetId], bool]:
@@ -83,9 +100,38 @@ class VisibilityCheck:
         if self._has_full_vision():
             return lambda _: True
         if batch:
-            visible_dataset_ids = self._auth.get_visible_dataset_ids(hub, dataset_ids)
+            visible_dataset_ids = self._get_visible_dataset_ids(hub, dataset_ids)
             return lambda dataset_id: dataset_id in visible_dataset_ids
-        return self._auth.is_dataset_visible
+        return self._is_dataset_id_visible
+
+    def _get_visible_dataset_ids(
+        self, hub: Optional[Hub], dataset_ids: Optional[Iterable[DatasetId]]
+    ) -> Set[DatasetId]:
+        if dataset_ids is None:
+            visible_dataset_ids = self._auth.get_visible_dataset_ids(hub)
+            if hub is None:
+                self._all_visible_dataset_ids = visible_dataset_ids
+            else:
+                self._dataset_id_visibility.update({dataset_id: True for dataset_id in visible_dataset_ids})
+            return visible_dataset_ids
+        requested_dataset_ids = set(dataset_ids)
+        visible_dataset_ids = self._auth.get_visible_dataset_ids(hub, requested_dataset_ids)
+        self._dataset_id_visibility.update(
+            {dataset_id: dataset_id in visible_dataset_ids for dataset_id in requested_dataset_ids}
+        )
+        return visible_dataset_ids
+
+    def _get_known_visibility(self, dataset_id: DatasetId) -> Optional[bool]:
+        if self._all_visible_dataset_ids is not None:
+            return dataset_id in self._all_visible_dataset_ids
+        return self._dataset_id_visibility.get(dataset_id)
+
+    def _is_dataset_id_visible(self, dataset_id: DatasetId) -> bool:
+        is_visible = self._get_known_visibility(dataset_id)
+        if is_visible is None:
+            self._get_visible_dataset_ids(hub=None, dataset_ids=[dataset_id])
+            is_visible = self._dataset_id_visibility[dataset_id]
+        return is_visible
 
     def get_resource_visibility_check(self, batch: bool, hub: Optional[Hub] = None) -> Callable[[Resource], bool]:
         """Return a method that decides whether a resource is visible.
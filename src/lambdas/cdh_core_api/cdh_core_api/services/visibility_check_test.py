@@ -27,6 +27,7 @@ from cdh_core.entities.dataset_test import build_dataset
 from cdh_core.entities.dataset_test import build_dataset_id
 from cdh_core.entities.resource_test import build_s3_resource
 from cdh_core.enums.hubs import Hub
+from cdh_core.enums.hubs_test import build_hub
 from cdh_core_dev_tools.testing.builder import Builder
 
 
@@ -96,12 +97,32 @@ class TestDatasetVisibility(TestVisibilityCheck):
 
     @pytest.mark.parametrize("is_visible", [False, True])
     def test_single(self, is_visible: bool) -> None:
-        self.authorization_api.is_dataset_visible.return_value = is_visible
-        visibility_check = self.visibility_check.get_dataset_visibility_check(batch=False)
         dataset = build_dataset()
+        self.authorization_api.get_visible_dataset_ids.return_value = {dataset.id} if is_visible else set()
+        visibility_check = self.visibility_check.get_dataset_visibility_check(batch=False)
 
         assert visibility_check(dataset) == is_visible
-        self.authorization_api.is_dataset_visible.assert_called_once_with(dataset.id)
+        self.authorization_api.get_visible_dataset_ids.assert_called_once_with(None, {dataset.id})
+
+    def test_predicate_full_vision(self) -> None:
+        self.full_vision_check.return_value = True
+        predicate = self.visibility_check.get_dataset_visibility_predicate()
+
+        assert predicate.is_visible(build_dataset())
+        assert predicate.visible_ids is None
+        assert not self.authorization_api.method_calls
+
+    def test_predicate(self) -> None:
+        visible_dataset = build_dataset()
+        hub = visible_dataset.hub
+        self.authorization_api.get_visible_dataset_ids.return_value = {visible_dataset.id}
+
+        predicate = self.visibility_check.get_dataset_visibility_predicate(hub)
+
+        assert predicate.is_visible(visible_dataset)
+        assert not predicate.is_visible(build_dataset())
+        assert predicate.visible_ids == frozenset({visible_dataset.id})
+        self.authorization_api.get_visible_dataset_ids.assert_called_once_with(hub)
 
 
 class TestDatasetIdVisibility(TestVisibilityCheck):
@@ -125,12 +146,43 @@ class TestDatasetIdVisibility(TestVisibilityCheck):
 
     @pytest.mark.parametrize("is_visible", [False, True])
     def test_single(self, is_visible: bool) -> None:
-        self.authorization_api.is_dataset_visible.return_value = is_visible
-        visibility_check = self.visibility_check.get_dataset_id_visibility_check(batch=False)
         dataset_id = build_dataset_id()
+        self.authorization_api.get_visible_dataset_ids.return_value = {dataset_id} if is_visible else set()
+        visibility_check = self.visibility_check.get_dataset_id_visibility_check(batch=False)
 
         assert visibility_check(dataset_id) == is_visible
-        self.authorization_api.is_dataset_visible.assert_called_once_with(dataset_id)
+        self.authorization_api.get_visible_dataset_ids.assert_called_once_with(None, {dataset_id})
+        self.authorization_api.is_dataset_visible.assert_not_called()
+
+    def test_single_answers_are_kept(self) -> None:
+        dataset_id = build_dataset_id()
+        self.authorization_api.get_visible_dataset_ids.return_value = {dataset_id}
+
+        assert self.visibility_check.get_dataset_id_visibility_check(batch=False)(dataset_id)
+        assert self.visibility_check.get_dataset_id_visibility_check(batch=False)(dataset_id)
+
+        self.authorization_api.get_visible_dataset_ids.assert_called_once()
+
+    def test_single_is_answered_from_all_visible_dataset_ids(self) -> None:
+        visible_dataset_id = build_dataset_id()
+        self.authorization_api.get_visible_dataset_ids.return_value = {visible_dataset_id}
+        self.visibility_check.get_dataset_id_visibility_check(batch=True)
+        visibility_check = self.visibility_check.get_dataset_id_visibility_check(batch=False)
+
+        assert visibility_check(visible_dataset_id)
+        assert not visibility_check(build_dataset_id())
+        self.authorization_api.get_visible_dataset_ids.assert_called_once_with(None)
+
+    def test_single_uses_visible_dataset_ids_of_hub(self) -> None:
+        visible_dataset_id = build_dataset_id()
+        self.authorization_api.get_visible_dataset_ids.return_value = {visible_dataset_id}
+        self.visibility_check.get_dataset_id_visibility_check(batch=True, hub=build_hub())
+        visibility_check = self.visibility_check.get_dataset_id_visibility_check(batch=False)
+
+        assert visibility_check(visible_dataset_id)
+        self.authorization_api.get_visible_dataset_ids.assert_called_once()
+        assert not visibility_check(build_dataset_id())
+        assert self.authorization_api.get_visible_dataset_ids.call_count == 2
 
 
 class TestResourceVisibility(TestVisibilityCheck):
@@ -155,12 +207,12 @@ class TestResourceVisibility(TestVisibilityCheck):
 
     @pytest.mark.parametrize("is_visible", [False, True])
     def test_single(self, is_visible: bool) -> None:
-        self.authorization_api.is_dataset_visible.return_value = is_visible
-        visibility_check = self.visibility_check.get_resource_visibility_check(batch=False)
         resource = build_s3_resource()
+        self.authorization_api.get_visible_dataset_ids.return_value = {resource.dataset_id} if is_visible else set()
+        visibility_check = self.visibility_check.get_resource_visibility_check(batch=False)
 
         assert visibility_check(resource) == is_visible
-        self.authorization_api.is_dataset_visible.assert_called_once_with(resource.dataset_id)
+        self.authorization_api.get_visible_dataset_ids.assert_called_once_with(None, {resource.dataset_id})
 
 
 @pytest.mark.parametrize(
@@ -12,10 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import re
+from itertools import islice
 from logging import getLogger
-from typing import Callable
 from typing import Generic
-from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Sequence
@@ -25,7 +24,10 @@ from typing import Union
 
 from cdh_core_api.catalog.accounts_table import AccountNotFound
 from cdh_core_api.catalog.accounts_table import GenericAccountsTable
+from cdh_core_api.catalog.base import DynamoItemIterator
 from cdh_core_api.catalog.base import LastEvaluatedKey
+from cdh_core_api.catalog.base import PrefetchingDynamoItemIterator
+from cdh_core_api.catalog.base import VisibilityPredicate
 from cdh_core_api.catalog.datasets_table import DatasetNotFound
 from cdh_core_api.catalog.datasets_table import DatasetsTable
 from cdh_core_api.catalog.filter_packages_table import FilterPackageNotFound
@@ -36,7 +38,9 @@ from cdh_core_api.catalog.resource_table import ResourceNotFound
 from cdh_core_api.generic_types import GenericAccount
 from cdh_core_api.generic_types import GenericGlueSyncResource
 from cdh_core_api.generic_types import GenericS3Resource
+from cdh_core_api.services.parallel_executor import ParallelExecutor
 from cdh_core_api.services.visibility_check import VisibilityCheck
+from marshmallow import ValidationError
 
 from cdh_core.entities.accounts import Account
 from cdh_core.entities.dataset import Dataset
@@ -59,7 +63,11 @@ ItemT = TypeVar("ItemT", bound=Union[Resource, Account, Dataset])
 
 
 class VisibleDataLoader(Generic[GenericAccount, GenericS3Resource, GenericGlueSyncResource]):
-    """Loads data from the catalog subject to visibility constraints."""
+    """Loads data from the catalog subject to visibility constraints.
+
+    The visibility lookups are submitted to the ParallelExecutor, so that they overlap with the DynamoDB reads.
+    Lists are read ahead by a PrefetchingDynamoItemIterator, which skips the invisible items in the background.
+    """
 
     def __init__(  # pylint: disable=too-many-arguments
         self,
@@ -68,12 +76,14 @@ class VisibleDataLoader(Generic[GenericAccount, GenericS3Resource, GenericGlueSy
         datasets_table: DatasetsTable,
         filter_packages_table: FilterPackagesTable,
         visibility_check: VisibilityCheck,
+        parallel_executor: ParallelExecutor,
     ):
         self._resources_table = resources_table
         self._datasets_table = datasets_table
         self._accounts_table = accounts_table
         self._filter_packages_table = filter_packages_table
         self._visibility_check = visibility_check
+        self._parallel_executor = parallel_executor
 
     def get_account(self, account_id: AccountId) -> GenericAccount:
         """Get a single account, if visible."""
@@ -88,21 +98,35 @@ class VisibleDataLoader(Generic[GenericAccount, GenericS3Resource, GenericGlueSy
         last_evaluated_key: Optional[LastEvaluatedKey],
     ) -> Tuple[Sequence[GenericAccount], Optional[LastEvaluatedKey]]:
         """Get all visible accounts."""
-        accounts_iterator = self._accounts_table.get_accounts_iterator(
-            last_evaluated_key=last_evaluated_key,
-            consistent_read=False,
+        is_visible = self._parallel_executor.submit(
+            "visible account ids", lambda: self._visibility_check.get_account_visibility_check(batch=True)
         )
-        items = self._fill_from_iterator(
-            iterator=accounts_iterator,
-            is_visible=self._visibility_check.get_account_visibility_check(batch=True),
-            limit=limit,
+        accounts_iterator = PrefetchingDynamoItemIterator(
+            source=self._accounts_table.get_accounts_iterator(
+                last_evaluated_key=last_evaluated_key,
+                consistent_read=False,
+            ),
+            get_visibility=lambda: VisibilityPredicate(is_visible.result()),
+            parallel_executor=self._parallel_executor,
+            page_size=limit,
         )
+        items = self._fill_from_iterator(iterator=accounts_iterator, limit=limit)
         return items, accounts_iterator.last_evaluated_key
 
     def get_dataset(self, dataset_id: DatasetId) -> Dataset:
         """Get a single dataset, if visible."""
-        if self._visibility_check.get_dataset_id_visibility_check(batch=False)(dataset_id):
-            return self._datasets_table.get(dataset_id)
+        is_visible = self._parallel_executor.submit(
+            "dataset visibility",
+            lambda: self._visibility_check.get_dataset_id_visibility_check(batch=False)(dataset_id),
+        )
+        try:
+            dataset = self._datasets_table.get(dataset_id)
+        except Exception:
+            # the error of the read takes precedence over the one of the visibility check
+            is_visible.cancel()
+            raise
+        if is_visible.result():
+            return dataset
         raise DatasetNotFound(dataset_id)
 
     def get_filter_package(
@@ -130,24 +154,63 @@ class VisibleDataLoader(Generic[GenericAccount, GenericS3Resource, GenericGlueSy
 
         Depending on the specified `limit`, the response may be truncated and contain a `LastEvaluatedKey`.
         """
-        datasets_iterator = self._datasets_table.get_datasets_iterator(
+        visibility = self._parallel_executor.submit(
+            "visible dataset ids", lambda: self._visibility_check.get_dataset_visibility_predicate(hub)
+        )
+        if self._datasets_table.is_batch_get_key(last_evaluated_key):
+            source = self._get_visible_datasets_by_ids(
+                hub=hub, last_evaluated_key=last_evaluated_key, visibility=visibility.result()
+            )
+        else:
+            source = self._datasets_table.get_datasets_iterator(
+                hub=hub, last_evaluated_key=last_evaluated_key, consistent_read=False
+            )
+        datasets_iterator = PrefetchingDynamoItemIterator(
+            source=source,
+            get_visibility=visibility.result,
+            parallel_executor=self._parallel_executor,
+            page_size=limit,
+            # a scan cannot switch to reading the visible datasets by their ids, since these are read in another order
+            get_visible_items=lambda dataset_ids: self._datasets_table.get_datasets_iterator(
+                hub=hub,
+                last_evaluated_key=last_evaluated_key,
+                consistent_read=False,
+                dataset_ids=dataset_ids,
+            )
+            if last_evaluated_key is None
+            else None,
+        )
+        items = self._fill_from_iterator(iterator=datasets_iterator, limit=limit)
+        return items, datasets_iterator.last_evaluated_key
+
+    def _get_visible_datasets_by_ids(
+        self, hub: Hub, last_evaluated_key: Optional[LastEvaluatedKey], visibility: VisibilityPredicate[Dataset]
+    ) -> DynamoItemIterator[Dataset]:
+        if visibility.visible_ids is None:
+            raise ValidationError("The provided nextPageToken has expired, request the first page again")
+        return self._datasets_table.get_datasets_iterator(
             hub=hub,
             last_evaluated_key=last_evaluated_key,
             consistent_read=False,
+            dataset_ids=visibility.visible_ids,
         )
-        items = self._fill_from_iterator(
-            iterator=datasets_iterator,
-            is_visible=self._visibility_check.get_dataset_visibility_check(batch=True, hub=hub),
-            limit=limit,
-        )
-        return items, datasets_iterator.last_evaluated_key
 
     def get_datasets_cross_hub(self, dataset_ids: List[DatasetId]) -> List[Dataset]:
-        """Get all visible datasets among a specific list."""
-        visibility_check = self._visibility_check.get_dataset_id_visibility_check(batch=True, dataset_ids=dataset_ids)
-        return self._datasets_table.batch_get(
-            [dataset_id for dataset_id in dataset_ids if visibility_check(dataset_id)]
+        """Get all visible datasets among a specific list.
+
+        The datasets are read while the visibility is determined and the invisible ones are dropped afterwards.
+        """
+        is_visible = self._parallel_executor.submit(
+            "visible dataset ids",
+            lambda: self._visibility_check.get_dataset_id_visibility_check(batch=True, dataset_ids=dataset_ids),
         )
+        try:
+            datasets = self._datasets_table.batch_get(dataset_ids)
+        except Exception:
+            is_visible.cancel()
+            raise
+        visibility_check = is_visible.result()
+        return [dataset for dataset in datasets if visibility_check(dataset.id)]
 
     def get_resource(
         self, resource_type: ResourceType, dataset_id: DatasetId, stage: Stage, region: Region
@@ -205,21 +268,25 @@ class VisibleDataLoader(Generic[GenericAccount, GenericS3Resource, GenericGlueSy
 
         Depending on the specified `limit`, the response may be truncated and contain a `LastEvaluatedKey`.
         """
-        resources_iterator = self._resources_table.get_resources_iterator(
-            hub=hub,
-            dataset_id=dataset_id,
-            stage=stage,
-            region=region,
-            resource_account=resource_account,
-            resource_type=resource_type,
-            last_evaluated_key=last_evaluated_key,
-            consistent_read=False,
+        is_visible = self._parallel_executor.submit(
+            "visible dataset ids", lambda: self._visibility_check.get_resource_visibility_check(batch=True, hub=hub)
         )
-        items = self._fill_from_iterator(
-            iterator=resources_iterator,
-            is_visible=self._visibility_check.get_resource_visibility_check(batch=True, hub=hub),
-            limit=limit,
+        resources_iterator = PrefetchingDynamoItemIterator(
+            source=self._resources_table.get_resources_iterator(
+                hub=hub,
+                dataset_id=dataset_id,
+                stage=stage,
+                region=region,
+                resource_account=resource_account,
+                resource_type=resource_type,
+                last_evaluated_key=last_evaluated_key,
+                consistent_read=False,
+            ),
+            get_visibility=lambda: VisibilityPredicate(is_visible.result()),
+            parallel_executor=self._parallel_executor,
+            page_size=limit,
         )
+        items = self._fill_from_iterator(iterator=resources_iterator, limit=limit)
         return items, resources_iterator.last_evaluated_key
 
     def get_hubs(self) -> List[Hub]:
@@ -228,11 +295,8 @@ class VisibleDataLoader(Generic[GenericAccount, GenericS3Resource, GenericGlueSy
         return [hub for hub in Hub if visibility_check(hub)]
 
     @staticmethod
-    def _fill_from_iterator(iterator: Iterator[ItemT], is_visible: Callable[[ItemT], bool], limit: int) -> List[ItemT]:
-        items: List[ItemT] = []
-        for item in iterator:
-            if is_visible(item):
-                items.append(item)
-            if len(items) >= limit:
-                break
-        return items
+    def _fill_from_iterator(iterator: PrefetchingDynamoItemIterator[ItemT], limit: int) -> List[ItemT]:
+        try:
+            return list(islice(iterator, limit))
+        finally:
+            iterator.close()
@@ -14,10 +14,13 @@
 # pylint: disable=use-implicit-booleaness-not-comparison
 import random
 from contextlib import ExitStack
+from itertools import chain
+from itertools import count
 from random import randint
+from typing import Dict
+from typing import Iterator
 from typing import Union
 from unittest.mock import call
-from unittest.mock import MagicMock
 from unittest.mock import Mock
 from unittest.mock import patch
 
@@ -25,15 +28,20 @@ import pytest
 from cdh_core_api.catalog.accounts_table import AccountNotFound
 from cdh_core_api.catalog.accounts_table import AccountsTable
 from cdh_core_api.catalog.base import DynamoItemIterator
+from cdh_core_api.catalog.base import LastEvaluatedKey
+from cdh_core_api.catalog.base import VisibilityPredicate
 from cdh_core_api.catalog.base_test import build_last_evaluated_key
+from cdh_core_api.catalog.datasets_table import BATCH_GET_KEY_MARKER
 from cdh_core_api.catalog.datasets_table import DatasetNotFound
 from cdh_core_api.catalog.datasets_table import DatasetsTable
 from cdh_core_api.catalog.filter_packages_table import FilterPackageNotFound
 from cdh_core_api.catalog.filter_packages_table import FilterPackagesTable
 from cdh_core_api.catalog.resource_table import ResourceNotFound
 from cdh_core_api.catalog.resource_table import ResourcesTable
+from cdh_core_api.services.parallel_executor import ParallelExecutor
 from cdh_core_api.services.visibility_check import VisibilityCheck
 from cdh_core_api.services.visible_data_loader import VisibleDataLoader
+from marshmallow import ValidationError
 
 from cdh_core.entities.accounts import Account
 from cdh_core.entities.accounts_test import build_account
@@ -52,12 +60,14 @@ from cdh_core.enums.resource_properties_test import build_stage
 from cdh_core.exceptions.http import InternalError
 from cdh_core.exceptions.http import NotFoundError
 from cdh_core.primitives.account_id_test import build_account_id
+from cdh_core_dev_tools.testing.assert_raises import assert_raises
 from cdh_core_dev_tools.testing.builder import Builder
 
 
 class VisibleDataLoaderTestCase:
     def setup_method(self) -> None:
         self.datasets_table = Mock(DatasetsTable)
+        self.datasets_table.is_batch_get_key.side_effect = DatasetsTable.is_batch_get_key
         self.resources_table = Mock(ResourcesTable)
         self.accounts_table = Mock(AccountsTable)
         self.filter_packages_table = Mock(FilterPackagesTable)
@@ -68,6 +78,7 @@ class VisibleDataLoaderTestCase:
             accounts_table=self.accounts_table,
             filter_packages_table=self.filter_packages_table,
             visibility_check=self.visibility_check,
+            parallel_executor=ParallelExecutor(max_workers=2, trace=False),
         )
 
 
@@ -114,33 +125,33 @@ class TestGetAccounts(VisibleDataLoaderTestCase):
             any_order=True,
         )
 
-    def test_stop_consuming_iterator_when_limit_reached(self) -> None:
+    def test_stop_when_limit_reached(self) -> None:
         accounts = [build_account() for _ in range(10)]
-        iterator = DynamoItemIterator(items=iter(accounts), get_last_evaluated_key=Mock())
-
-        self.accounts_table.get_accounts_iterator.return_value = iterator
+        self.accounts_table.get_accounts_iterator.return_value = DynamoItemIterator(
+            items=chain(accounts, (build_account() for _ in count())), get_last_evaluated_key=Mock()
+        )
         self.visibility_check.get_account_visibility_check.return_value.side_effect = lambda _: True
         limit = randint(1, len(accounts) - 1)
 
-        self.visible_data_loader.get_accounts(limit=limit, last_evaluated_key=build_last_evaluated_key())
+        result, _ = self.visible_data_loader.get_accounts(limit=limit, last_evaluated_key=build_last_evaluated_key())
 
-        remaining_accounts = list(iterator)
-        assert len(remaining_accounts) == len(accounts) - limit
+        assert result == accounts[:limit]
 
     @pytest.mark.parametrize("reach_limit", [False, True])
     def test_last_evaluated_key_retrieved_after_iterator_consumed(self, reach_limit: bool) -> None:
         accounts = [build_account() for _ in range(10)]
         visible_accounts = sorted(random.sample(accounts, 5), key=accounts.index)
-        raw_accounts_iter = iter(accounts)
-        iterator = MagicMock()
-        iterator.last_evaluated_key = build_last_evaluated_key()
+        keys = [build_last_evaluated_key()]
+        keys_by_item: Dict[int, LastEvaluatedKey] = {}
 
-        def get_next() -> Union[Account]:
-            iterator.last_evaluated_key = build_last_evaluated_key()
-            item = next(raw_accounts_iter)
-            return item
+        def read() -> Iterator[Union[Account]]:
+            for item in accounts:
+                keys.append(build_last_evaluated_key())
+                keys_by_item[id(item)] = keys[-1]
+                yield item
+            keys.append(build_last_evaluated_key())
 
-        iterator.__iter__.return_value.__next__.side_effect = get_next
+        iterator = DynamoItemIterator(items=read(), get_last_evaluated_key=lambda: keys[-1])
 
         self.accounts_table.get_accounts_iterator.return_value = iterator
         self.visibility_check.get_account_visibility_check.return_value.side_effect = (
@@ -148,10 +159,14 @@ class TestGetAccounts(VisibleDataLoaderTestCase):
         )
         limit = len(visible_accounts) + (-1 if reach_limit else +1)
 
-        _, last_evaluated_key = self.visible_data_loader.get_accounts(
+        result, last_evaluated_key = self.visible_data_loader.get_accounts(
             limit=limit, last_evaluated_key=build_last_evaluated_key()
         )
-        assert last_evaluated_key == iterator.last_evaluated_key
+        if reach_limit:
+            # the key must point to the last returned item, even though the items after it were read ahead
+            assert last_evaluated_key == keys_by_item[id(result[-1])]
+        else:
+            assert last_evaluated_key == keys[-1]
 
     def test_filter_visible_accounts_reach_limit(self) -> None:
         accounts = [build_account() for _ in range(10)]
@@ -166,12 +181,6 @@ class TestGetAccounts(VisibleDataLoaderTestCase):
 
         result, _ = self.visible_data_loader.get_accounts(limit=limit, last_evaluated_key=build_last_evaluated_key())
         assert result == visible_accounts[:limit]
-        max_index_reached = accounts.index(result[-1])
-        self.visibility_check.get_account_visibility_check.return_value.assert_has_calls(
-            calls=[call(account) for account in accounts[: max_index_reached + 1]],
-            any_order=True,
-        )
-        assert self.visibility_check.get_account_visibility_check.return_value.call_count == max_index_reached + 1
 
     def test_empty_account_iterator(self) -> None:
         expected_last_evaluated_key = build_last_evaluated_key()
@@ -216,7 +225,21 @@ class TestGetDataset(VisibleDataLoaderTestCase):
         with pytest.raises(DatasetNotFound):
             self.visible_data_loader.get_dataset(dataset.id)
 
-        self.datasets_table.get.assert_not_called()
+    def test_non_existing(self) -> None:
+        dataset = build_dataset()
+        self.datasets_table.get.side_effect = DatasetNotFound(dataset.id)
+        self.visibility_check.get_dataset_id_visibility_check.return_value.return_value = True
+
+        with pytest.raises(DatasetNotFound):
+            self.visible_data_loader.get_dataset(dataset.id)
+
+    def test_read_error_is_not_masked_by_visibility_error(self) -> None:
+        dataset = build_dataset()
+        self.datasets_table.get.side_effect = DatasetNotFound(dataset.id)
+        self.visibility_check.get_dataset_id_visibility_check.return_value.side_effect = Exception()
+
+        with pytest.raises(DatasetNotFound):
+            self.visible_data_loader.get_dataset(dataset.id)
 
 
 class TestGetDatasets(VisibleDataLoaderTestCase):
@@ -227,7 +250,7 @@ class TestGetDatasets(VisibleDataLoaderTestCase):
         self.datasets_table.get_datasets_iterator.return_value = DynamoItemIterator(
             items=iter(datasets), get_last_evaluated_key=Mock()
         )
-        self.visibility_check.get_dataset_visibility_check.return_value.side_effect = (
+        self.visibility_check.get_dataset_visibility_predicate.return_value = VisibilityPredicate(
             lambda dataset: dataset in visible_datasets
         )
         hub = build_hub()
@@ -236,50 +259,53 @@ class TestGetDatasets(VisibleDataLoaderTestCase):
         )
         assert result == visible_datasets
 
-        self.visibility_check.get_dataset_visibility_check.assert_called_once_with(batch=True, hub=hub)
-        self.visibility_check.get_dataset_visibility_check.return_value.assert_has_calls(
-            calls=[call(dataset) for dataset in datasets],
-            any_order=True,
-        )
+        self.visibility_check.get_dataset_visibility_predicate.assert_called_once_with(hub)
+        self.datasets_table.get_datasets_iterator.assert_called_once()
 
-    def test_stop_consuming_iterator_when_limit_reached(self) -> None:
+    def test_stop_when_limit_reached(self) -> None:
         datasets = [build_dataset() for _ in range(10)]
-        iterator = DynamoItemIterator(items=iter(datasets), get_last_evaluated_key=Mock())
-
-        self.datasets_table.get_datasets_iterator.return_value = iterator
-        self.visibility_check.get_dataset_visibility_check.return_value.side_effect = lambda _: True
+        self.datasets_table.get_datasets_iterator.return_value = DynamoItemIterator(
+            items=chain(datasets, (build_dataset() for _ in count())), get_last_evaluated_key=Mock()
+        )
+        self.visibility_check.get_dataset_visibility_predicate.return_value = VisibilityPredicate(lambda _: True)
         limit = randint(1, len(datasets) - 1)
 
-        self.visible_data_loader.get_datasets(build_hub(), limit=limit, last_evaluated_key=build_last_evaluated_key())
+        result, _ = self.visible_data_loader.get_datasets(
+            build_hub(), limit=limit, last_evaluated_key=build_last_evaluated_key()
+        )
 
-        remaining_datasets = list(iterator)
-        assert len(remaining_datasets) == len(datasets) - limit
+        assert result == datasets[:limit]
 
     @pytest.mark.parametrize("reach_limit", [False, True])
     def test_last_evaluated_key_retrieved_after_iterator_consumed(self, reach_limit: bool) -> None:
         datasets = [build_dataset() for _ in range(10)]
         visible_datasets = sorted(random.sample(datasets, 5), key=datasets.index)
-        raw_datasets_iter = iter(datasets)
-        iterator = MagicMock()
-        iterator.last_evaluated_key = build_last_evaluated_key()
+        keys = [build_last_evaluated_key()]
+        keys_by_item: Dict[int, LastEvaluatedKey] = {}
 
-        def get_next() -> Dataset:
-            iterator.last_evaluated_key = build_last_evaluated_key()
-            item = next(raw_datasets_iter)
-            return item
+        def read() -> Iterator[Dataset]:
+            for item in datasets:
+                keys.append(build_last_evaluated_key())
+                keys_by_item[id(item)] = keys[-1]
+                yield item
+            keys.append(build_last_evaluated_key())
 
-        iterator.__iter__.return_value.__next__.side_effect = get_next
+        iterator = DynamoItemIterator(items=read(), get_last_evaluated_key=lambda: keys[-1])
 
         self.datasets_table.get_datasets_iterator.return_value = iterator
-        self.visibility_check.get_dataset_visibility_check.return_value.side_effect = (
+        self.visibility_check.get_dataset_visibility_predicate.return_value = VisibilityPredicate(
             lambda dataset: dataset in visible_datasets
         )
         limit = len(visible_datasets) + (-1 if reach_limit else +1)
 
-        _, last_evaluated_key = self.visible_data_loader.get_datasets(
+        result, last_evaluated_key = self.visible_data_loader.get_datasets(
             build_hub(), limit=limit, last_evaluated_key=build_last_evaluated_key()
         )
-        assert last_evaluated_key == iterator.last_evaluated_key
+        if reach_limit:
+            # the key must point to the last returned item, even though the items after it were read ahead
+            assert last_evaluated_key == keys_by_item[id(result[-1])]
+        else:
+            assert last_evaluated_key == keys[-1]
 
     def test_filter_visible_datasets_reach_limit(self) -> None:
         datasets = [build_dataset() for _ in range(10)]
@@ -287,7 +313,7 @@ class TestGetDatasets(VisibleDataLoaderTestCase):
         self.datasets_table.get_datasets_iterator.return_value = DynamoItemIterator(
             items=iter(datasets), get_last_evaluated_key=Mock()
         )
-        self.visibility_check.get_dataset_visibility_check.return_value.side_effect = (
+        self.visibility_check.get_dataset_visibility_predicate.return_value = VisibilityPredicate(
             lambda dataset: dataset in visible_datasets
         )
         limit = randint(1, len(visible_datasets) - 1)
@@ -296,12 +322,6 @@ class TestGetDatasets(VisibleDataLoaderTestCase):
             build_hub(), limit=limit, last_evaluated_key=build_last_evaluated_key()
         )
         assert result == visible_datasets[:limit]
-        max_index_reached = datasets.index(result[-1])
-        self.visibility_check.get_dataset_visibility_check.return_value.assert_has_calls(
-            calls=[call(dataset) for dataset in datasets[: max_index_reached + 1]],
-            any_order=True,
-        )
-        assert self.visibility_check.get_dataset_visibility_check.return_value.call_count == max_index_reached + 1
 
     def test_empty_dataset_iterator(self) -> None:
         expected_last_evaluated_key = build_last_evaluated_key()
@@ -325,30 +345,95 @@ class TestGetDatasets(VisibleDataLoaderTestCase):
 
         assert self.datasets_table.get_datasets_iterator.call_args.kwargs["last_evaluated_key"] == last_evaluated_key
 
+    def test_read_few_visible_datasets_by_ids(self) -> None:
+        datasets = [build_dataset() for _ in range(3)]
+        visible_dataset_ids = frozenset(dataset.id for dataset in datasets)
+        hub = build_hub()
+        self.visibility_check.get_dataset_visibility_predicate.return_value = VisibilityPredicate(
+            lambda dataset: dataset.id in visible_dataset_ids, visible_ids=visible_dataset_ids
+        )
+        self.datasets_table.get_datasets_iterator.side_effect = [
+            DynamoItemIterator(items=iter([build_dataset()]), get_last_evaluated_key=Mock()),
+            DynamoItemIterator(items=iter(datasets), get_last_evaluated_key=lambda: None),
+        ]
+
+        result, last_evaluated_key = self.visible_data_loader.get_datasets(hub, limit=10, last_evaluated_key=None)
+
+        assert result == datasets
+        assert last_evaluated_key is None
+        self.datasets_table.get_datasets_iterator.assert_called_with(
+            hub=hub, last_evaluated_key=None, consistent_read=False, dataset_ids=visible_dataset_ids
+        )
+
+    def test_do_not_read_by_ids_when_resuming_scan(self) -> None:
+        datasets = [build_dataset() for _ in range(3)]
+        self.visibility_check.get_dataset_visibility_predicate.return_value = VisibilityPredicate(
+            lambda _: True, visible_ids=frozenset(dataset.id for dataset in datasets)
+        )
+        self.datasets_table.get_datasets_iterator.return_value = DynamoItemIterator(
+            items=iter(datasets), get_last_evaluated_key=Mock()
+        )
+
+        result, _ = self.visible_data_loader.get_datasets(
+            build_hub(), limit=10, last_evaluated_key=build_last_evaluated_key()
+        )
+
+        assert result == datasets
+        self.datasets_table.get_datasets_iterator.assert_called_once()
+
+    def test_resume_reading_visible_datasets_by_ids(self) -> None:
+        datasets = [build_dataset() for _ in range(3)]
+        visible_dataset_ids = frozenset(dataset.id for dataset in datasets)
+        hub = build_hub()
+        self.visibility_check.get_dataset_visibility_predicate.return_value = VisibilityPredicate(
+            lambda dataset: dataset.id in visible_dataset_ids, visible_ids=visible_dataset_ids
+        )
+        self.datasets_table.get_datasets_iterator.return_value = DynamoItemIterator(
+            items=iter(datasets), get_last_evaluated_key=lambda: None
+        )
+        last_evaluated_key = LastEvaluatedKey({"id": {"S": "a"}, BATCH_GET_KEY_MARKER: {"BOOL": True}})
+
+        result, _ = self.visible_data_loader.get_datasets(hub, limit=10, last_evaluated_key=last_evaluated_key)
+
+        assert result == datasets
+        self.datasets_table.get_datasets_iterator.assert_called_once_with(
+            hub=hub, last_evaluated_key=last_evaluated_key, consistent_read=False, dataset_ids=visible_dataset_ids
+        )
+
+    def test_resume_reading_by_ids_requires_visible_ids(self) -> None:
+        self.visibility_check.get_dataset_visibility_predicate.return_value = VisibilityPredicate(lambda _: True)
+        last_evaluated_key = LastEvaluatedKey({"id": {"S": "a"}, BATCH_GET_KEY_MARKER: {"BOOL": True}})
+
+        with pytest.raises(ValidationError):
+            self.visible_data_loader.get_datasets(build_hub(), limit=10, last_evaluated_key=last_evaluated_key)
+        self.datasets_table.get_datasets_iterator.assert_not_called()
+
 
 class TestGetDatasetsCrossHub(VisibleDataLoaderTestCase):
     def test_filter_visible_datasets(self) -> None:
         visible_dataset = build_dataset()
         invisible_dataset = build_dataset()
-        catalog_response = Mock()
-        self.datasets_table.batch_get.return_value = catalog_response
+        self.datasets_table.batch_get.return_value = [visible_dataset, invisible_dataset]
         self.visibility_check.get_dataset_id_visibility_check.return_value.side_effect = (
             lambda dataset_id: dataset_id == visible_dataset.id
         )
 
-        assert (
-            self.visible_data_loader.get_datasets_cross_hub([visible_dataset.id, invisible_dataset.id])
-            == catalog_response
-        )
+        assert self.visible_data_loader.get_datasets_cross_hub([visible_dataset.id, invisible_dataset.id]) == [
+            visible_dataset
+        ]
 
         self.visibility_check.get_dataset_id_visibility_check.assert_called_once_with(
             batch=True, dataset_ids=[visible_dataset.id, invisible_dataset.id]
         )
-        self.visibility_check.get_dataset_id_visibility_check.return_value.assert_has_calls(
-            calls=[call(visible_dataset.id), call(invisible_dataset.id)],
-            any_order=True,
-        )
-        self.datasets_table.batch_get.assert_called_once_with([visible_dataset.id])
+        self.datasets_table.batch_get.assert_called_once_with([visible_dataset.id, invisible_dataset.id])
+
+    def test_read_error_is_not_masked_by_visibility_error(self) -> None:
+        error = Exception(Builder.build_random_string())
+        self.datasets_table.batch_get.side_effect = error
+        self.visibility_check.get_dataset_id_visibility_check.side_effect = Exception()
+
+        with assert_raises(error):
+            self.visible_data_loader.get_datasets_cross_hub([build_dataset().id])
 
 
 class TestGetResource(VisibleDataLoaderTestCase):
@@ -523,33 +608,35 @@ class TestGetResources(VisibleDataLoaderTestCase):
             any_order=True,
         )
 
-    def test_stop_consuming_iterator_when_limit_reached(self) -> None:
+    def test_stop_when_limit_reached(self) -> None:
         resources = [build_resource() for _ in range(10)]
-        iterator = DynamoItemIterator(items=iter(resources), get_last_evaluated_key=Mock())
-
-        self.resources_table.get_resources_iterator.return_value = iterator
+        self.resources_table.get_resources_iterator.return_value = DynamoItemIterator(
+            items=chain(resources, (build_resource() for _ in count())), get_last_evaluated_key=Mock()
+        )
         self.visibility_check.get_resource_visibility_check.return_value.side_effect = lambda _: True
         limit = randint(1, len(resources) - 1)
 
-        self.visible_data_loader.get_resources(build_hub(), limit=limit, last_evaluated_key=build_last_evaluated_key())
+        result, _ = self.visible_data_loader.get_resources(
+            build_hub(), limit=limit, last_evaluated_key=build_last_evaluated_key()
+        )
 
-        remaining_resources = list(iterator)
-        assert len(remaining_resources) == len(resources) - limit
+        assert result == resources[:limit]
 
     @pytest.mark.parametrize("reach_limit", [False, True])
     def test_last_evaluated_key_retrieved_after_iterator_consumed(self, reach_limit: bool) -> None:
         resources = [build_resource() for _ in range(10)]
         visible_resources = sorted(random.sample(resources, 5), key=resources.index)
-        raw_resources_iter = iter(resources)
-        iterator = MagicMock()
-        iterator.last_evaluated_key = build_last_evaluated_key()
+        keys = [build_last_evaluated_key()]
+        keys_by_item: Dict[int, LastEvaluatedKey] = {}
 
-        def get_next() -> Union[S3Resource, GlueSyncResource]:
-            iterator.last_evaluated_key = build_last_evaluated_key()
-            item = next(raw_resources_iter)
-            return item
+        def read() -> Iterator[Union[S3Resource, GlueSyncResource]]:
+            for item in resources:
+                keys.append(build_last_evaluated_key())
+                keys_by_item[id(item)] = keys[-1]
+                yield item
+            keys.append(build_last_evaluated_key())
 
-        iterator.__iter__.return_value.__next__.side_effect = get_next
+        iterator = DynamoItemIterator(items=read(), get_last_evaluated_key=lambda: keys[-1])
 
         self.resources_table.get_resources_iterator.return_value = iterator
         self.visibility_check.get_resource_visibility_check.return_value.side_effect = (
@@ -557,10 +644,14 @@ class TestGetResources(VisibleDataLoaderTestCase):
         )
         limit = len(visible_resources) + (-1 if reach_limit else +1)
 
-        _, last_evaluated_key = self.visible_data_loader.get_resources(
+        result, last_evaluated_key = self.visible_data_loader.get_resources(
             build_hub(), limit=limit, last_evaluated_key=build_last_evaluated_key()
         )
-        assert last_evaluated_key == iterator.last_evaluated_key
+        if reach_limit:
+            # the key must point to the last returned item, even though the items after it were read ahead
+            assert last_evaluated_key == keys_by_item[id(result[-1])]
+        else:
+            assert last_evaluated_key == keys[-1]
 
     def test_filter_visible_resources_reach_limit(self) -> None:
         resources = [build_resource() for _ in range(10)]
@@ -577,12 +668,6 @@ class TestGetResources(VisibleDataLoaderTestCase):
             build_hub(), limit=limit, last_evaluated_key=build_last_evaluated_key()
         )
         assert result == visible_resources[:limit]
-        max_index_reached = resources.index(result[-1])
-        self.visibility_check.get_resource_visibility_check.return_value.assert_has_calls(
-            calls=[call(resource) for resource in resources[: max_index_reached + 1]],
-            any_order=True,
-        )
-        assert self.visibility_check.get_resource_visibility_check.return_value.call_count == max_index_reached + 1
 
     def test_empty_resource_iterator(self) -> None:
         expected_last_evaluated_key = build_last_evaluated_key()
@@ -29,7 +29,7 @@ setup(
     description="Central lambda for the cloud data hub (CDH) core api",
     version="0.0.1",
     packages=find_packages(include=["*"]),
-    package_data={"cdh_core_api": ["py.typed", "examples/*.json"]},
+    package_data={"cdh_core_api": ["py.typed", "examples/*.json", "route_manifest.json"]},
     python_requires=">=3.9",
     classifiers=[
         "Programming Language :: Python :: 3",